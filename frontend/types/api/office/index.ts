@@ -9,6 +9,7 @@ export type { AvailabilityResponse } from './models/AvailabilityResponse';
 export type { AvailableSlot } from './models/AvailableSlot';
 export type { BackfillRequest } from './models/BackfillRequest';
 export type { BackfillResponse } from './models/BackfillResponse';
+export type { BackfillShardCheckpoint } from './models/BackfillShardCheckpoint';
 export type { BackfillStatus } from './models/BackfillStatus';
 export { BackfillStatusEnum } from './models/BackfillStatusEnum';
 export type { CalendarEvent } from './models/CalendarEvent';
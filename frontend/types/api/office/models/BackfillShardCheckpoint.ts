@@ -0,0 +1,34 @@
+/* generated using openapi-typescript-codegen -- do no edit */
+/* istanbul ignore file */
+/* tslint:disable */
+/* eslint-disable */
+/**
+ * Resume checkpoint for one folder/date-window shard of a backfill job
+ */
+export type BackfillShardCheckpoint = {
+    /**
+     * Provider folder/label ID, or None for all mail
+     */
+    folder?: (string | null);
+    /**
+     * Inclusive lower bound of the shard's received-date window
+     */
+    start_date?: (string | null);
+    /**
+     * Exclusive upper bound of the shard's received-date window
+     */
+    end_date?: (string | null);
+    /**
+     * Provider cursor for the first unprocessed page
+     */
+    next_page_token?: (string | null);
+    /**
+     * Whether every page was processed
+     */
+    completed?: boolean;
+    /**
+     * Emails published from shard
+     */
+    processed_emails?: number;
+};
+
@@ -3,6 +3,7 @@
 /* tslint:disable */
 /* eslint-disable */
 import type { BackfillRequest } from './BackfillRequest';
+import type { BackfillShardCheckpoint } from './BackfillShardCheckpoint';
 import type { BackfillStatusEnum } from './BackfillStatusEnum';
 /**
  * Current status of a backfill job
@@ -56,6 +57,14 @@ export type BackfillStatus = {
      * Number of emails that failed
      */
     failed_emails?: number;
+    /**
+     * Provider cursor for the first unprocessed page (resume checkpoint)
+     */
+    next_page_token?: (string | null);
+    /**
+     * Folder/date-window shards with per-shard resume checkpoints
+     */
+    shards?: Array<BackfillShardCheckpoint>;
     /**
      * Error message if job failed
      */
@@ -6,6 +6,7 @@
  * Status of a backfill job
  */
 export enum BackfillStatusEnum {
+    QUEUED = 'queued',
     STARTED = 'started',
     RUNNING = 'running',
     PAUSED = 'paused',
@@ -12,6 +12,7 @@ export type EmailMessageListData = {
     providers_used: Array<string>;
     provider_errors?: (Record<string, string> | null);
     has_more?: boolean;
+    next_page_token?: (string | null);
     request_metadata: Record<string, any>;
 };
 
@@ -34,6 +34,9 @@ from services.api.v1.office.schemas import (  # Email Models; Calendar Models; F
     DriveFileList,
     DriveFileListApiResponse,
     EmailAddress,
+    EmailChange,
+    EmailChangeList,
+    EmailChangeListData,
     EmailDraftCreateRequest,
     EmailDraftResponse,
     EmailDraftResult,
@@ -83,6 +86,9 @@ __all__ = [
     "EmailDraftResponse",
     "EmailMessageListData",
     "EmailMessageList",
+    "EmailChange",
+    "EmailChangeListData",
+    "EmailChangeList",
     "EmailFolder",
     "EmailFolderListData",
     "EmailFolderList",
@@ -201,6 +201,7 @@ class EmailMessageListData(BaseModel):
     providers_used: List[str]
     provider_errors: Optional[Dict[str, str]] = None
     has_more: bool = False
+    next_page_token: Optional[str] = None
     request_metadata: Dict[str, Any]
 
 
@@ -215,6 +216,37 @@ class EmailMessageList(BaseModel):
     request_id: str
 
 
+class EmailChange(BaseModel):
+    """One message change from a provider's change feed."""
+
+    operation: str  # create, update or delete
+    message_id: str  # Unified message ID (e.g. gmail_abc)
+    provider_message_id: str
+    message: Optional[EmailMessage] = None  # None for deletes
+
+
+class EmailChangeListData(BaseModel):
+    """Data structure for a page of message changes."""
+
+    changes: List[EmailChange]
+    provider: str
+    # Cursor to pass back once every page of this round has been processed
+    cursor: Optional[str] = None
+    next_page_token: Optional[str] = None
+    # The cursor passed in is too old; the caller must start a new round
+    cursor_expired: bool = False
+    request_metadata: Dict[str, Any]
+
+
+class EmailChangeList(BaseModel):
+    """Response model for message change feeds."""
+
+    success: bool
+    data: Optional[EmailChangeListData] = None
+    error: Optional[Dict[str, Any]] = None
+    request_id: str
+
+
 class EmailFolder(BaseModel):
     """Model for email folders/labels."""
 
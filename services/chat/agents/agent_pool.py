@@ -0,0 +1,191 @@
+"""
+Pool of reusable BrieflyAgent instances.
+
+Building an agent registers every tool in a fresh registry, creates the search
+tools and renders the tool catalog and system prompt, all before the first
+token of a turn. None of that depends on the thread, so the pool keeps one
+agent per (user, provider, model) and only rebinds it to the thread of each
+turn; the conversation history is loaded per turn as before.
+
+An agent serves one turn at a time. A concurrent turn with the same key gets a
+throwaway agent that is cleaned up when the turn ends. Agents unused for
+longer than the idle timeout are evicted and their resources released.
+"""
+
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Callable, List, Optional, Tuple
+
+from services.chat.agents.briefly_agent import BrieflyAgent, create_briefly_agent
+from services.chat.settings import get_settings
+from services.common.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+AgentKey = Tuple[str, str, str]
+
+
+@dataclass
+class _PooledAgent:
+    agent: BrieflyAgent
+    in_use: bool = False
+    last_used: float = field(default_factory=time.monotonic)
+
+
+class AgentPool:
+    """Keeps built agents per user and model for reuse across turns."""
+
+    def __init__(
+        self,
+        idle_seconds: Optional[float] = None,
+        max_agents: Optional[int] = None,
+        factory: Callable[..., BrieflyAgent] = create_briefly_agent,
+    ) -> None:
+        """
+        Initialize the pool.
+
+        Args:
+            idle_seconds: Seconds an unused agent is kept (defaults from settings)
+            max_agents: Agents kept at most (defaults from settings)
+            factory: Builds a new agent (defaults to create_briefly_agent)
+        """
+        self._idle_seconds = idle_seconds
+        self._max_agents = max_agents
+        self._factory = factory
+        # Least recently used first
+        self._agents: "OrderedDict[AgentKey, _PooledAgent]" = OrderedDict()
+
+    @property
+    def idle_seconds(self) -> float:
+        if self._idle_seconds is None:
+            return get_settings().agent_pool_idle_seconds
+        return self._idle_seconds
+
+    @property
+    def max_agents(self) -> int:
+        if self._max_agents is None:
+            return get_settings().agent_pool_max_agents
+        return self._max_agents
+
+    @asynccontextmanager
+    async def acquire(
+        self,
+        thread_id: int,
+        user_id: str,
+        vespa_endpoint: str,
+        user_timezone: Optional[str] = None,
+        llm_model: str = "gpt-4.1-nano",
+        llm_provider: str = "openai",
+        **llm_kwargs: Any,
+    ) -> AsyncIterator[BrieflyAgent]:
+        """
+        Get an agent bound to a thread for the duration of one turn.
+
+        Args:
+            thread_id: Thread of the turn
+            user_id: User the agent's tools act for
+            vespa_endpoint: Vespa endpoint for the search tools
+            user_timezone: Timezone for the turn's date context
+            llm_model: LLM model name
+            llm_provider: LLM provider name
+            **llm_kwargs: Extra LLM arguments, used when an agent is built
+
+        Yields:
+            The agent, exclusively for this turn
+        """
+        await self.evict_idle()
+
+        def build() -> BrieflyAgent:
+            return self._factory(
+                thread_id=thread_id,
+                user_id=user_id,
+                vespa_endpoint=vespa_endpoint,
+                user_timezone=user_timezone,
+                llm_model=llm_model,
+                llm_provider=llm_provider,
+                **llm_kwargs,
+            )
+
+        key = (user_id, llm_provider, llm_model)
+        entry = self._agents.get(key)
+        evicted: List[_PooledAgent] = []
+        if entry is None:
+            evicted = self._make_room()
+            if len(self._agents) < self.max_agents:
+                entry = _PooledAgent(build())
+                self._agents[key] = entry
+        elif entry.in_use:
+            entry = None
+        else:
+            entry.agent.bind_thread(thread_id, user_timezone)
+            self._agents.move_to_end(key)
+        # Claimed before the first await, so no other turn can take it
+        if entry is not None:
+            entry.in_use = True
+        for old in evicted:
+            await old.agent.cleanup()
+
+        if entry is None:
+            # Busy with another turn, or the pool is full of busy agents
+            agent = build()
+            try:
+                yield agent
+            finally:
+                await agent.cleanup()
+            return
+
+        try:
+            yield entry.agent
+        finally:
+            entry.in_use = False
+            entry.last_used = time.monotonic()
+
+    async def evict_idle(self) -> int:
+        """
+        Evict agents unused for longer than the idle timeout.
+
+        Returns:
+            Number of agents evicted
+        """
+        cutoff = time.monotonic() - self.idle_seconds
+        expired = [
+            self._agents.pop(key)
+            for key, entry in list(self._agents.items())
+            if not entry.in_use and entry.last_used < cutoff
+        ]
+        for entry in expired:
+            await entry.agent.cleanup()
+        if expired:
+            logger.debug(f"Evicted {len(expired)} idle pooled agents")
+        return len(expired)
+
+    def _make_room(self) -> List[_PooledAgent]:
+        """Remove least recently used idle agents until one more fits."""
+        evicted: List[_PooledAgent] = []
+        while len(self._agents) >= self.max_agents:
+            idle = next(
+                (key for key, entry in self._agents.items() if not entry.in_use),
+                None,
+            )
+            if idle is None:
+                break
+            evicted.append(self._agents.pop(idle))
+        return evicted
+
+    async def close(self) -> None:
+        """Release every pooled agent."""
+        while self._agents:
+            _, entry = self._agents.popitem()
+            await entry.agent.cleanup()
+
+    def stats(self) -> dict:
+        """Number of pooled agents and how many are serving a turn."""
+        return {
+            "agents": len(self._agents),
+            "in_use": sum(entry.in_use for entry in self._agents.values()),
+        }
+
+
+agent_pool = AgentPool()
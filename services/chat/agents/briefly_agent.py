@@ -12,16 +12,26 @@ Part of the single-agent workflow system.
 
 import logging
 from datetime import datetime, timezone
-from typing import Any, Callable, List, Optional, Sequence, Tuple, Union
+from typing import Any, Callable, List, Optional, Sequence, Tuple, Union, cast
 
 import pytz
-from llama_index.core.agent.workflow import AgentStream, FunctionAgent
+from llama_index.core.agent.workflow import (
+    AgentInput,
+    AgentOutput,
+    AgentStream,
+    FunctionAgent,
+    ToolCall,
+    ToolCallResult,
+)
 from llama_index.core.base.llms.types import ChatMessage
-from llama_index.core.tools import FunctionTool
-from llama_index.core.workflow import Context
+from llama_index.core.tools import AsyncBaseTool, FunctionTool, ToolOutput
+from llama_index.core.workflow import Context, StopEvent, step
 
 from services.chat import history_manager
 from services.chat.agents.llm_manager import get_llm_manager
+from services.chat.agents.response_cache import answer_chunks, response_cache
+from services.chat.agents.tool_runner import PendingToolCall, run_tool_calls
+from services.chat.settings import get_settings
 from services.chat.tools import DraftTools, GetTools, UserDataSearchTool, WebTools
 from services.chat.tools.draft_tools import _draft_storage
 
@@ -83,6 +93,23 @@ async def summarize_findings(ctx: Context, summary: str) -> str:
     return f"Findings summarized and recorded: {summary}"
 
 
+class _ToolCallCapture:
+    """Workflow context that holds back the ToolCall events sent through it."""
+
+    def __init__(self, ctx: Context) -> None:
+        self._ctx = ctx
+        self.tool_calls: List[ToolCall] = []
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._ctx, name)
+
+    def send_event(self, event: Any, *args: Any, **kwargs: Any) -> None:
+        if isinstance(event, ToolCall):
+            self.tool_calls.append(event)
+        else:
+            self._ctx.send_event(event, *args, **kwargs)
+
+
 class BrieflyAgent(FunctionAgent):
     """
     Single-agent design for Briefly that uses tools directly (no subagents).
@@ -180,6 +207,7 @@ class BrieflyAgent(FunctionAgent):
         llm_model: str = "gpt-5-nano",
         llm_provider: str = "openai",
         search_tools: Optional[UserDataSearchTool] = None,
+        get_tools: Optional[GetTools] = None,
         **llm_kwargs: Any,
     ) -> None:
         # Ensure we have max_tokens set to handle large tool outputs
@@ -254,6 +282,7 @@ class BrieflyAgent(FunctionAgent):
 
         # Keep a reference to tools that manage external resources
         self._search_tools: Optional[UserDataSearchTool] = search_tools
+        self._get_tools: Optional[GetTools] = get_tools
 
         # Initialize simple state management instead of problematic Context
         self._state: dict[str, Any] = {}
@@ -270,12 +299,27 @@ class BrieflyAgent(FunctionAgent):
             # Fallback logging if attributes aren't accessible yet
             logger.debug("BrieflyAgent initialized successfully")
 
+    def bind_thread(self, thread_id: int, user_timezone: Optional[str] = None) -> None:
+        """
+        Point a reused agent at the thread of a new turn.
+
+        Tools, the tool catalog and the base system prompt only depend on the
+        user and model, so they are kept; the thread, timezone and loaded
+        conversation history are replaced.
+        """
+        self._thread_id = str(thread_id)
+        self._user_timezone = user_timezone or "UTC"
+        self._state = {}
+
     async def cleanup(self) -> None:
         """Release any external resources held by the agent/tools."""
         try:
             if self._search_tools is not None:
                 await self._search_tools.cleanup()
                 self._search_tools = None
+            if self._get_tools is not None:
+                await self._get_tools.cleanup()
+                self._get_tools = None
         except Exception as e:
             logger.warning(f"Cleanup warning: {e}")
 
@@ -327,17 +371,110 @@ class BrieflyAgent(FunctionAgent):
                 {"stream_events": lambda: self._fallback_stream_events(user_msg)},
             )()
 
+    @step
+    async def parse_agent_output(
+        self, ctx: Context, ev: AgentOutput
+    ) -> Union[StopEvent, AgentInput, ToolCall, None]:
+        """
+        Run the tool calls of a step concurrently when the LLM asked for several.
+
+        FunctionAgent keeps all of the step's bookkeeping (iterations,
+        retries, stopping); only the ToolCall events it would send are taken
+        over. Their results are sent in the order of the calls, for the
+        aggregation step to add them to memory exactly as sequential calls
+        would be.
+        """
+        if len(ev.tool_calls) < 2:
+            return await super().parse_agent_output(ctx, ev)
+
+        dispatch = _ToolCallCapture(ctx)
+        result = await super().parse_agent_output(cast(Context, dispatch), ev)
+        if dispatch.tool_calls:
+            await self._dispatch_tool_calls(ctx, dispatch.tool_calls)
+        return result
+
+    async def _dispatch_tool_calls(
+        self, ctx: Context, tool_calls: Sequence[ToolCall]
+    ) -> None:
+        """Run tool calls concurrently and send their results in call order."""
+        for call in tool_calls:
+            ctx.write_event_to_stream(call)
+        outputs = await self._run_tools(
+            ctx, [(call.tool_name, call.tool_kwargs) for call in tool_calls]
+        )
+        tools_by_name = {tool.metadata.name: tool for tool in self._tools}
+        for call, output in zip(tool_calls, outputs):
+            tool = tools_by_name.get(call.tool_name)
+            result = ToolCallResult(
+                tool_name=call.tool_name,
+                tool_kwargs=call.tool_kwargs,
+                tool_id=call.tool_id,
+                tool_output=output,
+                return_direct=bool(tool and tool.metadata.return_direct),
+            )
+            ctx.write_event_to_stream(result)
+            ctx.send_event(result)
+
+    async def _call_tool(
+        self, ctx: Context, tool: AsyncBaseTool, tool_input: dict
+    ) -> ToolOutput:
+        """Call a single tool, with its timeout."""
+        (output,) = await self._run_tools(ctx, [(tool.metadata.get_name(), tool_input)])
+        return output
+
+    async def _run_tools(
+        self, ctx: Context, calls: Sequence[Tuple[str, dict]]
+    ) -> List[ToolOutput]:
+        """Run (tool name, arguments) calls concurrently; outputs are in call order."""
+        tools_by_name = {tool.metadata.name: tool for tool in self._tools}
+
+        def start(tool_name: str, tool_input: dict) -> PendingToolCall:
+            async def call() -> ToolOutput:
+                tool = tools_by_name.get(tool_name)
+                if tool is None:
+                    raise ValueError(
+                        f"Tool {tool_name} not found. Please select a tool that is available."
+                    )
+                return await super(BrieflyAgent, self)._call_tool(ctx, tool, tool_input)
+
+            return tool_name, call
+
+        outcomes = await run_tool_calls(
+            [start(tool_name, tool_input) for tool_name, tool_input in calls]
+        )
+        return [
+            (
+                outcome.result
+                if outcome.ok
+                else ToolOutput(
+                    content=outcome.error or "",
+                    tool_name=tool_name,
+                    raw_input=tool_input,
+                    raw_output=outcome.error,
+                    is_error=True,
+                )
+            )
+            for (tool_name, tool_input), outcome in zip(calls, outcomes)
+        ]
+
     async def _load_conversation_history(self, exclude_latest: bool = True) -> None:
-        """Load conversation history from database into agent context."""
+        """Load the thread's history window and summary into agent context.
+
+        Only messages not yet folded into the thread's rolling summary are
+        read, so the read stays bounded however long the thread grows.
+        """
         try:
 
-            # Get messages from database (get extra to account for exclusion)
-            db_messages = await history_manager.get_thread_history(
-                int(self._thread_id), limit=101 if exclude_latest else 100
+            # Get the recent window (get extra to account for exclusion)
+            window_size = get_settings().history_window_messages
+            window = await history_manager.get_conversation_window(
+                int(self._thread_id),
+                limit=window_size + 1 if exclude_latest else window_size,
             )
 
-            # Reverse to chronological order (oldest to newest)
-            db_messages = list(reversed(db_messages))
+            # Reverse to chronological order (oldest to newest), skipping empty
+            # placeholders of responses still being streamed
+            db_messages = [m for m in reversed(window.messages) if m.content]
 
             # Exclude the most recent message if requested (it's likely the current user input)
             if (
@@ -363,6 +500,7 @@ class BrieflyAgent(FunctionAgent):
             if not isinstance(state, dict):
                 state = {}
             state["conversation_history"] = chat_history
+            state["conversation_summary"] = window.summary or ""
             self._state["state"] = state
 
             # Logging to help diagnose history loading behavior
@@ -416,22 +554,33 @@ class BrieflyAgent(FunctionAgent):
             logger.error(f"Fallback streaming failed: {e}")
             yield f"I apologize, but I encountered an error: {str(e)}"
 
-    def _format_history_for_prompt(self, max_messages: int = 20) -> str:
-        """Format recent conversation history into a textual prefix for the LLM."""
+    def _format_history_for_prompt(self, max_messages: Optional[int] = None) -> str:
+        """Format the conversation summary and recent history into a textual prefix for the LLM."""
         try:
             state = (
                 self._state.get("state", {}) if isinstance(self._state, dict) else {}
             )
             history = state.get("conversation_history", [])
-            if not isinstance(history, list) or not history:
+            summary = state.get("conversation_summary", "")
+            if not isinstance(history, list):
+                history = []
+            if not history and not summary:
                 logger.info(
                     f"No conversation history found for thread {self._thread_id}"
                 )
                 return ""
 
+            lines: List[str] = []
+            if summary:
+                lines.append("Summary of earlier conversation:")
+                lines.append(str(summary))
+                lines.append("")
+
             # Take last N messages for brevity
+            if max_messages is None:
+                max_messages = get_settings().history_window_messages
             recent_history = history[-max_messages:]
-            lines: List[str] = ["Conversation so far (most recent last):"]
+            lines.append("Conversation so far (most recent last):")
             for entry in recent_history:
                 role = str(entry.get("role", "user")).capitalize()
                 content = str(entry.get("content", ""))
@@ -488,6 +637,18 @@ class BrieflyAgent(FunctionAgent):
                 "yes" if bool(history_prefix) else "no",
             )
 
+            # The first turn of a thread depends only on the question and the
+            # user's data, so its answer can be reused for a repeated question
+            cacheable = get_settings().response_cache_enabled and not history_prefix
+            data_version = response_cache.data_version(self._user_id)
+            if cacheable:
+                cached_answer = await response_cache.lookup(self._user_id, message)
+                if cached_answer is not None:
+                    logger.info("BrieflyAgent: Answering from the response cache")
+                    for chunk in answer_chunks(cached_answer):
+                        yield chunk
+                    return
+
             # Try to use the FunctionAgent's run method, but with fallback
             try:
                 handler = self.run(user_msg=combined_message)
@@ -495,6 +656,7 @@ class BrieflyAgent(FunctionAgent):
                 # Check if handler has stream_events method
                 if hasattr(handler, "stream_events"):
                     try:
+                        answer_parts: List[str] = []
                         async for event in handler.stream_events():
                             # Only yield actual content, not debug info
                             if (
@@ -504,7 +666,12 @@ class BrieflyAgent(FunctionAgent):
                             ):
                                 # Only yield clean content, not raw data
                                 if isinstance(event.delta, str):
+                                    answer_parts.append(event.delta)
                                     yield event.delta
+                        if cacheable:
+                            await self._cache_answer(
+                                message, "".join(answer_parts), data_version
+                            )
                     except Exception as stream_error:
                         logger.warning(f"Streaming failed: {stream_error}")
                         # Use fallback streaming
@@ -531,6 +698,16 @@ class BrieflyAgent(FunctionAgent):
             logger.error(f"Error in BrieflyAgent streaming chat: {e}")
             yield f"I apologize, but I encountered an error: {str(e)}"
 
+    async def _cache_answer(self, message: str, answer: str, data_version: int) -> None:
+        """Cache the answer of a turn, unless the turn drafted something."""
+        try:
+            # Replaying the answer would not create the drafts again
+            if not answer or await self.get_draft_data():
+                return
+            await response_cache.store(self._user_id, message, answer, data_version)
+        except Exception as e:
+            logger.warning(f"Could not cache answer: {e}")
+
     async def get_draft_data(self) -> list[dict[str, Any]]:
         """Get draft data from the draft tools."""
         try:
@@ -552,8 +729,9 @@ class BrieflyAgent(FunctionAgent):
 
 def create_briefly_agent_tools(
     vespa_endpoint: str, user_id: str
-) -> Tuple[List[FunctionTool], str, UserDataSearchTool]:
-    """Create and return tools, tool catalog string, and the SearchTools instance."""
+) -> Tuple[List[FunctionTool], str, UserDataSearchTool, GetTools]:
+    """Create and return tools, tool catalog string, and the tool instances holding
+    external resources (the SearchTools and GetTools instances)."""
     # Initialize pre-authenticated tools with user context
     search_tools = UserDataSearchTool(vespa_endpoint, user_id)
     web_tools = WebTools()
@@ -585,11 +763,15 @@ def create_briefly_agent_tools(
         """Get complete API specification for a tool."""
         return get_tools.get_tool.get_tool_info(tool_id)
 
-    def get_tool_execute_wrapper(tool_name: str, params: Optional[dict] = None) -> Any:
+    async def get_tool_execute_wrapper(
+        tool_name: str, params: Optional[dict] = None
+    ) -> Any:
         """Execute a named tool with parameters."""
-        return get_tools.get_tool.execute(tool_name=tool_name, params=params)
+        return await get_tools.get_tool.execute(tool_name=tool_name, params=params)
 
-    def create_draft_email_wrapper(
+    # Drafts are in-memory; async wrappers keep them on the event loop rather
+    # than in the thread FunctionTool uses for sync functions
+    async def create_draft_email_wrapper(
         thread_id: str,
         to: Optional[str] = None,
         subject: Optional[str] = None,
@@ -600,7 +782,7 @@ def create_briefly_agent_tools(
             thread_id=thread_id, to=to, subject=subject, body=body, **kwargs
         )
 
-    def create_draft_calendar_event_wrapper(
+    async def create_draft_calendar_event_wrapper(
         thread_id: str,
         title: Optional[str] = None,
         start_time: Optional[str] = None,
@@ -621,7 +803,7 @@ def create_briefly_agent_tools(
             **kwargs,
         )
 
-    def create_draft_calendar_change_wrapper(
+    async def create_draft_calendar_change_wrapper(
         thread_id: str,
         event_id: Optional[str] = None,
         change_type: Optional[str] = None,
@@ -713,7 +895,7 @@ def create_briefly_agent_tools(
         ),
     ]
 
-    return tools, tool_catalog, search_tools
+    return tools, tool_catalog, search_tools, get_tools
 
 
 def create_briefly_agent(
@@ -726,7 +908,7 @@ def create_briefly_agent(
     **llm_kwargs: Any,
 ) -> BrieflyAgent:
     """Create a new BrieflyAgent instance with pre-authenticated tools."""
-    tools, tool_catalog, search_tools = create_briefly_agent_tools(
+    tools, tool_catalog, search_tools, get_tools = create_briefly_agent_tools(
         vespa_endpoint, user_id
     )
     agent = BrieflyAgent(
@@ -739,6 +921,7 @@ def create_briefly_agent(
         llm_model=llm_model,
         llm_provider=llm_provider,
         search_tools=search_tools,
+        get_tools=get_tools,
         **llm_kwargs,
     )
     return agent
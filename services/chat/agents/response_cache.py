@@ -0,0 +1,196 @@
+"""
+Per-user cache of answers to repeated chat questions.
+
+Users ask the same few questions many times a day ("what's on my calendar
+today", "emails from X"), and each one costs an LLM round trip plus tool
+calls. An answer is reused for a later question of the same user when the
+question is the same after normalization, or when its MiniLM embedding (the
+shared query embedder of the search tools) is similar enough, and
+- both were asked in the same time bucket, so "today" still means the same
+  day; buckets are aligned to the epoch, so with the default 15 minutes a
+  day boundary in any timezone starts a new bucket, and
+- the user's data version is unchanged, i.e. no email or calendar event was
+  ingested for the user in between (see ``invalidate_user``).
+
+The cache is in-process, like the agent pool, and opt-in
+(``response_cache_enabled``).
+"""
+
+import math
+import re
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+from services.chat.settings import get_settings
+from services.common.logging_config import get_logger
+from services.vespa_query.query_embedder import (
+    QueryEmbedder,
+    get_query_embedder,
+    normalize_query,
+)
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class _CachedAnswer:
+    embedding: Optional[List[float]]
+    bucket: int
+    data_version: int
+    answer: str
+
+
+def _cosine(a: List[float], b: List[float]) -> float:
+    dot = sum(x * y for x, y in zip(a, b))
+    norm = math.sqrt(sum(x * x for x in a)) * math.sqrt(sum(y * y for y in b))
+    return dot / norm if norm else 0.0
+
+
+def answer_chunks(answer: str) -> List[str]:
+    """Split a cached answer into word chunks to stream it like a fresh one."""
+    return re.findall(r"\s*\S+", answer) or [answer]
+
+
+class ResponseCache:
+    """Answers of recent questions per user, keyed by normalized question."""
+
+    def __init__(self, embedder: Optional[QueryEmbedder] = None) -> None:
+        """
+        Initialize the cache.
+
+        Args:
+            embedder: Embeds questions (defaults to the shared query embedder;
+                without one only normalized-equal questions match)
+        """
+        self._embedder = embedder
+        # user_id -> normalized question -> answer, least recently used first
+        self._entries: Dict[str, "OrderedDict[str, _CachedAnswer]"] = {}
+        self._data_versions: Dict[str, int] = {}
+        self._stats = {"hits": 0, "similar_hits": 0, "misses": 0, "invalidations": 0}
+
+    def data_version(self, user_id: str) -> int:
+        """Current data version of a user; pass it to ``store`` after the turn."""
+        return self._data_versions.get(user_id, 0)
+
+    def invalidate_user(self, user_id: str) -> None:
+        """Forget a user's answers after new data was ingested for them."""
+        self._data_versions[user_id] = self.data_version(user_id) + 1
+        self._entries.pop(user_id, None)
+        self._stats["invalidations"] += 1
+
+    def _bucket(self) -> int:
+        return int(time.time() // get_settings().response_cache_bucket_seconds)
+
+    def _current_entries(self, user_id: str) -> "OrderedDict[str, _CachedAnswer]":
+        """A user's entries, without those from past buckets or data versions."""
+        entries = self._entries.get(user_id)
+        if entries is None:
+            return OrderedDict()
+        bucket, version = self._bucket(), self.data_version(user_id)
+        for key in [
+            key
+            for key, entry in entries.items()
+            if entry.bucket != bucket or entry.data_version != version
+        ]:
+            del entries[key]
+        if not entries:
+            del self._entries[user_id]
+        return entries
+
+    async def _embed(self, question: str) -> Optional[List[float]]:
+        embedder = self._embedder or get_query_embedder()
+        if embedder is None:
+            return None
+        return await embedder.embed(question)
+
+    async def lookup(self, user_id: str, question: str) -> Optional[str]:
+        """
+        Get the cached answer to a question, or one similar enough.
+
+        Returns:
+            The answer, or None on a miss
+        """
+        key = normalize_query(question)
+        entries = self._current_entries(user_id)
+        if not key or not entries:
+            self._stats["misses"] += 1
+            return None
+
+        entry = entries.get(key)
+        if entry is not None:
+            entries.move_to_end(key)
+            self._stats["hits"] += 1
+            return entry.answer
+
+        version = self.data_version(user_id)
+        embedding = await self._embed(key)
+        # New data may have been ingested while embedding
+        if embedding is None or self.data_version(user_id) != version:
+            self._stats["misses"] += 1
+            return None
+
+        threshold = get_settings().response_cache_similarity_threshold
+        best_key, best_score = None, threshold
+        entries = self._current_entries(user_id)
+        for candidate_key, candidate in entries.items():
+            if candidate.embedding is None:
+                continue
+            score = _cosine(embedding, candidate.embedding)
+            if score >= best_score:
+                best_key, best_score = candidate_key, score
+        if best_key is None:
+            self._stats["misses"] += 1
+            return None
+
+        entries.move_to_end(best_key)
+        self._stats["similar_hits"] += 1
+        logger.debug(f"Reusing answer of a similar question (score={best_score:.3f})")
+        return entries[best_key].answer
+
+    async def store(
+        self, user_id: str, question: str, answer: str, data_version: int
+    ) -> None:
+        """
+        Cache the answer to a question.
+
+        Args:
+            user_id: User who asked
+            question: The question
+            answer: The full answer
+            data_version: ``data_version(user_id)`` from before the answer was
+                produced; the answer is dropped if new data arrived since
+        """
+        key = normalize_query(question)
+        if not key or not answer:
+            return
+        embedding = await self._embed(key)
+        if self.data_version(user_id) != data_version:
+            return
+
+        entries = self._entries.setdefault(user_id, OrderedDict())
+        entries[key] = _CachedAnswer(
+            embedding=embedding,
+            bucket=self._bucket(),
+            data_version=data_version,
+            answer=answer,
+        )
+        entries.move_to_end(key)
+        while len(entries) > get_settings().response_cache_max_entries_per_user:
+            entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Forget every cached answer."""
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and the number of cached answers."""
+        return {
+            **self._stats,
+            "users": len(self._entries),
+            "entries": sum(len(entries) for entries in self._entries.values()),
+        }
+
+
+response_cache = ResponseCache()
@@ -0,0 +1,90 @@
+"""
+Concurrent execution of the tool calls an LLM emits in one agent step.
+
+The tool calls of one step (for example user_data_search, web_search and a
+get_tool call) do not depend on each other, so they are run concurrently
+rather than one after another. Every call gets its own timeout, a failing or
+timed-out call does not affect the others, and outcomes are returned in the
+order the LLM listed the calls, so the conversation reads the same as with
+sequential execution.
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, List, Optional, Sequence, Tuple
+
+from services.chat.settings import get_settings
+from services.common.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+PendingToolCall = Tuple[str, Callable[[], Awaitable[Any]]]
+
+
+@dataclass
+class ToolCallOutcome:
+    """Result of one tool call, or why it produced none."""
+
+    tool_name: str
+    result: Any = None
+    error: Optional[str] = None
+    elapsed: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def tool_timeout(tool_name: str) -> float:
+    """Timeout for a tool: its override from settings, else the default."""
+    settings = get_settings()
+    return float(
+        settings.tool_call_timeouts.get(tool_name, settings.tool_call_timeout_seconds)
+    )
+
+
+async def run_tool_calls(
+    calls: Sequence[PendingToolCall], max_concurrency: Optional[int] = None
+) -> List[ToolCallOutcome]:
+    """
+    Run tool calls concurrently, each with its own timeout.
+
+    Args:
+        calls: (tool name, function starting the call) pairs
+        max_concurrency: Calls run at once (defaults from settings); 1 runs
+            them sequentially
+
+    Returns:
+        One outcome per call, in the order of ``calls``
+    """
+    if max_concurrency is None:
+        max_concurrency = get_settings().tool_call_max_concurrency
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+    async def run_one(
+        tool_name: str, call: Callable[[], Awaitable[Any]]
+    ) -> ToolCallOutcome:
+        async with semaphore:
+            # The timeout covers the call itself, not the wait for a slot
+            timeout = tool_timeout(tool_name)
+            started = time.monotonic()
+            try:
+                result = await asyncio.wait_for(call(), timeout)
+            except asyncio.TimeoutError:
+                logger.warning(f"Tool {tool_name} timed out after {timeout:g}s")
+                return ToolCallOutcome(
+                    tool_name,
+                    error=f"Tool {tool_name} timed out after {timeout:g} seconds",
+                    elapsed=time.monotonic() - started,
+                )
+            except Exception as e:
+                logger.error(f"Tool {tool_name} failed: {e}")
+                return ToolCallOutcome(
+                    tool_name, error=str(e), elapsed=time.monotonic() - started
+                )
+            return ToolCallOutcome(
+                tool_name, result=result, elapsed=time.monotonic() - started
+            )
+
+    return list(await asyncio.gather(*(run_one(name, call) for name, call in calls)))
@@ -0,0 +1,36 @@
+"""add_thread_summary_and_message_keyset_index
+
+Revision ID: 5c0f2b8d9e41
+Revises: a46de6cb2186
+Create Date: 2026-10-16 10:12:44.201937
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "5c0f2b8d9e41"
+down_revision: Union[str, None] = "a46de6cb2186"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column("threads", sa.Column("summary", sa.Text(), nullable=True))
+    op.add_column(
+        "threads", sa.Column("summary_through_id", sa.Integer(), nullable=True)
+    )
+    op.create_index(
+        "ix_messages_thread_id_id", "messages", ["thread_id", "id"], unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_messages_thread_id_id", table_name="messages")
+    op.drop_column("threads", "summary_through_id")
+    op.drop_column("threads", "summary")
@@ -8,6 +8,7 @@ Internal/service endpoints, if any, should be under /internal and require API ke
 
 import json
 import uuid
+from contextlib import AsyncExitStack
 from typing import AsyncGenerator, List, Optional
 
 from fastapi import APIRouter, Query, Request
@@ -15,7 +16,7 @@ from fastapi.responses import JSONResponse, StreamingResponse
 from pydantic import BaseModel
 
 from services.chat import history_manager
-from services.chat.agents.briefly_agent import create_briefly_agent
+from services.chat.agents.agent_pool import agent_pool
 from services.chat.agents.llm_manager import get_llm_manager
 from services.chat.history_manager import count_user_drafts
 from services.chat.models import (
@@ -122,16 +123,6 @@ async def chat_endpoint(
     if thread.id is None:
         raise ValidationError(message="thread.id cannot be None", field="thread.id")
 
-    agent = create_briefly_agent(
-        thread_id=int(thread.id),
-        user_id=user_id,
-        vespa_endpoint=get_settings().vespa_endpoint,
-        user_timezone=user_timezone,
-        llm_model=get_settings().llm_model,
-        llm_provider=get_settings().llm_provider,
-        **get_settings().llm_kwargs if hasattr(get_settings(), "llm_kwargs") else {},
-    )
-
     # Save user message to database first
     try:
         await history_manager.append_message(
@@ -143,15 +134,18 @@ async def chat_endpoint(
         logger.warning(f"Failed to save user message to database: {e}")
         # Continue without saving - conversation can still proceed
 
-    # Actually run the chat and get the agent's response
-    try:
+    # Actually run the chat with a pooled agent (reused across this user's turns)
+    async with agent_pool.acquire(
+        thread_id=int(thread.id),
+        user_id=user_id,
+        vespa_endpoint=get_settings().vespa_endpoint,
+        user_timezone=user_timezone,
+        llm_model=get_settings().llm_model,
+        llm_provider=get_settings().llm_provider,
+        **get_settings().llm_kwargs if hasattr(get_settings(), "llm_kwargs") else {},
+    ) as agent:
         agent_response = await agent.achat(user_input)
-    finally:
-        # Ensure any underlying client sessions are closed
-        try:
-            await agent.cleanup()
-        except Exception:
-            pass
+        draft_data = await agent.get_draft_data()
 
     # Save assistant response to database
     try:
@@ -164,9 +158,6 @@ async def chat_endpoint(
         logger.warning(f"Failed to save assistant response to database: {e}")
         # Continue without saving - response can still be returned
 
-    # Extract structured draft data
-    draft_data = await agent.get_draft_data()
-
     # Convert draft data to API models, including the database id
     from services.chat.models import DraftCalendarChange, DraftCalendarEvent, DraftEmail
 
@@ -219,7 +210,7 @@ async def chat_endpoint(
         )
     ]
     return ChatResponse(
-        thread_id=str(agent.thread_id),
+        thread_id=str(thread.id),
         messages=pydantic_messages,
         drafts=structured_drafts if structured_drafts else None,  # type: ignore[arg-type]
     )
@@ -275,13 +266,15 @@ async def chat_stream_endpoint(
 
     async def generate_streaming_response() -> AsyncGenerator[str, None]:
         """Generate streaming response using Server-Sent Events format."""
+        # Holds the pooled agent until the stream ends, however it ends
+        agent_scope = AsyncExitStack()
         try:
-            # Initialize the BrieflyAgent with user timezone and vespa endpoint
+            # Get a pooled BrieflyAgent bound to this thread and user timezone
             if thread.id is None:
                 raise ValidationError(
                     message="thread.id cannot be None", field="thread.id"
                 )
-            agent = create_briefly_agent(
+            acquire_agent = agent_pool.acquire(
                 thread_id=int(thread.id),
                 user_id=user_id,
                 vespa_endpoint=get_settings().vespa_endpoint,
@@ -294,6 +287,7 @@ async def chat_stream_endpoint(
                     else {}
                 ),
             )
+            agent = await agent_scope.enter_async_context(acquire_agent)
 
             # Save user message to database first
             try:
@@ -426,9 +420,9 @@ async def chat_stream_endpoint(
             error_data = {"error": str(e), "status": "error"}
             yield f"event: error\ndata: {json.dumps(error_data)}\n\n"
         finally:
-            # Ensure cleanup of agent resources regardless of outcome
+            # Return the agent to the pool regardless of outcome
             try:
-                await agent.cleanup()
+                await agent_scope.aclose()
             except Exception:
                 pass
 
@@ -0,0 +1,158 @@
+"""
+Pub/Sub consumer that invalidates cached chat answers when user data changes.
+
+Subscribes to the email and calendar topics the sync services publish to and,
+for every event, bumps the data version of the event's user in the response
+cache, so answers computed before the new data arrived are not reused.
+
+The cache is in-process, so every replica needs every event: each replica
+subscribes through its own subscriptions, named after the configured
+subscriptions with the replica id appended. They are deleted when the
+replica stops and expire in Pub/Sub if it never does.
+"""
+
+import asyncio
+import json
+import socket
+from typing import Any, Dict, Optional
+
+from services.chat.agents.response_cache import ResponseCache, response_cache
+from services.chat.settings import get_settings
+from services.common.config.subscription_config import SubscriptionConfig
+from services.common.logging_config import get_logger
+
+try:
+    from google.cloud import pubsub_v1  # type: ignore[attr-defined]
+
+    PUBSUB_AVAILABLE = True
+except ImportError:
+    PUBSUB_AVAILABLE = False
+    pubsub_v1 = None  # type: ignore
+
+logger = get_logger(__name__)
+
+# Pub/Sub deletes a replica's subscriptions after this long without a
+# subscriber (one day is the shortest expiration it allows)
+SUBSCRIPTION_TTL_SECONDS = 24 * 60 * 60
+
+
+class DataChangeConsumer:
+    """Invalidates a user's cached answers on their email and calendar events."""
+
+    def __init__(
+        self, cache: ResponseCache = response_cache, replica_id: Optional[str] = None
+    ) -> None:
+        self.cache = cache
+        self.replica_id = (
+            replica_id
+            or get_settings().response_cache_replica_id
+            or socket.gethostname()
+        )
+        self.subscriber: Optional[Any] = None
+        self._subscription_paths: Dict[str, str] = {}
+        self._streaming_futures: Dict[str, Any] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def subscription_name(self, topic_name: str) -> str:
+        """Name of this replica's subscription to a topic."""
+        config = SubscriptionConfig.get_subscription_config("chat", topic_name)
+        return f"{config['subscription_name']}-{self.replica_id}"
+
+    async def start(self) -> bool:
+        """Subscribe to the chat service's topics; returns whether it started."""
+        if not PUBSUB_AVAILABLE:
+            logger.error(
+                "Google Cloud Pub/Sub not available - cached answers expire by time only"
+            )
+            return False
+
+        settings = get_settings()
+        if settings.pubsub_emulator_host:
+            import os
+
+            os.environ["PUBSUB_EMULATOR_HOST"] = settings.pubsub_emulator_host
+
+        try:
+            self._loop = asyncio.get_running_loop()
+            # Subscription admin calls block, so they run off the event loop
+            await asyncio.to_thread(self._subscribe, settings.pubsub_project_id)
+            logger.info(
+                f"Response cache invalidation consumer started for replica {self.replica_id}"
+            )
+            return True
+        except Exception as e:
+            logger.error(f"Failed to start response cache invalidation consumer: {e}")
+            await self.stop()
+            return False
+
+    def _subscribe(self, project_id: str) -> None:
+        self.subscriber = pubsub_v1.SubscriberClient()
+        for topic_name in SubscriptionConfig.get_service_topics("chat"):
+            config = SubscriptionConfig.get_subscription_config("chat", topic_name)
+            subscription_name = self.subscription_name(topic_name)
+            subscription_path = self.subscriber.subscription_path(
+                project_id, subscription_name
+            )
+            try:
+                self.subscriber.get_subscription(
+                    request={"subscription": subscription_path}
+                )
+            except Exception:
+                self.subscriber.create_subscription(
+                    request={
+                        "name": subscription_path,
+                        "topic": self.subscriber.topic_path(project_id, topic_name),
+                        "ack_deadline_seconds": config["ack_deadline_seconds"],
+                        # Removes the subscriptions of replicas that never stopped
+                        "expiration_policy": {
+                            "ttl": {"seconds": SUBSCRIPTION_TTL_SECONDS}
+                        },
+                    }
+                )
+                logger.info(
+                    f"Created subscription {subscription_name} for topic {topic_name}"
+                )
+            self._subscription_paths[topic_name] = subscription_path
+            self._streaming_futures[topic_name] = self.subscriber.subscribe(
+                subscription_path, callback=self._on_message
+            )
+
+    def _on_message(self, message: Any) -> None:
+        """Handle an event on a Pub/Sub thread."""
+        try:
+            user_id = json.loads(message.data.decode("utf-8")).get("user_id")
+        except Exception as e:
+            logger.warning(f"Ignoring malformed data change event: {e}")
+            message.ack()
+            return
+
+        if user_id and self._loop is not None:
+            # The cache belongs to the event loop's thread
+            self._loop.call_soon_threadsafe(self.cache.invalidate_user, str(user_id))
+        message.ack()
+
+    async def stop(self) -> None:
+        """Cancel and delete this replica's subscriptions and close the subscriber."""
+        await asyncio.to_thread(self._unsubscribe)
+
+    def _unsubscribe(self) -> None:
+        for future in self._streaming_futures.values():
+            try:
+                future.cancel()
+            except Exception as e:
+                logger.warning(f"Error cancelling subscription: {e}")
+        self._streaming_futures.clear()
+        if self.subscriber is None:
+            return
+        # Events missed while the replica is down do not matter: its cache
+        # starts empty, so the subscriptions are not kept for it
+        for subscription_path in self._subscription_paths.values():
+            try:
+                self.subscriber.delete_subscription(
+                    request={"subscription": subscription_path}
+                )
+            except Exception as e:
+                logger.warning(f"Error deleting subscription {subscription_path}: {e}")
+        self._subscription_paths.clear()
+        self.subscriber.close()
+        self.subscriber = None
@@ -18,9 +18,11 @@ Key Design Decisions:
 """
 
 import datetime
+import re
+from dataclasses import dataclass
 from typing import Any, AsyncGenerator, List, Optional
 
-from sqlalchemy import Text, UniqueConstraint, desc, func
+from sqlalchemy import Index, Text, UniqueConstraint, desc, func, update
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import registry
 from sqlmodel import Column, DateTime, Field, Relationship, SQLModel, select
@@ -152,6 +154,11 @@ class Thread(ChatSQLModel, table=True):
     # Optional thread title for organization
     title: Optional[str] = Field(default=None, max_length=256)
 
+    # Rolling summary of the messages older than the history window, and the
+    # id of the newest message folded into it (maintained by append_message)
+    summary: Optional[str] = Field(default=None, sa_column=Column(Text))
+    summary_through_id: Optional[int] = Field(default=None)
+
     # SQLAlchemy relationships - not exposed in API models
     messages: list["Message"] = Relationship(back_populates="thread")
     drafts: list["Draft"] = Relationship(back_populates="thread")
@@ -182,7 +189,11 @@ class Message(ChatSQLModel, table=True):
     """
 
     __tablename__ = "messages"  # type: ignore[assignment]
-    __table_args__ = {"extend_existing": True}
+    __table_args__ = (
+        # Keyset pagination of a thread's history
+        Index("ix_messages_thread_id_id", "thread_id", "id"),
+        {"extend_existing": True},
+    )
 
     # Primary key - integer for database efficiency
     id: Optional[int] = Field(default=None, primary_key=True)
@@ -368,9 +379,83 @@ async def append_message(thread_id: int, user_id: str, content: str) -> Message:
                 "Database did not assign an ID after commit"
             )
 
+        await _roll_thread_summary(session, thread_id)
         return message
 
 
+def _summary_line(message: Message, thread_user_id: str) -> str:
+    role = "User" if message.user_id == thread_user_id else "Assistant"
+    content = re.sub(r"\s+", " ", message.content or "").strip()
+    max_chars = get_settings().history_summary_line_chars
+    if len(content) > max_chars:
+        content = content[: max_chars - 3].rstrip() + "..."
+    return f"{role}: {content}"
+
+
+def _extend_summary(
+    summary: Optional[str], messages: List[Message], thread_user_id: str
+) -> str:
+    """Append messages to a summary, dropping its oldest lines past the cap."""
+    lines = summary.splitlines() if summary else []
+    lines.extend(_summary_line(m, thread_user_id) for m in messages)
+    max_chars = get_settings().history_summary_max_chars
+    while len(lines) > 1 and sum(len(line) + 1 for line in lines) > max_chars:
+        lines.pop(0)
+    return "\n".join(lines)
+
+
+async def _roll_thread_summary(session: AsyncSession, thread_id: int) -> None:
+    """
+    Fold messages that fell out of the history window into the thread summary.
+
+    Runs after every append, so normally a single message is folded. The
+    update is conditional on the summary not having moved meanwhile; a
+    concurrent append that loses simply leaves the fold to the next append.
+    """
+    thread = await session.get(Thread, thread_id)
+    if thread is None:
+        return
+    window = get_settings().history_window_messages
+    after_id = thread.summary_through_id or 0
+
+    unsummarized = await session.scalar(
+        select(func.count())  # type: ignore[arg-type]
+        .select_from(Message)
+        .where(Message.thread_id == thread_id, Message.id > after_id)  # type: ignore[operator]
+    )
+    overflow = (unsummarized or 0) - window
+    if overflow <= 0:
+        return
+
+    result = await session.execute(
+        select(Message)
+        .where(Message.thread_id == thread_id, Message.id > after_id)  # type: ignore[operator]
+        .order_by(Message.id)  # type: ignore[arg-type]
+        .limit(overflow)
+    )
+    folded = list(result.scalars().all())
+    if not folded:
+        return
+
+    await session.execute(
+        update(Thread)
+        .where(
+            Thread.id == thread_id,  # type: ignore[arg-type]
+            (
+                Thread.summary_through_id == thread.summary_through_id  # type: ignore[arg-type]
+                if thread.summary_through_id is not None
+                else Thread.summary_through_id.is_(None)  # type: ignore[union-attr]
+            ),
+        )
+        .values(
+            summary=_extend_summary(thread.summary, folded, thread.user_id),
+            summary_through_id=folded[-1].id,
+        ),
+        execution_options={"synchronize_session": False},
+    )
+    await session.commit()
+
+
 async def update_message(message_id: int, content: str) -> Optional[Message]:
     """Update an existing message's content."""
     async with get_async_session_factory()() as session:
@@ -388,17 +473,65 @@ async def update_message(message_id: int, content: str) -> Optional[Message]:
 
 
 async def get_thread_history(
-    thread_id: int, limit: int = 50, offset: int = 0
+    thread_id: int,
+    limit: int = 50,
+    before_id: Optional[int] = None,
+    after_id: Optional[int] = None,
 ) -> List[Message]:
+    """
+    Get a page of a thread's messages, newest first.
+
+    Pages are keyset-paginated: pass the id of the last message of a page as
+    ``before_id`` to get the next (older) page.
+
+    Args:
+        thread_id: Thread ID
+        limit: Maximum messages returned
+        before_id: Only return messages older than this message
+        after_id: Only return messages newer than this message
+    """
+    query = select(Message).where(Message.thread_id == thread_id)
+    if before_id is not None:
+        query = query.where(Message.id < before_id)  # type: ignore[operator]
+    if after_id is not None:
+        query = query.where(Message.id > after_id)  # type: ignore[operator]
     async with get_async_session_factory()() as session:
+        result = await session.execute(
+            query.order_by(Message.id.desc()).limit(limit)  # type: ignore[union-attr]
+        )
+        return list(result.scalars().all())
+
+
+@dataclass
+class ConversationWindow:
+    """Recent messages of a thread plus the summary of everything older."""
+
+    summary: Optional[str]
+    # Newest first, like get_thread_history
+    messages: List[Message]
+
+
+async def get_conversation_window(thread_id: int, limit: int) -> ConversationWindow:
+    """
+    Get the messages of a thread not yet folded into its summary, and the summary.
+
+    Args:
+        thread_id: Thread ID
+        limit: Maximum recent messages returned
+    """
+    async with get_async_session_factory()() as session:
+        thread = await session.get(Thread, thread_id)
+        summary = thread.summary if thread else None
+        after_id = (thread.summary_through_id if thread else None) or 0
         result = await session.execute(
             select(Message)
-            .where(Message.thread_id == thread_id)
-            .order_by(Message.created_at.desc())  # type: ignore[attr-defined]
-            .offset(offset)
+            .where(Message.thread_id == thread_id, Message.id > after_id)  # type: ignore[operator]
+            .order_by(Message.id.desc())  # type: ignore[union-attr]
             .limit(limit)
         )
-        return list(result.scalars().all())
+        return ConversationWindow(
+            summary=summary, messages=list(result.scalars().all())
+        )
 
 
 async def delete_draft(thread_id: int, draft_type: str) -> None:
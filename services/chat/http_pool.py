@@ -0,0 +1,67 @@
+"""
+Process-wide pooled HTTP client for calls from the chat service.
+
+Chat tools call the user and office services (and the public web) while a
+chat turn is streaming. Creating a client per call pays a fresh connection
+setup every time, and a blocking client stalls the event loop that serves
+every other chat. Instead one long-lived httpx.AsyncClient is shared by the
+whole process; it carries no credentials, so callers pass their own auth
+headers on each request.
+
+The client is created lazily and closed from the application lifespan.
+"""
+
+import asyncio
+from typing import Optional
+
+import httpx
+
+from services.chat.settings import get_settings
+from services.common.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+_client: Optional[httpx.AsyncClient] = None
+_client_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def _running_loop() -> Optional[asyncio.AbstractEventLoop]:
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """
+    Get the shared HTTP client, creating it on first use.
+
+    Returns:
+        The process-wide httpx.AsyncClient
+    """
+    global _client, _client_loop
+    loop = _running_loop()
+    # Pooled connections belong to the loop that opened them. The server runs
+    # one loop, but test clients and scripts may start others.
+    if _client is None or _client.is_closed or _client_loop is not loop:
+        settings = get_settings()
+        _client = httpx.AsyncClient(
+            timeout=httpx.Timeout(settings.http_timeout_seconds),
+            limits=httpx.Limits(
+                max_connections=settings.http_max_connections,
+                max_keepalive_connections=settings.http_max_keepalive_connections,
+                keepalive_expiry=settings.http_keepalive_expiry_seconds,
+            ),
+        )
+        _client_loop = loop
+        logger.info("Created pooled HTTP client")
+    return _client
+
+
+async def close_http_client() -> None:
+    """Close the shared HTTP client and its open connections."""
+    global _client
+    if _client is not None:
+        client, _client = _client, None
+        await client.aclose()
+        logger.info("Closed pooled HTTP client")
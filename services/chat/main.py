@@ -7,7 +7,10 @@ from sqlalchemy import text
 from sqlmodel import select
 
 from services.chat import history_manager
+from services.chat.agents.agent_pool import agent_pool
 from services.chat.api import router
+from services.chat.data_change_consumer import DataChangeConsumer
+from services.chat.http_pool import close_http_client
 from services.chat.settings import get_settings
 from services.common.http_errors import register_briefly_exception_handlers
 from services.common.logging_config import (
@@ -65,10 +68,21 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
     async with engine.begin() as conn:
         await conn.execute(text("SELECT 1"))
 
+    # Cached answers are invalidated when new email or calendar data arrives
+    data_change_consumer: DataChangeConsumer | None = None
+    if get_settings().response_cache_enabled:
+        data_change_consumer = DataChangeConsumer()
+        if not await data_change_consumer.start():
+            data_change_consumer = None
+
     yield  # The application runs here
 
     # Shutdown: Clean up connections
     log_service_shutdown("chat-service")
+    if data_change_consumer is not None:
+        await data_change_consumer.stop()
+    await agent_pool.close()
+    await close_http_client()
     engine = history_manager.get_engine()
     await engine.dispose()
 
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Benchmark one BrieflyAgent turn whose LLM step asks for several tools at once.
+
+A FakeLLM subclass asks for every stub tool in its first step and answers
+once the tool results are in its history. Each stub tool sleeps for a fixed
+latency, standing in for Vespa, the web and the office service. The
+sequential run sets ``tool_call_max_concurrency`` to 1, which is how tool
+calls were executed before; the parallel run uses the configured default.
+
+Usage:
+    python -m services.chat.scripts.benchmark_parallel_tool_calls [--tools N]
+"""
+
+import argparse
+import asyncio
+import time
+from typing import Any, List, Sequence
+
+from llama_index.core.base.llms.types import (
+    ChatMessage,
+    ChatResponse,
+    ChatResponseAsyncGen,
+    MessageRole,
+)
+from llama_index.core.llms.llm import ToolSelection
+from llama_index.core.tools import FunctionTool
+
+import services.chat.settings as chat_settings
+from services.chat.agents.briefly_agent import BrieflyAgent
+from services.chat.agents.llm_manager import FakeLLM
+from services.chat.settings import Settings, get_settings
+from services.common.logging_config import setup_service_logging
+
+_TOOL_NAMES = ["user_data_search", "web_search", "get_tool", "get_tool_info"]
+
+
+class _ToolCallingFakeLLM(FakeLLM):
+    """Asks for every tool in one step, then answers from the tool results."""
+
+    async def achat_with_tools(
+        self,
+        tools: Sequence[Any],
+        user_msg: Any = None,
+        chat_history: List[ChatMessage] | None = None,
+        verbose: bool = False,
+        allow_parallel_tool_calls: bool = False,
+        tool_required: bool = False,
+        **kwargs: Any,
+    ) -> ChatResponse:
+        history = chat_history or []
+        if history and history[-1].role == MessageRole.TOOL:
+            answer = (
+                f"Combined {sum(m.role == MessageRole.TOOL for m in history)} results."
+            )
+            return ChatResponse(
+                message=ChatMessage(role=MessageRole.ASSISTANT, content=answer),
+                delta=answer,
+            )
+        calls = [
+            {"tool_id": f"call-{i}", "tool_name": tool.metadata.name, "tool_kwargs": {}}
+            for i, tool in enumerate(tools)
+        ]
+        return ChatResponse(
+            message=ChatMessage(
+                role=MessageRole.ASSISTANT,
+                content="",
+                additional_kwargs={"tool_calls": calls},
+            )
+        )
+
+    async def astream_chat_with_tools(
+        self,
+        tools: Sequence[Any],
+        user_msg: Any = None,
+        chat_history: List[ChatMessage] | None = None,
+        verbose: bool = False,
+        allow_parallel_tool_calls: bool = False,
+        tool_required: bool = False,
+        **kwargs: Any,
+    ) -> ChatResponseAsyncGen:
+        response = await self.achat_with_tools(
+            tools, user_msg=user_msg, chat_history=chat_history, **kwargs
+        )
+
+        async def stream() -> ChatResponseAsyncGen:
+            yield response
+
+        return stream()
+
+    def get_tool_calls_from_response(
+        self, response: ChatResponse, error_on_no_tool_call: bool = True, **kwargs: Any
+    ) -> List[ToolSelection]:
+        calls = response.message.additional_kwargs.get("tool_calls", [])
+        return [ToolSelection(**call) for call in calls]
+
+
+def _stub_tool(name: str, latency: float) -> FunctionTool:
+    async def call(query: str = "") -> str:
+        await asyncio.sleep(latency)
+        return f"{name} result"
+
+    return FunctionTool.from_defaults(fn=call, name=name, description=f"Stub {name}")
+
+
+def _agent(args: argparse.Namespace) -> BrieflyAgent:
+    latency = args.latency_ms / 1000
+    tools = [
+        _stub_tool(
+            _TOOL_NAMES[i] if i < len(_TOOL_NAMES) else f"stub_tool_{i}", latency
+        )
+        for i in range(args.tools)
+    ]
+    agent = BrieflyAgent(
+        thread_id=1,
+        user_id="benchmark-user",
+        vespa_endpoint="http://localhost:8080",
+        tools=tools,
+        tool_catalog="",
+        llm_model="fake-model",
+        llm_provider="fake",
+    )
+    agent.llm = _ToolCallingFakeLLM()
+    return agent
+
+
+async def _timed_turn(args: argparse.Namespace, max_concurrency: int) -> float:
+    get_settings().tool_call_max_concurrency = max_concurrency
+    agent = _agent(args)
+    started = time.perf_counter()
+    handler = agent.run(user_msg="What is on my plate today?")
+    await handler
+    return time.perf_counter() - started
+
+
+async def _run(args: argparse.Namespace) -> None:
+    parallel_limit = get_settings().tool_call_max_concurrency
+    sequential = await _timed_turn(args, max_concurrency=1)
+    parallel = await _timed_turn(args, max_concurrency=parallel_limit)
+
+    print(f"{args.tools} tool calls in one step, {args.latency_ms:.0f} ms per tool")
+    print(f"sequential tool calls:  {sequential * 1000:>8.0f} ms")
+    print(
+        f"parallel tool calls:    {parallel * 1000:>8.0f} ms  "
+        f"({sequential / parallel:.1f}x)"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tools", type=int, default=3)
+    parser.add_argument("--latency-ms", type=float, default=200.0)
+    args = parser.parse_args()
+
+    chat_settings._settings = Settings(
+        api_frontend_chat_key="benchmark",
+        api_chat_user_key="benchmark",
+        api_chat_office_key="benchmark",
+        user_service_url="http://localhost:8001",
+        office_service_url="http://localhost:8003",
+        db_url_chat="sqlite:///:memory:",
+    )
+    setup_service_logging("benchmark", log_level="CRITICAL", log_format="text")
+    asyncio.run(_run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -70,6 +70,24 @@ class Settings(BaseSettings):
         validation_alias=AliasChoices("VESPA_ENDPOINT", "VESPA_URL"),
     )
 
+    # Outgoing HTTP Configuration (shared by all tool calls in the process)
+    http_timeout_seconds: float = Field(
+        default=10.0, description="Timeout for calls to other services"
+    )
+    http_max_connections: int = Field(
+        default=100, description="Maximum open connections in the shared HTTP pool"
+    )
+    http_max_keepalive_connections: int = Field(
+        default=20, description="Idle connections kept open in the shared HTTP pool"
+    )
+    http_keepalive_expiry_seconds: float = Field(
+        default=30.0, description="Seconds an idle pooled connection is kept open"
+    )
+    integrations_cache_ttl_seconds: float = Field(
+        default=60.0,
+        description="Seconds a user's integration list is reused by data tools",
+    )
+
     # LLM Configuration
     llm_provider: str = Field(default="openai", description="LLM provider")
     llm_model: str = Field(default="gpt-4.1-nano", description="LLM model")
@@ -81,6 +99,72 @@ class Settings(BaseSettings):
         default={}, description="Additional keyword arguments to pass to LLM calls"
     )
 
+    # Tool Call Configuration
+    tool_call_timeout_seconds: float = Field(
+        default=30.0, description="Timeout for a single tool call of the agent"
+    )
+    tool_call_timeouts: dict = Field(
+        default={}, description="Per-tool timeout overrides in seconds, by tool name"
+    )
+    tool_call_max_concurrency: int = Field(
+        default=8, description="Tool calls of one agent step run at once"
+    )
+
+    # Conversation History Configuration
+    history_window_messages: int = Field(
+        default=20,
+        description="Recent messages sent to the LLM verbatim; older ones are summarized",
+    )
+    history_summary_max_chars: int = Field(
+        default=4000, description="Maximum length of a thread's rolling summary"
+    )
+    history_summary_line_chars: int = Field(
+        default=240, description="Maximum length of one message in the summary"
+    )
+
+    # Agent Pool Configuration
+    agent_pool_idle_seconds: float = Field(
+        default=900.0,
+        description="Seconds an unused pooled agent is kept before it is evicted",
+    )
+    agent_pool_max_agents: int = Field(
+        default=256, description="Maximum agents kept in the pool"
+    )
+
+    # Response Cache Configuration
+    response_cache_enabled: bool = Field(
+        default=False,
+        description="Reuse answers to repeated questions of the same user",
+    )
+    response_cache_similarity_threshold: float = Field(
+        default=0.92,
+        description="Minimum embedding similarity for two questions to share an answer",
+    )
+    response_cache_bucket_seconds: float = Field(
+        default=900.0,
+        description="Length of the time buckets an answer is reused within",
+    )
+    response_cache_max_entries_per_user: int = Field(
+        default=32, description="Maximum cached answers per user"
+    )
+    response_cache_replica_id: Optional[str] = Field(
+        default=None,
+        description="Suffix of this replica's invalidation subscriptions "
+        "(defaults to the host name)",
+    )
+
+    # Pub/Sub Configuration (response cache invalidation)
+    pubsub_project_id: str = Field(
+        default="briefly-dev",
+        description="Pub/Sub project of the email and calendar topics",
+        validation_alias=AliasChoices("PUBSUB_PROJECT_ID"),
+    )
+    pubsub_emulator_host: Optional[str] = Field(
+        default=None,
+        description="Pub/Sub emulator host, for local development",
+        validation_alias=AliasChoices("PUBSUB_EMULATOR_HOST"),
+    )
+
     # Logging Configuration
     log_level: str = Field(default="INFO", description="Logging level")
     log_format: str = Field(default="json", description="Log format (json or text)")
@@ -0,0 +1,107 @@
+"""Tests for reusing BrieflyAgent instances across chat turns."""
+
+from typing import List
+
+import pytest
+
+from services.chat.agents.agent_pool import AgentPool
+
+
+class FakeAgent:
+    def __init__(self, thread_id, user_id, user_timezone=None, **kwargs):
+        self.thread_id = str(thread_id)
+        self.user_id = user_id
+        self.user_timezone = user_timezone
+        self.cleaned_up = False
+
+    def bind_thread(self, thread_id, user_timezone=None):
+        self.thread_id = str(thread_id)
+        self.user_timezone = user_timezone
+
+    async def cleanup(self):
+        self.cleaned_up = True
+
+
+@pytest.fixture
+def built() -> List[FakeAgent]:
+    return []
+
+
+@pytest.fixture
+def pool(built):
+    def factory(**kwargs):
+        agent = FakeAgent(**kwargs)
+        built.append(agent)
+        return agent
+
+    return AgentPool(idle_seconds=60, max_agents=2, factory=factory)
+
+
+def turn(pool, thread_id, user_id="user-1", model="model-a", tz=None):
+    return pool.acquire(
+        thread_id=thread_id,
+        user_id=user_id,
+        vespa_endpoint="http://vespa",
+        user_timezone=tz,
+        llm_model=model,
+        llm_provider="fake",
+    )
+
+
+async def test_agent_is_reused_and_rebound_to_thread(pool, built):
+    async with turn(pool, 1) as first:
+        pass
+    async with turn(pool, 2, tz="Europe/Paris") as second:
+        assert second is first
+        assert second.thread_id == "2"
+        assert second.user_timezone == "Europe/Paris"
+
+    assert len(built) == 1
+    assert not first.cleaned_up
+
+
+async def test_agents_are_keyed_by_user_and_model(pool, built):
+    async with turn(pool, 1):
+        pass
+    async with turn(pool, 1, model="model-b"):
+        pass
+    async with turn(pool, 1, user_id="user-2"):
+        pass
+
+    assert len(built) == 3
+    # The pool holds two agents; the least recently used one was released
+    assert built[0].cleaned_up
+    assert pool.stats() == {"agents": 2, "in_use": 0}
+
+
+async def test_concurrent_turn_gets_throwaway_agent(pool, built):
+    async with turn(pool, 1) as pooled:
+        async with turn(pool, 2) as extra:
+            assert extra is not pooled
+            assert extra.thread_id == "2"
+        assert extra.cleaned_up
+        assert pool.stats() == {"agents": 1, "in_use": 1}
+
+    assert not pooled.cleaned_up
+
+
+async def test_idle_agents_are_evicted(pool, built):
+    async with turn(pool, 1):
+        pass
+    pool._idle_seconds = 0
+
+    assert await pool.evict_idle() == 1
+    assert built[0].cleaned_up
+    assert pool.stats() == {"agents": 0, "in_use": 0}
+
+
+async def test_close_releases_all_agents(pool, built):
+    async with turn(pool, 1):
+        pass
+    async with turn(pool, 1, user_id="user-2"):
+        pass
+
+    await pool.close()
+
+    assert all(agent.cleaned_up for agent in built)
+    assert pool.stats() == {"agents": 0, "in_use": 0}
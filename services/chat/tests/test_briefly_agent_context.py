@@ -11,10 +11,33 @@ These tests verify that:
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
+from llama_index.core.agent.workflow import AgentOutput, ToolCallResult
+from llama_index.core.base.llms.types import ChatMessage
+from llama_index.core.tools import ToolOutput, ToolSelection
+from llama_index.core.workflow import WorkflowRuntimeError
 
 from services.chat.agents.briefly_agent import create_briefly_agent
 from services.chat.agents.llm_manager import FakeLLM
+from services.chat.history_manager import ConversationWindow
 from services.chat.service_client import ServiceClient
+from services.chat.settings import get_settings
+
+
+@pytest.fixture(autouse=True)
+def patch_chat_settings_singleton():
+    import services.chat.settings as chat_settings
+    from services.chat.settings import Settings
+
+    chat_settings._settings = Settings(
+        api_frontend_chat_key="test-frontend-chat-key",
+        api_chat_office_key="test-chat-office-key",
+        api_chat_user_key="test-chat-user-key",
+        db_url_chat="sqlite:///:memory:",
+        user_service_url="http://test-user-server",
+        office_service_url="http://test-office-server",
+    )
+    yield
+    chat_settings._settings = None
 
 
 class TestBrieflyAgentContext:
@@ -49,7 +72,9 @@ class TestBrieflyAgentContext:
         mock_module = MagicMock()
         mock_module.create_thread = AsyncMock(return_value=mock_thread)
         mock_module.get_thread = AsyncMock(return_value=mock_thread)
-        mock_module.get_thread_history = AsyncMock(return_value=mock_history)
+        mock_module.get_conversation_window = AsyncMock(
+            return_value=ConversationWindow(summary=None, messages=mock_history)
+        )
         mock_module.append_message = AsyncMock(return_value=MagicMock(id=999))
 
         return mock_module
@@ -79,8 +104,8 @@ class TestBrieflyAgentContext:
         """Test that conversation context is loaded and saved correctly."""
         with (
             patch(
-                "services.chat.history_manager.get_thread_history",
-                mock_history_manager.get_thread_history,
+                "services.chat.history_manager.get_conversation_window",
+                mock_history_manager.get_conversation_window,
             ),
             patch(
                 "services.chat.agents.llm_manager.get_llm_manager"
@@ -119,9 +144,9 @@ class TestBrieflyAgentContext:
                 # Test that conversation history is loaded
                 # The agent should have loaded the conversation history during achat
                 # We can verify this by checking if the history manager was called
-                # Note: limit=101 is used when exclude_latest=True to account for excluding the latest message
-                mock_history_manager.get_thread_history.assert_called_once_with(
-                    123, limit=101
+                # One extra message is read to account for excluding the latest message
+                mock_history_manager.get_conversation_window.assert_called_once_with(
+                    123, limit=get_settings().history_window_messages + 1
                 )
 
     @pytest.mark.asyncio
@@ -131,8 +156,8 @@ class TestBrieflyAgentContext:
         """Test that context persists between multiple chat calls."""
         with (
             patch(
-                "services.chat.history_manager.get_thread_history",
-                mock_history_manager.get_thread_history,
+                "services.chat.history_manager.get_conversation_window",
+                mock_history_manager.get_conversation_window,
             ),
             patch(
                 "services.chat.agents.llm_manager.get_llm_manager"
@@ -179,7 +204,7 @@ class TestBrieflyAgentContext:
                 assert mock_run.call_count == 2
 
                 # Verify that conversation history was loaded for both calls
-                assert mock_history_manager.get_thread_history.call_count == 2
+                assert mock_history_manager.get_conversation_window.call_count == 2
 
     @pytest.mark.asyncio
     async def test_empty_conversation_history(
@@ -188,8 +213,8 @@ class TestBrieflyAgentContext:
         """Test handling of empty conversation history."""
         with (
             patch(
-                "services.chat.history_manager.get_thread_history",
-                mock_history_manager.get_thread_history,
+                "services.chat.history_manager.get_conversation_window",
+                mock_history_manager.get_conversation_window,
             ),
             patch(
                 "services.chat.agents.llm_manager.get_llm_manager"
@@ -197,7 +222,9 @@ class TestBrieflyAgentContext:
         ):
 
             # Mock empty history
-            mock_history_manager.get_thread_history.return_value = []
+            mock_history_manager.get_conversation_window.return_value = (
+                ConversationWindow(summary=None, messages=[])
+            )
 
             # Mock the LLM manager to return our FakeLLM
             mock_llm_manager_instance = MagicMock()
@@ -239,8 +266,8 @@ class TestBrieflyAgentContext:
         """Test graceful handling of database errors."""
         with (
             patch(
-                "services.chat.history_manager.get_thread_history",
-                mock_history_manager.get_thread_history,
+                "services.chat.history_manager.get_conversation_window",
+                mock_history_manager.get_conversation_window,
             ),
             patch(
                 "services.chat.agents.llm_manager.get_llm_manager"
@@ -248,7 +275,7 @@ class TestBrieflyAgentContext:
         ):
 
             # Mock database error
-            mock_history_manager.get_thread_history.side_effect = Exception(
+            mock_history_manager.get_conversation_window.side_effect = Exception(
                 "Database connection failed"
             )
 
@@ -310,12 +337,14 @@ class TestBrieflyAgentContext:
             ),
         ]
 
-        mock_history_manager.get_thread_history.return_value = rich_history
+        mock_history_manager.get_conversation_window.return_value = ConversationWindow(
+            summary=None, messages=rich_history
+        )
 
         with (
             patch(
-                "services.chat.history_manager.get_thread_history",
-                mock_history_manager.get_thread_history,
+                "services.chat.history_manager.get_conversation_window",
+                mock_history_manager.get_conversation_window,
             ),
             patch(
                 "services.chat.agents.llm_manager.get_llm_manager"
@@ -356,12 +385,90 @@ class TestBrieflyAgentContext:
                 mock_run.assert_called_once()
 
                 # Verify that the rich history was loaded during the achat call
-                # Note: limit=101 is used when exclude_latest=True to account for excluding the latest message
-                mock_history_manager.get_thread_history.assert_called_once_with(
-                    123, limit=101
+                # One extra message is read to account for excluding the latest message
+                mock_history_manager.get_conversation_window.assert_called_once_with(
+                    123, limit=get_settings().history_window_messages + 1
                 )
 
 
+class FakeStore:
+    def __init__(self):
+        self.values = {}
+
+    async def get(self, key, default=None):
+        return self.values.get(key, default)
+
+    async def set(self, key, value):
+        self.values[key] = value
+
+
+class FakeContext:
+    def __init__(self):
+        self.store = FakeStore()
+        self.sent = []
+
+    def send_event(self, event):
+        self.sent.append(event)
+
+    def write_event_to_stream(self, event):
+        pass
+
+
+class TestBrieflyAgentParallelToolCalls:
+    """Test the concurrent dispatch of a step's tool calls."""
+
+    @pytest.fixture
+    def agent(self):
+        with patch("services.chat.agents.llm_manager.get_llm_manager") as manager:
+            manager.return_value.get_llm.return_value = FakeLLM()
+            agent = create_briefly_agent(
+                user_id="test-user-123",
+                thread_id="123",
+                vespa_endpoint="http://localhost:8080",
+            )
+
+        async def run_tools(ctx, calls):
+            return [
+                ToolOutput(content=name, tool_name=name, raw_input={}, raw_output=name)
+                for name, _ in calls
+            ]
+
+        agent._run_tools = run_tools
+        return agent
+
+    def _output(self, *tool_names):
+        return AgentOutput(
+            response=ChatMessage(role="assistant", content=""),
+            tool_calls=[
+                ToolSelection(tool_id=f"call-{i}", tool_name=name, tool_kwargs={})
+                for i, name in enumerate(tool_names)
+            ],
+            raw=None,
+            current_agent_name="briefly",
+        )
+
+    @pytest.mark.asyncio
+    async def test_results_are_sent_in_call_order(self, agent):
+        ctx = FakeContext()
+
+        result = await agent.parse_agent_output(ctx, self._output("first", "second"))
+
+        assert result is None
+        assert all(isinstance(event, ToolCallResult) for event in ctx.sent)
+        assert [event.tool_id for event in ctx.sent] == ["call-0", "call-1"]
+        assert ctx.store.values["num_tool_calls"] == 2
+        assert ctx.store.values["num_iterations"] == 1
+
+    @pytest.mark.asyncio
+    async def test_max_iterations_is_left_to_function_agent(self, agent):
+        ctx = FakeContext()
+        ctx.store.values.update(max_iterations=2, num_iterations=1)
+
+        with pytest.raises(WorkflowRuntimeError):
+            await agent.parse_agent_output(ctx, self._output("first", "second"))
+        assert ctx.sent == []
+
+
 # Integration test that tests the full API flow
 class TestBrieflyAgentAPIIntegration:
     """Test the full API integration with conversation context."""
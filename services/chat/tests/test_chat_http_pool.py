@@ -0,0 +1,42 @@
+"""Tests for the chat service's pooled HTTP client."""
+
+import pytest
+
+from services.chat import http_pool
+
+
+@pytest.fixture(autouse=True)
+def patch_chat_settings_singleton():
+    import services.chat.settings as chat_settings
+    from services.chat.settings import Settings
+
+    chat_settings._settings = Settings(
+        api_frontend_chat_key="test-frontend-chat-key",
+        api_chat_office_key="test-chat-office-key",
+        api_chat_user_key="test-chat-user-key",
+        db_url_chat="sqlite:///:memory:",
+        user_service_url="http://test-user-server",
+        office_service_url="http://test-office-server",
+        http_max_connections=7,
+    )
+    yield
+    chat_settings._settings = None
+
+
+async def test_client_is_shared_until_closed():
+    client = http_pool.get_http_client()
+
+    assert http_pool.get_http_client() is client
+    assert client._transport._pool._max_connections == 7
+
+    await http_pool.close_http_client()
+    assert client.is_closed
+
+    replacement = http_pool.get_http_client()
+    assert replacement is not client
+    await http_pool.close_http_client()
+
+
+async def test_close_without_client_is_noop():
+    await http_pool.close_http_client()
+    await http_pool.close_http_client()
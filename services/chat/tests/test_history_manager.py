@@ -31,11 +31,14 @@ async def setup_test_database():
         pagination_secret_key="test-pagination-secret-key",
     )
 
-    # Save original singleton
+    # Save original singleton and the accessor history_manager was bound to
     original_settings = chat_settings._settings
+    original_get_settings = hm.get_settings
 
-    # Set the test settings as the singleton
+    # Set the test settings as the singleton. history_manager is patched
+    # directly because other tests re-import services.chat.settings.
     chat_settings._settings = test_settings
+    hm.get_settings = lambda: test_settings
 
     try:
         # Initialize database tables for testing
@@ -46,6 +49,7 @@ async def setup_test_database():
     finally:
         # Restore original singleton
         chat_settings._settings = original_settings
+        hm.get_settings = original_get_settings
 
 
 @pytest.mark.asyncio
@@ -180,6 +184,57 @@ async def test_pagination_and_ordering():
     assert t.id is not None
     for i in range(10):
         await hm.append_message(t.id, "user5", f"msg {i}")
-    msgs = await hm.get_thread_history(t.id, limit=5, offset=0)
+    msgs = await hm.get_thread_history(t.id, limit=5)
     assert len(msgs) == 5
-    assert msgs[0].created_at >= msgs[-1].created_at
+    assert [m.content for m in msgs] == [f"msg {i}" for i in range(9, 4, -1)]
+    older = await hm.get_thread_history(t.id, limit=5, before_id=msgs[-1].id)
+    assert [m.content for m in older] == [f"msg {i}" for i in range(4, -1, -1)]
+    assert await hm.get_thread_history(t.id, limit=5, before_id=older[-1].id) == []
+
+
+@pytest.fixture
+def small_window(monkeypatch):
+    monkeypatch.setattr(hm.get_settings(), "history_window_messages", 3)
+    monkeypatch.setattr(hm.get_settings(), "history_summary_max_chars", 60)
+
+
+@pytest.mark.asyncio
+async def test_rolling_summary_of_older_messages(small_window):
+    t = await hm.create_thread("user6", "Summary Thread")
+    assert t.id is not None
+    await hm.append_message(t.id, "user6", "Book a room")
+    await hm.append_message(t.id, "assistant", "Which   day?\nAny time")
+    window = await hm.get_conversation_window(t.id, limit=10)
+    assert window.summary is None
+    assert len(window.messages) == 2
+
+    for i in range(3):
+        await hm.append_message(t.id, "user6", f"msg {i}")
+
+    window = await hm.get_conversation_window(t.id, limit=10)
+    assert window.summary == "User: Book a room\nAssistant: Which day? Any time"
+    assert [m.content for m in window.messages] == ["msg 2", "msg 1", "msg 0"]
+
+    thread = await hm.get_thread(t.id)
+    assert thread is not None
+    assert (
+        thread.summary_through_id
+        == (
+            await hm.get_thread_history(t.id, limit=1, before_id=window.messages[-1].id)
+        )[0].id
+    )
+
+
+@pytest.mark.asyncio
+async def test_rolling_summary_drops_oldest_lines(small_window):
+    t = await hm.create_thread("user7", "Long Summary Thread")
+    assert t.id is not None
+    for i in range(8):
+        await hm.append_message(t.id, "user7", f"message number {i}")
+
+    window = await hm.get_conversation_window(t.id, limit=10)
+    assert window.summary is not None
+    assert len(window.summary) <= 60
+    assert window.summary.splitlines()[-1] == "User: message number 4"
+    assert "message number 0" not in window.summary
+    assert len(window.messages) == 3
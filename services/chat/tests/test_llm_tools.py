@@ -1,7 +1,10 @@
-from unittest.mock import Mock, patch
+from unittest.mock import AsyncMock, Mock, patch
 
 import pytest
 
+from services.chat.settings import Settings
+from services.chat.tools import data_tools as data_tools_module
+from services.chat.tools.data_tools import DataTools, clear_integrations_cache
 from services.chat.tools.draft_tools import DraftTools
 from services.chat.tools.get_tools import GetTools
 from services.chat.tools.tool_registry import ToolRegistry
@@ -12,6 +15,7 @@ class MockResponse:
     def __init__(self, json_data, status_code):
         self.json_data = json_data
         self.status_code = status_code
+        self.text = str(json_data)
 
     def json(self):
         return self.json_data
@@ -34,8 +38,29 @@ class TestLLMTools(BaseSelectiveHTTPIntegrationTest):
         """Set up test environment."""
         super().setup_method(method)
 
-        # Create a mock for requests.get that will be used by DataTools
-        self.mock_requests_get = patch("requests.get").start()
+        clear_integrations_cache()
+
+        # Mock the pooled HTTP client used by DataTools
+        self.mock_http_client = Mock()
+        self.mock_http_client.get = AsyncMock()
+        # Patch the module object GetTools is bound to: other tests re-import
+        # services.chat.*, so a dotted-path patch may hit a different copy
+        self.http_client_patch = patch.object(
+            data_tools_module, "get_http_client", return_value=self.mock_http_client
+        )
+        self.http_client_patch.start()
+        settings = Settings(
+            api_frontend_chat_key="test-frontend-chat-key",
+            api_chat_office_key="test-chat-office-key",
+            api_chat_user_key="test-chat-user-key",
+            db_url_chat="sqlite:///:memory:",
+            user_service_url="http://test-user-server",
+            office_service_url="http://test-office-server",
+        )
+        self.settings_patch = patch.object(
+            data_tools_module, "get_settings", return_value=settings
+        )
+        self.settings_patch.start()
 
         # Configure the mock to return appropriate responses
         def mock_get(*args, **kwargs):
@@ -138,23 +163,24 @@ class TestLLMTools(BaseSelectiveHTTPIntegrationTest):
                 # Default response for unknown URLs
                 return MockResponse({"error": "Not found"}, 404)
 
-        self.mock_requests_get.side_effect = mock_get
+        self.mock_http_client.get.side_effect = mock_get
 
     def teardown_method(self, method):
         """Clean up after each test method."""
-        self.mock_requests_get.stop()
+        self.http_client_patch.stop()
+        self.settings_patch.stop()
+        clear_integrations_cache()
         super().teardown_method(method)
 
-    def test_get_calendar_events_success(self):
+    async def test_get_calendar_events_success(self):
         """Test successful calendar events retrieval."""
         from datetime import datetime, timezone
 
         from services.api.v1.office import CalendarEvent, Provider
-        from services.chat.tools.data_tools import DataTools
 
         # Test the DataTools directly
         data_tools = DataTools("user123")
-        result = data_tools.get_calendar_events(
+        result = await data_tools.get_calendar_events(
             start_date="2025-06-20",
             end_date="2025-06-21",
             limit=10,
@@ -164,13 +190,12 @@ class TestLLMTools(BaseSelectiveHTTPIntegrationTest):
         assert "events" in result
         assert len(result["events"]) == 2
 
-    def test_get_calendar_events_malformed(self, clear_drafts):
+    async def test_get_calendar_events_malformed(self, clear_drafts):
         """Test calendar events with malformed response."""
-        from services.chat.tools.data_tools import DataTools
 
         # Test with malformed response
         data_tools = DataTools("user123")
-        result = data_tools.get_calendar_events(
+        result = await data_tools.get_calendar_events(
             start_date="invalid-date",
             end_date="invalid-date",
         )
@@ -178,12 +203,11 @@ class TestLLMTools(BaseSelectiveHTTPIntegrationTest):
         # The current implementation doesn't validate dates, so it should succeed
         assert result["status"] == "success"
 
-    def test_get_emails_success(self, clear_drafts):
+    async def test_get_emails_success(self, clear_drafts):
         """Test successful email retrieval."""
-        from services.chat.tools.data_tools import DataTools
 
         data_tools = DataTools("user123")
-        result = data_tools.get_emails(
+        result = await data_tools.get_emails(
             start_date="2025-06-20",
             end_date="2025-06-21",
             max_results=10,
@@ -193,12 +217,11 @@ class TestLLMTools(BaseSelectiveHTTPIntegrationTest):
         assert "emails" in result
         assert len(result["emails"]) == 1
 
-    def test_get_notes_success(self, clear_drafts):
+    async def test_get_notes_success(self, clear_drafts):
         """Test successful notes retrieval."""
-        from services.chat.tools.data_tools import DataTools
 
         data_tools = DataTools("user123")
-        result = data_tools.get_notes(
+        result = await data_tools.get_notes(
             notebook="test_notebook",
             tags="test_tag",
             max_results=10,
@@ -208,12 +231,11 @@ class TestLLMTools(BaseSelectiveHTTPIntegrationTest):
         assert "notes" in result
         assert len(result["notes"]) == 1
 
-    def test_get_documents_success(self, clear_drafts):
+    async def test_get_documents_success(self, clear_drafts):
         """Test successful documents retrieval."""
-        from services.chat.tools.data_tools import DataTools
 
         data_tools = DataTools("user123")
-        result = data_tools.get_documents(
+        result = await data_tools.get_documents(
             document_type="pdf",
             search_query="test",
             max_results=10,
@@ -223,6 +245,22 @@ class TestLLMTools(BaseSelectiveHTTPIntegrationTest):
         assert "documents" in result
         assert len(result["documents"]) == 1
 
+    async def test_integrations_are_fetched_once_per_user(self, clear_drafts):
+        """Test that data tools reuse a user's cached integrations."""
+
+        data_tools = DataTools("user123")
+        assert (await data_tools.get_emails())["status"] == "success"
+        assert (await data_tools.get_notes())["status"] == "success"
+        assert (await DataTools("user123").get_documents())["status"] == "success"
+
+        integration_calls = [
+            call
+            for call in self.mock_http_client.get.call_args_list
+            if "integrations" in call.args[0]
+        ]
+        assert len(integration_calls) == 1
+        assert self.mock_http_client.get.call_count == 4
+
     def test_get_tools_registry(self, clear_drafts):
         """Test that GetTools creates a proper registry."""
         get_tools = GetTools("user123")
@@ -238,13 +276,13 @@ class TestLLMTools(BaseSelectiveHTTPIntegrationTest):
         assert "get_notes" in tool_ids
         assert "get_documents" in tool_ids
 
-    def test_tool_execution(self, clear_drafts):
+    async def test_tool_execution(self, clear_drafts):
         """Test tool execution through the registry."""
         get_tools = GetTools("user123")
         registry = get_tools.registry
 
         # Test executing a tool
-        result = registry.execute_tool(
+        result = await registry.execute_tool(
             "get_calendar_events",
             start_date="2025-06-20",
             end_date="2025-06-21",
@@ -254,13 +292,13 @@ class TestLLMTools(BaseSelectiveHTTPIntegrationTest):
         assert result["status"] == "success"
         assert "events" in result
 
-    def test_tool_execution_with_user_id_injection(self, clear_drafts):
+    async def test_tool_execution_with_user_id_injection(self, clear_drafts):
         """Test that user_id is properly injected into tool execution."""
         get_tools = GetTools("user123")
         registry = get_tools.registry
 
         # Test executing a tool without passing user_id
-        result = registry.execute_tool(
+        result = await registry.execute_tool(
             "get_calendar_events",
             start_date="2025-06-20",
             end_date="2025-06-21",
@@ -293,26 +331,26 @@ class TestLLMTools(BaseSelectiveHTTPIntegrationTest):
         categories = list(registry._categories.keys())
         assert "data_retrieval" in categories
 
-    def test_tool_registry_tooloutput_error(self, clear_drafts):
+    async def test_tool_registry_tooloutput_error(self, clear_drafts):
         """Test tool registry error handling."""
         get_tools = GetTools("user123")
         registry = get_tools.registry
 
         # Test with a tool that will fail due to missing parameters
         try:
-            registry.execute_tool("create_draft_email")
+            await registry.execute_tool("create_draft_email")
             assert False, "Expected RuntimeError for missing thread_id"
         except RuntimeError as e:
             assert "thread_id" in str(e)
 
-    def test_tool_registry_execute_tool_error(self, clear_drafts):
+    async def test_tool_registry_execute_tool_error(self, clear_drafts):
         """Test tool registry execute_tool error handling."""
         get_tools = GetTools("user123")
         registry = get_tools.registry
 
         # Test with a tool that will fail due to missing parameters
         try:
-            registry.execute_tool("create_draft_email")
+            await registry.execute_tool("create_draft_email")
             assert False, "Expected RuntimeError for missing thread_id"
         except RuntimeError as e:
             assert "thread_id" in str(e)
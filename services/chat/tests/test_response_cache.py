@@ -0,0 +1,197 @@
+"""Tests for reusing answers to repeated chat questions."""
+
+import asyncio
+import json
+
+import pytest
+
+from services.chat import data_change_consumer
+from services.chat.agents import response_cache as response_cache_module
+from services.chat.agents.response_cache import ResponseCache, answer_chunks
+from services.chat.data_change_consumer import DataChangeConsumer
+from services.chat.settings import Settings
+
+
+@pytest.fixture(autouse=True)
+def patch_response_cache_settings(monkeypatch):
+    # Patch the modules under test: other tests re-import services.chat.settings
+    settings = Settings(
+        api_frontend_chat_key="test-frontend-chat-key",
+        api_chat_office_key="test-chat-office-key",
+        api_chat_user_key="test-chat-user-key",
+        db_url_chat="sqlite:///:memory:",
+        user_service_url="http://test-user-server",
+        office_service_url="http://test-office-server",
+        response_cache_enabled=True,
+        response_cache_max_entries_per_user=2,
+    )
+    monkeypatch.setattr(response_cache_module, "get_settings", lambda: settings)
+    monkeypatch.setattr(data_change_consumer, "get_settings", lambda: settings)
+
+
+class FakeEmbedder:
+    """Embeds questions about the calendar and about email on separate axes."""
+
+    def __init__(self):
+        self.calls = 0
+
+    async def embed(self, query):
+        self.calls += 1
+        if "calendar" in query or "meetings" in query:
+            return [1.0, 0.1, 0.0]
+        if "email" in query:
+            return [0.0, 1.0, 0.1]
+        return [0.0, 0.0, 1.0]
+
+
+@pytest.fixture
+def cache():
+    return ResponseCache(embedder=FakeEmbedder())
+
+
+async def test_same_question_after_normalization_hits(cache):
+    await cache.store("u1", "What's on my calendar today?", "Standup at 9", 0)
+
+    assert await cache.lookup("u1", "  what's ON my calendar   today? ") == (
+        "Standup at 9"
+    )
+    assert await cache.lookup("u2", "What's on my calendar today?") is None
+    assert cache.stats()["hits"] == 1
+
+
+async def test_similar_question_hits_by_embedding(cache):
+    await cache.store("u1", "What's on my calendar today?", "Standup at 9", 0)
+
+    assert await cache.lookup("u1", "which meetings do I have today") == (
+        "Standup at 9"
+    )
+    assert await cache.lookup("u1", "any email from Sam?") is None
+    assert cache.stats()["similar_hits"] == 1
+
+
+async def test_new_data_invalidates_answers(cache):
+    version = cache.data_version("u1")
+    await cache.store("u1", "emails from Sam", "Two emails", version)
+    cache.invalidate_user("u1")
+
+    assert await cache.lookup("u1", "emails from Sam") is None
+
+    # An answer produced before the new data arrived is not cached
+    await cache.store("u1", "emails from Sam", "Two emails", version)
+    assert await cache.lookup("u1", "emails from Sam") is None
+
+
+async def test_answers_expire_with_their_time_bucket(cache, monkeypatch):
+    monkeypatch.setattr(response_cache_module.time, "time", lambda: 1000.0)
+    await cache.store("u1", "What's on my calendar today?", "Standup at 9", 0)
+
+    monkeypatch.setattr(response_cache_module.time, "time", lambda: 1000.0 + 900)
+    assert await cache.lookup("u1", "What's on my calendar today?") is None
+    assert cache.stats()["entries"] == 0
+
+
+async def test_least_recently_used_answer_is_dropped(cache):
+    await cache.store("u1", "my calendar", "a1", 0)
+    await cache.store("u1", "my email", "a2", 0)
+    assert await cache.lookup("u1", "my calendar") == "a1"
+    await cache.store("u1", "the weather", "a3", 0)
+
+    assert await cache.lookup("u1", "my email") is None
+    assert await cache.lookup("u1", "my calendar") == "a1"
+    assert await cache.lookup("u1", "the weather") == "a3"
+
+
+def test_answer_chunks_rebuild_answer():
+    answer = "You have  two meetings:\n- Standup at 9"
+    chunks = answer_chunks(answer)
+
+    assert len(chunks) > 1
+    assert "".join(chunks) == answer
+
+
+class FakeMessage:
+    def __init__(self, payload):
+        self.data = json.dumps(payload).encode("utf-8")
+        self.acked = False
+
+    def ack(self):
+        self.acked = True
+
+
+async def test_ingested_event_invalidates_its_user(cache):
+    consumer = DataChangeConsumer(cache)
+    consumer._loop = asyncio.get_running_loop()
+    await cache.store("u1", "emails from Sam", "Two emails", 0)
+
+    message = FakeMessage({"user_id": "u1", "operation": "create"})
+    await asyncio.to_thread(consumer._on_message, message)
+    await asyncio.sleep(0)
+
+    assert message.acked
+    assert cache.data_version("u1") == 1
+    assert await cache.lookup("u1", "emails from Sam") is None
+
+
+class FakeSubscriber:
+    def __init__(self):
+        self.created = []
+        self.deleted = []
+        self.subscribed = []
+
+    def subscription_path(self, project, name):
+        return f"projects/{project}/subscriptions/{name}"
+
+    def topic_path(self, project, name):
+        return f"projects/{project}/topics/{name}"
+
+    def get_subscription(self, request):
+        raise LookupError(request["subscription"])
+
+    def create_subscription(self, request):
+        self.created.append(request)
+
+    def subscribe(self, path, callback):
+        self.subscribed.append(path)
+        return type("Future", (), {"cancel": lambda self: None})()
+
+    def delete_subscription(self, request):
+        self.deleted.append(request["subscription"])
+
+    def close(self):
+        pass
+
+
+async def test_each_replica_gets_its_own_subscriptions(cache, monkeypatch):
+    subscribers = []
+
+    def subscriber_client():
+        subscribers.append(FakeSubscriber())
+        return subscribers[-1]
+
+    monkeypatch.setattr(data_change_consumer, "PUBSUB_AVAILABLE", True)
+    monkeypatch.setattr(
+        data_change_consumer,
+        "pubsub_v1",
+        type("pubsub_v1", (), {"SubscriberClient": staticmethod(subscriber_client)}),
+    )
+
+    consumers = [DataChangeConsumer(cache, replica_id=r) for r in ("r1", "r2")]
+    for consumer in consumers:
+        assert await consumer.start()
+
+    names = [
+        request["name"].rsplit("/", 1)[1]
+        for subscriber in subscribers
+        for request in subscriber.created
+    ]
+    assert sorted(names) == [
+        "chat-calendars-r1",
+        "chat-calendars-r2",
+        "chat-emails-r1",
+        "chat-emails-r2",
+    ]
+    assert all("expiration_policy" in r for s in subscribers for r in s.created)
+
+    await consumers[0].stop()
+    assert sorted(subscribers[0].deleted) == sorted(subscribers[0].subscribed)
+    assert subscribers[1].deleted == []
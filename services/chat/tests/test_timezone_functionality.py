@@ -253,8 +253,18 @@ class TestTimezoneIntegration(BaseSelectiveHTTPIntegrationTest):
         """Set up test environment."""
         super().setup_method(method)
 
-        # Create a mock for requests.get that will be used by DataTools
-        self.mock_requests_get = patch("requests.get").start()
+        from services.chat.tools.data_tools import clear_integrations_cache
+
+        clear_integrations_cache()
+
+        # Mock the pooled HTTP client used by DataTools
+        self.mock_http_client = MagicMock()
+        self.mock_http_client.get = AsyncMock()
+        self.http_client_patch = patch(
+            "services.chat.tools.data_tools.get_http_client",
+            return_value=self.mock_http_client,
+        )
+        self.http_client_patch.start()
 
         # Configure the mock to return appropriate responses
         def mock_get(*args, **kwargs):
@@ -318,14 +328,14 @@ class TestTimezoneIntegration(BaseSelectiveHTTPIntegrationTest):
 
             return mock_response
 
-        self.mock_requests_get.side_effect = mock_get
+        self.mock_http_client.get.side_effect = mock_get
 
     def teardown_method(self, method):
         """Clean up after each test method."""
-        self.mock_requests_get.stop()
+        self.http_client_patch.stop()
         super().teardown_method(method)
 
-    def test_calendar_events_get_display_time_field(self):
+    async def test_calendar_events_get_display_time_field(self):
         """Test that calendar events get a display_time field with proper timezone formatting via DataTools."""
         from datetime import datetime, timezone
 
@@ -334,7 +344,7 @@ class TestTimezoneIntegration(BaseSelectiveHTTPIntegrationTest):
 
         # Call get_calendar_events with timezone using DataTools
         data_tools = DataTools("test_user")
-        result = data_tools.get_calendar_events(
+        result = await data_tools.get_calendar_events(
             start_date="2025-06-20",
             end_date="2025-06-21",
             time_zone="America/New_York",
@@ -226,10 +226,10 @@ class TestToolDiscovery:
         assert new_registry.get_tool_count() == registry.get_tool_count()
         assert set(new_registry.get_categories()) == set(registry.get_categories())
 
-    def test_tool_execution_through_registry(self, get_tools):
+    async def test_tool_execution_through_registry(self, get_tools):
         """Test that tools can be executed through the registry."""
         # Test executing a utility tool
-        result = get_tools.get_tool.execute(
+        result = await get_tools.get_tool.execute(
             "validate_email_format", {"email": "test@example.com"}
         )
         assert result["status"] == "success"
@@ -237,14 +237,14 @@ class TestToolDiscovery:
         assert "result" in result
 
         # Test executing with missing parameters
-        result = get_tools.get_tool.execute("validate_email_format", {})
+        result = await get_tools.get_tool.execute("validate_email_format", {})
         assert result["status"] == "error"
         assert "error" in result
 
-    def test_tool_execution_with_user_id_injection(self, get_tools):
+    async def test_tool_execution_with_user_id_injection(self, get_tools):
         """Test that user_id is automatically injected when missing."""
         # Test executing a data tool without user_id
-        result = get_tools.get_tool.execute(
+        result = await get_tools.get_tool.execute(
             "get_calendar_events", {"start_date": "2024-01-01"}
         )
         assert result["status"] == "success"
@@ -0,0 +1,83 @@
+"""Tests for running the tool calls of an agent step concurrently."""
+
+import asyncio
+import time
+
+import pytest
+
+from services.chat.agents import tool_runner
+from services.chat.agents.tool_runner import run_tool_calls, tool_timeout
+from services.chat.settings import Settings
+
+
+@pytest.fixture(autouse=True)
+def patch_tool_runner_settings(monkeypatch):
+    # Patch the module under test: other tests re-import services.chat.settings
+    settings = Settings(
+        api_frontend_chat_key="test-frontend-chat-key",
+        api_chat_office_key="test-chat-office-key",
+        api_chat_user_key="test-chat-user-key",
+        db_url_chat="sqlite:///:memory:",
+        user_service_url="http://test-user-server",
+        office_service_url="http://test-office-server",
+        tool_call_timeout_seconds=1.0,
+        tool_call_timeouts={"slow_tool": 0.05},
+    )
+    monkeypatch.setattr(tool_runner, "get_settings", lambda: settings)
+
+
+def sleeper(seconds, value):
+    async def call():
+        await asyncio.sleep(seconds)
+        return value
+
+    return call
+
+
+async def test_calls_run_concurrently_and_keep_order():
+    started = time.monotonic()
+    outcomes = await run_tool_calls(
+        [
+            ("user_data_search", sleeper(0.2, "search")),
+            ("web_search", sleeper(0.1, "web")),
+            ("get_tool", sleeper(0.15, "events")),
+        ]
+    )
+    elapsed = time.monotonic() - started
+
+    assert [o.result for o in outcomes] == ["search", "web", "events"]
+    assert all(o.ok for o in outcomes)
+    assert elapsed < 0.35
+
+
+async def test_concurrency_of_one_is_sequential():
+    started = time.monotonic()
+    outcomes = await run_tool_calls(
+        [("a", sleeper(0.1, 1)), ("b", sleeper(0.1, 2))], max_concurrency=1
+    )
+
+    assert [o.result for o in outcomes] == [1, 2]
+    assert time.monotonic() - started >= 0.2
+
+
+async def test_timeout_and_failure_do_not_affect_other_calls():
+    async def broken():
+        raise RuntimeError("office service unavailable")
+
+    outcomes = await run_tool_calls(
+        [
+            ("slow_tool", sleeper(1.0, "never")),
+            ("get_tool", broken),
+            ("web_search", sleeper(0.01, "web")),
+        ]
+    )
+
+    assert not outcomes[0].ok
+    assert "timed out after 0.05 seconds" in outcomes[0].error
+    assert outcomes[1].error == "office service unavailable"
+    assert outcomes[2].ok and outcomes[2].result == "web"
+
+
+def test_tool_timeout_overrides():
+    assert tool_timeout("slow_tool") == 0.05
+    assert tool_timeout("web_search") == 1.0
@@ -6,17 +6,34 @@ This module provides tools for retrieving:
 - Notes from the office service
 - Calendar events from the office service
 - Emails from the office service
+
+All calls are async and go through the process-wide pooled HTTP client, so a
+tool call never blocks the event loop serving other chats. A user's
+integration list is cached briefly instead of being fetched on every call.
 """
 
 import logging
-from typing import Any, Dict, List, Optional
+import time
+from typing import Any, Dict, List, Optional, Tuple, Union
 
-import requests
+import httpx
 
+from services.chat.http_pool import get_http_client
 from services.chat.settings import get_settings
 
 logger = logging.getLogger(__name__)
 
+# user_id -> (fetched_at, integrations), shared by every DataTools instance
+_integrations_cache: Dict[str, Tuple[float, List[Dict[str, Any]]]] = {}
+
+
+def clear_integrations_cache(user_id: Optional[str] = None) -> None:
+    """Forget cached integrations for one user, or for every user."""
+    if user_id is None:
+        _integrations_cache.clear()
+    else:
+        _integrations_cache.pop(user_id, None)
+
 
 class DataTools:
     """Collection of data retrieval tools with pre-authenticated user context."""
@@ -24,7 +41,97 @@ class DataTools:
     def __init__(self, user_id: str):
         self.user_id = user_id
 
-    def get_documents(
+    def _error(self, error: str) -> Dict[str, Any]:
+        return {"status": "error", "error": error, "user_id": self.user_id}
+
+    async def _get_integrations(
+        self,
+    ) -> Union[List[Dict[str, Any]], Dict[str, Any]]:
+        """Get the user's integrations, or an error result."""
+        settings = get_settings()
+        cached = _integrations_cache.get(self.user_id)
+        if (
+            cached is not None
+            and time.monotonic() - cached[0] < settings.integrations_cache_ttl_seconds
+        ):
+            return cached[1]
+
+        try:
+            response = await get_http_client().get(
+                f"{settings.user_service_url}/v1/internal/users/{self.user_id}/integrations",
+                headers={"Authorization": f"Bearer {settings.api_chat_user_key}"},
+            )
+            if response.status_code != 200:
+                return self._error(
+                    f"Failed to get user integrations: {response.status_code}"
+                )
+            integrations = response.json().get("integrations", [])
+        except Exception as e:
+            logger.error(f"Error checking user integrations: {e}")
+            return self._error(f"Failed to check user integrations: {str(e)}")
+
+        _integrations_cache[self.user_id] = (time.monotonic(), integrations)
+        return integrations
+
+    async def _check_integration(
+        self, scope: str, name: str
+    ) -> Optional[Dict[str, Any]]:
+        """Return an error result unless the user has an integration with a scope."""
+        integrations = await self._get_integrations()
+        if isinstance(integrations, dict):
+            return integrations
+        if not any(
+            scope in integration.get("scopes", []) for integration in integrations
+        ):
+            return self._error(f"No {name} integrations found for user")
+        return None
+
+    async def _get_office_list(
+        self,
+        path: str,
+        params: Dict[str, Any],
+        field: str,
+        name: str,
+        require_field: bool = False,
+    ) -> Union[List[Any], Dict[str, Any]]:
+        """Get a list field from an office service response, or an error result."""
+        settings = get_settings()
+        try:
+            response = await get_http_client().get(
+                f"{settings.office_service_url}{path}",
+                params=params,
+                headers={"Authorization": f"Bearer {settings.api_chat_office_key}"},
+            )
+        except httpx.TimeoutException:
+            logger.error(f"{name.capitalize()} request timed out")
+            return self._error("Request timed out")
+        except httpx.HTTPStatusError:
+            logger.error(f"{name.capitalize()} request failed with HTTP error")
+            return self._error("HTTP error occurred")
+        except Exception as e:
+            logger.error(f"Error making {name} request: {e}")
+            return self._error(f"Unexpected error: {str(e)}")
+
+        if response.status_code != 200:
+            logger.error(
+                f"Failed to get {name}s: {response.status_code} - {response.text}"
+            )
+            return self._error(f"HTTP {response.status_code}: {response.text}")
+
+        data = response.json()
+
+        # Validate response structure
+        if "data" not in data:
+            return self._error("Malformed response: missing 'data' field")
+        if require_field and field not in data.get("data", {}):
+            return self._error(f"Malformed response: missing '{field}' field")
+
+        items = data.get("data", {}).get(field, [])
+        if not isinstance(items, list):
+            return self._error(f"Malformed response: '{field}' field is not a list")
+        return items
+
+    async def get_documents(
         self,
         document_type: Optional[str] = None,
         start_date: Optional[str] = None,
@@ -46,45 +153,9 @@ class DataTools:
             Dict containing documents or error information
         """
         try:
-            # Get settings
-            settings = get_settings()
-
-            # First, check if user has document integrations
-            try:
-                integrations_response = requests.get(
-                    f"{settings.user_service_url}/v1/internal/users/{self.user_id}/integrations",
-                    headers={"Authorization": f"Bearer {settings.api_chat_user_key}"},
-                    timeout=10,
-                )
-
-                if integrations_response.status_code != 200:
-                    return {
-                        "status": "error",
-                        "error": f"Failed to get user integrations: {integrations_response.status_code}",
-                        "user_id": self.user_id,
-                    }
-
-                integrations_data = integrations_response.json()
-                document_integrations = [
-                    integration
-                    for integration in integrations_data.get("integrations", [])
-                    if "documents" in integration.get("scopes", [])
-                ]
-
-                if not document_integrations:
-                    return {
-                        "status": "error",
-                        "error": "No document integrations found for user",
-                        "user_id": self.user_id,
-                    }
-
-            except Exception as e:
-                logger.error(f"Error checking user integrations: {e}")
-                return {
-                    "status": "error",
-                    "error": f"Failed to check user integrations: {str(e)}",
-                    "user_id": self.user_id,
-                }
+            error = await self._check_integration("documents", "document")
+            if error:
+                return error
 
             # Build query parameters
             params: Dict[str, Any] = {
@@ -102,78 +173,25 @@ class DataTools:
             if max_results:
                 params["limit"] = str(max_results)
 
-            # Make request to office service
-            try:
-                response = requests.get(
-                    f"{settings.office_service_url}/v1/documents",
-                    params=params,
-                    headers={"Authorization": f"Bearer {settings.api_chat_office_key}"},
-                    timeout=10,
-                )
+            documents = await self._get_office_list(
+                "/v1/documents", params, "files", "document"
+            )
+            if isinstance(documents, dict):
+                return documents
 
-                if response.status_code == 200:
-                    data = response.json()
-
-                    # Validate response structure
-                    if "data" not in data:
-                        return {
-                            "status": "error",
-                            "error": "Malformed response: missing 'data' field",
-                            "user_id": self.user_id,
-                        }
-
-                    documents = data.get("data", {}).get("files", [])
-                    if not isinstance(documents, list):
-                        return {
-                            "status": "error",
-                            "error": "Malformed response: 'files' field is not a list",
-                            "user_id": self.user_id,
-                        }
-
-                    return {
-                        "status": "success",
-                        "documents": documents,
-                        "total_count": len(documents),
-                        "user_id": self.user_id,
-                        "query_params": params,
-                    }
-                else:
-                    logger.error(
-                        f"Failed to get documents: {response.status_code} - {response.text}"
-                    )
-                    return {
-                        "status": "error",
-                        "error": f"HTTP {response.status_code}: {response.text}",
-                        "user_id": self.user_id,
-                    }
-
-            except requests.Timeout:
-                logger.error("Document request timed out")
-                return {
-                    "status": "error",
-                    "error": "Request timed out",
-                    "user_id": self.user_id,
-                }
-            except requests.HTTPError:
-                logger.error("Document request failed with HTTP error")
-                return {
-                    "status": "error",
-                    "error": "HTTP error occurred",
-                    "user_id": self.user_id,
-                }
-            except Exception as e:
-                logger.error(f"Error making document request: {e}")
-                return {
-                    "status": "error",
-                    "error": f"Unexpected error: {str(e)}",
-                    "user_id": self.user_id,
-                }
+            return {
+                "status": "success",
+                "documents": documents,
+                "total_count": len(documents),
+                "user_id": self.user_id,
+                "query_params": params,
+            }
 
         except Exception as e:
             logger.error(f"Error getting documents for user {self.user_id}: {e}")
             return {"status": "error", "error": str(e), "user_id": self.user_id}
 
-    def get_notes(
+    async def get_notes(
         self,
         notebook: Optional[str] = None,
         tags: Optional[str] = None,
@@ -193,45 +211,9 @@ class DataTools:
             Dict containing notes or error information
         """
         try:
-            # Get settings
-            settings = get_settings()
-
-            # First, check if user has note integrations
-            try:
-                integrations_response = requests.get(
-                    f"{settings.user_service_url}/v1/internal/users/{self.user_id}/integrations",
-                    headers={"Authorization": f"Bearer {settings.api_chat_user_key}"},
-                    timeout=10,
-                )
-
-                if integrations_response.status_code != 200:
-                    return {
-                        "status": "error",
-                        "error": f"Failed to get user integrations: {integrations_response.status_code}",
-                        "user_id": self.user_id,
-                    }
-
-                integrations_data = integrations_response.json()
-                note_integrations = [
-                    integration
-                    for integration in integrations_data.get("integrations", [])
-                    if "notes" in integration.get("scopes", [])
-                ]
-
-                if not note_integrations:
-                    return {
-                        "status": "error",
-                        "error": "No note integrations found for user",
-                        "user_id": self.user_id,
-                    }
-
-            except Exception as e:
-                logger.error(f"Error checking user integrations: {e}")
-                return {
-                    "status": "error",
-                    "error": f"Failed to check user integrations: {str(e)}",
-                    "user_id": self.user_id,
-                }
+            error = await self._check_integration("notes", "note")
+            if error:
+                return error
 
             # Build query parameters
             params: Dict[str, Any] = {
@@ -247,78 +229,23 @@ class DataTools:
             if max_results:
                 params["limit"] = str(max_results)
 
-            # Make request to office service
-            try:
-                response = requests.get(
-                    f"{settings.office_service_url}/v1/notes",
-                    params=params,
-                    headers={"Authorization": f"Bearer {settings.api_chat_office_key}"},
-                    timeout=10,
-                )
+            notes = await self._get_office_list("/v1/notes", params, "notes", "note")
+            if isinstance(notes, dict):
+                return notes
 
-                if response.status_code == 200:
-                    data = response.json()
-
-                    # Validate response structure
-                    if "data" not in data:
-                        return {
-                            "status": "error",
-                            "error": "Malformed response: missing 'data' field",
-                            "user_id": self.user_id,
-                        }
-
-                    notes = data.get("data", {}).get("notes", [])
-                    if not isinstance(notes, list):
-                        return {
-                            "status": "error",
-                            "error": "Malformed response: 'notes' field is not a list",
-                            "user_id": self.user_id,
-                        }
-
-                    return {
-                        "status": "success",
-                        "notes": notes,
-                        "total_count": len(notes),
-                        "user_id": self.user_id,
-                        "query_params": params,
-                    }
-                else:
-                    logger.error(
-                        f"Failed to get notes: {response.status_code} - {response.text}"
-                    )
-                    return {
-                        "status": "error",
-                        "error": f"HTTP {response.status_code}: {response.text}",
-                        "user_id": self.user_id,
-                    }
-
-            except requests.Timeout:
-                logger.error("Note request timed out")
-                return {
-                    "status": "error",
-                    "error": "Request timed out",
-                    "user_id": self.user_id,
-                }
-            except requests.HTTPError:
-                logger.error("Note request failed with HTTP error")
-                return {
-                    "status": "error",
-                    "error": "HTTP error occurred",
-                    "user_id": self.user_id,
-                }
-            except Exception as e:
-                logger.error(f"Error making note request: {e}")
-                return {
-                    "status": "error",
-                    "error": f"Unexpected error: {str(e)}",
-                    "user_id": self.user_id,
-                }
+            return {
+                "status": "success",
+                "notes": notes,
+                "total_count": len(notes),
+                "user_id": self.user_id,
+                "query_params": params,
+            }
 
         except Exception as e:
             logger.error(f"Error getting notes for user {self.user_id}: {e}")
             return {"status": "error", "error": str(e), "user_id": self.user_id}
 
-    def get_calendar_events(
+    async def get_calendar_events(
         self,
         start_date: Optional[str] = None,
         end_date: Optional[str] = None,
@@ -340,45 +267,9 @@ class DataTools:
             Dict containing calendar events or error information
         """
         try:
-            # Get settings
-            settings = get_settings()
-
-            # First, check if user has calendar integrations
-            try:
-                integrations_response = requests.get(
-                    f"{settings.user_service_url}/v1/internal/users/{self.user_id}/integrations",
-                    headers={"Authorization": f"Bearer {settings.api_chat_user_key}"},
-                    timeout=10,
-                )
-
-                if integrations_response.status_code != 200:
-                    return {
-                        "status": "error",
-                        "error": f"Failed to get user integrations: {integrations_response.status_code}",
-                        "user_id": self.user_id,
-                    }
-
-                integrations_data = integrations_response.json()
-                calendar_integrations = [
-                    integration
-                    for integration in integrations_data.get("integrations", [])
-                    if "calendar" in integration.get("scopes", [])
-                ]
-
-                if not calendar_integrations:
-                    return {
-                        "status": "error",
-                        "error": "No calendar integrations found for user",
-                        "user_id": self.user_id,
-                    }
-
-            except Exception as e:
-                logger.error(f"Error checking user integrations: {e}")
-                return {
-                    "status": "error",
-                    "error": f"Failed to check user integrations: {str(e)}",
-                    "user_id": self.user_id,
-                }
+            error = await self._check_integration("calendar", "calendar")
+            if error:
+                return error
 
             # Build query parameters
             params: Dict[str, Any] = {"user_id": self.user_id, "limit": limit}
@@ -392,92 +283,39 @@ class DataTools:
             if providers:
                 params["providers"] = ",".join(providers)
 
-            # Make request to office service
-            try:
-                response = requests.get(
-                    f"{settings.office_service_url}/v1/calendar/events",
-                    params=params,
-                    headers={"Authorization": f"Bearer {settings.api_chat_office_key}"},
-                    timeout=10,
-                )
-
-                if response.status_code == 200:
-                    data = response.json()
-
-                    # Validate response structure
-                    if "data" not in data:
-                        return {
-                            "status": "error",
-                            "error": "Malformed response: missing 'data' field",
-                            "user_id": self.user_id,
-                        }
-
-                    events = data.get("data", {}).get("events", [])
-                    if not isinstance(events, list):
-                        return {
-                            "status": "error",
-                            "error": "Malformed response: 'events' field is not a list",
-                            "user_id": self.user_id,
-                        }
-
-                    # Convert events to list format
-                    events_list = []
-                    for event in events:
-                        if hasattr(event, "__dict__"):
-                            # Convert object to dictionary
-                            event_dict = {}
-                            for key, value in event.__dict__.items():
-                                if not key.startswith("_"):
-                                    event_dict[key] = value
-                            events_list.append(event_dict)
-                        else:
-                            # Handle dictionary events
-                            events_list.append(event.copy())
-
-                    return {
-                        "status": "success",
-                        "events": events_list,
-                        "total_count": len(events_list),
-                        "user_id": self.user_id,
-                        "query_params": params,
-                    }
+            events = await self._get_office_list(
+                "/v1/calendar/events", params, "events", "calendar event"
+            )
+            if isinstance(events, dict):
+                return events
+
+            # Convert events to list format
+            events_list = []
+            for event in events:
+                if hasattr(event, "__dict__"):
+                    # Convert object to dictionary
+                    event_dict = {}
+                    for key, value in event.__dict__.items():
+                        if not key.startswith("_"):
+                            event_dict[key] = value
+                    events_list.append(event_dict)
                 else:
-                    logger.error(
-                        f"Failed to get calendar events: {response.status_code} - {response.text}"
-                    )
-                    return {
-                        "status": "error",
-                        "error": f"HTTP {response.status_code}: {response.text}",
-                        "user_id": self.user_id,
-                    }
-
-            except requests.Timeout:
-                logger.error("Calendar request timed out")
-                return {
-                    "status": "error",
-                    "error": "Request timed out",
-                    "user_id": self.user_id,
-                }
-            except requests.HTTPError:
-                logger.error("Calendar request failed with HTTP error")
-                return {
-                    "status": "error",
-                    "error": "HTTP error occurred",
-                    "user_id": self.user_id,
-                }
-            except Exception as e:
-                logger.error(f"Error making calendar request: {e}")
-                return {
-                    "status": "error",
-                    "error": f"Unexpected error: {str(e)}",
-                    "user_id": self.user_id,
-                }
+                    # Handle dictionary events
+                    events_list.append(event.copy())
+
+            return {
+                "status": "success",
+                "events": events_list,
+                "total_count": len(events_list),
+                "user_id": self.user_id,
+                "query_params": params,
+            }
 
         except Exception as e:
             logger.error(f"Error getting calendar events for user {self.user_id}: {e}")
             return {"status": "error", "error": str(e), "user_id": self.user_id}
 
-    def get_emails(
+    async def get_emails(
         self,
         start_date: Optional[str] = None,
         end_date: Optional[str] = None,
@@ -501,45 +339,9 @@ class DataTools:
             Dict containing emails or error information
         """
         try:
-            # Get settings
-            settings = get_settings()
-
-            # First, check if user has email integrations
-            try:
-                integrations_response = requests.get(
-                    f"{settings.user_service_url}/v1/internal/users/{self.user_id}/integrations",
-                    headers={"Authorization": f"Bearer {settings.api_chat_user_key}"},
-                    timeout=10,
-                )
-
-                if integrations_response.status_code != 200:
-                    return {
-                        "status": "error",
-                        "error": f"Failed to get user integrations: {integrations_response.status_code}",
-                        "user_id": self.user_id,
-                    }
-
-                integrations_data = integrations_response.json()
-                email_integrations = [
-                    integration
-                    for integration in integrations_data.get("integrations", [])
-                    if "email" in integration.get("scopes", [])
-                ]
-
-                if not email_integrations:
-                    return {
-                        "status": "error",
-                        "error": "No email integrations found for user",
-                        "user_id": self.user_id,
-                    }
-
-            except Exception as e:
-                logger.error(f"Error checking user integrations: {e}")
-                return {
-                    "status": "error",
-                    "error": f"Failed to check user integrations: {str(e)}",
-                    "user_id": self.user_id,
-                }
+            error = await self._check_integration("email", "email")
+            if error:
+                return error
 
             # Build query parameters
             params: Dict[str, Any] = {
@@ -559,78 +361,19 @@ class DataTools:
             if max_results:
                 params["limit"] = str(max_results)
 
-            # Make request to office service
-            try:
-                response = requests.get(
-                    f"{settings.office_service_url}/v1/emails",
-                    params=params,
-                    headers={"Authorization": f"Bearer {settings.api_chat_office_key}"},
-                    timeout=10,
-                )
+            emails = await self._get_office_list(
+                "/v1/emails", params, "emails", "email", require_field=True
+            )
+            if isinstance(emails, dict):
+                return emails
 
-                if response.status_code == 200:
-                    data = response.json()
-
-                    # Validate response structure
-                    if "data" not in data:
-                        return {
-                            "status": "error",
-                            "error": "Malformed response: missing 'data' field",
-                            "user_id": self.user_id,
-                        }
-
-                    emails = data.get("data", {}).get("emails", [])
-                    if "emails" not in data.get("data", {}):
-                        return {
-                            "status": "error",
-                            "error": "Malformed response: missing 'emails' field",
-                            "user_id": self.user_id,
-                        }
-                    if not isinstance(emails, list):
-                        return {
-                            "status": "error",
-                            "error": "Malformed response: 'emails' field is not a list",
-                            "user_id": self.user_id,
-                        }
-
-                    return {
-                        "status": "success",
-                        "emails": emails,
-                        "total_count": len(emails),
-                        "user_id": self.user_id,
-                        "query_params": params,
-                    }
-                else:
-                    logger.error(
-                        f"Failed to get emails: {response.status_code} - {response.text}"
-                    )
-                    return {
-                        "status": "error",
-                        "error": f"HTTP {response.status_code}: {response.text}",
-                        "user_id": self.user_id,
-                    }
-
-            except requests.Timeout:
-                logger.error("Email request timed out")
-                return {
-                    "status": "error",
-                    "error": "Request timed out",
-                    "user_id": self.user_id,
-                }
-            except requests.HTTPError:
-                logger.error("Email request failed with HTTP error")
-                return {
-                    "status": "error",
-                    "error": "HTTP error occurred",
-                    "user_id": self.user_id,
-                }
-            except Exception as e:
-                logger.error(f"Error making email request: {e}")
-                return {
-                    "status": "error",
-                    "error": f"Unexpected error: {str(e)}",
-                    "user_id": self.user_id,
-                }
+            return {
+                "status": "success",
+                "emails": emails,
+                "total_count": len(emails),
+                "user_id": self.user_id,
+                "query_params": params,
+            }
 
         except Exception as e:
             logger.error(f"Error getting emails for user {self.user_id}: {e}")
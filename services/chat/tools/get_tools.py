@@ -5,11 +5,8 @@ This module provides dynamic tool discovery and execution capabilities.
 """
 
 import logging
-from typing import Any, Callable, Dict, List, Optional
+from typing import Any, Dict, List, Optional
 
-import requests
-
-from services.chat.settings import get_settings
 from services.chat.tools.data_tools import DataTools
 from services.chat.tools.draft_tools import DraftTools
 from services.chat.tools.tool_registry import (
@@ -55,7 +52,7 @@ class GetTool:
         except Exception as e:
             return {"status": "error", "error": str(e)}
 
-    def execute(
+    async def execute(
         self, tool_name: str, params: Optional[Dict[str, Any]] = None
     ) -> Dict[str, Any]:
         """Execute a tool by name with parameters."""
@@ -63,7 +60,7 @@ class GetTool:
             kwargs = params.copy() if params else {}
 
             # All tools are pre-bound with user context, no user_id injection needed
-            result = self.registry.execute_tool(tool_name, **kwargs)
+            result = await self.registry.execute_tool(tool_name, **kwargs)
             return {"status": "success", "tool": tool_name, "result": result}
         except Exception as e:
             logger.error(f"GetTool execute failed for {tool_name}: {e}")
@@ -1092,17 +1089,13 @@ class GetTools:
             self._semantic_search_wrapper,
         )
 
-    def _vespa_search_wrapper(
+    async def _vespa_search_wrapper(
         self, query: str, max_results: int = 20, ranking: str = "hybrid"
     ) -> Dict[str, Any]:
         """Wrapper method for Vespa search tool execution."""
         try:
             tool = self._search_tools["vespa_search"]
-
-            # Use sync execution with proper async handling
-            return self._execute_async_tool_method(
-                tool.search, query, max_results, ranking
-            )
+            return await tool.search(query, max_results, ranking)
 
         except Exception as e:
             return {
@@ -1112,17 +1105,13 @@ class GetTools:
                 "results": {},
             }
 
-    def _user_data_search_wrapper(
+    async def _user_data_search_wrapper(
         self, query: str, max_results: int = 20
     ) -> Dict[str, Any]:
         """Wrapper method for user data search tool execution."""
         try:
             tool = self._search_tools["user_data_search"]
-
-            # Use sync execution with proper async handling
-            return self._execute_async_tool_method(
-                tool.search_all_data, query, max_results
-            )
+            return await tool.search_all_data(query, max_results)
 
         except Exception as e:
             return {
@@ -1132,15 +1121,13 @@ class GetTools:
                 "grouped_results": {},
             }
 
-    def _semantic_search_wrapper(
+    async def _semantic_search_wrapper(
         self, query: str, max_results: int = 20
     ) -> Dict[str, Any]:
         """Wrapper method for semantic search tool execution."""
         try:
             tool = self._search_tools["semantic_search"]
-
-            # Use sync execution with proper async handling
-            return self._execute_async_tool_method(tool.search, query, max_results)
+            return await tool.search(query, max_results)
 
         except Exception as e:
             return {
@@ -1150,27 +1137,6 @@ class GetTools:
                 "results": {},
             }
 
-    def _execute_async_tool_method(
-        self, async_method: Callable[..., Any], *args: Any, **kwargs: Any
-    ) -> Dict[str, Any]:
-        """Execute an async tool method safely without creating nested event loops."""
-        try:
-            import asyncio
-            import concurrent.futures
-
-            # Always use ThreadPoolExecutor to avoid event loop conflicts
-            # This ensures clean isolation and prevents resource sharing issues
-            def run_in_thread() -> Dict[str, Any]:
-                return asyncio.run(async_method(*args, **kwargs))
-
-            with concurrent.futures.ThreadPoolExecutor() as executor:
-                future = executor.submit(run_in_thread)
-                return future.result()
-
-        except Exception as e:
-            logger.error(f"Failed to execute async tool method: {e}")
-            return {"status": "error", "error": str(e)}
-
 
 # Note: Legacy get_* functions have been moved to DataTools class
 # Use self.data_tools.get_calendar_events(), self.data_tools.get_emails(), etc.
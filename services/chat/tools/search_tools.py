@@ -14,6 +14,8 @@ can be added as optional parameters without changing the agent-side logic.
 import logging
 from typing import Any, Dict, List, Optional
 
+from services.vespa_query.query_builder import QUERY_EMBEDDING_INPUT, QueryBuilder
+from services.vespa_query.query_embedder import QueryEmbedder, get_query_embedder
 from services.vespa_query.search_engine import SearchEngine
 
 logger = logging.getLogger(__name__)
@@ -22,9 +24,16 @@ logger = logging.getLogger(__name__)
 class UserDataSearchTool:
     """Unified tool for searching user data with a single hybrid entry point."""
 
-    def __init__(self, vespa_endpoint: str, user_id: str):
+    def __init__(
+        self,
+        vespa_endpoint: str,
+        user_id: str,
+        query_embedder: Optional[QueryEmbedder] = None,
+    ):
         self.search_engine = SearchEngine(vespa_endpoint)
         self.user_id = user_id
+        # Shared per process so the model and query cache are loaded once
+        self.query_embedder = query_embedder or get_query_embedder()
         self.tool_name = "user_data_search"
         self.description = (
             "Hybrid search across emails, calendar, contacts, and files with "
@@ -49,7 +58,12 @@ class UserDataSearchTool:
     ) -> Dict[str, Any]:
         """Single entry point: perform a hybrid search across all data types."""
         try:
-            yql_query = self._build_yql_query(query)
+            query_embedding = (
+                await self.query_embedder.embed(query) if self.query_embedder else None
+            )
+            yql_query = self._build_yql_query(
+                query, nearest_neighbor=query_embedding is not None
+            )
             search_query = {
                 "yql": yql_query,
                 "hits": max_results,
@@ -57,8 +71,10 @@ class UserDataSearchTool:
                 "timeout": "5.0s",
                 "streaming.groupname": self.user_id,
             }
+            if query_embedding is not None:
+                search_query[QUERY_EMBEDDING_INPUT] = query_embedding
 
-            logger.info(f"Search query: {search_query}")
+            logger.info(f"Search query: {yql_query}")
             results = await self.search_engine.search(search_query)
 
             processed_results = self._process_search_results(results, query)
@@ -87,12 +103,16 @@ class UserDataSearchTool:
                 "grouped_results": {},
             }
 
-    def _build_yql_query(self, query: str) -> str:
-        """Build YQL query for Vespa with optional light parsing."""
-        yql = "select * from briefly_document where true"
-        enhanced_query = self._parse_and_enhance_query(query)
-        yql += enhanced_query
-        return yql
+    def _build_yql_query(self, query: str, nearest_neighbor: bool = False) -> str:
+        """Build YQL query for Vespa with optional light parsing.
+
+        With ``nearest_neighbor``, documents close to the query embedding are
+        recalled as well as keyword matches.
+        """
+        condition = self._parse_and_enhance_query(query)
+        if nearest_neighbor:
+            condition += " or " + QueryBuilder.build_nearest_neighbor_clause()
+        return f"select * from briefly_document where true and ({condition})"
 
     def _parse_and_enhance_query(self, query: str) -> str:
         """Parse the query and create enhanced search conditions."""
@@ -105,8 +125,8 @@ class UserDataSearchTool:
         if match:
             sender = match.group(1).strip()
             return (
-                f' and (sender contains "{sender}" or search_text contains "{sender}" '
-                f'or title contains "{sender}" or content contains "{sender}")'
+                f'sender contains "{sender}" or search_text contains "{sender}" '
+                f'or title contains "{sender}" or content contains "{sender}"'
             )
 
         find_from_pattern = r"\bfind\s+.+?\s+from\s+(.+?)(?:\s|$)"
@@ -114,13 +134,13 @@ class UserDataSearchTool:
         if match:
             sender = match.group(1).strip()
             return (
-                f' and (sender contains "{sender}" or search_text contains "{sender}" '
-                f'or title contains "{sender}" or content contains "{sender}")'
+                f'sender contains "{sender}" or search_text contains "{sender}" '
+                f'or title contains "{sender}" or content contains "{sender}"'
             )
 
         return (
-            f' and (search_text contains "{query}" or title contains "{query}" '
-            f'or content contains "{query}")'
+            f'search_text contains "{query}" or title contains "{query}" '
+            f'or content contains "{query}"'
         )
 
     def _process_search_results(
@@ -467,9 +487,16 @@ class VespaSearchTool:
 class SemanticSearchTool:
     """Semantic search tool using vector embeddings."""
 
-    def __init__(self, vespa_endpoint: str, user_id: str):
+    def __init__(
+        self,
+        vespa_endpoint: str,
+        user_id: str,
+        query_embedder: Optional[QueryEmbedder] = None,
+    ):
         self.search_engine = SearchEngine(vespa_endpoint)
         self.user_id = user_id
+        # Shared per process so the model and query cache are loaded once
+        self.query_embedder = query_embedder or get_query_embedder()
         self.tool_name = "semantic_search"
         self.description = (
             "Semantic search using vector embeddings and similarity scoring"
@@ -491,7 +518,13 @@ class SemanticSearchTool:
     async def search(self, query: str, max_results: int = 20) -> Dict[str, Any]:
         """Execute a semantic search using vector embeddings."""
         try:
-            yql_query = f'select * from briefly_document where user_id="{self.user_id}" and search_text contains "{query}"'
+            query_embedding = (
+                await self.query_embedder.embed(query) if self.query_embedder else None
+            )
+            condition = f'search_text contains "{query}"'
+            if query_embedding is not None:
+                condition += " or " + QueryBuilder.build_nearest_neighbor_clause()
+            yql_query = f'select * from briefly_document where user_id="{self.user_id}" and ({condition})'
             search_query = {
                 "yql": yql_query,
                 "hits": max_results,
@@ -499,6 +532,8 @@ class SemanticSearchTool:
                 "timeout": "5.0s",
                 "streaming.groupname": self.user_id,
             }
+            if query_embedding is not None:
+                search_query[QUERY_EMBEDDING_INPUT] = query_embedding
 
             logger.info(f"Semantic search query: {search_query}")
             results = await self.search_engine.search(search_query)
@@ -9,6 +9,7 @@ This module provides a comprehensive tool registry system that allows:
 - Tool execution through the registry
 """
 
+import inspect
 import json
 import logging
 from dataclasses import asdict, dataclass, field
@@ -125,9 +126,12 @@ class ToolRegistry:
         """
         return list(self._categories.keys())
 
-    def execute_tool(self, tool_id: str, **kwargs: Any) -> Any:
+    async def execute_tool(self, tool_id: str, **kwargs: Any) -> Any:
         """Execute a tool by ID with parameters.
 
+        Async executors are awaited on the caller's event loop; sync executors
+        are plain in-memory work and are called directly.
+
         Args:
             tool_id: ID of the tool to execute
             **kwargs: Parameters to pass to the tool
@@ -152,6 +156,8 @@ class ToolRegistry:
             else:
                 # Assume it's an object with an execute method
                 result = executor.execute(**kwargs)
+            if inspect.isawaitable(result):
+                result = await result
 
             logger.info(f"Successfully executed tool: {tool_id}")
             return result
@@ -6,7 +6,7 @@ import logging
 from typing import Any, Dict, List
 from urllib.parse import unquote
 
-import requests
+from services.chat.http_pool import get_http_client
 
 logger = logging.getLogger(__name__)
 
@@ -34,11 +34,11 @@ class WebSearchTool:
                     "Chrome/124.0.0.0 Safari/537.36"
                 )
             }
-            resp = requests.get(
+            resp = await get_http_client().get(
                 "https://duckduckgo.com/html/",
                 params={"q": query},
                 headers=headers,
-                timeout=10,
+                follow_redirects=True,
             )
             if resp.status_code != 200:
                 return {
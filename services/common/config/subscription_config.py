@@ -177,6 +177,18 @@ class SubscriptionConfig:
                 "ack_deadline_seconds": 60,
             },
         },
+        "chat": {
+            "emails": {
+                "subscription_name": "chat-emails",
+                "batch_size": 100,
+                "ack_deadline_seconds": 30,
+            },
+            "calendars": {
+                "subscription_name": "chat-calendars",
+                "batch_size": 100,
+                "ack_deadline_seconds": 30,
+            },
+        },
         "frontend_sse": {
             "emails": {
                 "subscription_name": "frontend-sse-emails",
@@ -2,10 +2,13 @@
 Shared PubSub utilities for Briefly services with integrated logging and tracing.
 """
 
+import asyncio
 import json
 import os
+from concurrent.futures import Future
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
-from typing import Any, Callable, Dict, Optional, Union
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
 
 from google.cloud import pubsub_v1  # type: ignore[attr-defined]
 
@@ -24,6 +27,71 @@ logger = get_logger(__name__)
 tracer = get_tracer(__name__)
 
 
+@dataclass
+class PublishResult:
+    """Outcome of publishing one message in a batch."""
+
+    message_id: Optional[str] = None
+    error: Optional[str] = None
+    exception: Optional[BaseException] = field(default=None, repr=False)
+
+    @property
+    def success(self) -> bool:
+        return self.error is None
+
+
+def create_batch_settings(
+    max_messages: int = 100,
+    max_bytes: int = 1024 * 1024,
+    max_latency: float = 0.01,
+) -> pubsub_v1.types.BatchSettings:
+    """
+    Build publisher batch settings.
+
+    The client library groups messages into one publish RPC until any of the
+    limits is hit. Larger values trade a little latency for far fewer RPCs
+    when publishing thousands of events.
+
+    Args:
+        max_messages: Messages per publish RPC
+        max_bytes: Payload bytes per publish RPC (Pub/Sub caps this at 10MB)
+        max_latency: Seconds to wait for a batch to fill before sending it
+    """
+    return pubsub_v1.types.BatchSettings(
+        max_messages=max_messages, max_bytes=max_bytes, max_latency=max_latency
+    )
+
+
+async def await_publish_futures(futures: Sequence[Future]) -> List[PublishResult]:
+    """
+    Await publish futures together without blocking the event loop.
+
+    Publisher futures are resolved on the client library's background
+    threads; each is bridged onto the running loop instead of calling the
+    blocking ``future.result()``.
+
+    Args:
+        futures: Futures returned by ``PublisherClient.publish``
+
+    Returns:
+        One PublishResult per future, in the same order
+    """
+    outcomes = await asyncio.gather(
+        *(asyncio.wrap_future(future) for future in futures),
+        return_exceptions=True,
+    )
+    return [
+        (
+            PublishResult(
+                error=f"{type(outcome).__name__}: {outcome}", exception=outcome
+            )
+            if isinstance(outcome, BaseException)
+            else PublishResult(message_id=outcome)
+        )
+        for outcome in outcomes
+    ]
+
+
 class PubSubClient:
     """Shared PubSub client for publishing messages with logging and tracing."""
 
@@ -32,9 +100,11 @@ class PubSubClient:
         project_id: Optional[str] = None,
         emulator_host: Optional[str] = None,
         service_name: str = "unknown-service",
+        batch_settings: Optional[pubsub_v1.types.BatchSettings] = None,
     ):
         self.project_id = project_id or os.getenv("PUBSUB_PROJECT_ID", "briefly-dev")
         self.service_name = service_name
+        self.batch_settings = batch_settings
 
         # Set up emulator if specified
         if emulator_host:
@@ -49,7 +119,12 @@ class PubSubClient:
 
         # Initialize publisher client
         try:
-            self.publisher = pubsub_v1.PublisherClient()
+            if batch_settings is not None:
+                self.publisher = pubsub_v1.PublisherClient(
+                    batch_settings=batch_settings
+                )
+            else:
+                self.publisher = pubsub_v1.PublisherClient()
         except Exception as e:
             logger.error(f"Failed to initialize Pub/Sub publisher client: {e}")
             logger.info("Pub/Sub functionality will be disabled")
@@ -67,7 +142,12 @@ class PubSubClient:
     def publish_message(
         self, topic_name: str, data: Union[Dict[str, Any], BaseEvent], **kwargs: Any
     ) -> str:
-        """Publish a message to a PubSub topic with tracing and logging."""
+        """
+        Publish a message to a PubSub topic with tracing and logging.
+
+        Blocks the calling thread until the publish completes; coroutines
+        should use ``publish_message_async`` instead.
+        """
         if not self.publisher:
             logger.warning("Pub/Sub publisher not available, message not published")
             return "disabled"
@@ -75,26 +155,7 @@ class PubSubClient:
         with tracer.start_as_current_span(f"pubsub.publish.{topic_name}") as span:
             try:
                 topic_path = self.publisher.topic_path(self.project_id, topic_name)
-
-                # Handle both dict and BaseEvent types
-                if isinstance(data, BaseEvent):
-                    # Add tracing context to the event
-                    if span.is_recording():
-                        span_context = span.get_span_context()
-                        data.add_trace_context(
-                            trace_id=f"{span_context.trace_id:032x}",
-                            span_id=f"{span_context.span_id:016x}",
-                        )
-
-                    # Convert event to dict
-                    message_data = data.model_dump_json().encode("utf-8")
-                    event_type = data.__class__.__name__
-                else:
-                    # Handle legacy dict format
-                    if "timestamp" not in data:
-                        data["timestamp"] = datetime.now(timezone.utc).isoformat()
-                    message_data = json.dumps(data, default=str).encode("utf-8")
-                    event_type = "dict"
+                message_data, event_type = self._encode_message(data, span)
 
                 # Add span attributes for tracing
                 span.set_attribute("pubsub.topic", topic_name)
@@ -152,8 +213,117 @@ class PubSubClient:
                 span.record_exception(e)
                 raise
 
+    def _encode_message(
+        self, data: Union[Dict[str, Any], BaseEvent], span: Any
+    ) -> Tuple[bytes, str]:
+        """Serialize a message, attaching the current trace context to events."""
+        # Handle both dict and BaseEvent types
+        if isinstance(data, BaseEvent):
+            # Add tracing context to the event
+            if span.is_recording():
+                span_context = span.get_span_context()
+                data.add_trace_context(
+                    trace_id=f"{span_context.trace_id:032x}",
+                    span_id=f"{span_context.span_id:016x}",
+                )
+
+            # Convert event to dict
+            return data.model_dump_json().encode("utf-8"), data.__class__.__name__
+
+        # Handle legacy dict format
+        if "timestamp" not in data:
+            data["timestamp"] = datetime.now(timezone.utc).isoformat()
+        return json.dumps(data, default=str).encode("utf-8"), "dict"
+
+    async def publish_message_async(
+        self, topic_name: str, data: Union[Dict[str, Any], BaseEvent], **kwargs: Any
+    ) -> str:
+        """Publish a single message and await it without blocking the event loop."""
+        result = (await self.publish_batch(topic_name, [data], **kwargs))[0]
+        if result.exception is not None:
+            raise result.exception
+        return result.message_id or "disabled"
+
+    async def publish_batch(
+        self,
+        topic_name: str,
+        messages: Sequence[Union[Dict[str, Any], BaseEvent]],
+        **kwargs: Any,
+    ) -> List[PublishResult]:
+        """
+        Publish many messages to one topic and await them together.
+
+        All messages are handed to the publisher up front so the client
+        library can pack them into batched RPCs per ``batch_settings``; the
+        resulting futures are then awaited concurrently on the event loop.
+        A failure of one message never affects the others.
+
+        Args:
+            topic_name: Topic to publish to
+            messages: Events or legacy dict payloads
+            **kwargs: Message attributes passed to every publish call
+
+        Returns:
+            One PublishResult per message, in input order
+        """
+        if not self.publisher:
+            logger.warning("Pub/Sub publisher not available, messages not published")
+            return [PublishResult(message_id="disabled") for _ in messages]
+
+        with tracer.start_as_current_span(f"pubsub.publish_batch.{topic_name}") as span:
+            topic_path = self.publisher.topic_path(self.project_id, topic_name)
+            futures: List[Optional[Future]] = []
+            results: List[Optional[PublishResult]] = []
+            total_bytes = 0
+
+            for data in messages:
+                try:
+                    message_data, _ = self._encode_message(data, span)
+                    futures.append(
+                        self.publisher.publish(topic_path, data=message_data, **kwargs)
+                    )
+                    results.append(None)
+                    total_bytes += len(message_data)
+                except Exception as e:
+                    futures.append(None)
+                    results.append(
+                        PublishResult(error=f"{type(e).__name__}: {e}", exception=e)
+                    )
+
+            pending = [future for future in futures if future is not None]
+            awaited = iter(await await_publish_futures(pending))
+            final_results = [
+                result if result is not None else next(awaited) for result in results
+            ]
+
+            failed = sum(1 for result in final_results if not result.success)
+            span.set_attribute("pubsub.topic", topic_name)
+            span.set_attribute("pubsub.batch_size", len(final_results))
+            span.set_attribute("pubsub.batch_failed", failed)
+            span.set_attribute("pubsub.message_size_bytes", total_bytes)
+
+            log = logger.warning if failed else logger.info
+            log(
+                "Published message batch",
+                extra={
+                    "topic_name": topic_name,
+                    "batch_size": len(final_results),
+                    "failed": failed,
+                    "message_size_bytes": total_bytes,
+                },
+            )
+            return final_results
+
     # New event publishing methods for event-driven architecture
-    def publish_email_event(self, event: EmailEvent, topic_name: str = "emails") -> str:
+    async def publish_email_events(
+        self, events: Sequence[EmailEvent], topic_name: str = "emails"
+    ) -> List[PublishResult]:
+        """Publish many email events in one batch without blocking the loop."""
+        return await self.publish_batch(topic_name, events)
+
+    async def publish_email_event(
+        self, event: EmailEvent, topic_name: str = "emails"
+    ) -> str:
         """Publish email event with type safety."""
         logger.info(
             "Publishing email event",
@@ -165,9 +335,9 @@ class PubSubClient:
                 "topic_name": topic_name,
             },
         )
-        return self.publish_message(topic_name, event)
+        return await self.publish_message_async(topic_name, event)
 
-    def publish_calendar_event(
+    async def publish_calendar_event(
         self, event: CalendarEvent, topic_name: str = "calendars"
     ) -> str:
         """Publish calendar event with type safety."""
@@ -181,9 +351,9 @@ class PubSubClient:
                 "topic_name": topic_name,
             },
         )
-        return self.publish_message(topic_name, event)
+        return await self.publish_message_async(topic_name, event)
 
-    def publish_contact_event(
+    async def publish_contact_event(
         self, event: ContactEvent, topic_name: str = "contacts"
     ) -> str:
         """Publish contact event with type safety."""
@@ -197,9 +367,9 @@ class PubSubClient:
                 "topic_name": topic_name,
             },
         )
-        return self.publish_message(topic_name, event)
+        return await self.publish_message_async(topic_name, event)
 
-    def publish_document_event(
+    async def publish_document_event(
         self, event: DocumentEvent, topic_name: str = "word_documents"
     ) -> str:
         """Publish document event with type safety."""
@@ -213,9 +383,11 @@ class PubSubClient:
                 "topic_name": topic_name,
             },
         )
-        return self.publish_message(topic_name, event)
+        return await self.publish_message_async(topic_name, event)
 
-    def publish_todo_event(self, event: TodoEvent, topic_name: str = "todos") -> str:
+    async def publish_todo_event(
+        self, event: TodoEvent, topic_name: str = "todos"
+    ) -> str:
         """Publish todo event with type safety."""
         logger.info(
             "Publishing todo event",
@@ -227,7 +399,7 @@ class PubSubClient:
                 "topic_name": topic_name,
             },
         )
-        return self.publish_message(topic_name, event)
+        return await self.publish_message_async(topic_name, event)
 
     def close(self) -> None:
         """Close the publisher client and release resources."""
@@ -0,0 +1,147 @@
+"""
+Tests for batched, non-blocking Pub/Sub publishing.
+"""
+
+import asyncio
+import threading
+from concurrent.futures import Future
+from datetime import datetime, timezone
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from services.common.events.base_events import EventMetadata
+from services.common.events.email_events import EmailData, EmailEvent
+from services.common.pubsub_client import PubSubClient, await_publish_futures
+
+
+def _make_email_data(index: int) -> EmailData:
+    return EmailData(
+        id=f"email{index}",
+        thread_id=f"thread{index}",
+        subject="Test",
+        body="Body",
+        from_address="sender@example.com",
+        to_addresses=["me@example.com"],
+        received_date=datetime(2024, 1, 1, tzinfo=timezone.utc),
+        provider="gmail",
+        provider_message_id=f"msg{index}",
+    )
+
+
+def _make_email_event(index: int) -> EmailEvent:
+    return EmailEvent(
+        metadata=EventMetadata(source_service="test-service"),
+        user_id="user123",
+        email=_make_email_data(index),
+        operation="create",
+        last_updated=datetime(2024, 1, 1, tzinfo=timezone.utc),
+        sync_timestamp=datetime(2024, 1, 1, tzinfo=timezone.utc),
+        provider="gmail",
+    )
+
+
+class FakePublisher:
+    """Returns unresolved futures and resolves them from a background thread."""
+
+    def __init__(self, failures=None):
+        self.failures = failures or {}
+        self.published = []
+        self.futures = []
+
+    def topic_path(self, project_id, topic_name):
+        return f"projects/{project_id}/topics/{topic_name}"
+
+    def publish(self, topic_path, data, **kwargs):
+        index = len(self.published)
+        self.published.append(data)
+        future = Future()
+        self.futures.append((index, future))
+        return future
+
+    def resolve_all(self):
+        for index, future in self.futures:
+            if index in self.failures:
+                future.set_exception(self.failures[index])
+            else:
+                future.set_result(f"id-{index}")
+
+
+def _resolve_later(publisher: FakePublisher) -> threading.Timer:
+    timer = threading.Timer(0.05, publisher.resolve_all)
+    timer.start()
+    return timer
+
+
+class TestAwaitPublishFutures:
+    @pytest.mark.asyncio
+    async def test_does_not_block_event_loop(self):
+        future = Future()
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while not future.done():
+                ticks += 1
+                await asyncio.sleep(0.005)
+
+        threading.Timer(0.05, future.set_result, args=("id-1",)).start()
+        results, _ = await asyncio.gather(await_publish_futures([future]), ticker())
+
+        assert results[0].message_id == "id-1"
+        assert ticks > 1
+
+
+class TestPubSubClientBatch:
+    @pytest.fixture
+    def client(self):
+        with patch("services.common.pubsub_client.pubsub_v1.PublisherClient"):
+            client = PubSubClient(project_id="test-project", service_name="test")
+        return client
+
+    @pytest.mark.asyncio
+    async def test_publishes_all_before_awaiting(self, client):
+        client.publisher = FakePublisher(failures={1: RuntimeError("boom")})
+        events = [_make_email_event(i) for i in range(3)]
+
+        _resolve_later(client.publisher)
+        results = await client.publish_email_events(events)
+
+        assert len(client.publisher.published) == 3
+        assert [r.success for r in results] == [True, False, True]
+        assert results[0].message_id == "id-0"
+        assert "boom" in results[1].error
+
+    @pytest.mark.asyncio
+    async def test_disabled_publisher_returns_placeholder_ids(self, client):
+        client.publisher = None
+
+        results = await client.publish_batch("emails", [{"a": 1}, {"b": 2}])
+
+        assert [r.message_id for r in results] == ["disabled", "disabled"]
+
+    @pytest.mark.asyncio
+    async def test_publish_message_async_reraises_failure(self, client):
+        client.publisher = FakePublisher(failures={0: ValueError("bad")})
+
+        _resolve_later(client.publisher)
+        with pytest.raises(ValueError, match="bad"):
+            await client.publish_message_async("emails", {"a": 1})
+
+    @pytest.mark.asyncio
+    async def test_typed_event_helper_does_not_block(self, client):
+        client.publisher = FakePublisher()
+
+        _resolve_later(client.publisher)
+        message_id = await client.publish_email_event(_make_email_event(0))
+
+        assert message_id == "id-0"
+
+    def test_batch_settings_passed_to_publisher(self):
+        settings = MagicMock()
+        with patch(
+            "services.common.pubsub_client.pubsub_v1.PublisherClient"
+        ) as publisher_cls:
+            PubSubClient(project_id="test-project", batch_settings=settings)
+
+        publisher_cls.assert_called_once_with(batch_settings=settings)
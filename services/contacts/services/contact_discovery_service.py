@@ -523,7 +523,7 @@ class ContactDiscoveryService:
             # Note: We'll need to get the contact again to ensure we have the latest data
             updated_contact = await self.get_contact(session, user_id, email)
             if updated_contact:
-                self._publish_contact_update(updated_contact)
+                await self._publish_contact_update(updated_contact)
 
         except Exception as e:
             logger.error(f"Error processing discovered contact {email}: {e}")
@@ -549,7 +549,7 @@ class ContactDiscoveryService:
             return " ".join(parts[1:])
         return None
 
-    def _publish_contact_update(self, contact: Contact) -> None:
+    async def _publish_contact_update(self, contact: Contact) -> None:
         """Publish contact update event for Vespa integration."""
         try:
             # Convert to Vespa document format
@@ -592,7 +592,7 @@ class ContactDiscoveryService:
                 metadata=metadata,
             )
 
-            self.pubsub_client.publish_contact_event(contact_event)
+            await self.pubsub_client.publish_contact_event(contact_event)
 
             logger.debug(f"Published contact update for {contact.email_address}")
 
@@ -703,7 +703,7 @@ class ContactDiscoveryService:
             await session.commit()
 
             # Publish update
-            self._publish_contact_update(contact)
+            await self._publish_contact_update(contact)
 
             return contact
         except Exception as e:
@@ -189,7 +189,7 @@ class VespaBackfillDemo:
                 if response.status_code == 200:
                     jobs = response.json()
                     for job in jobs:
-                        if job.get("status") == "running":
+                        if job.get("status") in ("queued", "running"):
                             job_id = job.get("job_id")
                             logger.info(f"Cancelling running job: {job_id}")
 
@@ -0,0 +1,23 @@
+"""
+API key authentication for the Email Sync service.
+"""
+
+from services.common.api_key_auth import (
+    APIKeyConfig,
+    make_verify_service_authentication,
+)
+from services.email_sync.settings import get_settings
+
+# API Key configurations
+API_KEY_CONFIGS = {
+    "api_user_email_sync_key": APIKeyConfig(
+        client="user-management",
+        service="email-sync-service",
+        permissions=["sync_emails"],
+        settings_key="api_user_email_sync_key",
+    ),
+}
+
+verify_service_authentication = make_verify_service_authentication(
+    API_KEY_CONFIGS, get_settings
+)
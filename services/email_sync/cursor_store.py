@@ -0,0 +1,148 @@
+"""
+Per-mailbox sync state kept in Redis.
+
+Registered users are kept in one hash (user ID -> providers) and the sync
+state of each stream in another (user ID -> SyncState JSON). A stream is one
+provider change feed: Gmail history is mailbox-wide, while Graph delta feeds
+are per mail folder, so Outlook has one stream per synced folder.
+"""
+
+import json
+from datetime import datetime
+from typing import AsyncIterator, List, Optional, Sequence, Tuple
+
+import redis.asyncio as redis
+from pydantic import BaseModel
+
+from services.common.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+
+class SyncState(BaseModel):
+    """Where the sync of one stream stands."""
+
+    # Cursor of the last completed round (Gmail historyId / Graph delta link)
+    cursor: Optional[str] = None
+    # Page token and cursor of a round that is still being read
+    page_token: Optional[str] = None
+    round_cursor: Optional[str] = None
+    # Lower bound of a round started without a cursor
+    since: Optional[datetime] = None
+    synced_at: Optional[datetime] = None
+
+
+def stream_name(provider: str, folder_id: Optional[str] = None) -> str:
+    """Name of the stream of a provider (and folder, for per-folder feeds)"""
+    return f"{provider}:{folder_id}" if folder_id else provider
+
+
+class SyncCursorStore:
+    """Redis-backed registry of synced mailboxes and their cursors."""
+
+    def __init__(
+        self,
+        redis_url: str,
+        prefix: str = "email_sync",
+        client: Optional[redis.Redis] = None,
+    ) -> None:
+        """
+        Initialize the store.
+
+        Args:
+            redis_url: Redis connection URL
+            prefix: Prefix of every key the store writes
+            client: Redis client to use instead of connecting (for tests)
+        """
+        self._redis = client or redis.from_url(
+            redis_url, encoding="utf-8", decode_responses=True
+        )
+        self._users_key = f"{prefix}:users"
+        self._state_prefix = f"{prefix}:state"
+
+    def _state_key(self, stream: str) -> str:
+        return f"{self._state_prefix}:{stream}"
+
+    async def register(self, user_id: str, providers: Sequence[str]) -> None:
+        """
+        Register a user's mailboxes for syncing.
+
+        Args:
+            user_id: User ID
+            providers: Providers to sync
+        """
+        await self._redis.hset(self._users_key, user_id, json.dumps(list(providers)))
+
+    async def unregister(self, user_id: str, streams: Sequence[str]) -> None:
+        """
+        Stop syncing a user and forget their cursors.
+
+        Args:
+            user_id: User ID
+            streams: Streams whose state to drop
+        """
+        async with self._redis.pipeline(transaction=False) as pipe:
+            pipe.hdel(self._users_key, user_id)
+            for stream in streams:
+                pipe.hdel(self._state_key(stream), user_id)
+            await pipe.execute()
+
+    async def get_providers(self, user_id: str) -> List[str]:
+        """
+        Get the providers registered for a user.
+
+        Args:
+            user_id: User ID
+
+        Returns:
+            Registered providers, empty if the user is not registered
+        """
+        raw = await self._redis.hget(self._users_key, user_id)
+        return json.loads(raw) if raw else []
+
+    async def users(self) -> AsyncIterator[Tuple[str, List[str]]]:
+        """
+        Iterate over the registered users without loading them all at once.
+
+        Yields:
+            Tuples of user ID and registered providers
+        """
+        async for user_id, raw in self._redis.hscan_iter(self._users_key, count=500):
+            yield user_id, json.loads(raw)
+
+    async def get_state(self, user_id: str, stream: str) -> SyncState:
+        """
+        Get the sync state of a stream.
+
+        Args:
+            user_id: User ID
+            stream: Stream name from stream_name()
+
+        Returns:
+            The stored state, or an empty state if the stream was never synced
+        """
+        raw = await self._redis.hget(self._state_key(stream), user_id)
+        if not raw:
+            return SyncState()
+        try:
+            return SyncState.model_validate_json(raw)
+        except ValueError:
+            logger.warning(f"Discarding unreadable sync state of {user_id} {stream}")
+            return SyncState()
+
+    async def set_state(self, user_id: str, stream: str, state: SyncState) -> None:
+        """
+        Store the sync state of a stream.
+
+        Args:
+            user_id: User ID
+            stream: Stream name from stream_name()
+            state: State to store
+        """
+        await self._redis.hset(
+            self._state_key(stream), user_id, state.model_dump_json()
+        )
+
+    async def close(self) -> None:
+        """Close the Redis connection."""
+        await self._redis.close()
@@ -4,13 +4,19 @@ Briefly Email Sync Service - FastAPI Application
 Provides email synchronization and processing capabilities.
 """
 
+import asyncio
+import contextlib
 from contextlib import asynccontextmanager
-from typing import AsyncGenerator
+from dataclasses import asdict
+from typing import Any, AsyncGenerator, Dict, List, Optional
 
-from fastapi import FastAPI
+from fastapi import Depends, FastAPI, Query
 from fastapi.middleware.cors import CORSMiddleware
 
-from services.common.http_errors import register_briefly_exception_handlers
+from services.common.http_errors import (
+    ValidationError,
+    register_briefly_exception_handlers,
+)
 from services.common.logging_config import (
     create_request_logging_middleware,
     get_logger,
@@ -18,10 +24,26 @@ from services.common.logging_config import (
     log_service_startup,
     setup_service_logging,
 )
+from services.common.pubsub_client import PubSubClient
+from services.email_sync.auth import verify_service_authentication
+from services.email_sync.cursor_store import SyncCursorStore
+from services.email_sync.office_client import OfficeClient
+from services.email_sync.settings import get_settings
+from services.email_sync.sync_engine import SUPPORTED_PROVIDERS, EmailSyncEngine
 
 # Set up centralized logging - will be initialized in lifespan
 logger = get_logger(__name__)
 
+# Sync engine, created in lifespan
+engine: Optional[EmailSyncEngine] = None
+
+
+def get_engine() -> EmailSyncEngine:
+    """Get the sync engine of the running service."""
+    if engine is None:
+        raise RuntimeError("Email sync engine is not initialized")
+    return engine
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
@@ -31,8 +53,36 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
         version="0.1.0",
         environment="development",
     )
+    global engine
+    settings = get_settings()
+    office = OfficeClient(
+        settings.office_service_url,
+        settings.api_email_sync_office_key,
+        timeout=settings.office_timeout_seconds,
+        max_connections=settings.office_max_connections,
+    )
+    store = SyncCursorStore(settings.REDIS_URL)
+    pubsub = PubSubClient(
+        project_id=settings.PUBSUB_PROJECT_ID,
+        emulator_host=settings.PUBSUB_EMULATOR_HOST,
+        service_name="email-sync",
+    )
+    engine = EmailSyncEngine(office, store, pubsub, settings)
+    sync_loop = None
+    if settings.sync_interval_seconds > 0:
+        sync_loop = asyncio.create_task(engine.run(settings.sync_interval_seconds))
+
     yield
+
     # Shutdown event logic
+    if sync_loop is not None:
+        sync_loop.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await sync_loop
+    await office.close()
+    await store.close()
+    pubsub.close()
+    engine = None
     log_service_shutdown("email-sync")
 
 
@@ -80,7 +130,57 @@ def root() -> dict:
 @app.get("/health")
 def health() -> dict:
     logger.info("Health check endpoint accessed")
-    return {"status": "ok", "service": "email-sync", "version": "0.1.0"}
+    status: Dict[str, Any] = {
+        "status": "ok",
+        "service": "email-sync",
+        "version": "0.1.0",
+    }
+    if engine is not None:
+        status["sync"] = engine.get_stats()
+    return status
+
+
+@app.post("/sync/users/{user_id}", tags=["sync"])
+async def sync_user(
+    user_id: str,
+    providers: List[str] = Query(
+        default=list(SUPPORTED_PROVIDERS), description="Providers to sync"
+    ),
+    service_name: str = Depends(verify_service_authentication),
+) -> dict:
+    """
+    Register a user's mailboxes for syncing and sync them now.
+
+    Also the hook for provider push notifications: calling it again syncs
+    only what changed since the last sync.
+    """
+    sync_engine = get_engine()
+    try:
+        await sync_engine.register(user_id, providers)
+    except ValueError as e:
+        raise ValidationError(message=str(e), field="providers")
+    results = await sync_engine.sync_user(user_id, providers)
+    return {
+        "user_id": user_id,
+        "streams": [asdict(result) for result in results],
+    }
+
+
+@app.delete("/sync/users/{user_id}", tags=["sync"])
+async def unregister_user(
+    user_id: str, service_name: str = Depends(verify_service_authentication)
+) -> dict:
+    """Stop syncing a user's mailboxes and drop their cursors."""
+    await get_engine().unregister(user_id)
+    return {"user_id": user_id, "unregistered": True}
+
+
+@app.get("/sync/status", tags=["sync"])
+async def sync_status(
+    service_name: str = Depends(verify_service_authentication),
+) -> dict:
+    """Counters of the syncs run by this replica."""
+    return get_engine().get_stats()
 
 
 @app.get("/openapi.json")
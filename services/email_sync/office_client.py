@@ -0,0 +1,119 @@
+"""
+Client for the Office service's internal message change feed.
+"""
+
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+import httpx
+
+from services.api.v1.office import EmailChangeList, EmailChangeListData
+from services.common.http_errors import ServiceError
+from services.common.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+
+class OfficeClient:
+    """Reads message changes from the Office service over one pooled client."""
+
+    def __init__(
+        self,
+        base_url: str,
+        api_key: str,
+        timeout: float = 30.0,
+        max_connections: int = 100,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ) -> None:
+        """
+        Initialize the client.
+
+        Args:
+            base_url: Office service base URL
+            api_key: API key with internal_access on the Office service
+            timeout: Seconds before a request times out
+            max_connections: Pooled connections kept to the Office service
+            transport: httpx transport (for tests)
+        """
+        self._client = httpx.AsyncClient(
+            base_url=base_url,
+            headers={"X-API-Key": api_key},
+            timeout=timeout,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+            ),
+            transport=transport,
+        )
+
+    async def get_changes(
+        self,
+        user_id: str,
+        provider: str,
+        cursor: Optional[str] = None,
+        since: Optional[datetime] = None,
+        page_token: Optional[str] = None,
+        folder_id: Optional[str] = None,
+        limit: int = 100,
+    ) -> EmailChangeListData:
+        """
+        Get one page of message changes.
+
+        Args:
+            user_id: User ID
+            provider: Provider to read changes from
+            cursor: Cursor of the last completed round, None to start anew
+            since: Without a cursor, only messages received after this
+            page_token: Token for the next page of the current round
+            folder_id: Outlook mail folder to read
+            limit: Maximum changes in the page
+
+        Returns:
+            The page of changes
+
+        Raises:
+            ServiceError: If the Office service fails the request
+        """
+        params: Dict[str, Any] = {
+            "user_id": user_id,
+            "provider": provider,
+            "limit": limit,
+        }
+        if cursor:
+            params["cursor"] = cursor
+        if since:
+            params["since"] = since.isoformat()
+        if page_token:
+            params["page_token"] = page_token
+        if folder_id:
+            params["folder_id"] = folder_id
+
+        try:
+            response = await self._client.get(
+                "/internal/messages/changes", params=params
+            )
+        except httpx.HTTPError as e:
+            raise ServiceError(
+                message=f"Office service request failed: {e}",
+                details={"user_id": user_id, "provider": provider},
+            )
+        if response.status_code != 200:
+            raise ServiceError(
+                message=(
+                    f"Office service returned status {response.status_code}: "
+                    f"{response.text}"
+                ),
+                details={"user_id": user_id, "provider": provider},
+            )
+
+        changes = EmailChangeList.model_validate_json(response.content)
+        if not changes.success or changes.data is None:
+            raise ServiceError(
+                message=f"Office service error: {changes.error}",
+                details={"user_id": user_id, "provider": provider},
+            )
+        return changes.data
+
+    async def close(self) -> None:
+        """Close the pooled connections."""
+        await self._client.aclose()
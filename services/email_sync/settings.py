@@ -0,0 +1,104 @@
+"""
+Configuration settings for the Email Sync service
+"""
+
+from typing import List, Optional
+
+from services.common.settings import (
+    AliasChoices,
+    BaseSettings,
+    Field,
+    SettingsConfigDict,
+)
+
+
+class Settings(BaseSettings):
+    """Email Sync service settings and configuration."""
+
+    model_config = SettingsConfigDict(
+        env_file=".env",
+        env_file_encoding="utf-8",
+        extra="ignore",
+        case_sensitive=False,
+    )
+
+    # Service configuration
+    SERVICE_NAME: str = Field(default="email-sync", description="Service name")
+
+    # API Keys for service communication
+    api_user_email_sync_key: str = Field(
+        ...,  # Required field - no default to prevent production mistakes
+        description="User service API key to access this Email Sync service",
+        validation_alias=AliasChoices("API_USER_EMAIL_SYNC_KEY"),
+    )
+
+    # Office service access
+    office_service_url: str = Field(
+        default="http://localhost:8003",
+        description="Office service base URL",
+        validation_alias=AliasChoices("OFFICE_SERVICE_URL"),
+    )
+    api_email_sync_office_key: str = Field(
+        ...,  # Required field - no default to prevent production mistakes
+        description="Email sync service API key to access the Office service",
+        validation_alias=AliasChoices("API_EMAIL_SYNC_OFFICE_KEY"),
+    )
+    office_timeout_seconds: float = Field(
+        default=30.0, description="Timeout of one change feed request"
+    )
+    office_max_connections: int = Field(
+        default=100, description="Pooled connections to the Office service"
+    )
+
+    # Cursor store
+    REDIS_URL: str = Field(
+        default="redis://localhost:6379", description="Redis connection URL"
+    )
+
+    # PubSub configuration
+    PUBSUB_PROJECT_ID: str = Field(
+        default="briefly-dev", description="Google Cloud Pub/Sub project ID"
+    )
+    PUBSUB_EMULATOR_HOST: Optional[str] = Field(
+        default="localhost:8085",
+        description="Pub/Sub emulator host for local development",
+    )
+    email_topic: str = Field(
+        default="emails", description="Topic EmailEvents are published to"
+    )
+
+    # Sync behaviour
+    sync_interval_seconds: float = Field(
+        default=300.0,
+        description="Seconds between syncs of every registered mailbox (0 disables)",
+    )
+    sync_concurrency: int = Field(
+        default=50, description="Mailboxes synced at the same time"
+    )
+    sync_page_size: int = Field(
+        default=100, description="Changes requested per change feed page"
+    )
+    sync_max_pages: int = Field(
+        default=50,
+        description="Pages read per mailbox and sync; the rest waits for the next",
+    )
+    recrawl_days: int = Field(
+        default=30,
+        description="Days of mail re-crawled when a mailbox has no valid cursor",
+    )
+    microsoft_sync_folders: List[str] = Field(
+        default_factory=lambda: ["inbox", "sentitems"],
+        description="Outlook mail folders synced (Graph delta is per folder)",
+    )
+
+
+# Global settings instance
+_settings: Settings | None = None
+
+
+def get_settings() -> Settings:
+    """Get the global settings instance, creating it if necessary."""
+    global _settings
+    if _settings is None:
+        _settings = Settings()  # type: ignore[call-arg]
+    return _settings
@@ -0,0 +1,408 @@
+"""
+Incremental email sync engine.
+
+Each registered mailbox is kept fresh from its provider's change feed (Gmail
+history, Graph delta) through the Office service, and every change is
+published as an EmailEvent. A sync reads only what changed since the stored
+cursor, so keeping many mailboxes fresh costs provider calls in proportion
+to their change volume rather than their size.
+
+A round is the walk of a feed from one cursor to the next. Its page token is
+checkpointed after each page has been published, and the new cursor is only
+stored once the last page is, so a crash never skips changes (it may publish
+some twice; consumers upsert). A mailbox without a cursor, or whose cursor
+has expired, gets a bounded re-crawl of its last ``recrawl_days`` of mail.
+
+Deletes are read from the feed but not published: consumers of the emails
+topic (the Vespa loader in particular) treat every event as an upsert, so a
+delete would overwrite the indexed email with an empty one.
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Sequence, Set
+
+from services.api.v1.office import EmailChange
+from services.common.events import EmailData, EmailEvent, EventMetadata
+from services.common.http_errors import ServiceError
+from services.common.logging_config import get_logger
+from services.common.pubsub_client import PubSubClient
+from services.email_sync.cursor_store import SyncCursorStore, SyncState, stream_name
+from services.email_sync.office_client import OfficeClient
+from services.email_sync.settings import Settings, get_settings
+
+logger = get_logger(__name__)
+
+SUPPORTED_PROVIDERS = ("google", "microsoft")
+
+
+@dataclass
+class StreamSyncResult:
+    """Outcome of syncing one stream."""
+
+    stream: str
+    changes: int = 0
+    pages: int = 0
+    recrawled: bool = False
+    # False when the page limit stopped the round before its last page
+    complete: bool = True
+
+
+def change_to_event(
+    change: EmailChange, user_id: str, provider: str, batch_id: str
+) -> EmailEvent:
+    """
+    Convert a created or updated message from the Office service into an EmailEvent.
+
+    Args:
+        change: Change from the message change feed
+        user_id: User the mailbox belongs to
+        provider: Provider the change came from
+        batch_id: ID of the sync round, used as batch and correlation ID
+
+    Returns:
+        EmailEvent ready to publish
+
+    Raises:
+        ValueError: If the change carries no message (deletes)
+    """
+    message = change.message
+    if message is None:
+        raise ValueError(
+            f"Change {change.operation} of {change.provider_message_id} has no message"
+        )
+
+    now = datetime.now(timezone.utc)
+    email_data = EmailData(
+        id=message.provider_message_id,
+        thread_id=message.thread_id or "",
+        subject=message.subject or "",
+        body=(
+            message.body_text_unquoted
+            or message.body_html_unquoted
+            or message.snippet
+            or ""
+        ),
+        from_address=message.from_address.email if message.from_address else "",
+        to_addresses=[addr.email for addr in message.to_addresses if addr.email],
+        cc_addresses=[addr.email for addr in message.cc_addresses if addr.email],
+        bcc_addresses=[addr.email for addr in message.bcc_addresses if addr.email],
+        received_date=message.date,
+        sent_date=None,  # Not available in EmailMessage
+        labels=message.labels,
+        is_read=message.is_read,
+        has_attachments=message.has_attachments,
+        provider=provider,
+        provider_message_id=message.provider_message_id,
+        size_bytes=None,  # Not available in EmailMessage
+        mime_type=None,  # Not available in EmailMessage
+    )
+
+    event = EmailEvent(
+        user_id=user_id,
+        email=email_data,
+        operation=change.operation,
+        batch_id=batch_id,
+        last_updated=now,
+        sync_timestamp=now,
+        provider=provider,
+        sync_type="sync",
+        metadata=EventMetadata(  # type: ignore[call-arg]
+            source_service="email-sync",
+            source_version="0.1.0",
+            user_id=user_id,
+            correlation_id=batch_id,
+        ),
+    )
+    event.add_correlation_id(batch_id)
+    return event
+
+
+class EmailSyncEngine:
+    """Keeps registered mailboxes in sync with their provider change feeds."""
+
+    def __init__(
+        self,
+        office: OfficeClient,
+        store: SyncCursorStore,
+        pubsub: PubSubClient,
+        settings: Optional[Settings] = None,
+    ) -> None:
+        """
+        Initialize the engine.
+
+        Args:
+            office: Client for the Office service change feed
+            store: Registry of mailboxes and their sync state
+            pubsub: Client used to publish EmailEvents
+            settings: Settings (defaults to the service settings)
+        """
+        self.office = office
+        self.store = store
+        self.pubsub = pubsub
+        self.settings = settings or get_settings()
+        # Syncs currently running, by user, so a user is never synced twice
+        # at the same time
+        self._running: Dict[str, "asyncio.Task[List[StreamSyncResult]]"] = {}
+        self._stats: Dict[str, Any] = {
+            "mailboxes_synced": 0,
+            "changes_published": 0,
+            "deletes_skipped": 0,
+            "recrawls": 0,
+            "failures": 0,
+            "last_run_started": None,
+            "last_run_seconds": None,
+        }
+
+    def streams(self, provider: str) -> List[Optional[str]]:
+        """Folders synced for a provider (None: the whole mailbox)"""
+        if provider == "microsoft":
+            return list(self.settings.microsoft_sync_folders)
+        return [None]
+
+    async def register(self, user_id: str, providers: Sequence[str]) -> None:
+        """
+        Start syncing a user's mailboxes.
+
+        Args:
+            user_id: User ID
+            providers: Providers to sync
+        """
+        unsupported = set(providers) - set(SUPPORTED_PROVIDERS)
+        if unsupported:
+            raise ValueError(f"Unsupported providers: {sorted(unsupported)}")
+        await self.store.register(user_id, providers)
+
+    async def unregister(self, user_id: str) -> None:
+        """
+        Stop syncing a user and drop their cursors.
+
+        Args:
+            user_id: User ID
+        """
+        streams = [
+            stream_name(provider, folder)
+            for provider in SUPPORTED_PROVIDERS
+            for folder in self.streams(provider)
+        ]
+        await self.store.unregister(user_id, streams)
+
+    async def sync_user(
+        self, user_id: str, providers: Optional[Sequence[str]] = None
+    ) -> List[StreamSyncResult]:
+        """
+        Sync every stream of a user's mailboxes.
+
+        A call made while the user is already being synced waits for that
+        sync instead of starting another one.
+
+        Args:
+            user_id: User ID
+            providers: Providers to sync (defaults to the registered ones)
+
+        Returns:
+            One result per stream synced
+        """
+        task = self._running.get(user_id)
+        if task is None:
+            task = asyncio.create_task(self._sync_user(user_id, providers))
+            self._running[user_id] = task
+            task.add_done_callback(lambda _: self._running.pop(user_id, None))
+        return await asyncio.shield(task)
+
+    async def _sync_user(
+        self, user_id: str, providers: Optional[Sequence[str]]
+    ) -> List[StreamSyncResult]:
+        if providers is None:
+            providers = await self.store.get_providers(user_id)
+        results = []
+        for provider in providers:
+            for folder in self.streams(provider):
+                results.append(await self.sync_stream(user_id, provider, folder))
+        self._stats["mailboxes_synced"] += 1
+        return results
+
+    async def sync_stream(
+        self, user_id: str, provider: str, folder_id: Optional[str] = None
+    ) -> StreamSyncResult:
+        """
+        Publish the changes of one stream since its stored cursor.
+
+        Args:
+            user_id: User ID
+            provider: Provider of the stream
+            folder_id: Mail folder of per-folder feeds
+
+        Returns:
+            What was synced
+
+        Raises:
+            ServiceError: If the feed cannot be read or events not published;
+                the stored state is left at the last published page
+        """
+        stream = stream_name(provider, folder_id)
+        result = StreamSyncResult(stream=stream)
+        state = await self.store.get_state(user_id, stream)
+        if state.cursor is None and state.page_token is None:
+            state = self._recrawl_state()
+            result.recrawled = True
+
+        batch_id = f"sync-{user_id}-{stream}-{int(time.time())}"
+        while True:
+            if result.pages >= self.settings.sync_max_pages:
+                result.complete = False
+                break
+
+            page = await self.office.get_changes(
+                user_id,
+                provider,
+                cursor=state.cursor,
+                since=state.since,
+                page_token=state.page_token,
+                folder_id=folder_id,
+                limit=self.settings.sync_page_size,
+            )
+            result.pages += 1
+
+            if page.cursor_expired:
+                if result.recrawled:
+                    raise ServiceError(
+                        message=f"Sync cursor of {stream} expired during a re-crawl",
+                        details={"user_id": user_id, "stream": stream},
+                    )
+                logger.info(
+                    f"Sync cursor of {stream} for user {user_id} expired, re-crawling"
+                )
+                state = self._recrawl_state()
+                result.recrawled = True
+                continue
+
+            await self._publish(user_id, provider, page.changes, batch_id)
+            result.changes += len(page.changes)
+
+            state.round_cursor = page.cursor or state.round_cursor
+            state.page_token = page.next_page_token
+            if state.page_token is None:
+                if state.round_cursor is None:
+                    logger.warning(
+                        f"Sync round of {stream} for user {user_id} ended without "
+                        "a cursor; the next sync re-crawls"
+                    )
+                state = SyncState(
+                    cursor=state.round_cursor, synced_at=datetime.now(timezone.utc)
+                )
+                await self.store.set_state(user_id, stream, state)
+                break
+            await self.store.set_state(user_id, stream, state)
+
+        self._stats["changes_published"] += result.changes
+        if result.recrawled:
+            self._stats["recrawls"] += 1
+        logger.info(
+            f"Synced {stream} for user {user_id}: {result.changes} changes in "
+            f"{result.pages} pages (recrawled={result.recrawled}, "
+            f"complete={result.complete})"
+        )
+        return result
+
+    def _recrawl_state(self) -> SyncState:
+        """State of a new round over the last recrawl_days of mail"""
+        since = datetime.now(timezone.utc) - timedelta(days=self.settings.recrawl_days)
+        return SyncState(since=since)
+
+    async def _publish(
+        self,
+        user_id: str,
+        provider: str,
+        changes: Sequence[EmailChange],
+        batch_id: str,
+    ) -> None:
+        """Publish changes, failing if any event could not be published"""
+        upserts = [change for change in changes if change.operation != "delete"]
+        self._stats["deletes_skipped"] += len(changes) - len(upserts)
+        if not upserts:
+            return
+        events = [
+            change_to_event(change, user_id, provider, batch_id) for change in upserts
+        ]
+        results = await self.pubsub.publish_email_events(
+            events, topic_name=self.settings.email_topic
+        )
+        failed = [result for result in results if not result.success]
+        if failed:
+            raise ServiceError(
+                message=(
+                    f"Failed to publish {len(failed)} of {len(events)} email events: "
+                    f"{failed[0].error}"
+                ),
+                details={"user_id": user_id, "provider": provider},
+            )
+
+    async def sync_all(self) -> Dict[str, int]:
+        """
+        Sync every registered mailbox with bounded concurrency.
+
+        Returns:
+            Counts of users synced and failed
+        """
+        started = time.monotonic()
+        self._stats["last_run_started"] = datetime.now(timezone.utc).isoformat()
+        semaphore = asyncio.Semaphore(max(self.settings.sync_concurrency, 1))
+        tasks: Set["asyncio.Task[bool]"] = set()
+        outcomes: List[bool] = []
+
+        async def sync_one(user_id: str, providers: List[str]) -> bool:
+            try:
+                await self.sync_user(user_id, providers)
+                return True
+            except Exception as e:
+                self._stats["failures"] += 1
+                logger.error(f"Email sync failed for user {user_id}: {e}")
+                return False
+            finally:
+                semaphore.release()
+
+        async for user_id, providers in self.store.users():
+            await semaphore.acquire()
+            task = asyncio.create_task(sync_one(user_id, providers))
+            tasks.add(task)
+            task.add_done_callback(lambda done: outcomes.append(done.result()))
+            task.add_done_callback(tasks.discard)
+        if tasks:
+            await asyncio.wait(tasks)
+
+        self._stats["last_run_seconds"] = round(time.monotonic() - started, 3)
+        summary = {
+            "synced": sum(outcomes),
+            "failed": len(outcomes) - sum(outcomes),
+        }
+        logger.info(f"Email sync run finished: {summary}")
+        return summary
+
+    async def run(self, interval_seconds: float) -> None:
+        """
+        Sync every registered mailbox, then wait out the interval, forever.
+
+        Args:
+            interval_seconds: Seconds from the start of one run to the next
+        """
+        while True:
+            started = time.monotonic()
+            try:
+                await self.sync_all()
+            except Exception as e:
+                logger.error(f"Email sync run failed: {e}")
+            await asyncio.sleep(
+                max(0.0, interval_seconds - (time.monotonic() - started))
+            )
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Counters of the syncs run by this replica.
+
+        Returns:
+            Mailboxes synced, changes published, re-crawls and failures
+        """
+        return {**self._stats, "running": len(self._running)}
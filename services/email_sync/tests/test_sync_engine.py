@@ -0,0 +1,330 @@
+"""
+Tests for the incremental email sync engine.
+"""
+
+import asyncio
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+from unittest.mock import AsyncMock
+
+import pytest
+
+from services.api.v1.office import (
+    EmailAddress,
+    EmailChange,
+    EmailChangeListData,
+    EmailMessage,
+    Provider,
+)
+from services.common.http_errors import ServiceError
+from services.common.pubsub_client import PublishResult
+from services.email_sync.cursor_store import SyncState, stream_name
+from services.email_sync.settings import Settings
+from services.email_sync.sync_engine import EmailSyncEngine, change_to_event
+
+
+@pytest.fixture(autouse=True)
+def patch_settings(monkeypatch):
+    """Patch the email sync settings with test values."""
+    test_settings = Settings(
+        api_user_email_sync_key="test-user-email-sync-key",
+        api_email_sync_office_key="test-email-sync-office-key",
+        sync_max_pages=5,
+        microsoft_sync_folders=["inbox"],
+    )
+    monkeypatch.setattr("services.email_sync.settings._settings", test_settings)
+    return test_settings
+
+
+def make_message(message_id: str) -> EmailMessage:
+    return EmailMessage(
+        id=f"gmail_{message_id}",
+        thread_id="gmail_thread",
+        subject=f"Subject {message_id}",
+        snippet="Snippet",
+        body_text="Body",
+        from_address=EmailAddress(email="sender@example.com"),
+        to_addresses=[EmailAddress(email="user@example.com")],
+        date=datetime(2025, 1, 1, tzinfo=timezone.utc),
+        provider=Provider.GOOGLE,
+        provider_message_id=message_id,
+        account_email="user@example.com",
+    )
+
+
+def make_page(
+    changes: List[Tuple[str, str]],
+    cursor: Optional[str] = None,
+    next_page_token: Optional[str] = None,
+    cursor_expired: bool = False,
+) -> EmailChangeListData:
+    return EmailChangeListData(
+        changes=[
+            EmailChange(
+                operation=operation,
+                message_id=f"gmail_{message_id}",
+                provider_message_id=message_id,
+                message=None if operation == "delete" else make_message(message_id),
+            )
+            for operation, message_id in changes
+        ],
+        provider="google",
+        cursor=cursor,
+        next_page_token=next_page_token,
+        cursor_expired=cursor_expired,
+        request_metadata={},
+    )
+
+
+class FakeOffice:
+    """Office client returning scripted pages and recording the requests."""
+
+    def __init__(self, pages: List[EmailChangeListData]) -> None:
+        self.pages = list(pages)
+        self.requests: List[Dict] = []
+
+    async def get_changes(self, user_id, provider, **kwargs) -> EmailChangeListData:
+        self.requests.append({"user_id": user_id, "provider": provider, **kwargs})
+        return self.pages.pop(0)
+
+
+class FakeStore:
+    """In-memory cursor store."""
+
+    def __init__(self) -> None:
+        self.providers: Dict[str, List[str]] = {}
+        self.states: Dict[Tuple[str, str], SyncState] = {}
+
+    async def register(self, user_id, providers) -> None:
+        self.providers[user_id] = list(providers)
+
+    async def unregister(self, user_id, streams) -> None:
+        self.providers.pop(user_id, None)
+        for stream in streams:
+            self.states.pop((user_id, stream), None)
+
+    async def get_providers(self, user_id) -> List[str]:
+        return self.providers.get(user_id, [])
+
+    async def users(self):
+        for user_id, providers in list(self.providers.items()):
+            yield user_id, providers
+
+    async def get_state(self, user_id, stream) -> SyncState:
+        return self.states.get((user_id, stream), SyncState()).model_copy()
+
+    async def set_state(self, user_id, stream, state) -> None:
+        self.states[(user_id, stream)] = state.model_copy()
+
+
+def make_pubsub(error: Optional[str] = None) -> AsyncMock:
+    pubsub = AsyncMock()
+    pubsub.publish_email_events = AsyncMock(
+        side_effect=lambda events, topic_name: [
+            PublishResult(message_id=None if error else "id", error=error)
+            for _ in events
+        ]
+    )
+    return pubsub
+
+
+def published(pubsub: AsyncMock) -> List[Tuple[str, str]]:
+    return [
+        (event.operation, event.email.provider_message_id)
+        for call in pubsub.publish_email_events.call_args_list
+        for event in call.args[0]
+    ]
+
+
+@pytest.mark.asyncio
+async def test_first_sync_recrawls_and_stores_cursor():
+    office = FakeOffice([make_page([("create", "m1"), ("create", "m2")], "100")])
+    store = FakeStore()
+    pubsub = make_pubsub()
+    engine = EmailSyncEngine(office, store, pubsub)
+
+    result = await engine.sync_stream("user-1", "google")
+
+    assert result.recrawled and result.complete
+    assert result.changes == 2
+    request = office.requests[0]
+    assert request["cursor"] is None
+    assert request["since"] is not None
+    assert published(pubsub) == [("create", "m1"), ("create", "m2")]
+    state = store.states[("user-1", "google")]
+    assert state.cursor == "100"
+    assert state.page_token is None and state.since is None
+
+
+@pytest.mark.asyncio
+async def test_incremental_sync_reads_from_cursor():
+    office = FakeOffice([make_page([("update", "m1"), ("delete", "m2")], "200")])
+    store = FakeStore()
+    store.states[("user-1", "google")] = SyncState(cursor="100")
+    pubsub = make_pubsub()
+    engine = EmailSyncEngine(office, store, pubsub)
+
+    result = await engine.sync_stream("user-1", "google")
+
+    assert not result.recrawled
+    assert office.requests[0]["cursor"] == "100"
+    assert office.requests[0]["since"] is None
+    assert published(pubsub) == [("update", "m1")]
+    assert engine.get_stats()["deletes_skipped"] == 1
+    assert store.states[("user-1", "google")].cursor == "200"
+
+
+@pytest.mark.asyncio
+async def test_cursor_is_kept_until_the_round_ends():
+    office = FakeOffice(
+        [
+            make_page([("create", "m1")], cursor="300", next_page_token="p2"),
+            make_page([("create", "m2")]),
+        ]
+    )
+    store = FakeStore()
+    store.states[("user-1", "google")] = SyncState(cursor="100")
+    engine = EmailSyncEngine(office, store, make_pubsub())
+
+    original = store.set_state
+    checkpoints: List[SyncState] = []
+
+    async def record(user_id, stream, state):
+        checkpoints.append(state.model_copy())
+        await original(user_id, stream, state)
+
+    store.set_state = record
+    await engine.sync_stream("user-1", "google")
+
+    # The checkpoint keeps the old cursor; the new one is stored at the end
+    assert checkpoints[0].cursor == "100"
+    assert checkpoints[0].page_token == "p2"
+    assert checkpoints[0].round_cursor == "300"
+    assert office.requests[1]["page_token"] == "p2"
+    assert store.states[("user-1", "google")].cursor == "300"
+
+
+@pytest.mark.asyncio
+async def test_expired_cursor_recrawls():
+    office = FakeOffice(
+        [make_page([], cursor_expired=True), make_page([("create", "m1")], "500")]
+    )
+    store = FakeStore()
+    store.states[("user-1", "google")] = SyncState(cursor="100")
+    pubsub = make_pubsub()
+    engine = EmailSyncEngine(office, store, pubsub)
+
+    result = await engine.sync_stream("user-1", "google")
+
+    assert result.recrawled
+    assert office.requests[1]["cursor"] is None
+    assert office.requests[1]["since"] is not None
+    assert store.states[("user-1", "google")].cursor == "500"
+    assert engine.get_stats()["recrawls"] == 1
+
+
+@pytest.mark.asyncio
+async def test_expired_cursor_during_recrawl_fails():
+    office = FakeOffice([make_page([], cursor_expired=True)])
+    store = FakeStore()
+    engine = EmailSyncEngine(office, store, make_pubsub())
+
+    with pytest.raises(ServiceError):
+        await engine.sync_stream("user-1", "google")
+
+
+@pytest.mark.asyncio
+async def test_publish_failure_keeps_state():
+    office = FakeOffice([make_page([("create", "m1")], "200")])
+    store = FakeStore()
+    store.states[("user-1", "google")] = SyncState(cursor="100")
+    engine = EmailSyncEngine(office, store, make_pubsub(error="unavailable"))
+
+    with pytest.raises(ServiceError):
+        await engine.sync_stream("user-1", "google")
+
+    assert store.states[("user-1", "google")].cursor == "100"
+
+
+@pytest.mark.asyncio
+async def test_page_limit_resumes_from_checkpoint(patch_settings):
+    patch_settings.sync_max_pages = 1
+    office = FakeOffice(
+        [
+            make_page([("create", "m1")], cursor="300", next_page_token="p2"),
+            make_page([("create", "m2")]),
+        ]
+    )
+    store = FakeStore()
+    store.states[("user-1", "google")] = SyncState(cursor="100")
+    engine = EmailSyncEngine(office, store, make_pubsub())
+
+    first = await engine.sync_stream("user-1", "google")
+    second = await engine.sync_stream("user-1", "google")
+
+    assert not first.complete and second.complete
+    assert office.requests[1]["cursor"] == "100"
+    assert office.requests[1]["page_token"] == "p2"
+    assert store.states[("user-1", "google")].cursor == "300"
+
+
+@pytest.mark.asyncio
+async def test_sync_all_syncs_every_stream_and_isolates_failures():
+    class Office(FakeOffice):
+        async def get_changes(self, user_id, provider, **kwargs):
+            self.requests.append({"user_id": user_id, "provider": provider, **kwargs})
+            if user_id == "broken":
+                raise ServiceError(message="Office service error")
+            return make_page([], cursor="1")
+
+    office = Office([])
+    store = FakeStore()
+    await store.register("user-1", ["google", "microsoft"])
+    await store.register("broken", ["google"])
+    engine = EmailSyncEngine(office, store, make_pubsub())
+
+    summary = await engine.sync_all()
+
+    assert summary == {"synced": 1, "failed": 1}
+    assert ("user-1", stream_name("microsoft", "inbox")) in store.states
+    assert ("user-1", "google") in store.states
+    assert engine.get_stats()["failures"] == 1
+
+
+@pytest.mark.asyncio
+async def test_concurrent_syncs_of_a_user_share_one_run():
+    gate = asyncio.Event()
+
+    class Office(FakeOffice):
+        async def get_changes(self, user_id, provider, **kwargs):
+            self.requests.append({"user_id": user_id, "provider": provider})
+            await gate.wait()
+            return make_page([], cursor="1")
+
+    office = Office([])
+    engine = EmailSyncEngine(office, FakeStore(), make_pubsub())
+
+    first = asyncio.create_task(engine.sync_user("user-1", ["google"]))
+    second = asyncio.create_task(engine.sync_user("user-1", ["google"]))
+    await asyncio.sleep(0)
+    gate.set()
+
+    assert await first == await second
+    assert len(office.requests) == 1
+
+
+@pytest.mark.asyncio
+async def test_register_rejects_unknown_provider():
+    engine = EmailSyncEngine(FakeOffice([]), FakeStore(), make_pubsub())
+
+    with pytest.raises(ValueError):
+        await engine.register("user-1", ["yahoo"])
+
+
+def test_change_to_event_rejects_delete():
+    change = EmailChange(
+        operation="delete", message_id="outlook_m1", provider_message_id="m1"
+    )
+
+    with pytest.raises(ValueError):
+        change_to_event(change, "user-1", "microsoft", "batch-1")
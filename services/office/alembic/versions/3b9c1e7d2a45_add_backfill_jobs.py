@@ -0,0 +1,62 @@
+"""Add backfill jobs
+
+Revision ID: 3b9c1e7d2a45
+Revises: f400e819f446
+Create Date: 2025-08-20 10:12:41.527093
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "3b9c1e7d2a45"
+down_revision = "f400e819f446"
+branch_labels = None
+depends_on = None
+
+ACTIVE_STATUSES = "status IN ('queued', 'running', 'paused')"
+
+
+def upgrade() -> None:
+    op.create_table(
+        "backfill_jobs",
+        sa.Column("job_id", sa.String(length=255), nullable=False),
+        sa.Column("user_id", sa.String(length=255), nullable=False),
+        sa.Column("provider", sa.String(length=20), nullable=False),
+        sa.Column("status", sa.String(length=20), nullable=False),
+        sa.Column("data", sa.JSON(), nullable=False),
+        sa.Column("lease_owner", sa.String(length=255), nullable=True),
+        sa.Column("lease_expires_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("attempts", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint("job_id"),
+    )
+    op.create_index(
+        "ix_backfill_jobs_user_id_created_at",
+        "backfill_jobs",
+        ["user_id", "created_at"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_backfill_jobs_status_lease",
+        "backfill_jobs",
+        ["status", "lease_expires_at"],
+        unique=False,
+    )
+    op.create_index(
+        "uq_backfill_jobs_active_user",
+        "backfill_jobs",
+        ["user_id"],
+        unique=True,
+        postgresql_where=sa.text(ACTIVE_STATUSES),
+        sqlite_where=sa.text(ACTIVE_STATUSES),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("uq_backfill_jobs_active_user", table_name="backfill_jobs")
+    op.drop_index("ix_backfill_jobs_status_lease", table_name="backfill_jobs")
+    op.drop_index("ix_backfill_jobs_user_id_created_at", table_name="backfill_jobs")
+    op.drop_table("backfill_jobs")
@@ -4,16 +4,24 @@ Backfill API endpoints for the office service
 """
 
 from datetime import datetime, timedelta, timezone
-from typing import Any, Dict, List, Optional
+from typing import Dict, List, Optional
 
-from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query
 
-from services.api.v1.office import EmailMessage
-from services.common.events import EmailData, EmailEvent, EventMetadata
 from services.common.logging_config import get_logger
-from services.common.pubsub_client import PubSubClient
+from services.common.pubsub_client import PubSubClient, create_batch_settings
 from services.office.core.auth import verify_backfill_api_key
+from services.office.core.backfill_pipeline import (
+    BackfillPipeline,
+    plan_backfill_shards,
+)
+from services.office.core.backfill_store import (
+    ActiveBackfillJobError,
+    backfill_job_store,
+)
+from services.office.core.backfill_worker import backfill_workers
 from services.office.core.email_crawler import EmailCrawler
+from services.office.core.http_pool import get_http_pool
 from services.office.core.settings import get_settings
 from services.office.models.backfill import (
     BackfillRequest,
@@ -64,9 +72,6 @@ def _parse_email_date(
 
 internal_router = APIRouter(prefix="/internal/backfill", tags=["internal-backfill"])
 
-# Global backfill job tracking
-active_backfill_jobs: Dict[str, BackfillStatus] = {}
-
 
 async def _resolve_email_to_user_id(email: str) -> Optional[str]:
     """Resolve email address to internal user ID using the user service"""
@@ -105,46 +110,42 @@ async def _resolve_email_to_user_id(email: str) -> Optional[str]:
         logger.info(f"Email resolution - Request headers: X-API-Key: {api_key[:10]}...")
 
         # Call user service to resolve email to user ID
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                request_url,
-                params=request_params,
-                headers=request_headers,
-                timeout=10.0,
-            )
+        client = get_http_pool().get_client(request_url)
+        response = await client.get(
+            request_url,
+            params=request_params,
+            headers=request_headers,
+            timeout=10.0,
+        )
 
-            # Log response details
-            logger.info(f"Email resolution - Response status: {response.status_code}")
-            logger.info(
-                f"Email resolution - Response headers: {dict(response.headers)}"
-            )
+        # Log response details
+        logger.info(f"Email resolution - Response status: {response.status_code}")
+        logger.info(f"Email resolution - Response headers: {dict(response.headers)}")
 
-            if response.status_code == 200:
-                try:
-                    data = response.json()
-                    logger.info(f"Email resolution - Response data: {data}")
-
-                    if data.get("exists"):
-                        user_id = data.get("user_id")
-                        logger.info(f"Resolved email {email} to user ID {user_id}")
-                        return str(user_id) if user_id is not None else None
-                    else:
-                        logger.warning(f"Email {email} not found in user service")
-                        return None
-                except Exception as json_error:
-                    logger.error(
-                        f"Email resolution - Failed to parse JSON response: {json_error}"
-                    )
-                    logger.error(
-                        f"Email resolution - Raw response text: {response.text}"
-                    )
+        if response.status_code == 200:
+            try:
+                data = response.json()
+                logger.info(f"Email resolution - Response data: {data}")
+
+                if data.get("exists"):
+                    user_id = data.get("user_id")
+                    logger.info(f"Resolved email {email} to user ID {user_id}")
+                    return str(user_id) if user_id is not None else None
+                else:
+                    logger.warning(f"Email {email} not found in user service")
                     return None
-            else:
+            except Exception as json_error:
                 logger.error(
-                    f"Failed to resolve email {email}: {response.status_code} - {response.text}"
+                    f"Email resolution - Failed to parse JSON response: {json_error}"
                 )
-                logger.error(f"Email resolution - Full response: {response}")
+                logger.error(f"Email resolution - Raw response text: {response.text}")
                 return None
+        else:
+            logger.error(
+                f"Failed to resolve email {email}: {response.status_code} - {response.text}"
+            )
+            logger.error(f"Email resolution - Full response: {response}")
+            return None
 
     except httpx.TimeoutException as e:
         logger.error(f"Email resolution - Timeout error for {email}: {e}")
@@ -163,11 +164,14 @@ async def _resolve_email_to_user_id(email: str) -> Optional[str]:
 @internal_router.post("/start", response_model=BackfillResponse)
 async def start_internal_backfill(
     request: BackfillRequest,
-    background_tasks: BackgroundTasks,
     user_id: str = Query(..., description="User email address"),
     api_key: str = Depends(verify_backfill_api_key),
 ) -> BackfillResponse:
-    """Internal endpoint for starting backfill jobs (service-to-service)"""
+    """Internal endpoint for starting backfill jobs (service-to-service)
+
+    The job is stored and queued; a backfill worker on any replica picks it
+    up, subject to the per-provider cap on running jobs.
+    """
     try:
         # Validate user_id format (basic email validation)
         if "@" not in user_id or "." not in user_id:
@@ -175,18 +179,6 @@ async def start_internal_backfill(
                 status_code=400, detail="Invalid email format for user_id"
             )
 
-        # Check if user already has an active backfill job
-        if user_id in active_backfill_jobs:
-            existing_job = active_backfill_jobs[user_id]
-            if existing_job.status in [
-                BackfillStatusEnum.RUNNING,
-                BackfillStatusEnum.PAUSED,
-            ]:
-                raise HTTPException(
-                    status_code=409,
-                    detail=f"User already has an active backfill job: {existing_job.job_id}",
-                )
-
         # Create new backfill job
         job_id = (
             f"backfill_{user_id}_{datetime.now(timezone.utc).strftime('%Y%m%d_%H%M%S')}"
@@ -195,7 +187,7 @@ async def start_internal_backfill(
         backfill_status = BackfillStatus(
             job_id=job_id,
             user_id=user_id,
-            status=BackfillStatusEnum.RUNNING,
+            status=BackfillStatusEnum.QUEUED,
             start_time=datetime.now(timezone.utc),
             end_time=None,
             pause_time=None,
@@ -205,16 +197,19 @@ async def start_internal_backfill(
             total_emails=0,
             processed_emails=0,
             failed_emails=0,
+            next_page_token=None,
             error_message=None,
         )
 
-        # Store job status
-        active_backfill_jobs[user_id] = backfill_status
+        # Store the job; one active job per user is enforced by the database
+        try:
+            await backfill_job_store.create(backfill_status)
+        except ActiveBackfillJobError as e:
+            raise HTTPException(status_code=409, detail=str(e))
 
-        # Start backfill job in background
-        background_tasks.add_task(run_backfill_job, job_id, user_id, request)
+        backfill_workers.notify()
 
-        logger.info(f"Started internal backfill job {job_id} for user {user_id}")
+        logger.info(f"Queued internal backfill job {job_id} for user {user_id}")
 
         return BackfillResponse(
             job_id=job_id,
@@ -228,8 +223,6 @@ async def start_internal_backfill(
         logger.error(f"Failed to start internal backfill job: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
-    # Function end
-
 
 @internal_router.get("/status/{job_id}", response_model=BackfillStatus)
 async def get_internal_backfill_status(
@@ -239,12 +232,7 @@ async def get_internal_backfill_status(
 ) -> BackfillStatus:
     """Internal endpoint for getting backfill job status"""
     try:
-        # Find job by ID and user_id
-        job = None
-        for active_job in active_backfill_jobs.values():
-            if active_job.job_id == job_id and active_job.user_id == user_id:
-                job = active_job
-                break
+        job = await backfill_job_store.get(job_id, user_id)
 
         if not job:
             raise HTTPException(status_code=404, detail="Backfill job not found")
@@ -263,14 +251,9 @@ async def list_internal_backfill_jobs(
     user_id: str = Query(..., description="User email address"),
     api_key: str = Depends(verify_backfill_api_key),
 ) -> List[BackfillStatus]:
-    """Internal endpoint for listing backfill jobs for a user"""
+    """Internal endpoint for listing backfill jobs for a user, newest first"""
     try:
-        # Filter jobs by user_id
-        user_jobs = [
-            job for job in active_backfill_jobs.values() if job.user_id == user_id
-        ]
-
-        return user_jobs
+        return await backfill_job_store.list_for_user(user_id)
 
     except Exception as e:
         logger.error(f"Failed to list internal backfill jobs: {e}")
@@ -285,29 +268,17 @@ async def cancel_internal_backfill_job(
 ) -> Dict[str, str]:
     """Internal endpoint for cancelling a backfill job"""
     try:
-        # Find job by ID and user_id
-        job = None
-        for active_job in active_backfill_jobs.values():
-            if active_job.job_id == job_id and active_job.user_id == user_id:
-                job = active_job
-                break
+        job = await backfill_job_store.get(job_id, user_id)
 
         if not job:
             raise HTTPException(status_code=404, detail="Backfill job not found")
 
-        if job.status in [
-            BackfillStatusEnum.COMPLETED,
-            BackfillStatusEnum.FAILED,
-            BackfillStatusEnum.CANCELLED,
-        ]:  # Use enum values
+        # The worker running the job stops at its next checkpoint
+        if not await backfill_job_store.cancel(job_id, user_id):
             raise HTTPException(
                 status_code=400, detail=f"Cannot cancel job with status: {job.status}"
             )
 
-        # Cancel the job
-        job.status = BackfillStatusEnum.CANCELLED  # Use enum value
-        job.end_time = datetime.now(timezone.utc)
-
         logger.info(f"Cancelled internal backfill job {job_id}")
 
         return {"message": f"Backfill job {job_id} cancelled successfully"}
@@ -320,13 +291,29 @@ async def cancel_internal_backfill_job(
 
 
 async def run_backfill_job(
-    job_id: str, user_id: str, request: BackfillRequest, resume_from: int = 0
+    job: BackfillStatus,
+    resume_from: Optional[str] = None,
 ) -> None:
-    """Run the backfill job in the background"""
+    """Run a backfill job claimed by a backfill worker
+
+    Progress and shard checkpoints are written to ``job``; the worker saves
+    them to the job store. A job that already has shards was interrupted
+    and resumes from their checkpoints.
+
+    Args:
+        job: Job to run
+        resume_from: Provider cursor to resume from, normally the job's
+            checkpointed ``next_page_token``. Only valid when a single shard
+            is left; sharded jobs resume from their per-shard checkpoints.
+    """
+    job_id = job.job_id
+    user_id = job.user_id
+    request = job.request
     try:
         # Update job status
-        job = active_backfill_jobs[user_id]
         job.status = BackfillStatusEnum.RUNNING  # Use enum value
+        if resume_from or job.shards:
+            job.resume_time = datetime.now(timezone.utc)
 
         # Resolve email to internal user ID for API calls
         logger.info(f"Backfill job {job_id} - Starting email resolution for: {user_id}")
@@ -340,16 +327,42 @@ async def run_backfill_job(
             f"Backfill job {job_id} - Successfully resolved email {user_id} to internal user ID: {internal_user_id}"
         )
 
-        # Initialize email crawler and pubsub client
+        # Split the request into folder/date-window shards. A job that already
+        # has shards is being resumed and keeps its own plan and checkpoints.
+        settings = get_settings()
+        if not job.shards:
+            job.shards = plan_backfill_shards(
+                request.folders,
+                request.start_date,
+                request.end_date,
+                window_days=settings.backfill_shard_window_days,
+                default_shard_count=settings.backfill_shard_count,
+            )
+        if resume_from:
+            unfinished = [shard for shard in job.shards if not shard.completed]
+            if len(unfinished) != 1:
+                raise ValueError(
+                    "resume_from requires a single unfinished shard; "
+                    "sharded jobs resume from their shard checkpoints"
+                )
+            unfinished[0].next_page_token = resume_from
+
+        pubsub_client = PubSubClient(
+            service_name="office-service",
+            batch_settings=create_batch_settings(
+                max_messages=settings.backfill_publish_batch_size,
+                max_bytes=settings.backfill_publish_max_bytes,
+                max_latency=settings.backfill_publish_max_latency,
+            ),
+        )
+
+        # Count emails for progress reporting
         email_crawler = EmailCrawler(
             internal_user_id,
             request.provider,
             user_id,
             max_email_count=request.max_emails or 10,
         )
-        pubsub_client = PubSubClient(service_name="office-service")
-
-        # Start crawling emails
         total_emails = await email_crawler.get_total_email_count()
         job.total_emails = total_emails
 
@@ -361,181 +374,34 @@ async def run_backfill_job(
                 "total_emails": total_emails,
                 "max_emails": request.max_emails,
                 "provider": request.provider,
+                "shards": len(job.shards),
             },
         )
 
-        # Process emails in batches
-        batch_size = request.batch_size or 100
-        processed_count = resume_from
-
-        async for email_batch in email_crawler.crawl_emails(
-            batch_size=batch_size,
-            start_date=request.start_date,
-            end_date=request.end_date,
-            folders=request.folders,
-            resume_from=resume_from,
-            max_emails=request.max_emails,
-        ):
-            # Convert email batch to EmailData objects and publish as individual EmailEvents
-            try:
-                # Convert normalized EmailMessage objects to EmailData objects and publish individually
-                for email in email_batch:
-                    try:
-                        # Debug logging to see what we're actually getting
-                        logger.debug(f"Processing email: type={type(email)}")
-
-                        # Check if email is a dict (from cache) and reconstruct EmailMessage if needed
-                        if isinstance(email, dict):
-                            logger.debug(
-                                f"Reconstructing EmailMessage from dict: {email.get('id', 'unknown')}"
-                            )
-                            from services.api.v1.office import EmailMessage
-
-                            try:
-                                email = EmailMessage(**email)
-                                logger.debug(
-                                    f"Successfully reconstructed EmailMessage: {email.id}"
-                                )
-                            except Exception as e:
-                                logger.error(f"Failed to reconstruct EmailMessage: {e}")
-                                continue
-
-                        if hasattr(email, "provider_message_id"):
-                            logger.debug(
-                                f"Email has provider_message_id: {email.provider_message_id}"
-                            )
-                        else:
-                            logger.error(
-                                f"Email missing provider_message_id attribute: {email}"
-                            )
-                            logger.error(
-                                f"Email type: {type(email)}, dir: {dir(email)}"
-                            )
-                            continue
-
-                        # email should now be a proper EmailMessage object, so we can access fields directly
-                        # Use the pre-split unquoted field (visible content only)
-                        # Prefer text over HTML for Vespa ingestion
-                        body_content = (
-                            email.body_text_unquoted
-                            or email.body_html_unquoted
-                            or email.snippet
-                            or ""
-                        )
-
-                        # Extract email addresses as strings
-                        from_address = (
-                            email.from_address.email if email.from_address else ""
-                        )
-                        to_addresses = [
-                            addr.email for addr in email.to_addresses if addr.email
-                        ]
-                        cc_addresses = [
-                            addr.email for addr in email.cc_addresses if addr.email
-                        ]
-                        bcc_addresses = [
-                            addr.email for addr in email.bcc_addresses if addr.email
-                        ]
-
-                        email_data = EmailData(
-                            id=email.provider_message_id,
-                            thread_id=email.thread_id or "",
-                            subject=email.subject or "",
-                            body=body_content,
-                            from_address=from_address,
-                            to_addresses=to_addresses,
-                            cc_addresses=cc_addresses,
-                            bcc_addresses=bcc_addresses,
-                            received_date=email.date,
-                            sent_date=None,  # Not available in EmailMessage
-                            labels=email.labels,
-                            is_read=email.is_read,
-                            is_starred=False,  # Not available in EmailMessage
-                            has_attachments=email.has_attachments,
-                            provider=request.provider,
-                            provider_message_id=email.provider_message_id,
-                            size_bytes=None,  # Not available in EmailMessage
-                            mime_type=None,  # Not available in EmailMessage
-                        )
-
-                        # Create and publish EmailEvent
-                        email_event = EmailEvent(
-                            user_id=internal_user_id,
-                            email=email_data,
-                            operation="create",  # Backfill creates new emails
-                            batch_id=job_id,  # Use job_id as batch_id for correlation
-                            last_updated=datetime.now(timezone.utc),
-                            sync_timestamp=datetime.now(timezone.utc),
-                            provider=request.provider,
-                            sync_type="backfill",
-                            metadata=EventMetadata(  # type: ignore[call-arg]
-                                source_service="office-service",
-                                source_version="1.0.0",
-                                user_id=internal_user_id,
-                                correlation_id=job_id,
-                            ),
-                        )
-
-                        # Add correlation ID for tracking
-                        email_event.add_correlation_id(job_id)
-
-                        # Publish the individual email event
-                        message_id = pubsub_client.publish_email_event(email_event)
-                        processed_count += 1
-                        job.processed_emails = processed_count
-
-                        # Update progress
-                        if request.max_emails:
-                            job.progress = min(
-                                100.0, (processed_count / request.max_emails) * 100
-                            )
-                        else:
-                            job.progress = min(
-                                100.0, (processed_count / total_emails) * 100
-                            )
-
-                        logger.debug(
-                            f"Published EmailEvent to PubSub",
-                            extra={
-                                "job_id": job_id,
-                                "email_id": email_data.id,
-                                "message_id": message_id,
-                                "processed_count": processed_count,
-                                "progress": job.progress,
-                            },
-                        )
-
-                    except Exception as e:
-                        logger.error(
-                            f"Failed to convert or publish email data: {e}",
-                            extra={"email_id": email.provider_message_id},
-                        )
-                        job.failed_emails += 1
-                        continue
-
-                logger.info(
-                    f"Published email batch to PubSub",
-                    extra={
-                        "job_id": job_id,
-                        "batch_size": len(email_batch),
-                        "processed_count": processed_count,
-                        "progress": job.progress,
-                    },
-                )
+        # Continue the counters of a resumed job
+        max_emails = request.max_emails
+        if max_emails:
+            max_emails = max(max_emails - job.processed_emails, 0)
 
-            except Exception as e:
-                logger.error(
-                    f"Failed to publish email batch: {e}", extra={"job_id": job_id}
-                )
-                job.failed_emails += len(email_batch)
+        pipeline = BackfillPipeline(
+            job,
+            internal_user_id,
+            user_id,
+            pubsub_client,
+            batch_size=request.batch_size or 100,
+            max_emails=max_emails,
+            total_emails=total_emails,
+        )
+        await pipeline.run()
+        processed_count = job.processed_emails
 
-            # Check if job was cancelled or paused
-            if job.status in [
-                BackfillStatusEnum.CANCELLED,
-                BackfillStatusEnum.PAUSED,
-            ]:  # Use enum values
-                logger.info(f"Backfill job {job_id} {job.status}")
-                return
+        # Check if job was cancelled or paused
+        if job.status in [
+            BackfillStatusEnum.CANCELLED,
+            BackfillStatusEnum.PAUSED,
+        ]:  # Use enum values
+            logger.info(f"Backfill job {job_id} {job.status}")
+            return
 
         # Mark job as completed
         job.status = BackfillStatusEnum.COMPLETED  # Use enum value
@@ -556,8 +422,6 @@ async def run_backfill_job(
 
     except Exception as e:
         logger.error(f"Backfill job {job_id} failed: {e}")
-        if user_id in active_backfill_jobs:
-            job = active_backfill_jobs[user_id]
-            job.status = BackfillStatusEnum.FAILED  # Use enum value
-            job.end_time = datetime.now(timezone.utc)
-            job.error_message = str(e)
+        job.status = BackfillStatusEnum.FAILED  # Use enum value
+        job.end_time = datetime.now(timezone.utc)
+        job.error_message = str(e)
@@ -29,13 +29,18 @@ from services.api.v1.office import (
 from services.common.http_errors import (
     AuthError,
     NotFoundError,
+    ProviderError,
     ServiceError,
     ValidationError,
 )
 from services.common.logging_config import get_logger, request_id_var
 from services.office.core.api_client_factory import APIClientFactory
 from services.office.core.auth import service_permission_required
-from services.office.core.cache_manager import cache_manager, generate_cache_key
+from services.office.core.cache_manager import (
+    cache_manager,
+    generate_cache_key,
+    generate_cache_tag,
+)
 from services.office.core.clients.google import GoogleAPIClient
 from services.office.core.clients.microsoft import MicrosoftAPIClient
 from services.office.core.normalizer import normalize_google_calendar_event
@@ -65,6 +70,22 @@ async def get_api_client_factory() -> APIClientFactory:
     return _api_client_factory
 
 
+async def _invalidate_events_cache(
+    user_id: str, event_id: Optional[str] = None
+) -> None:
+    """
+    Drop the cached event lists and availability of a user after a change.
+
+    Args:
+        user_id: User ID
+        event_id: Unified ID of the changed event, if it may be cached
+    """
+    tags = [generate_cache_tag(user_id, "events")]
+    if event_id:
+        tags.append(generate_cache_tag(user_id, "event", event_id))
+    await cache_manager.invalidate_tags(*tags)
+
+
 async def get_user_id_from_gateway(request: Request) -> str:
     """
     Extract user ID from gateway headers.
@@ -265,7 +286,12 @@ async def get_user_availability(
 
         # Cache the result for 5 minutes (availability changes frequently)
         if providers_used:  # Only cache if at least one provider succeeded
-            await cache_manager.set_to_cache(cache_key, response_data, ttl_seconds=300)
+            await cache_manager.set_to_cache(
+                cache_key,
+                response_data,
+                ttl_seconds=300,
+                tags=[generate_cache_tag(user_id, "events")],
+            )
         else:
             logger.info(
                 "Not caching response due to no successful providers",
@@ -534,7 +560,12 @@ async def get_calendar_events(
             providers_used and len(aggregated_events) > 0
         ):  # Only cache if at least one provider succeeded and we have events
             # Cache the result for 10 minutes (calendar data changes more frequently)
-            await cache_manager.set_to_cache(cache_key, response_data, ttl_seconds=600)
+            await cache_manager.set_to_cache(
+                cache_key,
+                response_data,
+                ttl_seconds=600,
+                tags=[generate_cache_tag(user_id, "events")],
+            )
             logger.debug(
                 f"Cached {len(aggregated_events)} events for user {user_id}",
                 request_id=request_id,
@@ -640,7 +671,12 @@ async def get_calendar_event(
         }
 
         # Cache the result for 30 minutes (events don't change very often)
-        await cache_manager.set_to_cache(cache_key, response_data, ttl_seconds=1800)
+        await cache_manager.set_to_cache(
+            cache_key,
+            response_data,
+            ttl_seconds=1800,
+            tags=[generate_cache_tag(user_id, "event", event_id)],
+        )
 
         # Calculate response time
         end_time = datetime.now(timezone.utc)
@@ -741,6 +777,7 @@ async def create_calendar_event(
                 created_event_data = await create_microsoft_event(
                     request_id, microsoft_client, event_data
                 )
+        await _invalidate_events_cache(user_id)
 
         # Build response using Pydantic model
         response_data = CalendarEventResponse(
@@ -841,6 +878,7 @@ async def update_calendar_event(
                 updated_event_data = convert_microsoft_event_to_google_format(
                     ms_updated_data
                 )
+        await _invalidate_events_cache(user_id, event_id)
 
         # Extract actual updated values from the provider response
         actual_title = (
@@ -1278,6 +1316,7 @@ async def delete_calendar_event(
                 await delete_microsoft_event(
                     request_id, microsoft_client, original_event_id
                 )
+        await _invalidate_events_cache(user_id, event_id)
 
         # Build response
         response_data = {
@@ -1464,15 +1503,36 @@ async def fetch_provider_events(
                 logger.debug(
                     f"Fetching Microsoft events with start_time={start_dt.isoformat()}, end_time={end_dt.isoformat()}"
                 )
-                events_response = await microsoft_client.get_events(
-                    calendar_id=None,  # Use primary calendar
-                    start_time=start_dt.isoformat(),
-                    end_time=end_dt.isoformat(),
-                    top=limit,
-                    skip=0,
-                    order_by="start/dateTime asc",
-                )
-                events = events_response.get("value", [])
+                if calendar_ids:
+                    # Query every requested calendar in as few $batch calls as possible
+                    calendar_results = await microsoft_client.get_events_batch(
+                        calendar_ids,
+                        start_time=start_dt.isoformat(),
+                        end_time=end_dt.isoformat(),
+                        top=limit,
+                        order_by="start/dateTime asc",
+                    )
+                    events = []
+                    for calendar_id, calendar_result in zip(
+                        calendar_ids, calendar_results
+                    ):
+                        if isinstance(calendar_result, ProviderError):
+                            logger.warning(
+                                "Failed to fetch from Microsoft calendar "
+                                f"{calendar_id}: {calendar_result.message}"
+                            )
+                            continue
+                        events.extend(calendar_result.get("value", []))
+                else:
+                    events_response = await microsoft_client.get_events(
+                        calendar_id=None,  # Use primary calendar
+                        start_time=start_dt.isoformat(),
+                        end_time=end_dt.isoformat(),
+                        top=limit,
+                        skip=0,
+                        order_by="start/dateTime asc",
+                    )
+                    events = events_response.get("value", [])
                 logger.debug(f"Microsoft API returned {len(events)} events")
 
                 # Normalize events
@@ -1503,6 +1563,8 @@ async def fetch_provider_events(
 
                     normalized_events.append(normalized_event)
 
+                normalized_events = normalized_events[:limit]
+
             else:
                 raise ValueError(f"Unsupported provider: {provider}")
 
@@ -18,7 +18,11 @@ from services.common.logging_config import get_logger, request_id_var
 from services.office.api.email import get_provider_enum, get_user_account_info
 from services.office.core.api_client_factory import APIClientFactory
 from services.office.core.auth import service_permission_required
-from services.office.core.cache_manager import cache_manager, generate_cache_key
+from services.office.core.cache_manager import (
+    cache_manager,
+    generate_cache_key,
+    generate_cache_tag,
+)
 from services.office.core.clients.google import GoogleAPIClient
 from services.office.core.clients.microsoft import MicrosoftAPIClient
 from services.office.core.normalizer import (
@@ -55,7 +59,7 @@ async def _invalidate_contacts_cache(user_id: str) -> None:
     """Invalidate contacts cache for a user with backwards compatibility.
 
     Older tests/modules may patch `cache_manager.invalidate_user_cache`.
-    Prefer that if present; otherwise fall back to `delete_pattern`.
+    Prefer that if present; otherwise drop the keys tagged as contacts.
     """
     # Back-compat: some tests patch this attribute as AsyncMock
     invalidate_attr = getattr(cache_manager, "invalidate_user_cache", None)
@@ -68,8 +72,7 @@ async def _invalidate_contacts_cache(user_id: str) -> None:
             pass
 
     # Default: delete contacts keys for this user
-    pattern = f"office:{user_id}:unified:contacts:*"
-    await cache_manager.delete_pattern(pattern)
+    await cache_manager.invalidate_tags(generate_cache_tag(user_id, "contacts"))
 
 
 async def get_user_id_from_gateway(request: Request) -> str:
@@ -328,7 +331,12 @@ async def list_contacts(
         }
 
         if providers_used:
-            await cache_manager.set_to_cache(cache_key, response_data, ttl_seconds=900)
+            await cache_manager.set_to_cache(
+                cache_key,
+                response_data,
+                ttl_seconds=900,
+                tags=[generate_cache_tag(user_id, "contacts")],
+            )
 
         return ContactList(
             success=True,
@@ -14,6 +14,9 @@ import httpx
 from fastapi import APIRouter, Depends, Path, Query, Request
 
 from services.api.v1.office import (
+    EmailChange,
+    EmailChangeList,
+    EmailChangeListData,
     EmailDraftCreateRequest,
     EmailDraftResponse,
     EmailDraftResult,
@@ -32,19 +35,31 @@ from services.api.v1.office import (
     SendEmailRequest,
     SendEmailResponse,
 )
-from services.common.http_errors import NotFoundError, ServiceError, ValidationError
+from services.common.http_errors import (
+    NotFoundError,
+    ProviderError,
+    ServiceError,
+    ValidationError,
+)
 from services.common.logging_config import get_logger, request_id_var
 from services.office.core.api_client_factory import APIClientFactory
 from services.office.core.auth import service_permission_required
 from services.office.core.cache_manager import (
+    CACHE_MISS,
     cache_manager,
     generate_cache_key,
+    generate_cache_tag,
     generate_message_thread_cache_key,
     generate_thread_cache_key,
     generate_threads_list_cache_key,
 )
 from services.office.core.clients.google import GoogleAPIClient
-from services.office.core.clients.microsoft import MicrosoftAPIClient
+from services.office.core.clients.microsoft import BatchResult, MicrosoftAPIClient
+from services.office.core.http_pool import get_http_pool
+from services.office.core.integration_directory import (
+    EMAIL_PROVIDERS,
+    integration_directory,
+)
 from services.office.core.normalizer import (
     normalize_google_email,
     normalize_google_thread,
@@ -102,18 +117,20 @@ async def get_api_client_factory() -> APIClientFactory:
     return _api_client_factory
 
 
-async def get_user_email_providers(user_id: str) -> List[str]:
+async def _fetch_user_email_providers(user_id: str) -> List[str]:
     """
-    Get list of available email providers for a user.
+    Fetch the active email providers for a user from the user service.
 
     Args:
         user_id: User identifier
 
     Returns:
         List of available provider names (e.g., ['google', 'microsoft'])
-    """
-    logger.info(f"Starting get_user_email_providers for user {user_id}")
 
+    Raises:
+        httpx.HTTPError: If the user service request fails
+        ValueError: If the response is not valid JSON
+    """
     settings = get_settings()
     url = f"{settings.USER_SERVICE_URL}/v1/internal/users/{user_id}/integrations"
     headers: Dict[str, str] = {}
@@ -127,88 +144,80 @@ async def get_user_email_providers(user_id: str) -> List[str]:
     if request_id and request_id != "uninitialized":
         headers["X-Request-Id"] = request_id
 
-    try:
-        async with httpx.AsyncClient() as client:
-            resp = await client.get(url, headers=headers)
-            resp.raise_for_status()
-            data = resp.json()
+    client = get_http_pool().get_client(url)
+    resp = await client.get(url, headers=headers, timeout=10.0)
+    resp.raise_for_status()
+    data = resp.json()
 
-            # Debug logging to see what's being returned
-            logger.info(f"User service response for {user_id}: {data}")
-            logger.info(
-                f"Response keys: {list(data.keys()) if isinstance(data, dict) else 'Not a dict'}"
-            )
+    # Extract active email providers
+    available_providers: List[str] = []
+    integrations = data.get("integrations", [])
+    logger.debug(f"Found {len(integrations)} integrations for user {user_id}")
 
-            # Extract active email providers
-            available_providers = []
-            integrations = data.get("integrations", [])
-            logger.info(f"Found {len(integrations)} integrations: {integrations}")
+    # Validate integration data structure
+    if not isinstance(integrations, list):
+        logger.error(
+            f"Expected integrations to be a list, got {type(integrations)}: {integrations}"
+        )
+        return []
 
-            # Validate integration data structure
-            if not isinstance(integrations, list):
-                logger.error(
-                    f"Expected integrations to be a list, got {type(integrations)}: {integrations}"
-                )
-                return []
+    for i, integration in enumerate(integrations):
+        try:
+            if not isinstance(integration, dict):
+                logger.error(f"Integration {i} is not a dict: {integration}")
+                continue
 
-            for i, integration in enumerate(integrations):
-                try:
-                    if not isinstance(integration, dict):
-                        logger.error(f"Integration {i} is not a dict: {integration}")
-                        continue
+            provider = integration.get("provider")
+            status = integration.get("status")
 
-                    provider = integration.get("provider")
-                    status = integration.get("status")
+            # Validate required fields
+            if provider is None:
+                logger.error(f"Integration {i} missing provider field: {integration}")
+                continue
+            if status is None:
+                logger.error(f"Integration {i} missing status field: {integration}")
+                continue
 
-                    logger.info(
-                        f"Processing integration {i}: provider='{provider}' (type: {type(provider)}), status='{status}' (type: {type(status)})"
-                    )
+            # Convert to lowercase strings for comparison
+            provider_str = str(provider).lower()
+            status_str = str(status).lower()
 
-                    # Validate required fields
-                    if provider is None:
-                        logger.error(
-                            f"Integration {i} missing provider field: {integration}"
-                        )
-                        continue
-                    if status is None:
-                        logger.error(
-                            f"Integration {i} missing status field: {integration}"
-                        )
-                        continue
+            # Only include active integrations for email providers
+            if status_str == "active" and provider_str in ["google", "microsoft"]:
+                available_providers.append(provider_str)
+            else:
+                logger.debug(
+                    f"Skipped integration {i}: provider='{provider_str}' with status '{status_str}' (not active or not email provider)"
+                )
 
-                    # Convert to lowercase strings for comparison
-                    provider_str = str(provider).lower()
-                    status_str = str(status).lower()
+        except Exception as integration_error:
+            logger.error(f"Error processing integration {i}: {integration_error}")
+            continue
 
-                    logger.info(
-                        f"Normalized integration {i}: provider='{provider_str}', status='{status_str}'"
-                    )
+    logger.info(f"Available providers for {user_id}: {available_providers}")
+    return available_providers
 
-                    # Only include active integrations for email providers
-                    if status_str == "active" and provider_str in [
-                        "google",
-                        "microsoft",
-                    ]:
-                        available_providers.append(provider_str)
-                        logger.info(
-                            f"Added provider '{provider_str}' to available providers"
-                        )
-                    else:
-                        logger.info(
-                            f"Skipped integration {i}: provider='{provider_str}' with status '{status_str}' (not active or not email provider)"
-                        )
 
-                except Exception as integration_error:
-                    logger.error(
-                        f"Error processing integration {i}: {integration_error}"
-                    )
-                    logger.error(f"Integration data: {integration}")
-                    continue
+async def get_user_email_providers(user_id: str) -> List[str]:
+    """
+    Get list of available email providers for a user.
 
-            logger.info(
-                f"Final available providers for {user_id}: {available_providers}"
-            )
-            return available_providers
+    Answers come from the integration directory cache, so the user service is
+    asked at most once per user per cache TTL. Failed lookups are not cached.
+
+    Args:
+        user_id: User identifier
+
+    Returns:
+        List of available provider names (e.g., ['google', 'microsoft'])
+    """
+    try:
+        providers = await integration_directory.get(
+            user_id,
+            EMAIL_PROVIDERS,
+            lambda: _fetch_user_email_providers(user_id),
+        )
+        return list(providers)
 
     except httpx.HTTPStatusError as http_error:
         logger.error(
@@ -231,9 +240,6 @@ async def get_user_email_providers(user_id: str) -> List[str]:
         return []
     except ValueError as json_error:
         logger.error(f"JSON parsing error for user {user_id}: {json_error}")
-        logger.error(
-            f"Response text: {resp.text if 'resp' in locals() else 'No response'}"
-        )
         return []
     except Exception as e:
         logger.error(f"Unexpected error fetching user integrations for {user_id}: {e}")
@@ -244,6 +250,32 @@ async def get_user_email_providers(user_id: str) -> List[str]:
         return []
 
 
+def _mail_list_tags(user_id: str) -> List[str]:
+    """Tags of a user's cached message, thread and folder lists"""
+    return [
+        generate_cache_tag(user_id, resource)
+        for resource in ("messages", "threads", "folders")
+    ]
+
+
+async def _invalidate_mail_cache(
+    user_id: str, provider: str, thread_id: Optional[str] = None
+) -> None:
+    """
+    Drop the cached mail lists of a user after a mailbox change.
+
+    Args:
+        user_id: User ID
+        provider: Provider the change was made in
+        thread_id: Provider thread ID of the changed thread, if known
+    """
+    tags = _mail_list_tags(user_id)
+    if thread_id:
+        prefix = "gmail" if provider == "google" else "outlook"
+        tags.append(generate_cache_tag(user_id, "thread", f"{prefix}_{thread_id}"))
+    await cache_manager.invalidate_tags(*tags)
+
+
 async def get_user_id_from_gateway(request: Request) -> str:
     """
     Extract user ID from gateway headers.
@@ -378,138 +410,111 @@ async def get_email_messages(
             "folder_id": folder_id or "",
             "q": q or "",
             "page_token": page_token or "",
-            "no_cache": no_cache,
         }
         cache_key = generate_cache_key(user_id, "unified", "messages", cache_params)
 
-        # Check cache first
-        cached_result = await cache_manager.get_from_cache(cache_key)
-        if cached_result and not no_cache:
-            logger.info("Cache hit for email messages")
-            # Ensure cached data has required request_metadata field
-            if "request_metadata" not in cached_result:
-                cached_result["request_metadata"] = {
-                    "user_id": user_id,
-                    "providers_requested": valid_providers,
-                    "limit": limit,
-                    "include_body": include_body,
-                }
-            # Convert cached dicts to models for typed response
-            try:
-                cached_messages = cached_result.get("messages", [])
-                messages_models = [
-                    (m if isinstance(m, EmailMessage) else EmailMessage(**m))
-                    for m in cached_messages
-                ]
-                data_obj = EmailMessageListData(
-                    messages=messages_models,
-                    total_count=cached_result.get("total_count", len(messages_models)),
-                    providers_used=cached_result.get("providers_used", []),
-                    provider_errors=cached_result.get("provider_errors"),
-                    has_more=cached_result.get("has_more", False),
-                    request_metadata=cached_result.get("request_metadata", {}),
+        async def fetch_messages() -> EmailMessageListData:
+            # Fetch from providers in parallel
+            tasks = []
+            for provider_name in valid_providers:
+                logger.info(
+                    f"[{request_id}] Creating task for provider: {provider_name}"
                 )
-            except Exception:
-                # Fallback to minimal empty response if cache format unexpected
-                data_obj = EmailMessageListData(
-                    messages=[],
-                    total_count=0,
-                    providers_used=cached_result.get("providers_used", []),
-                    provider_errors=cached_result.get("provider_errors"),
-                    has_more=False,
-                    request_metadata=cached_result.get("request_metadata", {}),
+                task = fetch_provider_emails(
+                    request_id,
+                    user_id,
+                    provider_name,
+                    limit,
+                    include_body,
+                    labels,
+                    folder_id,
+                    q,
+                    page_token,
                 )
-            return EmailMessageList(
-                success=True, data=data_obj, cache_hit=True, request_id=request_id
-            )
+                tasks.append(task)
 
-        # Fetch from providers in parallel
-        tasks = []
-        for provider_name in valid_providers:
-            logger.info(f"[{request_id}] Creating task for provider: {provider_name}")
-            task = fetch_provider_emails(
-                request_id,
-                user_id,
-                provider_name,
-                limit,
-                include_body,
-                labels,
-                folder_id,
-                q,
-                page_token,
+            logger.info(
+                f"[{request_id}] Created {len(tasks)} tasks, executing with asyncio.gather"
             )
-            tasks.append(task)
 
-        logger.info(
-            f"[{request_id}] Created {len(tasks)} tasks, executing with asyncio.gather"
-        )
+            # Execute parallel requests
+            provider_results = await asyncio.gather(*tasks, return_exceptions=True)
 
-        # Execute parallel requests
-        provider_results = await asyncio.gather(*tasks, return_exceptions=True)
+            # Process results
+            aggregated_messages: List[EmailMessage] = []
+            provider_errors = {}
+            providers_used = []
 
-        # Process results
-        aggregated_messages: List[EmailMessage] = []
-        provider_errors = {}
-        providers_used = []
-
-        for i, result in enumerate(provider_results):
-            provider_name = valid_providers[i]
+            for i, result in enumerate(provider_results):
+                provider_name = valid_providers[i]
 
-            if isinstance(result, Exception):
-                logger.error(f"Provider {provider_name} failed: {result}")
-                provider_errors[provider_name] = str(result)
-            elif result is not None and not isinstance(result, BaseException):
-                try:
-                    # Type narrowing: result should be tuple[List[EmailMessage], str]
-                    messages, provider_name = result
-                    aggregated_messages.extend(messages)
-                    providers_used.append(provider_name)
-                    logger.info(
-                        f"Provider {provider_name} returned {len(messages)} messages"
-                    )
-                except (TypeError, ValueError) as e:
-                    logger.error(f"Invalid result format from {provider_name}: {e}")
-                    provider_errors[provider_name] = f"Invalid result format: {e}"
+                if isinstance(result, Exception):
+                    logger.error(f"Provider {provider_name} failed: {result}")
+                    provider_errors[provider_name] = str(result)
+                elif result is not None and not isinstance(result, BaseException):
+                    try:
+                        # Type narrowing: result should be tuple[List[EmailMessage], str]
+                        messages, provider_name = result
+                        aggregated_messages.extend(messages)
+                        providers_used.append(provider_name)
+                        logger.info(
+                            f"Provider {provider_name} returned {len(messages)} messages"
+                        )
+                    except (TypeError, ValueError) as e:
+                        logger.error(f"Invalid result format from {provider_name}: {e}")
+                        provider_errors[provider_name] = f"Invalid result format: {e}"
 
-        # Sort messages by date (newest first)
-        aggregated_messages.sort(key=lambda msg: msg.date, reverse=True)
+            # Sort messages by date (newest first)
+            aggregated_messages.sort(key=lambda msg: msg.date, reverse=True)
 
-        # Apply global limit if we have results from multiple providers
-        if len(providers_used) > 1:
-            aggregated_messages = aggregated_messages[: limit * 2]  # Allow some overlap
+            # Apply global limit if we have results from multiple providers
+            # (allowing some overlap)
+            if len(providers_used) > 1:
+                aggregated_messages = aggregated_messages[: limit * 2]
 
-        # Build response (models for response, dicts for cache)
-        response_data = {
-            "messages": aggregated_messages,
-            "total_count": len(aggregated_messages),
-            "providers_used": providers_used,
-            "provider_errors": provider_errors if provider_errors else None,
-            "has_more": len(aggregated_messages) >= limit,  # Simple heuristic
-            "request_metadata": {
-                "user_id": user_id,
-                "providers_requested": valid_providers,
-                "limit": limit,
-                "include_body": include_body,
-            },
-        }
+            if not providers_used:
+                logger.info(
+                    "Not caching response due to no successful providers",
+                    extra={
+                        "providers_used": providers_used,
+                        "provider_errors": provider_errors,
+                    },
+                )
 
-        # Only cache if we have successful results from at least one provider
-        if providers_used:  # Only cache if at least one provider succeeded
-            # Cache the result for 15 minutes
-            cache_data = {
-                **response_data,
-                "messages": [msg.model_dump() for msg in aggregated_messages],
-            }
-            await cache_manager.set_to_cache(cache_key, cache_data, ttl_seconds=900)
-        else:
-            logger.info(
-                "Not caching response due to no successful providers",
-                extra={
-                    "providers_used": providers_used,
-                    "provider_errors": provider_errors,
+            return EmailMessageListData(
+                messages=aggregated_messages,
+                total_count=len(aggregated_messages),
+                providers_used=providers_used,
+                provider_errors=provider_errors if provider_errors else None,
+                has_more=len(aggregated_messages) >= limit,  # Simple heuristic
+                request_metadata={
+                    "user_id": user_id,
+                    "providers_requested": valid_providers,
+                    "limit": limit,
+                    "include_body": include_body,
                 },
             )
 
+        # Serve from cache (stale entries are refreshed in the background);
+        # only cache if at least one provider succeeded
+        data_obj, cache_status = await cache_manager.get_or_compute(
+            cache_key,
+            fetch_messages,
+            ttl_seconds=900,
+            namespace="unified:messages",
+            force_refresh=no_cache,
+            should_cache=lambda data: bool(data.providers_used),
+            model=EmailMessageListData,
+            tags=_mail_list_tags(user_id),
+        )
+        if cache_status != CACHE_MISS:
+            logger.info(f"Cache {cache_status} for email messages")
+            return EmailMessageList(
+                success=True, data=data_obj, cache_hit=True, request_id=request_id
+            )
+
+        providers_used = data_obj.providers_used
+
         # Calculate response time
         end_time = datetime.now(timezone.utc)
         response_time_ms = int((end_time - start_time).total_seconds() * 1000)
@@ -518,19 +523,7 @@ async def get_email_messages(
 
         return EmailMessageList(
             success=True,
-            data=EmailMessageListData(
-                messages=aggregated_messages,
-                total_count=len(aggregated_messages),
-                providers_used=providers_used,
-                provider_errors=provider_errors if provider_errors else None,
-                has_more=len(aggregated_messages) >= limit,
-                request_metadata={
-                    "user_id": user_id,
-                    "providers_requested": valid_providers,
-                    "limit": limit,
-                    "include_body": include_body,
-                },
-            ),
+            data=data_obj,
             cache_hit=False,
             provider_used=(
                 Provider(providers_used[0]) if len(providers_used) == 1 else None
@@ -700,7 +693,7 @@ async def get_email_folders(
 
         # Cache the result
         await cache_manager.set_to_cache(
-            cache_key, cache_data, ttl_seconds=3600
+            cache_key, cache_data, ttl_seconds=3600, tags=_mail_list_tags(user_id)
         )  # 1 hour
 
         end_time = datetime.now(timezone.utc)
@@ -808,7 +801,12 @@ async def get_email_message(
             **response_data,
             "messages": [message.model_dump()],
         }
-        await cache_manager.set_to_cache(cache_key, cache_payload, ttl_seconds=3600)
+        await cache_manager.set_to_cache(
+            cache_key,
+            cache_payload,
+            ttl_seconds=3600,
+            tags=[generate_cache_tag(user_id, "message", message_id)],
+        )
 
         # Calculate response time
         end_time = datetime.now(timezone.utc)
@@ -933,6 +931,7 @@ async def send_email(
             + len(email_data.bcc or []),
             has_attachments=False,  # TODO: Implement attachment detection
         )
+        await _invalidate_mail_cache(user_id, provider, email_send_result.thread_id)
 
         return SendEmailResponse(
             success=True,
@@ -1004,7 +1003,7 @@ async def get_email_threads(
                 message=f"Invalid providers: {invalid_providers}. Valid providers: {valid_providers}"
             )
 
-        # Check cache first
+        # Build cache key
         cache_key = generate_threads_list_cache_key(
             user_id=user_id,
             providers=providers,
@@ -1016,107 +1015,41 @@ async def get_email_threads(
             page_token=page_token,
         )
 
-        if not no_cache:
-            cached_result = await cache_manager.get_from_cache(cache_key)
-            if cached_result:
-                logger.info(f"Cache hit for email threads request {request_id}")
+        async def fetch_threads() -> EmailThreadListData:
+            # Fetch threads from each provider
+            all_threads = []
+            provider_errors = {}
+            providers_used = []
+
+            for provider in providers:
                 try:
-                    cached_threads = cached_result.get("threads", [])
-                    threads_models = [
-                        (t if isinstance(t, EmailThread) else EmailThread(**t))
-                        for t in cached_threads
-                    ]
-                    data_obj = EmailThreadListData(
-                        threads=threads_models,
-                        total_count=cached_result.get(
-                            "total_count", len(threads_models)
-                        ),
-                        providers_used=cached_result.get("providers_used", []),
-                        provider_errors=cached_result.get("provider_errors"),
-                        has_more=cached_result.get("has_more", False),
-                        request_metadata=cached_result.get("request_metadata", {}),
+                    threads, provider_used = await fetch_provider_threads(
+                        request_id,
+                        user_id,
+                        provider,
+                        limit,
+                        include_body,
+                        labels,
+                        folder_id,
+                        q,
+                        page_token,
                     )
-                except Exception:
-                    data_obj = EmailThreadListData(
-                        threads=[],
-                        total_count=0,
-                        providers_used=cached_result.get("providers_used", []),
-                        provider_errors=cached_result.get("provider_errors"),
-                        has_more=False,
-                        request_metadata=cached_result.get("request_metadata", {}),
-                    )
-
-                return EmailThreadList(
-                    success=True,
-                    data=data_obj,
-                    cache_hit=True,
-                    request_id=request_id,
-                )
-
-        # Fetch threads from each provider
-        all_threads = []
-        provider_errors = {}
-        providers_used = []
-        primary_provider = None
+                    all_threads.extend(threads)
+                    providers_used.append(provider_used)
 
-        for provider in providers:
-            try:
-                threads, provider_used = await fetch_provider_threads(
-                    request_id,
-                    user_id,
-                    provider,
-                    limit,
-                    include_body,
-                    labels,
-                    folder_id,
-                    q,
-                    page_token,
-                )
-                all_threads.extend(threads)
-                providers_used.append(provider_used)
-                if not primary_provider:
-                    primary_provider = provider_used
-
-            except Exception as e:
-                logger.error(f"Failed to fetch threads from {provider}: {e}")
-                provider_errors[provider] = str(e)
-
-        # Sort threads by last message date
-        all_threads.sort(key=lambda t: t.last_message_date, reverse=True)
-
-        # Prepare response data
-        response_data = {
-            "threads": all_threads,
-            "total_count": len(all_threads),
-            "providers_used": providers_used,
-            "provider_errors": provider_errors if provider_errors else None,
-            "has_more": len(all_threads) >= limit,  # Simple heuristic for pagination
-            "request_metadata": {
-                "request_id": request_id,
-                "timestamp": datetime.now(timezone.utc).isoformat(),
-                "providers_requested": providers,
-                "limit": limit,
-                "include_body": include_body,
-                "labels": labels,
-                "folder_id": folder_id,
-                "query": q,
-                "page_token": page_token,
-            },
-        }
+                except Exception as e:
+                    logger.error(f"Failed to fetch threads from {provider}: {e}")
+                    provider_errors[provider] = str(e)
 
-        # Cache the result
-        if not no_cache:
-            await cache_manager.set_to_cache(
-                cache_key, response_data, ttl_seconds=300
-            )  # 5 minutes
+            # Sort threads by last message date
+            all_threads.sort(key=lambda t: t.last_message_date, reverse=True)
 
-        return EmailThreadList(
-            success=True,
-            data=EmailThreadListData(
+            return EmailThreadListData(
                 threads=all_threads,
                 total_count=len(all_threads),
                 providers_used=providers_used,
                 provider_errors=provider_errors if provider_errors else None,
+                # Simple heuristic for pagination
                 has_more=len(all_threads) >= limit,
                 request_metadata={
                     "request_id": request_id,
@@ -1129,9 +1062,35 @@ async def get_email_threads(
                     "query": q,
                     "page_token": page_token,
                 },
-            ),
+            )
+
+        # Serve from cache for 5 minutes (stale entries are refreshed in the
+        # background); failures of every provider are not cached
+        data_obj, cache_status = await cache_manager.get_or_compute(
+            cache_key,
+            fetch_threads,
+            ttl_seconds=300,
+            namespace="unified:threads",
+            force_refresh=no_cache,
+            should_cache=lambda data: bool(data.providers_used),
+            model=EmailThreadListData,
+            tags=_mail_list_tags(user_id),
+        )
+        if cache_status != CACHE_MISS:
+            logger.info(f"Cache {cache_status} for email threads request {request_id}")
+            return EmailThreadList(
+                success=True,
+                data=data_obj,
+                cache_hit=True,
+                request_id=request_id,
+            )
+
+        providers_used = data_obj.providers_used
+        return EmailThreadList(
+            success=True,
+            data=data_obj,
             provider_used=(
-                get_provider_enum(primary_provider) if primary_provider else None
+                get_provider_enum(providers_used[0]) if providers_used else None
             ),
             request_id=request_id,
         )
@@ -1248,7 +1207,10 @@ async def get_email_thread(
         # Cache the result
         if not no_cache:
             await cache_manager.set_to_cache(
-                cache_key, response_data, ttl_seconds=600
+                cache_key,
+                response_data,
+                ttl_seconds=600,
+                tags=[generate_cache_tag(user_id, "thread", thread_id)],
             )  # 10 minutes
 
         return EmailThreadList(
@@ -1357,7 +1319,13 @@ async def get_message_thread(
         # Cache the result
         if not no_cache:
             await cache_manager.set_to_cache(
-                cache_key, response_data, ttl_seconds=600
+                cache_key,
+                response_data,
+                ttl_seconds=600,
+                tags=[
+                    generate_cache_tag(user_id, "message", message_id),
+                    generate_cache_tag(user_id, "thread", thread.id),
+                ],
             )  # 10 minutes
 
         return EmailThreadList(
@@ -1627,17 +1595,14 @@ async def fetch_provider_emails(
                     )
                 messages = messages_response.get("messages", [])
 
+                # Fetch full messages if we only got summaries, in batches
+                messages = await _hydrate_gmail_messages(
+                    google_client, messages, "full", refetch=include_body
+                )
+
                 # Normalize messages
                 normalized_messages = []
-                for msg_summary in messages:
-                    # Fetch full message if we only got summaries
-                    if include_body or "payload" not in msg_summary:
-                        full_message = await google_client.get_message(
-                            msg_summary["id"]
-                        )
-                    else:
-                        full_message = msg_summary
-
+                for full_message in messages:
                     # Get user account info (simplified - in real implementation would cache this)
                     # Handle case where user_id is already an email address
                     if "@" in user_id:
@@ -2027,6 +1992,80 @@ def parse_message_id(message_id: str) -> tuple[str, str]:
         )
 
 
+def _build_gmail_date_query(
+    q: Optional[str],
+    received_after: Optional[datetime],
+    received_before: Optional[datetime],
+) -> Optional[str]:
+    """
+    Append a received-date window to a Gmail search query.
+
+    Gmail's ``after:``/``before:`` operators accept epoch seconds, which keeps
+    the window exact instead of rounding to whole days.
+    """
+    query_parts = [q] if q else []
+    if received_after:
+        query_parts.append(f"after:{int(_as_utc(received_after).timestamp())}")
+    if received_before:
+        query_parts.append(f"before:{int(_as_utc(received_before).timestamp())}")
+    return " ".join(query_parts) or None
+
+
+def _build_graph_date_filter(
+    received_after: Optional[datetime], received_before: Optional[datetime]
+) -> Optional[str]:
+    """Build a Microsoft Graph $filter clause for a received-date window."""
+    clauses = []
+    if received_after:
+        clauses.append(
+            f"receivedDateTime ge {_as_utc(received_after).strftime('%Y-%m-%dT%H:%M:%SZ')}"
+        )
+    if received_before:
+        clauses.append(
+            f"receivedDateTime lt {_as_utc(received_before).strftime('%Y-%m-%dT%H:%M:%SZ')}"
+        )
+    return " and ".join(clauses) or None
+
+
+def _as_utc(value: datetime) -> datetime:
+    """Treat naive datetimes as UTC."""
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+async def _hydrate_gmail_messages(
+    client: GoogleAPIClient,
+    summaries: List[Dict[str, Any]],
+    format: str,
+    refetch: bool = False,
+) -> List[Dict[str, Any]]:
+    """
+    Replace Gmail list summaries with full messages fetched in batches.
+
+    Only summaries without a payload are fetched unless ``refetch`` is set.
+    Messages that could not be fetched are logged and dropped, so one bad
+    message does not fail the whole page.
+    """
+    ids = [
+        summary["id"] for summary in summaries if refetch or "payload" not in summary
+    ]
+    if not ids:
+        return summaries
+
+    fetched = dict(zip(ids, await client.get_messages_batch(ids, format=format)))
+    hydrated = []
+    for summary in summaries:
+        message = fetched.get(summary["id"], summary)
+        if isinstance(message, ProviderError):
+            logger.warning(
+                f"Failed to fetch Gmail message {summary['id']}: {message.message}"
+            )
+            continue
+        hydrated.append(message)
+    return hydrated
+
+
 def get_user_account_info(user_id: str, provider: str) -> tuple[str, str]:
     """
     Get standardized user account info for a provider.
@@ -2162,25 +2201,39 @@ async def fetch_provider_threads(
                 # Get user account info
                 account_email, account_name = get_user_account_info(user_id, provider)
 
+                # Get messages for all threads in one batch
+                thread_ids = [
+                    thread_data["id"]
+                    for thread_data in threads_data.get("threads", [])
+                    if thread_data.get("id")
+                ]
+                thread_results = (
+                    await google_client.get_threads_batch(thread_ids)
+                    if thread_ids
+                    else []
+                )
+
                 # Convert Gmail threads to unified format
                 threads = []
-                for thread_data in threads_data.get("threads", []):
-                    thread_id = thread_data.get("id")
-                    if thread_id:
-                        # Get messages for this thread
-                        thread_messages = await google_client.get_thread(thread_id)
-
-                        # Use the normalization function
-                        try:
-                            normalized_thread = normalize_google_thread(
-                                thread_messages, account_email, account_name
-                            )
-                            threads.append(normalized_thread)
-                        except Exception as e:
-                            logger.warning(
-                                f"Failed to normalize Gmail thread {thread_id}: {e}"
-                            )
-                            continue
+                for thread_id, thread_messages in zip(thread_ids, thread_results):
+                    if isinstance(thread_messages, ProviderError):
+                        logger.warning(
+                            f"Failed to fetch Gmail thread {thread_id}: "
+                            f"{thread_messages.message}"
+                        )
+                        continue
+
+                    # Use the normalization function
+                    try:
+                        normalized_thread = normalize_google_thread(
+                            thread_messages, account_email, account_name
+                        )
+                        threads.append(normalized_thread)
+                    except Exception as e:
+                        logger.warning(
+                            f"Failed to normalize Gmail thread {thread_id}: {e}"
+                        )
+                        continue
 
                 return threads, provider
 
@@ -2205,9 +2258,33 @@ async def fetch_provider_threads(
                             conversation_groups[conv_id] = []
                         conversation_groups[conv_id].append(message)
 
+                # When bodies are asked for, hydrate the full conversations in
+                # $batch calls; the listing above only holds the messages that
+                # made it into the page. Otherwise the listing is enough.
+                conversation_ids = list(conversation_groups)[:limit]
+                conversation_results: List[BatchResult] = (
+                    await microsoft_client.get_conversation_messages_batch(
+                        conversation_ids
+                    )
+                    if include_body and conversation_ids
+                    else [{} for _ in conversation_ids]
+                )
+
                 # Convert grouped messages to unified thread format
                 threads = []
-                for conv_id, conv_messages in list(conversation_groups.items())[:limit]:
+                for conv_id, conversation in zip(
+                    conversation_ids, conversation_results
+                ):
+                    if isinstance(conversation, ProviderError):
+                        logger.warning(
+                            f"Failed to fetch Microsoft thread {conv_id}, using "
+                            f"listed messages: {conversation.message}"
+                        )
+                        conv_messages = conversation_groups[conv_id]
+                    else:
+                        conv_messages = (
+                            conversation.get("value") or conversation_groups[conv_id]
+                        )
                     try:
                         # Create minimal conversation data
                         conv_data = {"id": conv_id}
@@ -2478,6 +2555,7 @@ async def create_email_draft(
                         else "new"
                     ),
                 )
+                await _invalidate_mail_cache(user_id, provider, draft_result.thread_id)
                 return EmailDraftResponse(
                     success=True,
                     data=draft_result,
@@ -2600,6 +2678,7 @@ async def create_email_draft(
                         else "new"
                     ),
                 )
+                await _invalidate_mail_cache(user_id, provider, draft_result.thread_id)
                 return EmailDraftResponse(
                     success=True,
                     data=draft_result,
@@ -2663,6 +2742,7 @@ async def update_email_draft(
                         else "new"
                     ),
                 )
+                await _invalidate_mail_cache(user_id, provider, draft_result.thread_id)
                 return EmailDraftResponse(
                     success=True,
                     data=draft_result,
@@ -2721,6 +2801,7 @@ async def update_email_draft(
                         else "new"
                     ),
                 )
+                await _invalidate_mail_cache(user_id, provider, draft_result.thread_id)
                 return EmailDraftResponse(
                     success=True,
                     data=draft_result,
@@ -2767,6 +2848,7 @@ async def delete_email_draft(
             else:
                 microsoft_client = cast(MicrosoftAPIClient, client)
                 await microsoft_client.delete_draft_message(draft_id)
+        await _invalidate_mail_cache(user_id, provider)
         # Represent deletion as an EmailDraftResult with minimal info
         return EmailDraftResponse(
             success=True,
@@ -2837,8 +2919,22 @@ async def list_thread_drafts(
             if provider == "google":
                 google_client = cast(GoogleAPIClient, client)
                 raw_list = await google_client.list_drafts(max_results=50)
-                for item in raw_list.get("drafts", []) or []:
-                    detail = await google_client.get_draft(item.get("id"))
+                draft_ids = [
+                    item["id"]
+                    for item in raw_list.get("drafts", []) or []
+                    if item.get("id")
+                ]
+                draft_results = (
+                    await google_client.get_drafts_batch(draft_ids, format="metadata")
+                    if draft_ids
+                    else []
+                )
+                for draft_id, detail in zip(draft_ids, draft_results):
+                    if isinstance(detail, ProviderError):
+                        logger.warning(
+                            f"Failed to fetch Gmail draft {draft_id}: {detail.message}"
+                        )
+                        continue
                     msg = (detail or {}).get("message", {})
                     if msg.get("threadId") == provider_thread_id:
                         drafts.append(detail)
@@ -2905,6 +3001,12 @@ async def get_internal_email_messages(
         None, description="Folder ID to fetch messages from (provider-specific)"
     ),
     q: Optional[str] = Query(None, description="Search query to filter messages"),
+    received_after: Optional[datetime] = Query(
+        None, description="Only messages received at or after this time"
+    ),
+    received_before: Optional[datetime] = Query(
+        None, description="Only messages received before this time"
+    ),
     page_token: Optional[str] = Query(
         None, description="Pagination token for next page"
     ),
@@ -2953,6 +3055,8 @@ async def get_internal_email_messages(
             "labels": labels or [],
             "folder_id": folder_id or "",
             "q": q or "",
+            "received_after": received_after.isoformat() if received_after else "",
+            "received_before": received_before.isoformat() if received_before else "",
             "page_token": page_token or "",
             "no_cache": no_cache,
         }
@@ -2976,6 +3080,15 @@ async def get_internal_email_messages(
         # Query each provider
         all_messages = []
         total_count = 0
+        next_page_tokens: Dict[str, str] = {}
+
+        # Provider cursors are opaque and provider-specific (Gmail pageToken,
+        # Graph @odata.nextLink), so they can only be honoured for one provider
+        if page_token and len(valid_providers) > 1:
+            raise ValidationError(
+                message="page_token requires exactly one provider",
+                field="page_token",
+            )
 
         # Build filter string if labels are provided
         filter_str = None
@@ -2987,6 +3100,14 @@ async def get_internal_email_messages(
                 filter_str = "from/emailAddress/address eq 'me'"
             # Add more label filters as needed
 
+        # Received-date window, expressed in each provider's own filter syntax
+        google_query = _build_gmail_date_query(q, received_after, received_before)
+        date_filter = _build_graph_date_filter(received_after, received_before)
+        if date_filter:
+            filter_str = (
+                f"{filter_str} and {date_filter}" if filter_str else date_filter
+            )
+
         for provider in valid_providers:
             try:
                 # Check if user has integration for this provider
@@ -3023,12 +3144,27 @@ async def get_internal_email_messages(
                         logger.info(
                             f"Fetching messages from Microsoft API for user {user_id}"
                         )
-                        messages = await client.get_messages(
-                            top=limit,
-                            filter=filter_str,
-                            search=q,
-                            order_by="receivedDateTime desc",
-                        )
+                        if page_token:
+                            # The nextLink already carries $top/$filter/$search
+                            messages = await client.get_messages_page(page_token)
+                        elif folder_id:
+                            messages = await client.get_messages_from_folder(
+                                folder_id=folder_id,
+                                top=limit,
+                                filter=filter_str,
+                                search=q,
+                                order_by="receivedDateTime desc",
+                            )
+                        else:
+                            messages = await client.get_messages(
+                                top=limit,
+                                filter=filter_str,
+                                search=q,
+                                order_by="receivedDateTime desc",
+                            )
+                        next_link = messages.get("@odata.nextLink")
+                        if next_link:
+                            next_page_tokens[provider] = next_link
                         logger.info(
                             f"Microsoft API returned: {type(messages)} with keys: {list(messages.keys()) if isinstance(messages, dict) else 'Not a dict'}"
                         )
@@ -3037,9 +3173,26 @@ async def get_internal_email_messages(
                         logger.info(
                             f"Fetching messages from Google API for user {user_id}"
                         )
-                        messages = await client.get_messages(
-                            max_results=limit,
-                            query=q,
+                        if folder_id:
+                            messages = await client.get_messages_from_label(
+                                label_id=folder_id,
+                                max_results=limit,
+                                page_token=page_token,
+                                query=google_query,
+                            )
+                        else:
+                            messages = await client.get_messages(
+                                max_results=limit,
+                                page_token=page_token,
+                                query=google_query,
+                            )
+                        if messages.get("nextPageToken"):
+                            next_page_tokens[provider] = messages["nextPageToken"]
+                        # The list call returns only IDs, so hydrate the page
+                        messages["messages"] = await _hydrate_gmail_messages(
+                            client,
+                            messages.get("messages", []),
+                            "full" if include_body else "metadata",
                         )
                         logger.info(
                             f"Google API returned: {type(messages)} with keys: {list(messages.keys()) if isinstance(messages, dict) else 'Not a dict'}"
@@ -3112,7 +3265,9 @@ async def get_internal_email_messages(
         # Cache the result (unless no_cache)
         if not no_cache:
             await cache_manager.set_to_cache(
-                cache_key, {"messages": all_messages, "total_count": total_count}
+                cache_key,
+                {"messages": all_messages, "total_count": total_count},
+                tags=_mail_list_tags(user_id),
             )
 
         # Calculate response time
@@ -3122,6 +3277,12 @@ async def get_internal_email_messages(
             f"Internal email messages response: {len(all_messages)} messages in {response_time:.3f}s"
         )
 
+        next_page_token = (
+            next_page_tokens.get(valid_providers[0])
+            if len(valid_providers) == 1
+            else None
+        )
+
         return EmailMessageList(
             success=True,
             data=EmailMessageListData(
@@ -3129,7 +3290,8 @@ async def get_internal_email_messages(
                 total_count=total_count,
                 providers_used=valid_providers,
                 provider_errors=None,
-                has_more=False,
+                has_more=bool(next_page_tokens),
+                next_page_token=next_page_token,
                 request_metadata={
                     "user_id": user_id,
                     "providers_requested": valid_providers,
@@ -3141,6 +3303,8 @@ async def get_internal_email_messages(
             request_id=request_id,
         )
 
+    except ValidationError:
+        raise
     except Exception as e:
         logger.error(f"Internal email messages error: {e}")
         raise ServiceError(message=f"Failed to fetch internal email messages: {str(e)}")
@@ -3283,3 +3447,256 @@ async def get_internal_email_count(
     except Exception as e:
         logger.error(f"Internal email count error: {e}")
         return {"success": False, "total_count": 0, "error": str(e)}
+
+
+# Gmail history record types and the change each one stands for
+_GMAIL_HISTORY_OPERATIONS = (
+    ("messagesAdded", "create"),
+    ("labelsAdded", "update"),
+    ("labelsRemoved", "update"),
+    ("messagesDeleted", "delete"),
+)
+
+
+def _merge_gmail_history(history: List[Dict[str, Any]]) -> Dict[str, str]:
+    """
+    Collapse Gmail history records into one operation per message.
+
+    A deletion wins over everything else and an addition over label changes,
+    so a message added and relabelled in the same window is a single create.
+    """
+    operations: Dict[str, str] = {}
+    rank = {"update": 0, "create": 1, "delete": 2}
+    for record in history:
+        for key, operation in _GMAIL_HISTORY_OPERATIONS:
+            for item in record.get(key, []):
+                message_id = item.get("message", {}).get("id")
+                if not message_id:
+                    continue
+                current = operations.get(message_id)
+                if current is None or rank[operation] > rank[current]:
+                    operations[message_id] = operation
+    return operations
+
+
+async def fetch_gmail_changes(
+    client: GoogleAPIClient,
+    user_id: str,
+    cursor: Optional[str],
+    since: Optional[datetime],
+    page_token: Optional[str],
+    limit: int,
+) -> EmailChangeListData:
+    """
+    Get one page of Gmail changes.
+
+    With a cursor (a historyId) the page lists the messages added, relabelled
+    or deleted since then. Without one, the page lists the messages received
+    since ``since`` as creates, and the first page carries the mailbox's
+    current historyId as the cursor to continue from.
+    """
+    account_email, account_name = get_user_account_info(user_id, "google")
+    operations: Dict[str, str]
+    next_cursor: Optional[str]
+    if cursor:
+        try:
+            response = await client.get_history(
+                cursor, page_token=page_token, max_results=limit
+            )
+        except ProviderError as e:
+            if e.status_code != 404:
+                raise
+            # Gmail keeps about a week of history
+            return EmailChangeListData(
+                changes=[],
+                provider="google",
+                cursor_expired=True,
+                request_metadata={"user_id": user_id},
+            )
+        operations = _merge_gmail_history(response.get("history", []))
+        next_cursor = response.get("historyId") or cursor
+    else:
+        # Take the cursor before listing, so changes made while the window
+        # is crawled are picked up by the next round
+        next_cursor = None
+        if not page_token:
+            profile = await client.get_profile()
+            next_cursor = str(profile["historyId"])
+        query = f"after:{int(_as_utc(since).timestamp())}" if since else None
+        response = await client.get_messages(
+            max_results=limit, page_token=page_token, query=query
+        )
+        operations = {
+            summary["id"]: "create" for summary in response.get("messages", [])
+        }
+
+    changes: List[EmailChange] = []
+    fetch_ids = [mid for mid, operation in operations.items() if operation != "delete"]
+    fetched = dict(zip(fetch_ids, await client.get_messages_batch(fetch_ids)))
+    for message_id, operation in operations.items():
+        message = fetched.get(message_id)
+        if isinstance(message, ProviderError):
+            if message.status_code != 404:
+                # Skipping would lose the change once the cursor moves on
+                raise message
+            operation, message = "delete", None
+        changes.append(
+            EmailChange(
+                operation=operation,
+                message_id=f"gmail_{message_id}",
+                provider_message_id=message_id,
+                message=(
+                    normalize_google_email(message, account_email, account_name)
+                    if message
+                    else None
+                ),
+            )
+        )
+
+    return EmailChangeListData(
+        changes=changes,
+        provider="google",
+        cursor=next_cursor,
+        next_page_token=response.get("nextPageToken"),
+        request_metadata={"user_id": user_id},
+    )
+
+
+async def fetch_outlook_changes(
+    client: MicrosoftAPIClient,
+    user_id: str,
+    folder_id: str,
+    cursor: Optional[str],
+    since: Optional[datetime],
+    page_token: Optional[str],
+    limit: int,
+) -> EmailChangeListData:
+    """
+    Get one page of Outlook changes from a mail folder's delta feed.
+
+    Without a cursor a new delta round starts over the messages received
+    since ``since``, returned as creates. With a cursor (a delta link) every
+    changed message is returned as an update, since Graph does not tell new
+    messages from changed ones. The last page of a round carries the delta
+    link to continue from as the cursor.
+    """
+    account_email, account_name = get_user_account_info(user_id, "microsoft")
+    try:
+        response = await client.get_messages_delta(
+            folder_id=folder_id,
+            link=page_token or cursor,
+            received_after=(
+                _as_utc(since).strftime("%Y-%m-%dT%H:%M:%SZ") if since else None
+            ),
+            page_size=limit,
+        )
+    except ProviderError as e:
+        if not cursor or e.status_code != 410:
+            raise
+        return EmailChangeListData(
+            changes=[],
+            provider="microsoft",
+            cursor_expired=True,
+            request_metadata={"user_id": user_id, "folder_id": folder_id},
+        )
+
+    changes: List[EmailChange] = []
+    for item in response.get("value", []):
+        removed = "@removed" in item
+        changes.append(
+            EmailChange(
+                operation="delete" if removed else ("update" if cursor else "create"),
+                message_id=f"outlook_{item['id']}",
+                provider_message_id=item["id"],
+                message=(
+                    None
+                    if removed
+                    else normalize_microsoft_email(item, account_email, account_name)
+                ),
+            )
+        )
+
+    return EmailChangeListData(
+        changes=changes,
+        provider="microsoft",
+        cursor=response.get("@odata.deltaLink"),
+        next_page_token=response.get("@odata.nextLink"),
+        request_metadata={"user_id": user_id, "folder_id": folder_id},
+    )
+
+
+@internal_router.get("/messages/changes", response_model=EmailChangeList)
+async def get_internal_email_changes(
+    user_id: str = Query(..., description="User ID to sync"),
+    provider: str = Query(..., description="Provider to read changes from"),
+    cursor: Optional[str] = Query(
+        None,
+        description="Cursor returned by the previous round; omit to start a new one",
+    ),
+    since: Optional[datetime] = Query(
+        None, description="Without a cursor, only messages received after this"
+    ),
+    page_token: Optional[str] = Query(
+        None, description="Token for the next page of the current round"
+    ),
+    folder_id: str = Query(
+        "inbox", description="Mail folder to sync (Microsoft only; Gmail is global)"
+    ),
+    limit: int = Query(100, ge=1, le=500, description="Maximum changes per page"),
+    service_name: str = Depends(service_permission_required(["internal_access"])),
+) -> EmailChangeList:
+    """
+    Internal endpoint listing the messages changed since a sync cursor.
+
+    Reads Gmail history or the Graph delta feed, so the cost of a sync is
+    proportional to the number of changes rather than to the mailbox size.
+    A round is walked with ``page_token`` until no next page is returned;
+    the ``cursor`` of the round is then stored for the next one. When the
+    cursor has expired the response sets ``cursor_expired`` and the caller
+    starts a new round without a cursor.
+    """
+    request_id = get_request_id()
+    provider = provider.lower()
+    if provider not in ["google", "microsoft"]:
+        raise ValidationError(message=f"Unsupported provider: {provider}")
+
+    factory = await get_api_client_factory()
+    client = await factory.create_client(user_id, provider)
+    if client is None:
+        raise ValidationError(
+            message=f"Failed to create API client for provider {provider}"
+        )
+
+    try:
+        async with client:
+            if provider == "google":
+                data = await fetch_gmail_changes(
+                    cast(GoogleAPIClient, client),
+                    user_id,
+                    cursor,
+                    since,
+                    page_token,
+                    limit,
+                )
+            else:
+                data = await fetch_outlook_changes(
+                    cast(MicrosoftAPIClient, client),
+                    user_id,
+                    folder_id,
+                    cursor,
+                    since,
+                    page_token,
+                    limit,
+                )
+    except ProviderError:
+        raise
+    except Exception as e:
+        logger.error(f"Failed to fetch email changes for user {user_id}: {e}")
+        raise ServiceError(message=f"Failed to fetch email changes: {str(e)}")
+
+    logger.info(
+        f"Internal email changes for user {user_id} from {provider}: "
+        f"{len(data.changes)} changes, more={data.next_page_token is not None}, "
+        f"expired={data.cursor_expired}"
+    )
+    return EmailChangeList(success=True, data=data, request_id=request_id)
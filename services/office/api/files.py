@@ -26,7 +26,11 @@ from services.common.http_errors import (
 from services.common.logging_config import get_logger, request_id_var
 from services.office.core.api_client_factory import APIClientFactory
 from services.office.core.auth import service_permission_required
-from services.office.core.cache_manager import cache_manager, generate_cache_key
+from services.office.core.cache_manager import (
+    cache_manager,
+    generate_cache_key,
+    generate_cache_tag,
+)
 from services.office.core.normalizer import (
     normalize_google_drive_file,
     normalize_microsoft_drive_file,
@@ -339,7 +343,12 @@ async def get_files(
         # Only cache if we have successful results from at least one provider
         if providers_used:  # Only cache if at least one provider succeeded
             # Cache the result (5 minutes TTL for files)
-            await cache_manager.set_to_cache(cache_key, response_data, ttl_seconds=300)
+            await cache_manager.set_to_cache(
+                cache_key,
+                response_data,
+                ttl_seconds=300,
+                tags=[generate_cache_tag(user_id, "files")],
+            )
         else:
             logger.info(
                 "Not caching response due to no successful providers",
@@ -579,7 +588,12 @@ async def search_files(
         # Only cache if we have successful results from at least one provider
         if providers_used:  # Only cache if at least one provider succeeded
             # Cache the search results (5 minutes TTL)
-            await cache_manager.set_to_cache(cache_key, response_data, ttl_seconds=300)
+            await cache_manager.set_to_cache(
+                cache_key,
+                response_data,
+                ttl_seconds=300,
+                tags=[generate_cache_tag(user_id, "files")],
+            )
         else:
             logger.info(
                 "Not caching search response due to no successful providers",
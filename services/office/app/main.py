@@ -18,6 +18,10 @@ from services.office.api.contacts import router as contacts_router
 from services.office.api.email import internal_router as email_internal_router
 from services.office.api.email import router as email_router
 from services.office.api.files import router as files_router
+from services.office.core.backfill_worker import backfill_workers
+from services.office.core.cache_manager import cache_manager
+from services.office.core.http_pool import close_http_pool, get_http_pool
+from services.office.core.integration_directory import integration_directory
 from services.office.core.settings import get_settings
 
 # Set up centralized logging - will be initialized in lifespan
@@ -45,8 +49,16 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
         debug=settings.DEBUG,
         user_service_url=settings.USER_SERVICE_URL,
     )
+
+    # Drop cached user integrations when the user service reports changes
+    await integration_directory.start_listener()
+    # Run queued backfill jobs and resume those interrupted on any replica
+    await backfill_workers.start()
     yield
     # Shutdown event logic
+    await backfill_workers.stop()
+    await integration_directory.stop_listener()
+    await close_http_pool()
     log_service_shutdown("office")
 
 
@@ -109,7 +121,8 @@ async def read_root() -> Dict[str, str]:
 async def health_check() -> Dict[str, Any]:
     """
     Health check endpoint for load balancers and monitoring.
-    Checks database connectivity and basic configuration.
+    Checks database connectivity and basic configuration, and reports
+    utilisation of the pooled upstream HTTP clients.
     """
     import time
     from datetime import datetime, timezone
@@ -165,6 +178,10 @@ async def health_check() -> Dict[str, Any]:
                 "error": db_error,
             },
             "configuration": {"status": config_status, "issues": config_issues},
+            "http_pools": get_http_pool().stats(),
+            "cache": cache_manager.get_stats(),
+            "local_cache": cache_manager.get_local_stats(),
+            "backfill_jobs": backfill_workers.running_jobs(),
         },
         "performance": {"total_check_time_ms": total_duration},
     }
@@ -13,6 +13,11 @@ from services.api.v1.office import Provider
 from services.common.logging_config import get_logger
 from services.office.core.clients.google import GoogleAPIClient
 from services.office.core.clients.microsoft import MicrosoftAPIClient
+from services.office.core.http_pool import get_http_pool
+from services.office.core.integration_directory import (
+    PREFERRED_PROVIDER,
+    integration_directory,
+)
 from services.office.core.settings import get_settings
 from services.office.core.token_manager import TokenManager
 
@@ -254,6 +259,9 @@ class APIClientFactory:
         """
         Get the user's preferred provider from the user service.
 
+        Answers come from the integration directory cache, so the user service
+        is asked at most once per user per cache TTL.
+
         Args:
             user_id: External auth ID to get preferred provider for
 
@@ -261,12 +269,6 @@ class APIClientFactory:
             Preferred provider or None if not set
         """
         try:
-            # Import here to avoid circular imports
-            import httpx
-
-            from services.common.logging_config import request_id_var
-            from services.office.core.settings import get_settings
-
             settings = get_settings()
             if not settings.USER_SERVICE_URL:
                 logger.warning(
@@ -274,54 +276,77 @@ class APIClientFactory:
                 )
                 return None
 
-            # Assert that the API key is set
-            assert (
-                settings.api_office_user_key is not None
-            ), "api_office_user_key must be set in settings for service-to-service authentication"
-
-            # Prepare headers for service-to-service calls
-            headers = {"X-API-Key": settings.api_office_user_key}
-            request_id = request_id_var.get()
-            if request_id and request_id != "uninitialized":
-                headers["X-Request-Id"] = request_id
-
-            # Get user profile from user service using internal endpoint
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                # Use the internal endpoint to get user by external_auth_id
-                response = await client.get(
-                    f"{settings.USER_SERVICE_URL}/v1/internal/users/by-external-id/{user_id}",
-                    headers=headers,
-                )
+            preferred_provider = await integration_directory.get(
+                user_id,
+                PREFERRED_PROVIDER,
+                lambda: self._fetch_user_preferred_provider(user_id),
+            )
+            if not preferred_provider:
+                return None
 
-                if response.status_code == 200:
-                    user_data = response.json()
-
-                    if user_data.get("exists"):
-                        preferred_provider = user_data.get("preferred_provider")
-                        if preferred_provider:
-                            try:
-                                return Provider(preferred_provider.lower())
-                            except ValueError:
-                                logger.warning(
-                                    f"Invalid preferred provider: {preferred_provider}"
-                                )
-                                return None
-                        else:
-                            logger.info(f"No preferred provider set for user {user_id}")
-                            return None
-                    else:
-                        logger.warning(f"User not found for external_auth_id {user_id}")
-                        return None
-                else:
-                    logger.warning(
-                        f"Failed to get user profile: {response.status_code}"
-                    )
-                    return None
+            try:
+                return Provider(preferred_provider.lower())
+            except ValueError:
+                logger.warning(f"Invalid preferred provider: {preferred_provider}")
+                return None
 
         except Exception as e:
             logger.error(f"Error getting user preferred provider: {e}")
             return None
 
+    async def _fetch_user_preferred_provider(self, user_id: str) -> Optional[str]:
+        """
+        Fetch the user's preferred provider name from the user service.
+
+        Args:
+            user_id: External auth ID to get preferred provider for
+
+        Returns:
+            Preferred provider name, or None if the user has none or does not exist
+
+        Raises:
+            ValueError: If the user service answers with an error status
+        """
+        # Import here to avoid circular imports
+        from services.common.logging_config import request_id_var
+
+        settings = get_settings()
+
+        # Assert that the API key is set
+        assert (
+            settings.api_office_user_key is not None
+        ), "api_office_user_key must be set in settings for service-to-service authentication"
+
+        # Prepare headers for service-to-service calls
+        headers = {"X-API-Key": settings.api_office_user_key}
+        request_id = request_id_var.get()
+        if request_id and request_id != "uninitialized":
+            headers["X-Request-Id"] = request_id
+
+        # Get user profile from user service using internal endpoint
+        client = get_http_pool().get_client(settings.USER_SERVICE_URL)
+        # Use the internal endpoint to get user by external_auth_id
+        response = await client.get(
+            f"{settings.USER_SERVICE_URL}/v1/internal/users/by-external-id/{user_id}",
+            headers=headers,
+            timeout=10.0,
+        )
+
+        if response.status_code != 200:
+            # Raised rather than returned so the failure is not cached
+            raise ValueError(f"Failed to get user profile: {response.status_code}")
+
+        user_data = response.json()
+        if not user_data.get("exists"):
+            logger.warning(f"User not found for external_auth_id {user_id}")
+            return None
+
+        preferred_provider = user_data.get("preferred_provider")
+        if not preferred_provider:
+            logger.info(f"No preferred provider set for user {user_id}")
+            return None
+        return str(preferred_provider)
+
     async def create_client_for_user(
         self,
         user_id: str,
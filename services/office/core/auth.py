@@ -84,6 +84,17 @@ API_KEY_CONFIGS: Dict[str, APIKeyConfig] = {
         ],
         settings_key="api_backfill_office_key",  # This maps to the settings field
     ),
+    # Email sync service key - reads message change feeds for any user
+    "api_email_sync_office_key": APIKeyConfig(
+        client="email-sync-service",
+        service="office-service-access",
+        permissions=[
+            "read_emails",
+            "health",
+            "internal_access",
+        ],
+        settings_key="api_email_sync_office_key",
+    ),
 }
 
 # Service-level permissions fallback (optional, for legacy support)
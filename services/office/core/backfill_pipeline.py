@@ -0,0 +1,538 @@
+#!/usr/bin/env python3
+"""
+Staged, bounded-concurrency pipeline for email backfill jobs.
+
+    fetch workers -> [page queue] -> convert workers -> [event queue] -> publish workers
+
+Fetch workers each own one folder/date-window shard at a time and walk it with
+provider page cursors. All fetches of a job share one provider-aware token
+bucket instead of sleeping a fixed delay between batches. The queues between
+stages are bounded, so a slow stage applies backpressure upstream and memory
+stays proportional to the queue sizes rather than to the mailbox size.
+
+Each shard's cursor is checkpointed only once every message of a page and of
+all earlier pages of that shard has been published, so resuming a job never
+skips messages that were fetched but not yet published. A page with a message
+that failed to convert or publish holds the cursor back for good in that run:
+the job fails and a resume refetches the page. A page cut short by
+``max_emails`` is checkpointed at its own cursor, so a resume refetches the
+messages left out.
+"""
+
+import asyncio
+import time
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+from services.api.v1.office import EmailMessage
+from services.common.events import EmailData, EmailEvent, EventMetadata
+from services.common.logging_config import get_logger
+from services.common.pubsub_client import PublishResult, PubSubClient
+from services.office.core.email_crawler import EmailCrawler
+from services.office.core.rate_limiter import TokenBucket
+from services.office.core.settings import get_settings
+from services.office.models.backfill import (
+    BackfillShardCheckpoint,
+    BackfillStatus,
+    BackfillStatusEnum,
+)
+
+logger = get_logger(__name__)
+
+# Microsoft Graph allows at most 4 concurrent requests per mailbox
+_MAX_CONCURRENT_FETCHES = {"microsoft": 4}
+
+_STOP_STATUSES = (BackfillStatusEnum.CANCELLED, BackfillStatusEnum.PAUSED)
+
+
+def _provider_name(provider: Any) -> str:
+    """Return a lowercase provider name for enum or string providers."""
+    return str(getattr(provider, "value", provider)).lower()
+
+
+def create_provider_rate_limiter(provider: Any) -> TokenBucket:
+    """Create the page-fetch token bucket for a provider from settings."""
+    settings = get_settings()
+    if _provider_name(provider) == "microsoft":
+        return TokenBucket(
+            settings.backfill_microsoft_requests_per_second,
+            settings.backfill_microsoft_burst,
+        )
+    return TokenBucket(
+        settings.backfill_google_requests_per_second, settings.backfill_google_burst
+    )
+
+
+def plan_backfill_shards(
+    folders: Optional[List[str]],
+    start_date: Optional[datetime],
+    end_date: Optional[datetime],
+    window_days: int,
+    default_shard_count: int,
+    now: Optional[datetime] = None,
+) -> List[BackfillShardCheckpoint]:
+    """
+    Split a backfill request into folder x date-window shards.
+
+    With a start_date the range is cut into ``window_days`` windows. Without
+    one, ``default_shard_count`` windows are laid back from the end date and a
+    final open-ended shard covers everything older, so the whole mailbox is
+    still crawled. Shards are ordered newest first.
+
+    Args:
+        folders: Folder/label IDs to crawl, or None for all mail
+        start_date: Inclusive lower bound of the range, if any
+        end_date: Exclusive upper bound of the range (defaults to now)
+        window_days: Width of each date window
+        default_shard_count: Window count when there is no start_date
+        now: Current time (for tests)
+
+    Returns:
+        List of shard checkpoints with no cursor yet
+    """
+    end = _as_utc(end_date or now or datetime.now(timezone.utc))
+    start = _as_utc(start_date) if start_date else None
+    window = timedelta(days=max(window_days, 1))
+
+    windows: List[Tuple[Optional[datetime], datetime]] = []
+    upper = end
+    if start is not None:
+        while upper > start:
+            lower = max(upper - window, start)
+            windows.append((lower, upper))
+            upper = lower
+    else:
+        for _ in range(max(default_shard_count, 0)):
+            windows.append((upper - window, upper))
+            upper = upper - window
+        # Everything older than the last window
+        windows.append((None, upper))
+
+    shard_folders: List[Optional[str]] = list(folders) if folders else [None]
+    shards = []
+    for folder in shard_folders:
+        for lower_bound, upper_bound in windows:
+            shards.append(
+                BackfillShardCheckpoint(  # type: ignore[call-arg]
+                    folder=folder, start_date=lower_bound, end_date=upper_bound
+                )
+            )
+    return shards
+
+
+def email_message_to_event(
+    email: EmailMessage, user_id: str, provider: Any, job_id: str
+) -> EmailEvent:
+    """
+    Convert a normalized EmailMessage into a backfill EmailEvent.
+
+    Args:
+        email: Normalized message from the office service
+        user_id: Internal user ID the event belongs to
+        provider: Provider the message came from
+        job_id: Backfill job ID, used as batch and correlation ID
+
+    Returns:
+        EmailEvent ready to publish
+    """
+    # Use the pre-split unquoted field (visible content only)
+    # Prefer text over HTML for Vespa ingestion
+    body_content = (
+        email.body_text_unquoted or email.body_html_unquoted or email.snippet or ""
+    )
+
+    email_data = EmailData(
+        id=email.provider_message_id,
+        thread_id=email.thread_id or "",
+        subject=email.subject or "",
+        body=body_content,
+        from_address=email.from_address.email if email.from_address else "",
+        to_addresses=[addr.email for addr in email.to_addresses if addr.email],
+        cc_addresses=[addr.email for addr in email.cc_addresses if addr.email],
+        bcc_addresses=[addr.email for addr in email.bcc_addresses if addr.email],
+        received_date=email.date,
+        sent_date=None,  # Not available in EmailMessage
+        labels=email.labels,
+        is_read=email.is_read,
+        is_starred=False,  # Not available in EmailMessage
+        has_attachments=email.has_attachments,
+        provider=provider,
+        provider_message_id=email.provider_message_id,
+        size_bytes=None,  # Not available in EmailMessage
+        mime_type=None,  # Not available in EmailMessage
+    )
+
+    email_event = EmailEvent(
+        user_id=user_id,
+        email=email_data,
+        operation="create",  # Backfill creates new emails
+        batch_id=job_id,  # Use job_id as batch_id for correlation
+        last_updated=datetime.now(timezone.utc),
+        sync_timestamp=datetime.now(timezone.utc),
+        provider=provider,
+        sync_type="backfill",
+        metadata=EventMetadata(  # type: ignore[call-arg]
+            source_service="office-service",
+            source_version="1.0.0",
+            user_id=user_id,
+            correlation_id=job_id,
+        ),
+    )
+    email_event.add_correlation_id(job_id)
+    return email_event
+
+
+@dataclass
+class _PageTicket:
+    """Tracks the unpublished messages of one fetched page."""
+
+    shard_index: int
+    next_page_token: Optional[str]
+    is_last: bool
+    remaining: int
+    # A message of the page failed to convert or publish, so the cursor must
+    # not pass it
+    failed: bool = False
+
+
+class BackfillPipeline:
+    """Runs one backfill job through the fetch/convert/publish stages."""
+
+    def __init__(
+        self,
+        job: BackfillStatus,
+        user_id: str,
+        user_email: str,
+        pubsub_client: PubSubClient,
+        batch_size: int = 100,
+        max_emails: Optional[int] = None,
+        total_emails: int = 0,
+        crawler_factory: Optional[Callable[[], EmailCrawler]] = None,
+        fetch_workers: Optional[int] = None,
+        convert_workers: Optional[int] = None,
+        publish_workers: Optional[int] = None,
+        publish_batch_size: Optional[int] = None,
+        queue_size: Optional[int] = None,
+        rate_limiter: Optional[TokenBucket] = None,
+    ):
+        """
+        Initialize the pipeline.
+
+        Args:
+            job: Job status object; progress and shard checkpoints are written
+                to it as the pipeline runs
+            user_id: Internal user ID used for API calls and events
+            user_email: User email address (for the normalizer)
+            pubsub_client: Client used to publish EmailEvents
+            batch_size: Page size requested from the provider
+            max_emails: Maximum emails to publish in this run, None for all
+            total_emails: Estimated total, used for progress when no max is set
+            crawler_factory: Creates one EmailCrawler per shard (for tests)
+            fetch_workers: Concurrent shard fetchers (defaults from settings)
+            convert_workers: Concurrent converters (defaults from settings)
+            publish_workers: Concurrent publishers (defaults from settings)
+            publish_batch_size: Max events handed to Pub/Sub per publish call
+            queue_size: Pages buffered between fetch and convert
+            rate_limiter: Token bucket shared by all fetches of this job
+        """
+        settings = get_settings()
+        provider = _provider_name(job.request.provider)
+
+        self.job = job
+        self.user_id = user_id
+        self.user_email = user_email
+        self.pubsub_client = pubsub_client
+        self.batch_size = batch_size
+        self.max_emails = max_emails
+        self.total_emails = total_emails
+        self.rate_limiter = rate_limiter or create_provider_rate_limiter(provider)
+        self.fetch_workers = min(
+            fetch_workers or settings.backfill_fetch_workers,
+            _MAX_CONCURRENT_FETCHES.get(provider, settings.backfill_fetch_workers),
+        )
+        self.convert_workers = convert_workers or settings.backfill_convert_workers
+        self.publish_workers = publish_workers or settings.backfill_publish_workers
+        self.publish_batch_size = (
+            publish_batch_size or settings.backfill_publish_batch_size
+        )
+        self._crawler_factory = crawler_factory or (
+            lambda: EmailCrawler(
+                user_id,
+                job.request.provider,
+                user_email,
+                max_email_count=max_emails or 10,
+                rate_limiter=self.rate_limiter,
+            )
+        )
+
+        page_queue_size = queue_size or settings.backfill_queue_size
+        self._shard_queue: asyncio.Queue[int] = asyncio.Queue()
+        self._page_queue: asyncio.Queue[
+            Optional[Tuple[_PageTicket, List[EmailMessage]]]
+        ] = asyncio.Queue(maxsize=page_queue_size)
+        self._event_queue: asyncio.Queue[Optional[Tuple[_PageTicket, EmailEvent]]] = (
+            asyncio.Queue(maxsize=max(self.publish_batch_size, batch_size))
+        )
+
+        self._pending: Dict[int, Deque[_PageTicket]] = {}
+        self._remaining_budget = max_emails
+        self._processed_emails = job.processed_emails
+        self._initial_processed = job.processed_emails
+        self._failed_shards: Dict[int, str] = {}
+
+    async def run(self) -> None:
+        """
+        Crawl every unfinished shard and publish its messages.
+
+        Raises:
+            RuntimeError: If any shard failed after retries. Checkpoints of all
+                shards are preserved so the job can be resumed.
+        """
+        for index, shard in enumerate(self.job.shards):
+            if not shard.completed:
+                self._pending[index] = deque()
+                self._shard_queue.put_nowait(index)
+
+        started = time.monotonic()
+        fetchers = [
+            asyncio.create_task(self._fetch_worker()) for _ in range(self.fetch_workers)
+        ]
+        converters = [
+            asyncio.create_task(self._convert_worker())
+            for _ in range(self.convert_workers)
+        ]
+        publishers = [
+            asyncio.create_task(self._publish_worker())
+            for _ in range(self.publish_workers)
+        ]
+
+        try:
+            # Shut stages down in order so queued work drains before exit
+            await asyncio.gather(*fetchers)
+            for _ in converters:
+                await self._page_queue.put(None)
+            await asyncio.gather(*converters)
+            for _ in publishers:
+                await self._event_queue.put(None)
+            await asyncio.gather(*publishers)
+        except BaseException:
+            for task in [*fetchers, *converters, *publishers]:
+                task.cancel()
+            await asyncio.gather(
+                *fetchers, *converters, *publishers, return_exceptions=True
+            )
+            raise
+
+        elapsed = time.monotonic() - started
+        published = self._processed_emails - self._initial_processed
+        logger.info(
+            f"Backfill pipeline finished for job {self.job.job_id}",
+            extra={
+                "job_id": self.job.job_id,
+                "shards": len(self.job.shards),
+                "failed_shards": len(self._failed_shards),
+                "published_emails": published,
+                "emails_per_second": round(published / elapsed, 1) if elapsed else None,
+                "elapsed_seconds": round(elapsed, 3),
+                "fetch_workers": self.fetch_workers,
+                "publish_workers": self.publish_workers,
+            },
+        )
+
+        if self._failed_shards:
+            raise RuntimeError(
+                f"{len(self._failed_shards)} backfill shard(s) failed: "
+                + "; ".join(self._failed_shards.values())
+            )
+
+    def _should_stop(self) -> bool:
+        return self.job.status in _STOP_STATUSES or self._remaining_budget == 0
+
+    async def _fetch_worker(self) -> None:
+        while not self._should_stop():
+            try:
+                index = self._shard_queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            try:
+                await self._fetch_shard(index)
+            except Exception as e:
+                shard = self.job.shards[index]
+                logger.error(
+                    f"Backfill shard {index} failed for job {self.job.job_id}: {e}",
+                    extra={
+                        "job_id": self.job.job_id,
+                        "folder": shard.folder,
+                        "start_date": shard.start_date,
+                        "end_date": shard.end_date,
+                    },
+                )
+                self._failed_shards[index] = str(e)
+
+    async def _fetch_shard(self, index: int) -> None:
+        shard = self.job.shards[index]
+        crawler = self._crawler_factory()
+        exhausted = True
+        # Cursor of the page being handled, for pages that are cut short
+        page_token = shard.next_page_token
+
+        async for batch in crawler.crawl_emails(
+            batch_size=self.batch_size,
+            start_date=shard.start_date,
+            end_date=shard.end_date,
+            folders=[shard.folder] if shard.folder else None,
+            resume_from=shard.next_page_token,
+        ):
+            if self._should_stop():
+                # Drop the page; its cursor is not checkpointed so it is refetched
+                exhausted = False
+                break
+
+            truncated = False
+            if self._remaining_budget is not None:
+                truncated = len(batch) > self._remaining_budget
+                batch = batch[: self._remaining_budget]
+                self._remaining_budget -= len(batch)
+
+            ticket = _PageTicket(
+                shard_index=index,
+                next_page_token=page_token if truncated else crawler.next_page_token,
+                is_last=False,
+                remaining=len(batch),
+            )
+            page_token = crawler.next_page_token
+            self._pending[index].append(ticket)
+            if batch:
+                # Blocks while the converters are behind (backpressure)
+                await self._page_queue.put((ticket, batch))
+            else:
+                self._advance(index)
+
+            if self._remaining_budget == 0:
+                exhausted = False
+                break
+
+        if exhausted:
+            # Marks the shard complete once every earlier page is published
+            self._pending[index].append(
+                _PageTicket(
+                    shard_index=index, next_page_token=None, is_last=True, remaining=0
+                )
+            )
+            self._advance(index)
+
+    async def _convert_worker(self) -> None:
+        while True:
+            item = await self._page_queue.get()
+            if item is None:
+                return
+            ticket, batch = item
+            for email in batch:
+                try:
+                    # Check if email is a dict (from cache) and reconstruct EmailMessage if needed
+                    if isinstance(email, dict):
+                        email = EmailMessage(**email)
+                    event = email_message_to_event(
+                        email, self.user_id, self.job.request.provider, self.job.job_id
+                    )
+                except Exception as e:
+                    logger.error(
+                        f"Failed to convert email data: {e}",
+                        extra={"job_id": self.job.job_id},
+                    )
+                    self.job.failed_emails += 1
+                    ticket.failed = True
+                    self._failed_shards[ticket.shard_index] = (
+                        f"failed to convert email: {e}"
+                    )
+                    self._complete(ticket)
+                    continue
+                await self._event_queue.put((ticket, event))
+
+    async def _publish_worker(self) -> None:
+        while True:
+            item = await self._event_queue.get()
+            if item is None:
+                return
+            # Drain whatever else is already queued so one publish call hands
+            # the client library a full batch instead of one message at a time
+            items = [item]
+            stop = False
+            while len(items) < self.publish_batch_size:
+                try:
+                    queued = self._event_queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    break
+                if queued is None:
+                    stop = True
+                    break
+                items.append(queued)
+
+            await self._publish_items(items)
+            if stop:
+                return
+
+    async def _publish_items(self, items: List[Tuple[_PageTicket, EmailEvent]]) -> None:
+        events = [event for _, event in items]
+        try:
+            results = await self.pubsub_client.publish_email_events(events)
+        except Exception as e:
+            results = [PublishResult(error=str(e), exception=e) for _ in items]
+
+        for (ticket, event), result in zip(items, results):
+            if result.success:
+                self._processed_emails += 1
+                self.job.processed_emails = self._processed_emails
+                self.job.shards[ticket.shard_index].processed_emails += 1
+            else:
+                logger.error(
+                    f"Failed to publish email data: {result.error}",
+                    extra={"job_id": self.job.job_id, "email_id": event.email.id},
+                )
+                self.job.failed_emails += 1
+                ticket.failed = True
+                self._failed_shards[ticket.shard_index] = (
+                    f"failed to publish email {event.email.id}: {result.error}"
+                )
+            self._complete(ticket)
+
+        self._update_progress()
+        logger.debug(
+            "Published EmailEvent batch to PubSub",
+            extra={
+                "job_id": self.job.job_id,
+                "batch_size": len(items),
+                "processed_count": self._processed_emails,
+            },
+        )
+
+    def _complete(self, ticket: _PageTicket) -> None:
+        ticket.remaining -= 1
+        if ticket.remaining <= 0:
+            self._advance(ticket.shard_index)
+
+    def _advance(self, index: int) -> None:
+        """Move the shard checkpoint past every fully published leading page."""
+        pending = self._pending[index]
+        shard = self.job.shards[index]
+        while pending and pending[0].remaining <= 0 and not pending[0].failed:
+            ticket = pending.popleft()
+            shard.next_page_token = ticket.next_page_token
+            if ticket.is_last:
+                shard.completed = True
+        if len(self.job.shards) == 1:
+            self.job.next_page_token = shard.next_page_token
+
+    def _update_progress(self) -> None:
+        target = self.job.request.max_emails or self.total_emails
+        if target:
+            self.job.progress = min(100.0, (self._processed_emails / target) * 100)
+
+
+def _as_utc(value: datetime) -> datetime:
+    """Treat naive datetimes as UTC."""
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
@@ -0,0 +1,430 @@
+"""
+Durable backfill job store.
+
+Jobs live in the ``backfill_jobs`` table so they survive restarts and can be
+run by any replica. A worker claims a job by taking a lease on it and keeps
+the lease by checkpointing the job before it lapses; a job whose lease has
+lapsed (its worker crashed or was stopped) is claimed again and resumes from
+its last shard checkpoints. Claims are conditional updates, so two workers
+never run the same job at once. Running jobs are capped per provider, but the
+cap is soft: it is counted without a lock, so replicas claiming at the same
+moment can briefly exceed it.
+"""
+
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy import and_, func, or_, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import select
+
+from services.common.logging_config import get_logger
+from services.office.models import BackfillJob, get_async_session_factory
+from services.office.models.backfill import BackfillStatus, BackfillStatusEnum
+
+logger = get_logger(__name__)
+
+ACTIVE_STATUSES = (
+    BackfillStatusEnum.QUEUED.value,
+    BackfillStatusEnum.RUNNING.value,
+    BackfillStatusEnum.PAUSED.value,
+)
+
+# Candidates looked at per claim; others are left to the next poll
+_CLAIM_CANDIDATES = 10
+
+# Conditional updates are decided by the database, not by loaded objects
+_NO_SYNC = {"synchronize_session": False}
+
+
+class ActiveBackfillJobError(Exception):
+    """Raised when a user already has an active backfill job."""
+
+    def __init__(self, job_id: Optional[str]) -> None:
+        super().__init__(f"User already has an active backfill job: {job_id}")
+        self.job_id = job_id
+
+
+def _to_status(row: BackfillJob) -> BackfillStatus:
+    # The status column is authoritative; cancellation only updates it
+    return BackfillStatus.model_validate({**row.data, "status": row.status})
+
+
+def _status_value(status: Any) -> str:
+    return str(getattr(status, "value", status))
+
+
+class BackfillJobStore:
+    """Reads, writes and leases backfill jobs in the office database."""
+
+    def __init__(
+        self, session_factory: Optional[Callable[[], AsyncSession]] = None
+    ) -> None:
+        """
+        Initialize the store.
+
+        Args:
+            session_factory: Async session factory (defaults to the office
+                database)
+        """
+        self._session_factory = session_factory
+
+    def _session(self) -> AsyncSession:
+        factory = self._session_factory or get_async_session_factory()
+        return factory()
+
+    async def create(self, job: BackfillStatus) -> None:
+        """
+        Store a new job.
+
+        Args:
+            job: Job to store, normally queued
+
+        Raises:
+            ActiveBackfillJobError: If the user already has an active job
+        """
+        now = datetime.now(timezone.utc)
+        row = BackfillJob(
+            job_id=job.job_id,
+            user_id=job.user_id,
+            provider=_status_value(job.request.provider),
+            status=_status_value(job.status),
+            data=job.model_dump(mode="json"),
+            created_at=now,
+            updated_at=now,
+        )
+        async with self._session() as session:
+            session.add(row)
+            try:
+                await session.commit()
+            except IntegrityError:
+                await session.rollback()
+                active = await self.get_active(job.user_id)
+                raise ActiveBackfillJobError(active.job_id if active else None)
+
+    async def get(self, job_id: str, user_id: str) -> Optional[BackfillStatus]:
+        """
+        Get a job of a user.
+
+        Args:
+            job_id: Job ID
+            user_id: User the job must belong to
+
+        Returns:
+            The job, or None if the user has no such job
+        """
+        async with self._session() as session:
+            row = await session.get(BackfillJob, job_id)
+            if row is None or row.user_id != user_id:
+                return None
+            return _to_status(row)
+
+    async def get_active(self, user_id: str) -> Optional[BackfillStatus]:
+        """
+        Get the active (queued, running or paused) job of a user.
+
+        Args:
+            user_id: User ID
+
+        Returns:
+            The active job, or None
+        """
+        async with self._session() as session:
+            result = await session.execute(
+                select(BackfillJob).where(
+                    BackfillJob.user_id == user_id,
+                    BackfillJob.status.in_(ACTIVE_STATUSES),  # type: ignore[attr-defined]
+                )
+            )
+            row = result.scalars().first()
+            return _to_status(row) if row else None
+
+    async def list_for_user(
+        self, user_id: str, limit: int = 100
+    ) -> List[BackfillStatus]:
+        """
+        List a user's jobs, newest first.
+
+        Args:
+            user_id: User ID
+            limit: Maximum jobs returned
+
+        Returns:
+            The user's jobs
+        """
+        async with self._session() as session:
+            result = await session.execute(
+                select(BackfillJob)
+                .where(BackfillJob.user_id == user_id)
+                .order_by(BackfillJob.created_at.desc())  # type: ignore[attr-defined]
+                .limit(limit)
+            )
+            return [_to_status(row) for row in result.scalars()]
+
+    async def cancel(self, job_id: str, user_id: str) -> bool:
+        """
+        Cancel an active job.
+
+        A worker running the job sees the cancellation at its next
+        checkpoint and stops.
+
+        Args:
+            job_id: Job ID
+            user_id: User the job must belong to
+
+        Returns:
+            True if the job was active and is now cancelled
+        """
+        now = datetime.now(timezone.utc)
+        async with self._session() as session:
+            row = await session.get(BackfillJob, job_id)
+            if row is None or row.user_id != user_id:
+                return False
+            data = {
+                **row.data,
+                "status": BackfillStatusEnum.CANCELLED.value,
+                "end_time": now.isoformat(),
+            }
+            result = await session.execute(
+                update(BackfillJob)
+                .where(
+                    BackfillJob.job_id == job_id,  # type: ignore[arg-type]
+                    BackfillJob.status.in_(ACTIVE_STATUSES),  # type: ignore[attr-defined]
+                )
+                .values(
+                    status=BackfillStatusEnum.CANCELLED.value,
+                    data=data,
+                    updated_at=now,
+                ),
+                execution_options=_NO_SYNC,
+            )
+            await session.commit()
+            return bool(result.rowcount)  # type: ignore[attr-defined]
+
+    async def claim(
+        self,
+        owner: str,
+        lease_seconds: float,
+        max_running: Dict[str, int],
+        max_attempts: int,
+    ) -> Optional[BackfillStatus]:
+        """
+        Lease the oldest runnable job.
+
+        Runnable jobs are queued jobs and running jobs whose lease has lapsed.
+        Providers already running ``max_running`` jobs are skipped; this is a
+        soft cap, as concurrent claims from other replicas are not locked out
+        of the count. A job claimed ``max_attempts`` times is marked failed
+        instead of run again; claims handed back by ``release`` don't count.
+
+        Args:
+            owner: Name of the claiming worker
+            lease_seconds: Seconds the lease lasts without a checkpoint
+            max_running: Running job cap per provider
+            max_attempts: Claims allowed per job
+
+        Returns:
+            The claimed job, marked running, or None if no job is runnable
+        """
+        now = datetime.now(timezone.utc)
+        claimable = or_(
+            BackfillJob.status == BackfillStatusEnum.QUEUED.value,  # type: ignore[arg-type]
+            and_(
+                BackfillJob.status == BackfillStatusEnum.RUNNING.value,  # type: ignore[arg-type]
+                or_(
+                    BackfillJob.lease_expires_at.is_(None),  # type: ignore[union-attr]
+                    BackfillJob.lease_expires_at <= now,  # type: ignore[operator,arg-type]
+                ),
+            ),
+        )
+
+        async with self._session() as session:
+            counts = await session.execute(
+                select(BackfillJob.provider, func.count())
+                .where(
+                    BackfillJob.status == BackfillStatusEnum.RUNNING.value,
+                    BackfillJob.lease_expires_at > now,  # type: ignore[operator]
+                )
+                .group_by(BackfillJob.provider)
+            )
+            running = {provider: count for provider, count in counts.all()}
+            full = [
+                provider
+                for provider, cap in max_running.items()
+                if running.get(provider, 0) >= cap
+            ]
+
+            query = select(BackfillJob).where(claimable)
+            if full:
+                query = query.where(
+                    BackfillJob.provider.not_in(full)  # type: ignore[attr-defined]
+                )
+            rows = await session.execute(
+                query.order_by(BackfillJob.created_at)  # type: ignore[arg-type]
+                .limit(_CLAIM_CANDIDATES)
+                .with_for_update(skip_locked=True)
+            )
+            candidates = list(rows.scalars())
+
+            for row in candidates:
+                if row.attempts >= max_attempts:
+                    await self._fail_exhausted(session, row, claimable, now)
+                    continue
+
+                job = _to_status(row)
+                job.status = BackfillStatusEnum.RUNNING
+                # The same condition as the select: whoever updates first wins
+                result = await session.execute(
+                    update(BackfillJob)
+                    .where(
+                        BackfillJob.job_id == row.job_id,  # type: ignore[arg-type]
+                        claimable,
+                    )
+                    .values(
+                        status=BackfillStatusEnum.RUNNING.value,
+                        data=job.model_dump(mode="json"),
+                        lease_owner=owner,
+                        lease_expires_at=now + timedelta(seconds=lease_seconds),
+                        attempts=BackfillJob.attempts + 1,
+                        updated_at=now,
+                    ),
+                    execution_options=_NO_SYNC,
+                )
+                if result.rowcount:  # type: ignore[attr-defined]
+                    await session.commit()
+                    logger.info(
+                        f"Claimed backfill job {row.job_id}",
+                        extra={
+                            "job_id": row.job_id,
+                            "owner": owner,
+                            "attempt": row.attempts + 1,
+                            "resumed": bool(job.shards),
+                        },
+                    )
+                    return job
+
+            await session.commit()
+            return None
+
+    async def _fail_exhausted(
+        self, session: AsyncSession, row: BackfillJob, claimable: Any, now: datetime
+    ) -> None:
+        data = {
+            **row.data,
+            "status": BackfillStatusEnum.FAILED.value,
+            "end_time": now.isoformat(),
+            "error_message": f"Backfill job gave up after {row.attempts} attempts",
+        }
+        await session.execute(
+            update(BackfillJob)
+            .where(
+                BackfillJob.job_id == row.job_id,  # type: ignore[arg-type]
+                claimable,
+            )
+            .values(
+                status=BackfillStatusEnum.FAILED.value,
+                data=data,
+                lease_owner=None,
+                lease_expires_at=None,
+                updated_at=now,
+            ),
+            execution_options=_NO_SYNC,
+        )
+        logger.error(
+            f"Backfill job {row.job_id} failed after {row.attempts} attempts",
+            extra={"job_id": row.job_id},
+        )
+
+    async def checkpoint(
+        self, job: BackfillStatus, owner: str, lease_seconds: float
+    ) -> Optional[BackfillStatusEnum]:
+        """
+        Save a running job's progress and renew its lease.
+
+        Args:
+            job: Job as the worker sees it
+            owner: Worker holding the lease
+            lease_seconds: Seconds the renewed lease lasts
+
+        Returns:
+            The job's stored status (cancelled if it was cancelled meanwhile),
+            or None if the worker no longer holds the lease
+        """
+        now = datetime.now(timezone.utc)
+        async with self._session() as session:
+            result = await session.execute(
+                update(BackfillJob)
+                .where(
+                    BackfillJob.job_id == job.job_id,  # type: ignore[arg-type]
+                    BackfillJob.lease_owner == owner,  # type: ignore[arg-type]
+                    BackfillJob.status == BackfillStatusEnum.RUNNING.value,  # type: ignore[arg-type]
+                )
+                .values(
+                    data=job.model_dump(mode="json"),
+                    lease_expires_at=now + timedelta(seconds=lease_seconds),
+                    updated_at=now,
+                ),
+                execution_options=_NO_SYNC,
+            )
+            if result.rowcount:  # type: ignore[attr-defined]
+                await session.commit()
+                return BackfillStatusEnum.RUNNING
+
+            row = await session.get(BackfillJob, job.job_id)
+            if row is None or row.lease_owner != owner:
+                return None
+            return BackfillStatusEnum(row.status)
+
+    async def release(self, job: BackfillStatus, owner: str) -> None:
+        """
+        Save a job's final state and give up its lease.
+
+        A job that is still running (its worker was stopped) is left
+        claimable, so another worker resumes it straight away, and its claim
+        is not counted against ``max_attempts``. A job cancelled while it ran
+        stays cancelled.
+
+        Args:
+            job: Job as the worker left it
+            owner: Worker holding the lease
+        """
+        now = datetime.now(timezone.utc)
+        async with self._session() as session:
+            row = await session.get(BackfillJob, job.job_id)
+            if row is None or row.lease_owner != owner:
+                logger.warning(
+                    f"Lost the lease on backfill job {job.job_id} before releasing it"
+                )
+                return
+            status = _status_value(job.status)
+            data = job.model_dump(mode="json")
+            if row.status == BackfillStatusEnum.CANCELLED.value:
+                status = row.status
+                data = {**data, "status": status, "end_time": row.data.get("end_time")}
+            # A graceful stop hands the claim back; only lapsed leases use one up
+            attempts = (
+                BackfillJob.attempts - 1
+                if status == BackfillStatusEnum.RUNNING.value
+                else BackfillJob.attempts
+            )
+            await session.execute(
+                update(BackfillJob)
+                .where(
+                    BackfillJob.job_id == job.job_id,  # type: ignore[arg-type]
+                    BackfillJob.lease_owner == owner,  # type: ignore[arg-type]
+                )
+                .values(
+                    status=status,
+                    data=data,
+                    attempts=attempts,
+                    lease_owner=None,
+                    lease_expires_at=None,
+                    updated_at=now,
+                ),
+                execution_options=_NO_SYNC,
+            )
+            await session.commit()
+
+
+backfill_job_store = BackfillJobStore()
@@ -0,0 +1,177 @@
+"""
+Pool of workers running backfill jobs from the durable job store.
+
+Every replica runs a pool. An idle worker claims the oldest runnable job
+(see BackfillJobStore.claim), runs it, and checkpoints it on a heartbeat that
+also renews the lease and picks up cancellations made through any replica.
+Stopping the pool saves and releases the jobs it was running, so another
+replica resumes them instead of waiting for their leases to lapse.
+"""
+
+import asyncio
+import contextlib
+import os
+import socket
+import uuid
+from typing import Any, Callable, Coroutine, Dict, List, Optional
+
+from services.common.logging_config import get_logger
+from services.office.core.backfill_store import BackfillJobStore, backfill_job_store
+from services.office.core.settings import get_settings
+from services.office.models.backfill import BackfillStatus, BackfillStatusEnum
+
+logger = get_logger(__name__)
+
+JobRunner = Callable[[BackfillStatus], Coroutine[Any, Any, None]]
+
+
+class BackfillWorkerPool:
+    """Claims and runs backfill jobs under leases."""
+
+    def __init__(
+        self,
+        store: Optional[BackfillJobStore] = None,
+        runner: Optional[JobRunner] = None,
+        worker_count: Optional[int] = None,
+        owner: Optional[str] = None,
+    ) -> None:
+        """
+        Initialize the pool.
+
+        Args:
+            store: Job store (defaults to the office database store)
+            runner: Runs one job to completion, updating it in place
+                (defaults to run_backfill_job)
+            worker_count: Jobs run at the same time (defaults from settings)
+            owner: Lease owner name (defaults to host, pid and a random suffix)
+        """
+        self.store = store or backfill_job_store
+        self._runner = runner
+        self._worker_count = worker_count
+        self.owner = owner or (
+            f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        )
+        self._workers: List["asyncio.Task[None]"] = []
+        self._running: Dict[str, BackfillStatus] = {}
+        self._wakeup = asyncio.Event()
+        self._stopping = False
+
+    @property
+    def runner(self) -> JobRunner:
+        if self._runner is None:
+            from services.office.api.backfill import run_backfill_job
+
+            self._runner = run_backfill_job
+        return self._runner
+
+    async def start(self) -> None:
+        """Start the workers."""
+        if self._workers:
+            return
+        self._stopping = False
+        count = self._worker_count or get_settings().backfill_job_workers
+        self._workers = [
+            asyncio.create_task(self._work(), name=f"backfill-worker-{i}")
+            for i in range(count)
+        ]
+        logger.info(f"Started {count} backfill workers as {self.owner}")
+
+    async def stop(self) -> None:
+        """Stop the workers, releasing the jobs they were running."""
+        self._stopping = True
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    def notify(self) -> None:
+        """Wake idle workers, e.g. after a job was queued on this replica."""
+        self._wakeup.set()
+
+    def running_jobs(self) -> List[str]:
+        """IDs of the jobs this replica is running."""
+        return list(self._running)
+
+    async def _work(self) -> None:
+        settings = get_settings()
+        max_running = {
+            "google": settings.backfill_google_max_jobs,
+            "microsoft": settings.backfill_microsoft_max_jobs,
+        }
+        while True:
+            try:
+                job = await self.store.claim(
+                    self.owner,
+                    settings.backfill_lease_seconds,
+                    max_running,
+                    settings.backfill_max_attempts,
+                )
+            except Exception as e:
+                logger.error(f"Failed to claim a backfill job: {e}")
+                job = None
+
+            if job is None:
+                self._wakeup.clear()
+                with contextlib.suppress(asyncio.TimeoutError):
+                    await asyncio.wait_for(
+                        self._wakeup.wait(), settings.backfill_poll_seconds
+                    )
+                continue
+
+            await self._run(job)
+
+    async def _run(self, job: BackfillStatus) -> None:
+        """Run a claimed job with a heartbeat, then release it."""
+        self._running[job.job_id] = job
+        task = asyncio.create_task(self.runner(job))
+        heartbeat = asyncio.create_task(self._heartbeat(job, task))
+        try:
+            await asyncio.shield(task)
+        except asyncio.CancelledError:
+            if self._stopping or not task.done():
+                # The pool is stopping: stop the job and hand it back
+                task.cancel()
+                await asyncio.gather(task, return_exceptions=True)
+                raise
+            # The heartbeat stopped the job after another worker took it over
+        except Exception as e:
+            # run_backfill_job records its own failures; this is a bug
+            logger.error(f"Backfill job {job.job_id} raised: {e}")
+            job.status = BackfillStatusEnum.FAILED
+            job.error_message = str(e)
+        finally:
+            heartbeat.cancel()
+            await asyncio.gather(heartbeat, return_exceptions=True)
+            self._running.pop(job.job_id, None)
+            try:
+                await asyncio.shield(self.store.release(job, self.owner))
+            except Exception as e:
+                logger.error(f"Failed to release backfill job {job.job_id}: {e}")
+
+    async def _heartbeat(self, job: BackfillStatus, task: "asyncio.Task[None]") -> None:
+        settings = get_settings()
+        while True:
+            await asyncio.sleep(settings.backfill_heartbeat_seconds)
+            try:
+                status = await self.store.checkpoint(
+                    job, self.owner, settings.backfill_lease_seconds
+                )
+            except Exception as e:
+                # Keep running; the lease may lapse and the job be resumed
+                # elsewhere, which at worst republishes some messages
+                logger.error(f"Failed to checkpoint backfill job {job.job_id}: {e}")
+                continue
+
+            if status is None:
+                logger.warning(
+                    f"Lost the lease on backfill job {job.job_id}, stopping it"
+                )
+                task.cancel()
+                return
+            if status in (BackfillStatusEnum.CANCELLED, BackfillStatusEnum.PAUSED):
+                # The pipeline stops at its next page
+                job.status = status
+                return
+
+
+backfill_workers = BackfillWorkerPool()
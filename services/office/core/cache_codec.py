@@ -0,0 +1,251 @@
+"""
+Compact binary encoding for values cached by CacheManager.get_or_compute.
+
+An entry is a fixed header followed by the value's JSON:
+
+    magic (2 bytes) | compression (1 byte) | fresh_until (8-byte float) | payload
+
+JSON is produced by orjson when it is installed (Pydantic models use their
+own Rust serializer) and payloads above COMPRESSION_THRESHOLD bytes are
+compressed with zstd, or zlib when zstandard is not installed.
+
+Entries holding a Pydantic model are rebuilt with model_construct instead of
+being validated again: the value was validated when it was produced, and
+validation (email addresses in particular) costs far more than decoding a
+page of messages.
+"""
+
+import json
+import struct
+import types
+import zlib
+from datetime import date, datetime
+from enum import Enum
+from functools import lru_cache
+from typing import (
+    Annotated,
+    Any,
+    Callable,
+    Dict,
+    Optional,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+    get_args,
+    get_origin,
+)
+
+from pydantic import BaseModel
+
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import zstandard
+
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+MAGIC = b"\xc7\x01"
+COMPRESSION_NONE = 0
+COMPRESSION_ZLIB = 1
+COMPRESSION_ZSTD = 2
+
+# Payloads smaller than this are stored uncompressed
+COMPRESSION_THRESHOLD = 1024
+
+_HEADER = struct.Struct("!2sBd")
+_ZSTD_LEVEL = 3
+_ZLIB_LEVEL = 6
+
+# JSON errors are ValueErrors; the rest come from data not matching the model
+_DECODE_ERRORS: Tuple[Type[Exception], ...] = (
+    ValueError,
+    TypeError,
+    KeyError,
+    AttributeError,
+    zlib.error,
+)
+if ZSTD_AVAILABLE:
+    _DECODE_ERRORS += (zstandard.ZstdError,)
+
+
+def _default(obj: Any) -> Any:
+    if isinstance(obj, BaseModel):
+        return obj.model_dump(mode="json")
+    if isinstance(obj, datetime):
+        return obj.isoformat()
+    raise TypeError(f"Object of type {type(obj)} is not JSON serializable")
+
+
+def dumps(value: Any) -> bytes:
+    """
+    Serialize a value to JSON bytes.
+
+    Args:
+        value: Pydantic model or JSON-compatible value (models and datetimes
+            may be nested)
+
+    Returns:
+        UTF-8 JSON
+    """
+    if isinstance(value, BaseModel):
+        return value.model_dump_json().encode()
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(value, default=_default)
+    return json.dumps(value, default=_default, separators=(",", ":")).encode()
+
+
+def _loads(payload: bytes) -> Any:
+    if ORJSON_AVAILABLE:
+        return orjson.loads(payload)
+    return json.loads(payload)
+
+
+Converter = Callable[[Any], Any]
+
+
+@lru_cache(maxsize=None)
+def _converter(annotation: Any) -> Optional[Converter]:
+    """Converter from JSON back to a value of the annotation (None: use as is)"""
+    origin = get_origin(annotation)
+    if origin is Annotated:
+        return _converter(get_args(annotation)[0])
+    if origin is Union or origin is types.UnionType:
+        args = [arg for arg in get_args(annotation) if arg is not type(None)]
+        inner = _converter(args[0]) if len(args) == 1 else None
+        if inner is None:
+            return None
+        return lambda value: None if value is None else inner(value)
+    if origin is list:
+        item = _converter((get_args(annotation) or (Any,))[0])
+        if item is None:
+            return None
+        return lambda value: [item(v) for v in value]
+    if origin is dict:
+        entry = _converter((get_args(annotation) or (Any, Any))[1])
+        if entry is None:
+            return None
+        return lambda value: {k: entry(v) for k, v in value.items()}
+    if isinstance(annotation, type):
+        if issubclass(annotation, BaseModel):
+            return lambda value: construct(annotation, value)
+        if issubclass(annotation, datetime):
+            return datetime.fromisoformat
+        if issubclass(annotation, date):
+            return date.fromisoformat
+        if issubclass(annotation, Enum):
+            return annotation
+    return None
+
+
+@lru_cache(maxsize=None)
+def _fields(
+    model: Type[BaseModel],
+) -> Tuple[Tuple[str, bool, Optional[Converter]], ...]:
+    fields = []
+    for name, field in model.model_fields.items():
+        # Pydantic types this as a type form, which is hashable at runtime
+        annotation: Any = field.annotation
+        fields.append((name, field.is_required(), _converter(annotation)))
+    return tuple(fields)
+
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+
+def construct(model: Type[ModelT], data: Dict[str, Any]) -> ModelT:
+    """
+    Rebuild a model from its own JSON dump without validating it.
+
+    Nested models, lists, dicts, datetimes and enums are rebuilt from their
+    field annotations; other values are used as they are.
+
+    Args:
+        model: Model class the data was dumped from
+        data: Parsed JSON of model_dump_json()
+
+    Returns:
+        Model instance
+
+    Raises:
+        KeyError: If a required field is missing
+    """
+    values = {}
+    for name, required, convert in _fields(model):
+        if name not in data:
+            if required:
+                raise KeyError(name)
+            continue
+        value = data[name]
+        values[name] = (
+            convert(value) if convert is not None and value is not None else value
+        )
+    return model.model_construct(**values)
+
+
+def encode_entry(value: Any, fresh_until: float) -> bytes:
+    """
+    Encode a cache entry.
+
+    Args:
+        value: Value to cache
+        fresh_until: Unix time until which the value is fresh
+
+    Returns:
+        Encoded entry
+    """
+    payload = dumps(value)
+    compression = COMPRESSION_NONE
+    if len(payload) > COMPRESSION_THRESHOLD:
+        if ZSTD_AVAILABLE:
+            payload = zstandard.ZstdCompressor(level=_ZSTD_LEVEL).compress(payload)
+            compression = COMPRESSION_ZSTD
+        else:
+            payload = zlib.compress(payload, _ZLIB_LEVEL)
+            compression = COMPRESSION_ZLIB
+    return _HEADER.pack(MAGIC, compression, fresh_until) + payload
+
+
+def decode_entry(
+    data: bytes, model: Optional[Type[BaseModel]] = None
+) -> Optional[Tuple[Any, float]]:
+    """
+    Decode a cache entry.
+
+    Args:
+        data: Encoded entry
+        model: Pydantic model the value was cached as, if any
+
+    Returns:
+        Tuple of the value and its fresh-until time, or None if the data is
+        not an entry in this format (or cannot be decoded)
+    """
+    if len(data) < _HEADER.size or not data.startswith(MAGIC):
+        return None
+    _, compression, fresh_until = _HEADER.unpack_from(data)
+    payload = data[_HEADER.size :]
+    try:
+        if compression == COMPRESSION_ZSTD:
+            if not ZSTD_AVAILABLE:
+                return None
+            payload = zstandard.ZstdDecompressor().decompress(payload)
+        elif compression == COMPRESSION_ZLIB:
+            payload = zlib.decompress(payload)
+        elif compression != COMPRESSION_NONE:
+            return None
+
+        if model is not None:
+            data = _loads(payload)
+            if not isinstance(data, dict):
+                return None
+            return construct(model, data), fresh_until
+        return _loads(payload), fresh_until
+    except _DECODE_ERRORS:
+        return None
@@ -1,22 +1,73 @@
 """
 Cache manager for the Office Service using Redis.
 Provides async methods for caching API responses with TTL support.
+
+Hot endpoints go through get_or_compute, which serves stale entries while a
+single background refresh runs, so an expiring key does not send every
+concurrent request to the providers at once. Its entries are stored in the
+compact binary format of cache_codec and also kept, decoded, in an in-process
+LRU tier for a few seconds.
+
+Writes can register their key under invalidation tags (Redis sets named by
+generate_cache_tag, e.g. all message lists of a user, or one thread), so that
+a mutation deletes exactly the affected keys with invalidate_tags instead of
+walking the keyspace.
 """
 
 import asyncio
 import hashlib
 import json
 import logging
+import time
+import uuid
+from collections import defaultdict
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    FrozenSet,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Type,
+    Union,
+)
 
 import redis.asyncio as redis
+from pydantic import BaseModel
 from redis.asyncio import Redis
+from redis.asyncio.client import PubSub
 
+from services.office.core.cache_codec import decode_entry, encode_entry
+from services.office.core.local_cache import LocalCache
 from services.office.core.settings import get_settings
 
 logger = logging.getLogger(__name__)
 
+# get_or_compute outcomes
+CACHE_HIT = "hit"
+CACHE_STALE = "stale"
+CACHE_MISS = "miss"
+
+# Seconds between checks for a value another replica is computing
+_LOCK_POLL_INTERVAL_SECONDS = 0.05
+
+# Keys deleted per UNLINK, and keys asked for per SCAN step
+_DELETE_BATCH_SIZE = 500
+_SCAN_COUNT = 1000
+
+# Deletes the lock only if this process still owns it
+_RELEASE_LOCK_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
 
 class CacheManager:
     """
@@ -27,30 +78,76 @@ class CacheManager:
 
     def __init__(self) -> None:
         self._redis: Optional[Redis] = None
+        # get_or_compute entries are binary, so they use a second client that
+        # does not decode responses
+        self._binary_redis: Optional[Redis] = None
         self._connection_lock = asyncio.Lock()
+        self._local: Optional[LocalCache] = None
+        # Producers currently running, by cache key
+        self._inflight: Dict[str, "asyncio.Task[Any]"] = {}
+        # Tags of running producers, and the keys invalidated while running
+        # (whose results must then not be cached)
+        self._inflight_tags: Dict[str, FrozenSet[str]] = {}
+        self._invalidated_inflight: Set[str] = set()
+        # Namespace -> outcome -> count
+        self._stats: Dict[str, Dict[str, int]] = defaultdict(
+            lambda: {
+                CACHE_HIT: 0,
+                CACHE_STALE: 0,
+                CACHE_MISS: 0,
+                "local_hits": 0,
+                "refresh_errors": 0,
+            }
+        )
+
+    async def _connect(self, decode_responses: bool) -> Redis:
+        try:
+            client = redis.from_url(  # type: ignore[no-untyped-call]
+                get_settings().REDIS_URL,
+                encoding="utf-8",
+                decode_responses=decode_responses,
+                socket_timeout=5.0,
+                socket_connect_timeout=5.0,
+                retry_on_timeout=True,
+            )
+            # Test connection
+            await client.ping()
+            logger.info("Redis connection established successfully")
+            return client
+        except Exception as e:
+            logger.error(f"Failed to connect to Redis: {e}")
+            raise
 
     async def _get_redis(self) -> Redis:
         """Get Redis connection with lazy initialization."""
         if self._redis is None:
             async with self._connection_lock:
                 if self._redis is None:
-                    try:
-                        self._redis = redis.from_url(  # type: ignore[no-untyped-call]
-                            get_settings().REDIS_URL,
-                            encoding="utf-8",
-                            decode_responses=True,
-                            socket_timeout=5.0,
-                            socket_connect_timeout=5.0,
-                            retry_on_timeout=True,
-                        )
-                        # Test connection
-                        await self._redis.ping()
-                        logger.info("Redis connection established successfully")
-                    except Exception as e:
-                        logger.error(f"Failed to connect to Redis: {e}")
-                        raise
+                    self._redis = await self._connect(decode_responses=True)
         return self._redis
 
+    async def _get_binary_redis(self) -> Redis:
+        """Get the Redis connection for binary values, with lazy initialization."""
+        if self._binary_redis is None:
+            async with self._connection_lock:
+                if self._binary_redis is None:
+                    self._binary_redis = await self._connect(decode_responses=False)
+        return self._binary_redis
+
+    @property
+    def local_cache(self) -> Optional[LocalCache]:
+        """The in-process tier, or None when CACHE_LOCAL_ENABLED is off."""
+        if self._local is None:
+            settings = get_settings()
+            if not settings.CACHE_LOCAL_ENABLED:
+                return None
+            self._local = LocalCache(
+                max_entries=settings.CACHE_MAX_SIZE,
+                max_bytes=settings.CACHE_LOCAL_MAX_BYTES,
+                ttl_seconds=settings.CACHE_LOCAL_TTL,
+            )
+        return self._local
+
     async def get_from_cache(self, key: str) -> Optional[Any]:
         """
         Retrieve data from cache.
@@ -79,7 +176,11 @@ class CacheManager:
             return None
 
     async def set_to_cache(
-        self, key: str, data: Any, ttl_seconds: Optional[int] = None
+        self,
+        key: str,
+        data: Any,
+        ttl_seconds: Optional[int] = None,
+        tags: Sequence[str] = (),
     ) -> bool:
         """
         Store data in cache with optional TTL.
@@ -88,6 +189,7 @@ class CacheManager:
             key: Cache key to store under
             data: Data to cache (must be JSON serializable)
             ttl_seconds: Time to live in seconds (defaults to settings.DEFAULT_CACHE_TTL_SECONDS)
+            tags: Invalidation tags to register the key under
 
         Returns:
             True if successful, False otherwise
@@ -103,7 +205,7 @@ class CacheManager:
                 ttl_seconds = get_settings().CACHE_TTL
 
             # Set data with TTL
-            await redis_client.setex(key, ttl_seconds, serialized_data)
+            await self._setex(redis_client, key, ttl_seconds, serialized_data, tags)
 
             logger.debug(f"Cached data for key: {key} (TTL: {ttl_seconds}s)")
             return True
@@ -112,6 +214,347 @@ class CacheManager:
             logger.error(f"Failed to set data to cache for key '{key}': {e}")
             return False
 
+    async def get_raw(self, key: str) -> Optional[bytes]:
+        """
+        Retrieve raw bytes from cache.
+
+        Args:
+            key: Cache key to retrieve
+
+        Returns:
+            Cached bytes if they exist, None otherwise
+        """
+        try:
+            redis_client = await self._get_binary_redis()
+            data = await redis_client.get(key)
+            if isinstance(data, str):
+                return data.encode()
+            return data
+
+        except Exception as e:
+            logger.error(f"Failed to get data from cache for key '{key}': {e}")
+            return None
+
+    async def set_raw(
+        self, key: str, data: bytes, ttl_seconds: int, tags: Sequence[str] = ()
+    ) -> bool:
+        """
+        Store raw bytes in cache.
+
+        Args:
+            key: Cache key to store under
+            data: Bytes to cache
+            ttl_seconds: Time to live in seconds
+            tags: Invalidation tags to register the key under
+
+        Returns:
+            True if successful, False otherwise
+        """
+        try:
+            redis_client = await self._get_binary_redis()
+            await self._setex(redis_client, key, ttl_seconds, data, tags)
+            logger.debug(
+                f"Cached {len(data)} bytes for key: {key} (TTL: {ttl_seconds}s)"
+            )
+            return True
+
+        except Exception as e:
+            logger.error(f"Failed to set data to cache for key '{key}': {e}")
+            return False
+
+    async def _setex(
+        self,
+        redis_client: Redis,
+        key: str,
+        ttl_seconds: int,
+        value: Union[str, bytes],
+        tags: Sequence[str],
+    ) -> None:
+        """Set a key and add it to its tag sets in one round trip"""
+        if not tags:
+            await redis_client.setex(key, ttl_seconds, value)
+            return
+        # Tag sets outlive every key they hold, so no tagged key is orphaned
+        tag_ttl = max(get_settings().CACHE_TAG_TTL, ttl_seconds)
+        async with redis_client.pipeline(transaction=False) as pipe:
+            pipe.setex(key, ttl_seconds, value)
+            for tag in tags:
+                pipe.sadd(tag, key)
+                pipe.expire(tag, tag_ttl)
+            await pipe.execute()
+
+    async def get_or_compute(
+        self,
+        key: str,
+        producer: Callable[[], Awaitable[Any]],
+        ttl_seconds: Optional[int] = None,
+        stale_ttl_seconds: Optional[int] = None,
+        namespace: str = "default",
+        force_refresh: bool = False,
+        should_cache: Optional[Callable[[Any], bool]] = None,
+        model: Optional[Type[BaseModel]] = None,
+        tags: Sequence[str] = (),
+    ) -> Tuple[Any, str]:
+        """
+        Get a cached value, computing it with the producer if needed.
+
+        Entries are fresh for ttl_seconds and may then be served for another
+        stale_ttl_seconds while a background refresh replaces them. Only one
+        producer runs per key in this process; with CACHE_REFRESH_LOCK set,
+        a Redis lock also keeps other replicas from refreshing the same key.
+
+        Values read from Redis are kept in the in-process tier for
+        CACHE_LOCAL_TTL seconds and are shared between callers, so they must
+        not be mutated.
+
+        Args:
+            key: Cache key
+            producer: Coroutine factory computing the value, either an
+                instance of model or a JSON-compatible value
+            ttl_seconds: Seconds the value is fresh (defaults to
+                settings.CACHE_TTL)
+            stale_ttl_seconds: Seconds a stale value may still be served
+                (defaults to settings.CACHE_STALE_TTL)
+            namespace: Endpoint namespace the hit/miss/stale counters are
+                kept under (e.g. "unified:messages")
+            force_refresh: Skip the cache read and always run the producer
+            should_cache: Predicate deciding whether a computed value is
+                stored; failures are best left uncached
+            model: Pydantic model the producer returns; cached values are
+                decoded straight into it
+            tags: Invalidation tags to register the key under. A value
+                whose tags are invalidated while it is computed is returned
+                but not cached.
+
+        Returns:
+            Tuple of the value and CACHE_HIT, CACHE_STALE or CACHE_MISS
+        """
+        settings = get_settings()
+        if ttl_seconds is None:
+            ttl_seconds = settings.CACHE_TTL
+        if stale_ttl_seconds is None:
+            stale_ttl_seconds = settings.CACHE_STALE_TTL
+
+        if not force_refresh:
+            cached = await self._read_entry(key, namespace, model, tags)
+            if cached is not None:
+                value, fresh_until = cached
+                if fresh_until > time.time():
+                    self._stats[namespace][CACHE_HIT] += 1
+                    return value, CACHE_HIT
+
+                self._stats[namespace][CACHE_STALE] += 1
+                if key not in self._inflight:
+                    self._start_compute(
+                        key,
+                        producer,
+                        ttl_seconds,
+                        stale_ttl_seconds,
+                        namespace,
+                        should_cache,
+                        model,
+                        tags,
+                        background=True,
+                    )
+                return value, CACHE_STALE
+
+        self._stats[namespace][CACHE_MISS] += 1
+        task = self._inflight.get(key)
+        if task is None:
+            task = self._start_compute(
+                key,
+                producer,
+                ttl_seconds,
+                stale_ttl_seconds,
+                namespace,
+                should_cache,
+                model,
+                tags,
+                background=False,
+            )
+        # Shield the shared computation so one cancelled caller does not
+        # cancel it for every other waiter
+        return await asyncio.shield(task), CACHE_MISS
+
+    def _start_compute(
+        self,
+        key: str,
+        producer: Callable[[], Awaitable[Any]],
+        ttl_seconds: int,
+        stale_ttl_seconds: int,
+        namespace: str,
+        should_cache: Optional[Callable[[Any], bool]],
+        model: Optional[Type[BaseModel]],
+        tags: Sequence[str],
+        background: bool,
+    ) -> "asyncio.Task[Any]":
+        task = asyncio.create_task(
+            self._compute(
+                key,
+                producer,
+                ttl_seconds,
+                stale_ttl_seconds,
+                should_cache,
+                model,
+                tags,
+            )
+        )
+        self._inflight[key] = task
+        self._inflight_tags[key] = frozenset(tags)
+
+        def _done(finished: "asyncio.Task[Any]") -> None:
+            self._inflight.pop(key, None)
+            self._inflight_tags.pop(key, None)
+            self._invalidated_inflight.discard(key)
+            if finished.cancelled():
+                return
+            error = finished.exception()
+            if error is not None and background:
+                self._stats[namespace]["refresh_errors"] += 1
+                logger.warning(f"Background refresh failed for key '{key}': {error}")
+
+        task.add_done_callback(_done)
+        return task
+
+    async def _compute(
+        self,
+        key: str,
+        producer: Callable[[], Awaitable[Any]],
+        ttl_seconds: int,
+        stale_ttl_seconds: int,
+        should_cache: Optional[Callable[[Any], bool]],
+        model: Optional[Type[BaseModel]],
+        tags: Sequence[str],
+    ) -> Any:
+        """Run the producer (under the refresh lock if enabled) and store the value"""
+        lock_token: Optional[str] = None
+        if get_settings().CACHE_REFRESH_LOCK:
+            lock_token = await self._acquire_lock(key)
+            if lock_token is None:
+                # Another replica is computing this key; use its value unless
+                # it gives up or takes longer than the lock allows
+                cached = await self._wait_for_value(key, model)
+                if cached is not None:
+                    return cached
+
+        try:
+            value = await producer()
+            if key in self._invalidated_inflight:
+                logger.debug(f"Not caching key invalidated while computing: {key}")
+            elif should_cache is None or should_cache(value):
+                fresh_until = time.time() + ttl_seconds
+                data = encode_entry(value, fresh_until)
+                await self.set_raw(key, data, ttl_seconds + stale_ttl_seconds, tags)
+                local = self.local_cache
+                if local is not None:
+                    local.set(key, value, fresh_until, len(data), tags)
+            return value
+        finally:
+            if lock_token is not None:
+                await self._release_lock(key, lock_token)
+
+    async def _read_entry(
+        self,
+        key: str,
+        namespace: str,
+        model: Optional[Type[BaseModel]],
+        tags: Sequence[str],
+    ) -> Optional[Tuple[Any, float]]:
+        """Read an entry through the in-process tier, returning (value, fresh_until)"""
+        local = self.local_cache
+        if local is not None:
+            entry = local.get(key)
+            if entry is not None:
+                self._stats[namespace]["local_hits"] += 1
+                return entry.value, entry.fresh_until
+
+        data = await self.get_raw(key)
+        if data is None:
+            return None
+        decoded = decode_entry(data, model)
+        if decoded is None:
+            # Written in another format (or by an older release); recompute
+            logger.debug(f"Ignoring undecodable cache entry for key: {key}")
+            return None
+        if local is not None:
+            local.set(key, decoded[0], decoded[1], len(data), tags)
+        return decoded
+
+    async def _acquire_lock(self, key: str) -> Optional[str]:
+        """
+        Take the refresh lock for a key.
+
+        Returns:
+            The lock token, or None if another process holds the lock. If
+            Redis is unreachable a local token is returned so the refresh
+            still runs.
+        """
+        token = uuid.uuid4().hex
+        try:
+            redis_client = await self._get_redis()
+            acquired = await redis_client.set(
+                f"{key}:lock",
+                token,
+                nx=True,
+                px=int(get_settings().CACHE_REFRESH_LOCK_TTL * 1000),
+            )
+        except Exception as e:
+            logger.error(f"Failed to acquire refresh lock for key '{key}': {e}")
+            return token
+        return token if acquired else None
+
+    async def _release_lock(self, key: str, token: str) -> None:
+        try:
+            redis_client = await self._get_redis()
+            await redis_client.eval(_RELEASE_LOCK_SCRIPT, 1, f"{key}:lock", token)
+        except Exception as e:
+            logger.error(f"Failed to release refresh lock for key '{key}': {e}")
+
+    async def _wait_for_value(
+        self, key: str, model: Optional[Type[BaseModel]]
+    ) -> Optional[Any]:
+        """Wait for a fresh value another replica is computing, up to the lock TTL"""
+        deadline = time.monotonic() + get_settings().CACHE_REFRESH_LOCK_TTL
+        while time.monotonic() < deadline:
+            await asyncio.sleep(_LOCK_POLL_INTERVAL_SECONDS)
+            data = await self.get_raw(key)
+            decoded = decode_entry(data, model) if data is not None else None
+            if decoded is not None and decoded[1] > time.time():
+                return decoded[0]
+            if not await self.exists(f"{key}:lock"):
+                break
+        return None
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Hit, miss and stale counts per endpoint namespace.
+
+        Returns:
+            Mapping of namespace to its counters and hit ratio
+        """
+        stats: Dict[str, Dict[str, Any]] = {}
+        for namespace, counters in self._stats.items():
+            lookups = counters[CACHE_HIT] + counters[CACHE_STALE] + counters[CACHE_MISS]
+            stats[namespace] = {
+                **counters,
+                "hit_ratio": (
+                    round((counters[CACHE_HIT] + counters[CACHE_STALE]) / lookups, 3)
+                    if lookups
+                    else None
+                ),
+            }
+        return stats
+
+    def get_local_stats(self) -> Optional[Dict[str, Any]]:
+        """
+        Size of the in-process tier.
+
+        Returns:
+            Entry count and bytes held, or None if the tier is disabled
+        """
+        local = self.local_cache
+        return local.stats() if local is not None else None
+
     async def delete_from_cache(self, key: str) -> bool:
         """
         Delete data from cache.
@@ -122,6 +565,9 @@ class CacheManager:
         Returns:
             True if successful, False otherwise
         """
+        local = self.local_cache
+        if local is not None:
+            local.delete(key)
         try:
             redis_client = await self._get_redis()
             deleted_count = await redis_client.delete(key)
@@ -137,27 +583,92 @@ class CacheManager:
             logger.error(f"Failed to delete cache key '{key}': {e}")
             return False
 
+    async def invalidate_tags(self, *tags: str) -> int:
+        """
+        Delete every key registered under any of the tags.
+
+        The tag sets are read and dropped atomically, then their keys are
+        deleted with pipelined UNLINKs, so the cost is proportional to the
+        number of tagged keys rather than the size of the keyspace.
+
+        Args:
+            *tags: Tags from generate_cache_tag
+
+        Returns:
+            Number of keys deleted
+        """
+        if not tags:
+            return 0
+        tag_set = frozenset(tags)
+        for key, key_tags in self._inflight_tags.items():
+            if key_tags & tag_set:
+                self._invalidated_inflight.add(key)
+        local = self.local_cache
+        if local is not None:
+            local.delete_tagged(tag_set)
+
+        try:
+            redis_client = await self._get_redis()
+            async with redis_client.pipeline(transaction=True) as pipe:
+                for tag in tag_set:
+                    pipe.smembers(tag)
+                pipe.delete(*tag_set)
+                results = await pipe.execute()
+
+            keys: Set[str] = set()
+            for members in results[:-1]:
+                keys.update(members)
+            if local is not None:
+                for key in keys:
+                    local.delete(key)
+            deleted_count = await self._unlink(redis_client, list(keys))
+            logger.debug(f"Deleted {deleted_count} keys tagged {sorted(tag_set)}")
+            return deleted_count
+
+        except Exception as e:
+            logger.error(f"Failed to invalidate cache tags {sorted(tag_set)}: {e}")
+            return 0
+
+    async def _unlink(self, redis_client: Redis, keys: List[str]) -> int:
+        """Delete keys in pipelined batches without blocking Redis on large values"""
+        if not keys:
+            return 0
+        async with redis_client.pipeline(transaction=False) as pipe:
+            for start in range(0, len(keys), _DELETE_BATCH_SIZE):
+                pipe.unlink(*keys[start : start + _DELETE_BATCH_SIZE])
+            results = await pipe.execute()
+        return int(sum(results))
+
     async def delete_pattern(self, pattern: str) -> int:
         """
         Delete all cache keys matching a pattern.
 
+        Walks the keyspace incrementally with SCAN, so Redis is not blocked
+        the way KEYS would block it. Prefer invalidate_tags for keys that are
+        written with tags.
+
         Args:
             pattern: Redis pattern to match (e.g., "user:123:*")
 
         Returns:
             Number of keys deleted
         """
+        local = self.local_cache
+        if local is not None:
+            local.delete_pattern(pattern)
         try:
             redis_client = await self._get_redis()
-            keys = await redis_client.keys(pattern)
+            deleted_count = 0
+            batch: List[str] = []
+            async for key in redis_client.scan_iter(match=pattern, count=_SCAN_COUNT):
+                batch.append(key)
+                if len(batch) >= _DELETE_BATCH_SIZE:
+                    deleted_count += await self._unlink(redis_client, batch)
+                    batch = []
+            deleted_count += await self._unlink(redis_client, batch)
 
-            if not keys:
-                logger.debug(f"No keys found matching pattern: {pattern}")
-                return 0
-
-            deleted_count = await redis_client.delete(*keys)
             logger.debug(f"Deleted {deleted_count} keys matching pattern: {pattern}")
-            return int(deleted_count)
+            return deleted_count
 
         except Exception as e:
             logger.error(f"Failed to delete keys matching pattern '{pattern}': {e}")
@@ -207,6 +718,40 @@ class CacheManager:
             logger.error(f"Failed to get TTL for cache key '{key}': {e}")
             return None
 
+    async def publish(self, channel: str, message: str) -> int:
+        """
+        Publish a message on a Redis pub/sub channel.
+
+        Args:
+            channel: Channel name
+            message: Message payload
+
+        Returns:
+            Number of subscribers that received the message, 0 on failure
+        """
+        try:
+            redis_client = await self._get_redis()
+            return int(await redis_client.publish(channel, message))
+
+        except Exception as e:
+            logger.error(f"Failed to publish to channel '{channel}': {e}")
+            return 0
+
+    async def subscribe(self, channel: str) -> PubSub:
+        """
+        Subscribe to a Redis pub/sub channel.
+
+        Args:
+            channel: Channel name
+
+        Returns:
+            PubSub handle; the caller must close it when done
+        """
+        redis_client = await self._get_redis()
+        pubsub = redis_client.pubsub()
+        await pubsub.subscribe(channel)
+        return pubsub
+
     async def health_check(self) -> bool:
         """
         Check Redis connection health.
@@ -224,15 +769,20 @@ class CacheManager:
 
     async def close(self) -> None:
         """Close Redis connection."""
+        if self._binary_redis:
+            await self._binary_redis.close()
+            self._binary_redis = None
         if self._redis:
             await self._redis.close()
             self._redis = None
             logger.info("Redis connection closed")
 
-    def _json_serializer(self, obj: Any) -> str:
-        """Custom JSON serializer for datetime objects."""
+    def _json_serializer(self, obj: Any) -> Any:
+        """Custom JSON serializer for datetime objects and Pydantic models."""
         if isinstance(obj, datetime):
             return obj.isoformat()
+        if isinstance(obj, BaseModel):
+            return obj.model_dump(mode="json")
         raise TypeError(f"Object of type {type(obj)} is not JSON serializable")
 
 
@@ -271,6 +821,34 @@ def generate_cache_key(
     return cache_key
 
 
+def generate_cache_tag(
+    user_id: str, resource: str, resource_id: Optional[str] = None
+) -> str:
+    """
+    Generate an invalidation tag for a user's cached data.
+
+    A tag names a Redis set of the cache keys written under it. Tags either
+    cover a resource type (every cached message list of a user) or a single
+    resource (one thread, one calendar event).
+
+    Args:
+        user_id: User ID
+        resource: Resource type (e.g., "messages", "threads", "events")
+        resource_id: Optional ID of a single resource
+
+    Returns:
+        Tag (the Redis key of the tag set)
+
+    Examples:
+        >>> generate_cache_tag("user123", "thread", "gmail_abc")
+        'office:user123:tag:thread:gmail_abc'
+    """
+    tag = f"office:{user_id}:tag:{resource}"
+    if resource_id:
+        tag = f"{tag}:{resource_id}"
+    return tag
+
+
 def generate_user_cache_pattern(user_id: str, provider: Optional[str] = None) -> str:
     """
     Generate a cache pattern for deleting all user data.
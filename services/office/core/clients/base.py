@@ -16,6 +16,7 @@ import httpx
 from services.api.v1.office import ApiCallStatus, Provider
 from services.common.http_errors import ErrorCode, ProviderError
 from services.common.logging_config import get_logger
+from services.office.core.http_pool import get_http_pool
 from services.office.models import ApiCall
 
 # Configure logging
@@ -27,7 +28,7 @@ class BaseAPIClient(ABC):
     Base API client class that provides common functionality for provider-specific clients.
 
     Features:
-    - httpx.AsyncClient integration with proper configuration
+    - Shared, pooled httpx.AsyncClient per provider host
     - Request/response logging and metrics collection
     - Authentication header management
     - Error handling and retry logic foundation
@@ -53,17 +54,17 @@ class BaseAPIClient(ABC):
 
     async def __aenter__(self) -> "BaseAPIClient":
         """Async context manager entry"""
-        self.http_client = httpx.AsyncClient(
-            timeout=httpx.Timeout(30.0),  # 30 second timeout for external APIs
-            headers=self._get_default_headers(),
-        )
+        # Share the process-wide pooled client for this provider's host; the
+        # per-user auth headers are added to every request in _make_request
+        self.http_client = get_http_pool().get_client(self._get_base_url())
         logger.debug(f"Initialized {self.provider} API client for user {self.user_id}")
         return self
 
     async def __aexit__(self, exc_type: Any, exc_val: Any, exc_tb: Any) -> None:
         """Async context manager exit"""
         if self.http_client:
-            await self.http_client.aclose()
+            # The pooled client outlives this API client, so it is only released
+            self.http_client = None
             logger.debug(f"Closed {self.provider} API client for user {self.user_id}")
 
     @abstractmethod
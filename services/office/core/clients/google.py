@@ -1,8 +1,77 @@
-from typing import Any, Dict, List, Optional, cast
+import asyncio
+import json
+import re
+import uuid
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union, cast
+from urllib.parse import urlencode
 
 from services.api.v1.office import Provider
+from services.common.http_errors import ProviderError
+from services.common.logging_config import get_logger
 from services.office.core.clients.base import BaseAPIClient
 
+logger = get_logger(__name__)
+
+# Gmail accepts up to 100 calls per batch but recommends at most 50, since
+# larger batches are likely to trigger per-user rate limiting
+GMAIL_BATCH_PATH = "/batch/gmail/v1"
+GMAIL_BATCH_SIZE = 50
+
+# Batch items that failed with these statuses are retried individually
+_RETRYABLE_BATCH_STATUSES = {429, 500, 502, 503, 504}
+
+_BOUNDARY_RE = re.compile(r'boundary="?([^";]+)"?', re.IGNORECASE)
+_CONTENT_ID_RE = re.compile(r"content-id:\s*<response-item-(\d+)>", re.IGNORECASE)
+_BLANK_LINE_RE = re.compile(r"\r?\n\r?\n")
+
+BatchResult = Union[Dict[str, Any], ProviderError]
+
+
+def _build_gmail_batch_body(boundary: str, paths: Sequence[str]) -> bytes:
+    """Build a multipart/mixed batch body with one GET per path"""
+    parts = [
+        f"--{boundary}\r\n"
+        "Content-Type: application/http\r\n"
+        f"Content-ID: <item-{index}>\r\n"
+        "\r\n"
+        f"GET {path}\r\n"
+        "\r\n"
+        for index, path in enumerate(paths)
+    ]
+    parts.append(f"--{boundary}--\r\n")
+    return "".join(parts).encode("utf-8")
+
+
+def _parse_gmail_batch_response(
+    content_type: str, body: str
+) -> Dict[int, Tuple[int, str]]:
+    """
+    Split a multipart/mixed batch response into its embedded HTTP responses.
+
+    Returns:
+        Mapping of request index to (status code, response body)
+    """
+    match = _BOUNDARY_RE.search(content_type)
+    if not match:
+        raise ValueError(f"Batch response has no boundary: {content_type}")
+
+    responses: Dict[int, Tuple[int, str]] = {}
+    for part in body.split(f"--{match.group(1)}"):
+        sections = _BLANK_LINE_RE.split(part.strip(), maxsplit=2)
+        if len(sections) < 2:
+            continue
+        content_id = _CONTENT_ID_RE.search(sections[0])
+        if not content_id:
+            continue
+        status_line = sections[1].lstrip().split("\n", 1)[0].split()
+        if len(status_line) < 2 or not status_line[1].isdigit():
+            continue
+        responses[int(content_id.group(1))] = (
+            int(status_line[1]),
+            sections[2] if len(sections) > 2 else "",
+        )
+    return responses
+
 
 class GoogleAPIClient(BaseAPIClient):
     """
@@ -167,6 +236,7 @@ class GoogleAPIClient(BaseAPIClient):
         label_id: str,
         max_results: int = 100,
         page_token: Optional[str] = None,
+        query: Optional[str] = None,
     ) -> Dict[str, Any]:
         """
         Get list of Gmail messages from a specific label.
@@ -175,6 +245,7 @@ class GoogleAPIClient(BaseAPIClient):
             label_id: Gmail label ID
             max_results: Maximum number of messages to return
             page_token: Token for pagination
+            query: Gmail search query applied within the label
 
         Returns:
             Dictionary containing messages list and pagination info
@@ -182,6 +253,8 @@ class GoogleAPIClient(BaseAPIClient):
         params: Dict[str, Any] = {"maxResults": max_results}
         if page_token:
             params["pageToken"] = page_token
+        if query:
+            params["q"] = query
 
         # Use the label query parameter to filter messages by label
         response = await self.get(
@@ -189,6 +262,53 @@ class GoogleAPIClient(BaseAPIClient):
         )
         return cast(Dict[str, Any], response.json())
 
+    async def get_profile(self) -> Dict[str, Any]:
+        """
+        Get the Gmail profile of the mailbox.
+
+        Returns:
+            Dictionary containing the email address, message counts and the
+            current historyId
+        """
+        response = await self.get("/gmail/v1/users/me/profile")
+        return cast(Dict[str, Any], response.json())
+
+    async def get_history(
+        self,
+        start_history_id: str,
+        page_token: Optional[str] = None,
+        max_results: int = 500,
+        history_types: Optional[Sequence[str]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Get the mailbox changes made after a history ID.
+
+        Args:
+            start_history_id: historyId of the last synced state
+            page_token: Token for pagination
+            max_results: Maximum number of history records to return
+            history_types: Change types to include (messageAdded,
+                messageDeleted, labelAdded, labelRemoved); all if None
+
+        Returns:
+            Dictionary containing history records, the mailbox's current
+            historyId and pagination info
+
+        Raises:
+            ProviderError: With status 404 if the history ID is too old
+        """
+        params: Dict[str, Any] = {
+            "startHistoryId": start_history_id,
+            "maxResults": max_results,
+        }
+        if page_token:
+            params["pageToken"] = page_token
+        if history_types:
+            params["historyTypes"] = list(history_types)
+
+        response = await self.get("/gmail/v1/users/me/history", params=params)
+        return cast(Dict[str, Any], response.json())
+
     # Google Calendar API methods
     async def get_calendar_list(self) -> Dict[str, Any]:
         """
@@ -410,6 +530,166 @@ class GoogleAPIClient(BaseAPIClient):
         )
         return cast(Dict[str, Any], response.json())
 
+    async def get_messages_batch(
+        self,
+        message_ids: Sequence[str],
+        format: str = "full",
+        batch_size: int = GMAIL_BATCH_SIZE,
+        max_concurrency: int = 10,
+    ) -> List[BatchResult]:
+        """
+        Get several Gmail messages in as few round trips as possible.
+
+        Args:
+            message_ids: Gmail message IDs
+            format: Message format (minimal, full, raw, metadata)
+            batch_size: Messages per batch request (at most 100)
+            max_concurrency: Concurrent requests when falling back to
+                individual fetches
+
+        Returns:
+            One entry per message ID, in order: the message, or the
+            ProviderError for that message alone
+        """
+        paths = [f"/gmail/v1/users/me/messages/{mid}" for mid in message_ids]
+        return await self._batch_get(
+            paths, {"format": format}, batch_size, max_concurrency
+        )
+
+    async def get_threads_batch(
+        self,
+        thread_ids: Sequence[str],
+        format: str = "full",
+        batch_size: int = GMAIL_BATCH_SIZE,
+        max_concurrency: int = 10,
+    ) -> List[BatchResult]:
+        """
+        Get several Gmail threads in as few round trips as possible.
+
+        Args:
+            thread_ids: Gmail thread IDs
+            format: Message format (minimal, full, raw, metadata)
+            batch_size: Threads per batch request (at most 100)
+            max_concurrency: Concurrent requests when falling back to
+                individual fetches
+
+        Returns:
+            One entry per thread ID, in order: the thread, or the
+            ProviderError for that thread alone
+        """
+        paths = [f"/gmail/v1/users/me/threads/{tid}" for tid in thread_ids]
+        return await self._batch_get(
+            paths, {"format": format}, batch_size, max_concurrency
+        )
+
+    async def get_drafts_batch(
+        self,
+        draft_ids: Sequence[str],
+        format: str = "full",
+        batch_size: int = GMAIL_BATCH_SIZE,
+        max_concurrency: int = 10,
+    ) -> List[BatchResult]:
+        """
+        Get several Gmail drafts in as few round trips as possible.
+
+        Args:
+            draft_ids: Gmail draft IDs
+            format: Message format (minimal, full, raw, metadata)
+            batch_size: Drafts per batch request (at most 100)
+            max_concurrency: Concurrent requests when falling back to
+                individual fetches
+
+        Returns:
+            One entry per draft ID, in order: the draft, or the
+            ProviderError for that draft alone
+        """
+        paths = [f"/gmail/v1/users/me/drafts/{did}" for did in draft_ids]
+        return await self._batch_get(
+            paths, {"format": format}, batch_size, max_concurrency
+        )
+
+    async def _batch_get(
+        self,
+        paths: Sequence[str],
+        params: Dict[str, Any],
+        batch_size: int,
+        max_concurrency: int,
+    ) -> List[BatchResult]:
+        """
+        GET many resources through the Gmail batch endpoint.
+
+        Items that come back rate limited or with a server error, and every
+        item of a batch request that fails outright, are fetched individually
+        with bounded concurrency instead.
+        """
+        query = urlencode(params)
+        results: List[Optional[BatchResult]] = [None] * len(paths)
+        fallback: List[int] = []
+        batch_size = max(1, min(batch_size, 100))
+
+        for start in range(0, len(paths), batch_size):
+            indices = list(range(start, min(start + batch_size, len(paths))))
+            try:
+                responses = await self._send_batch(
+                    [f"{paths[i]}?{query}" for i in indices]
+                )
+            except (ProviderError, ValueError) as e:
+                logger.warning(
+                    f"Gmail batch request failed, fetching {len(indices)} items "
+                    f"individually: {e}"
+                )
+                fallback.extend(indices)
+                continue
+
+            for position, index in enumerate(indices):
+                status_code, body = responses.get(position, (0, ""))
+                if status_code == 200:
+                    try:
+                        results[index] = cast(Dict[str, Any], json.loads(body))
+                    except ValueError:
+                        fallback.append(index)
+                elif status_code in _RETRYABLE_BATCH_STATUSES or status_code == 0:
+                    # Rate limited, server error or missing from the response
+                    fallback.append(index)
+                else:
+                    message, code = self._parse_google_error(body, status_code)
+                    results[index] = ProviderError(
+                        message=message,
+                        provider=self.provider.value,
+                        status_code=status_code,
+                        response_body=body,
+                        code=code,
+                        details={"endpoint": paths[index]},
+                    )
+
+        if fallback:
+            semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+            async def fetch(index: int) -> None:
+                async with semaphore:
+                    try:
+                        response = await self.get(paths[index], params=params)
+                        results[index] = cast(Dict[str, Any], response.json())
+                    except ProviderError as e:
+                        results[index] = e
+
+            await asyncio.gather(*(fetch(index) for index in fallback))
+
+        return cast(List[BatchResult], results)
+
+    async def _send_batch(self, requests: Sequence[str]) -> Dict[int, Tuple[int, str]]:
+        """POST one multipart batch of GET requests and split the response"""
+        boundary = f"batch_{uuid.uuid4().hex}"
+        response = await self._make_request(
+            "POST",
+            GMAIL_BATCH_PATH,
+            content=_build_gmail_batch_body(boundary, requests),
+            headers={"Content-Type": f"multipart/mixed; boundary={boundary}"},
+        )
+        return _parse_gmail_batch_response(
+            response.headers.get("Content-Type", ""), response.text
+        )
+
     async def get_messages_with_threads(
         self,
         max_results: int = 100,
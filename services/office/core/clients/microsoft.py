@@ -1,11 +1,37 @@
-from typing import Any, Dict, Optional, cast
+import asyncio
+import json
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Set, Union, cast
+from urllib.parse import quote, urlencode
 
 from services.api.v1.office import Provider
+from services.common.http_errors import ProviderError
 from services.common.logging_config import get_logger
 from services.office.core.clients.base import BaseAPIClient
 
 logger = get_logger(__name__)
 
+# Graph accepts at most 20 sub-requests per JSON $batch call
+GRAPH_BATCH_PATH = "/$batch"
+GRAPH_BATCH_SIZE = 20
+
+# Throttled sub-requests are retried this many times, waiting Retry-After
+# seconds (capped) between rounds
+GRAPH_BATCH_MAX_RETRIES = 3
+GRAPH_BATCH_DEFAULT_RETRY_AFTER = 1.0
+GRAPH_BATCH_MAX_RETRY_AFTER = 30.0
+
+# Graph answers 424 Failed Dependency for requests whose dependsOn failed
+_FAILED_DEPENDENCY = 424
+
+_MESSAGE_SELECT = (
+    "id,conversationId,subject,bodyPreview,body,from,toRecipients,"
+    "ccRecipients,bccRecipients,receivedDateTime,sentDateTime,isRead,"
+    "hasAttachments,categories,importance"
+)
+
+BatchResult = Union[Dict[str, Any], ProviderError]
+
 
 def escape_odata_string_literal(value: str) -> str:
     """
@@ -27,6 +53,106 @@ def escape_odata_string_literal(value: str) -> str:
     return value.replace("'", "''")
 
 
+def build_graph_url(path: str, params: Optional[Dict[str, Any]] = None) -> str:
+    """
+    Build a relative Graph URL for use inside a $batch request.
+
+    Args:
+        path: Resource path relative to the API version, e.g. /me/messages
+        params: Query parameters (OData options keep their literal $ prefix)
+
+    Returns:
+        Path with an encoded query string
+    """
+    if not params:
+        return path
+    return f"{path}?{urlencode(params, quote_via=quote, safe='$,/')}"
+
+
+@dataclass
+class GraphBatchRequest:
+    """
+    A single sub-request of a Microsoft Graph JSON $batch call.
+
+    Attributes:
+        url: Relative URL including the query string, see build_graph_url
+        method: HTTP method
+        body: JSON body for POST/PATCH/PUT requests
+        headers: Extra headers for this sub-request
+        depends_on: Positions of earlier requests in the same call that must
+            succeed before this one runs
+    """
+
+    url: str
+    method: str = "GET"
+    body: Optional[Dict[str, Any]] = None
+    headers: Dict[str, str] = field(default_factory=dict)
+    depends_on: Sequence[int] = ()
+
+
+def _group_batch_requests(
+    requests: Sequence[GraphBatchRequest], batch_size: int
+) -> List[List[int]]:
+    """
+    Pack request positions into $batch calls of at most batch_size.
+
+    Graph only honours dependsOn within one $batch call, so every request is
+    kept in the same call as the requests it depends on (directly or not).
+
+    Raises:
+        ValueError: For forward/unknown dependencies, or a dependency chain
+            longer than batch_size
+    """
+    # Union-find over dependency edges; groups are ordered by first member
+    parent = list(range(len(requests)))
+
+    def find(index: int) -> int:
+        while parent[index] != index:
+            parent[index] = parent[parent[index]]
+            index = parent[index]
+        return index
+
+    for index, request in enumerate(requests):
+        for dependency in request.depends_on:
+            if not 0 <= dependency < index:
+                raise ValueError(
+                    f"Batch request {index} depends on {dependency}, which is "
+                    "not an earlier request"
+                )
+            parent[find(index)] = find(dependency)
+
+    groups: Dict[int, List[int]] = {}
+    for index in range(len(requests)):
+        groups.setdefault(find(index), []).append(index)
+
+    batches: List[List[int]] = []
+    current: List[int] = []
+    for group in groups.values():
+        if len(group) > batch_size:
+            raise ValueError(
+                f"{len(group)} dependent requests do not fit in one batch of "
+                f"{batch_size}"
+            )
+        if len(current) + len(group) > batch_size:
+            batches.append(current)
+            current = []
+        current.extend(group)
+    if current:
+        batches.append(current)
+    return batches
+
+
+def _parse_retry_after(headers: Dict[str, Any]) -> Optional[float]:
+    """Read a Retry-After value in seconds from sub-response headers"""
+    for key, value in (headers or {}).items():
+        if key.lower() == "retry-after":
+            try:
+                return float(value)
+            except (TypeError, ValueError):
+                return None
+    return None
+
+
 class MicrosoftAPIClient(BaseAPIClient):
     """
     Microsoft Graph API client for accessing Outlook, Microsoft Calendar, and OneDrive APIs.
@@ -58,6 +184,149 @@ class MicrosoftAPIClient(BaseAPIClient):
         """Get base URL for Microsoft Graph API"""
         return "https://graph.microsoft.com/v1.0"
 
+    # JSON $batch methods
+    async def batch(
+        self,
+        requests: Sequence[GraphBatchRequest],
+        batch_size: int = GRAPH_BATCH_SIZE,
+        max_retries: int = GRAPH_BATCH_MAX_RETRIES,
+    ) -> List[BatchResult]:
+        """
+        Run several Graph requests through the JSON $batch endpoint.
+
+        Requests are packed into as few $batch calls as possible, keeping
+        dependent requests together. Sub-requests throttled with 429 (and the
+        requests depending on them) are resent after their Retry-After delay.
+
+        Args:
+            requests: Sub-requests to run
+            batch_size: Sub-requests per $batch call (at most 20)
+            max_retries: Retry rounds for throttled sub-requests
+
+        Returns:
+            One entry per request, in order: the response body (empty for
+            responses without one), or the ProviderError for that request alone
+
+        Raises:
+            ValueError: If a dependency is invalid or does not fit in one call
+        """
+        results: List[Optional[BatchResult]] = [None] * len(requests)
+        batch_size = max(1, min(batch_size, GRAPH_BATCH_SIZE))
+
+        for indices in _group_batch_requests(requests, batch_size):
+            await self._run_batch(requests, indices, results, max_retries)
+
+        return cast(List[BatchResult], results)
+
+    async def _run_batch(
+        self,
+        requests: Sequence[GraphBatchRequest],
+        indices: List[int],
+        results: List[Optional[BatchResult]],
+        max_retries: int,
+    ) -> None:
+        """Send one $batch call, resending throttled sub-requests"""
+        pending = indices
+        for attempt in range(max_retries + 1):
+            try:
+                responses = await self._send_batch(requests, pending)
+            except ProviderError as e:
+                for index in pending:
+                    results[index] = e
+                return
+
+            throttled: Set[int] = set()
+            retry_after = 0.0
+            for index in pending:
+                response = responses.get(index, {})
+                status_code = int(response.get("status", 0))
+                if 200 <= status_code < 300:
+                    body = response.get("body")
+                    results[index] = body if isinstance(body, dict) else {}
+                    continue
+
+                results[index] = self._batch_item_error(requests[index], response)
+                if status_code == 429:
+                    throttled.add(index)
+                    retry_after = max(
+                        retry_after,
+                        _parse_retry_after(response.get("headers", {}))
+                        or GRAPH_BATCH_DEFAULT_RETRY_AFTER,
+                    )
+                elif status_code == _FAILED_DEPENDENCY and throttled.intersection(
+                    requests[index].depends_on
+                ):
+                    # Positions are ascending, so dependencies were seen first
+                    throttled.add(index)
+
+            if not throttled or attempt == max_retries:
+                return
+
+            delay = min(retry_after, GRAPH_BATCH_MAX_RETRY_AFTER)
+            logger.warning(
+                f"Graph throttled {len(throttled)} batch requests, retrying in "
+                f"{delay}s (attempt {attempt + 1}/{max_retries})"
+            )
+            await asyncio.sleep(delay)
+            pending = sorted(throttled)
+
+    async def _send_batch(
+        self, requests: Sequence[GraphBatchRequest], indices: List[int]
+    ) -> Dict[int, Dict[str, Any]]:
+        """POST one $batch call and map its responses by request position"""
+        included = set(indices)
+        payload: List[Dict[str, Any]] = []
+        for index in indices:
+            request = requests[index]
+            item: Dict[str, Any] = {
+                "id": str(index),
+                "method": request.method.upper(),
+                "url": request.url,
+            }
+            headers = dict(request.headers)
+            if request.body is not None:
+                headers.setdefault("Content-Type", "application/json")
+                item["body"] = request.body
+            if headers:
+                item["headers"] = headers
+            # Dependencies that already succeeded are not resent
+            depends_on = [str(d) for d in request.depends_on if d in included]
+            if depends_on:
+                item["dependsOn"] = depends_on
+            payload.append(item)
+
+        response = await self.post(GRAPH_BATCH_PATH, json_data={"requests": payload})
+        return {
+            int(item["id"]): item
+            for item in response.json().get("responses", [])
+            if str(item.get("id", "")).isdigit()
+        }
+
+    def _batch_item_error(
+        self, request: GraphBatchRequest, response: Dict[str, Any]
+    ) -> ProviderError:
+        """Build the ProviderError for a failed or missing sub-response"""
+        status_code = int(response.get("status", 0))
+        if not status_code:
+            return ProviderError(
+                message="Request missing from Graph batch response",
+                provider=self.provider.value,
+                details={"endpoint": request.url, "method": request.method.upper()},
+            )
+
+        body = json.dumps(response.get("body") or {})
+        message, code = self._parse_microsoft_error(body, status_code)
+        retry_after = _parse_retry_after(response.get("headers", {}))
+        return ProviderError(
+            message=message,
+            provider=self.provider.value,
+            status_code=status_code,
+            response_body=body,
+            retry_after=int(retry_after) if retry_after is not None else None,
+            code=code,
+            details={"endpoint": request.url, "method": request.method.upper()},
+        )
+
     # Contacts API methods
     async def get_contacts(
         self,
@@ -195,6 +464,84 @@ class MicrosoftAPIClient(BaseAPIClient):
         )
         return cast(Dict[str, Any], response.json())
 
+    async def get_messages_page(self, next_link: str) -> Dict[str, Any]:
+        """
+        Follow an @odata.nextLink returned by a previous message list call.
+
+        Graph encodes the full query (including $select, $filter and the
+        server-side skip token) in the link, so it is requested verbatim.
+
+        Args:
+            next_link: Absolute @odata.nextLink URL from a previous page
+
+        Returns:
+            Dictionary containing messages list and pagination info
+
+        Raises:
+            ValueError: If the link does not point at the Graph API
+        """
+        base_url = self._get_base_url()
+        if not next_link.startswith(f"{base_url}/"):
+            # Never send the user's bearer token to an arbitrary host
+            raise ValueError("next_link must be a Microsoft Graph URL")
+
+        response = await self.get(next_link[len(base_url) :])
+        return cast(Dict[str, Any], response.json())
+
+    async def get_messages_delta(
+        self,
+        folder_id: str = "inbox",
+        link: Optional[str] = None,
+        received_after: Optional[str] = None,
+        page_size: int = 100,
+    ) -> Dict[str, Any]:
+        """
+        Get the changes to the messages of a mail folder.
+
+        Without a link a new delta round starts and returns every message
+        of the folder (received after ``received_after``, if given). Each
+        page ends in an @odata.nextLink, or, on the last page, in an
+        @odata.deltaLink to request the changes made from then on. Deleted
+        messages are returned as ``{"id": ..., "@removed": {...}}``.
+
+        Args:
+            folder_id: Mail folder ID or well-known name
+            link: @odata.nextLink or @odata.deltaLink of a previous call
+            received_after: ISO timestamp bounding a new round
+            page_size: Maximum messages per page
+
+        Returns:
+            Dictionary containing messages and the next or delta link
+
+        Raises:
+            ValueError: If the link does not point at the Graph API
+            ProviderError: With status 410 if the delta token has expired
+        """
+        headers = {"Prefer": f"odata.maxpagesize={page_size}"}
+        if link:
+            base_url = self._get_base_url()
+            if not link.startswith(f"{base_url}/"):
+                # Never send the user's bearer token to an arbitrary host
+                raise ValueError("link must be a Microsoft Graph URL")
+            response = await self.get(link[len(base_url) :], headers=headers)
+            return cast(Dict[str, Any], response.json())
+
+        params: Dict[str, Any] = {
+            "$select": (
+                "id,conversationId,subject,bodyPreview,body,from,toRecipients,"
+                "ccRecipients,bccRecipients,receivedDateTime,sentDateTime,isRead,"
+                "hasAttachments,categories,importance"
+            )
+        }
+        if received_after:
+            params["$filter"] = f"receivedDateTime ge {received_after}"
+        response = await self.get(
+            f"/me/mailFolders/{folder_id}/messages/delta",
+            params=params,
+            headers=headers,
+        )
+        return cast(Dict[str, Any], response.json())
+
     async def get_message(
         self, message_id: str, select: Optional[str] = None
     ) -> Dict[str, Any]:
@@ -313,6 +660,47 @@ class MicrosoftAPIClient(BaseAPIClient):
         response = await self.get(endpoint, params=params)
         return cast(Dict[str, Any], response.json())
 
+    async def get_events_batch(
+        self,
+        calendar_ids: Sequence[str],
+        start_time: str,
+        end_time: str,
+        top: int = 250,
+        order_by: Optional[str] = None,
+        batch_size: int = GRAPH_BATCH_SIZE,
+    ) -> List[BatchResult]:
+        """
+        Get the calendarView of several calendars in as few round trips as possible.
+
+        Args:
+            calendar_ids: Calendar IDs
+            start_time: ISO 8601 timestamp for earliest event time
+            end_time: ISO 8601 timestamp for latest event time
+            top: Maximum number of events per calendar
+            order_by: Order by expression
+            batch_size: Calendars per $batch call (at most 20)
+
+        Returns:
+            One entry per calendar ID, in order: the events response, or the
+            ProviderError for that calendar alone
+        """
+        params: Dict[str, Any] = {
+            "$top": top,
+            "startDateTime": start_time,
+            "endDateTime": end_time,
+            "$orderby": order_by or "start/dateTime",
+        }
+        requests = [
+            GraphBatchRequest(
+                url=build_graph_url(
+                    f"/me/calendars/{quote(calendar_id, safe='')}/calendarView",
+                    params,
+                )
+            )
+            for calendar_id in calendar_ids
+        ]
+        return await self.batch(requests, batch_size=batch_size)
+
     async def create_event(
         self, event_data: Dict[str, Any], calendar_id: Optional[str] = None
     ) -> Dict[str, Any]:
@@ -544,6 +932,42 @@ class MicrosoftAPIClient(BaseAPIClient):
         )
         return cast(Dict[str, Any], response.json())
 
+    async def get_conversation_messages_batch(
+        self,
+        conversation_ids: Sequence[str],
+        top: int = 100,
+        batch_size: int = GRAPH_BATCH_SIZE,
+    ) -> List[BatchResult]:
+        """
+        Get the messages of several conversations in as few round trips as possible.
+
+        Args:
+            conversation_ids: Microsoft Graph conversation IDs
+            top: Maximum number of messages per conversation
+            batch_size: Conversations per $batch call (at most 20)
+
+        Returns:
+            One entry per conversation ID, in order: the message list response,
+            or the ProviderError for that conversation alone
+        """
+        requests = [
+            GraphBatchRequest(
+                url=build_graph_url(
+                    "/me/messages",
+                    {
+                        "$top": top,
+                        "$select": _MESSAGE_SELECT,
+                        "$filter": (
+                            "conversationId eq "
+                            f"'{escape_odata_string_literal(conversation_id)}'"
+                        ),
+                    },
+                )
+            )
+            for conversation_id in conversation_ids
+        ]
+        return await self.batch(requests, batch_size=batch_size)
+
     async def create_draft_message(
         self, message_data: Dict[str, Any]
     ) -> Dict[str, Any]:
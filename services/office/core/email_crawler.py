@@ -6,10 +6,12 @@ Email crawling logic for backfill functionality
 import asyncio
 import time
 from datetime import datetime, timedelta, timezone
-from typing import Any, AsyncGenerator, Dict, List, Optional
+from typing import Any, AsyncGenerator, Dict, List, Optional, Tuple
 
 from services.api.v1.office import EmailMessage, EmailMessageList
 from services.common.logging_config import get_logger
+from services.office.core.http_pool import get_http_pool
+from services.office.core.rate_limiter import TokenBucket
 from services.office.core.settings import get_settings
 
 logger = get_logger(__name__)
@@ -69,13 +71,23 @@ class EmailCrawler:
     """Crawls emails from email providers for backfill operations"""
 
     def __init__(
-        self, user_id: str, provider: str, user_email: str, max_email_count: int = 10
+        self,
+        user_id: str,
+        provider: str,
+        user_email: str,
+        max_email_count: int = 10,
+        rate_limiter: Optional[TokenBucket] = None,
     ):
         self.user_id = user_id
         self.provider = provider
         self.user_email = user_email  # Add user_email for normalizer calls
         self.max_email_count = max_email_count  # Add max email count parameter
         self.rate_limit_delay = 1.0  # Default 1 second between batches
+        self.rate_limiter = rate_limiter
+        self.max_batch_retries = 3
+        self.retry_base_delay = 1.0
+        # Provider cursor for the page after the last yielded batch
+        self.next_page_token: Optional[str] = None
 
     async def get_total_email_count(self) -> int:
         """Get the total number of emails to process"""
@@ -96,21 +108,27 @@ class EmailCrawler:
         start_date: Optional[datetime] = None,
         end_date: Optional[datetime] = None,
         folders: Optional[List[str]] = None,
-        resume_from: int = 0,
+        resume_from: Optional[str] = None,
         max_emails: Optional[int] = None,
     ) -> AsyncGenerator[List[EmailMessage], None]:
-        """Crawl emails in batches with optional maximum limit"""
+        """Crawl emails in batches with optional maximum limit
+
+        Pages are walked with the provider's own cursor (Gmail ``pageToken`` /
+        Graph ``@odata.nextLink``). After each yielded batch ``next_page_token``
+        holds the cursor for the following page, so callers can checkpoint it
+        once the batch has been processed and pass it back as ``resume_from``.
+        """
         try:
             total_processed = 0
             async for batch in self._crawl_emails(
                 batch_size, start_date, end_date, folders, resume_from, max_emails
             ):
                 # Check if we've reached the max_emails limit
-                if max_emails and total_processed >= max_emails:
+                if max_emails is not None and total_processed >= max_emails:
                     break
 
                 # Limit batch size if it would exceed max_emails
-                if max_emails and total_processed + len(batch) > max_emails:
+                if max_emails is not None and total_processed + len(batch) > max_emails:
                     remaining = max_emails - total_processed
                     batch = batch[:remaining]
 
@@ -118,7 +136,7 @@ class EmailCrawler:
                 total_processed += len(batch)
 
                 # Check if we've reached the limit after this batch
-                if max_emails and total_processed >= max_emails:
+                if max_emails is not None and total_processed >= max_emails:
                     break
 
         except Exception as e:
@@ -131,8 +149,6 @@ class EmailCrawler:
     async def _get_email_count(self) -> int:
         """Get email count from the specified provider using the office service's unified API"""
         try:
-            import httpx
-
             # Call the office service's internal /internal/messages/count endpoint
             office_service_url = "http://localhost:8003"
 
@@ -150,41 +166,39 @@ class EmailCrawler:
                 "providers": [provider_str],
             }
 
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    f"{office_service_url}/internal/messages/count",
-                    params=params,
-                    headers={
-                        "X-API-Key": get_settings().api_backfill_office_key,
-                    },
-                    timeout=10.0,
-                )
+            client = get_http_pool().get_client(office_service_url)
+            response = await client.get(
+                f"{office_service_url}/internal/messages/count",
+                params=params,
+                headers={
+                    "X-API-Key": get_settings().api_backfill_office_key,
+                },
+                timeout=10.0,
+            )
 
-                if response.status_code == 200:
-                    data = response.json()
-                    count = data.get("total_count", 0)
-                    # Ensure count is an integer
-                    if isinstance(count, (int, float)):
-                        count = int(count)
-                    else:
-                        count = 0
-                    logger.info(
-                        f"Got email count for user {self.user_id} with provider {provider_str}: {count}",
-                        extra={
-                            "user_id": self.user_id,
-                            "provider": provider_str,
-                            "operation": "email_count",
-                            "count": count,
-                        },
-                    )
-                    return min(
-                        count, self.max_email_count
-                    )  # Respect max_email_count limit
+            if response.status_code == 200:
+                data = response.json()
+                count = data.get("total_count", 0)
+                # Ensure count is an integer
+                if isinstance(count, (int, float)):
+                    count = int(count)
                 else:
-                    logger.warning(
-                        f"Failed to get email count: {response.status_code} - {response.text}"
-                    )
-                    return 0  # Return 0 instead of max_email_count to avoid false positives
+                    count = 0
+                logger.info(
+                    f"Got email count for user {self.user_id} with provider {provider_str}: {count}",
+                    extra={
+                        "user_id": self.user_id,
+                        "provider": provider_str,
+                        "operation": "email_count",
+                        "count": count,
+                    },
+                )
+                return min(count, self.max_email_count)  # Respect max_email_count limit
+            else:
+                logger.warning(
+                    f"Failed to get email count: {response.status_code} - {response.text}"
+                )
+                return 0  # Return 0 instead of max_email_count to avoid false positives
 
         except Exception as e:
             logger.error(f"Error getting email count: {str(e)}", exc_info=True)
@@ -196,10 +210,10 @@ class EmailCrawler:
         start_date: Optional[datetime],
         end_date: Optional[datetime],
         folders: Optional[List[str]],
-        resume_from: int,
+        resume_from: Optional[str],
         max_emails: Optional[int] = None,
     ) -> AsyncGenerator[List[EmailMessage], None]:
-        """Crawl emails from the specified provider"""
+        """Crawl emails from the specified provider by following page cursors"""
         logger.info(
             f"Starting email crawl for user {self.user_id} with provider {self.provider}",
             extra={
@@ -209,93 +223,113 @@ class EmailCrawler:
                 "batch_size": batch_size,
                 "start_date": start_date,
                 "end_date": end_date,
+                "resuming": resume_from is not None,
             },
         )
 
-        # Calculate total batches and apply max_emails limit
-        total_emails = await self._get_email_count()
-        original_total = total_emails  # Store original total for logging
-
-        # If max_emails is specified and smaller than total_emails, limit accordingly
-        if max_emails and max_emails < total_emails:
-            total_emails = max_emails
-            logger.info(
-                f"Limited to {max_emails} emails (requested) out of {original_total} available"
+        page_token = resume_from
+        self.next_page_token = resume_from
+        emails_processed = 0
+        batch_num = 0
+
+        while True:
+            # Limit this batch to the emails we are still allowed to process
+            effective_batch_size = batch_size
+            if max_emails is not None:
+                remaining_emails = max_emails - emails_processed
+                if remaining_emails <= 0:
+                    break  # We've reached the max_emails limit
+                effective_batch_size = min(batch_size, remaining_emails)
+
+            # Apply rate limiting between pages; a shared token bucket paces all
+            # crawlers of a job together, otherwise fall back to a fixed delay
+            if self.rate_limiter is not None:
+                await self.rate_limiter.acquire()
+            elif batch_num > 0:
+                await asyncio.sleep(self.rate_limit_delay)
+
+            emails, next_page_token = await self._get_email_batch_with_retry(
+                self.provider,
+                effective_batch_size,
+                start_date,
+                end_date,
+                folders,
+                page_token,
             )
 
-        total_batches = (total_emails + batch_size - 1) // batch_size
+            # Only advance the cursor once the page was fetched successfully
+            self.next_page_token = next_page_token
+            emails_processed += len(emails)
+            batch_num += 1
 
-        # Skip completed batches
-        start_batch = resume_from // batch_size
-
-        # Track actual emails processed (including resume_from offset)
-        emails_processed = resume_from
-
-        for batch_num in range(start_batch, total_batches):
-            try:
-                # Calculate effective batch size for this batch
-                effective_batch_size = batch_size
-                if max_emails:
-                    # Calculate how many emails we've already processed (including resume_from)
-                    processed_so_far = emails_processed
-                    # Calculate how many emails we can still process
-                    remaining_emails = max_emails - processed_so_far
-                    if remaining_emails <= 0:
-                        break  # We've reached the max_emails limit
-                    # Limit this batch to the remaining emails
-                    effective_batch_size = min(batch_size, remaining_emails)
-
-                # Get batch of emails
-                emails = await self._get_email_batch(
-                    self.provider,
-                    batch_num,
-                    effective_batch_size,
-                    start_date,
-                    end_date,
-                    folders,
-                )
+            if emails:
+                yield emails
 
-                # Update the count of emails processed
-                emails_processed += len(emails)
+            logger.debug(
+                f"Processed email batch {batch_num} for provider {self.provider}",
+                extra={
+                    "user_id": self.user_id,
+                    "batch_size": len(emails),
+                    "emails_processed": emails_processed,
+                    "has_more": next_page_token is not None,
+                },
+            )
 
-                # Apply rate limiting
-                if batch_num > start_batch:
-                    await asyncio.sleep(self.rate_limit_delay)
+            if not next_page_token:
+                break
+            page_token = next_page_token
 
-                yield emails
+    async def _get_email_batch_with_retry(
+        self,
+        provider: str,
+        batch_size: int,
+        start_date: Optional[datetime],
+        end_date: Optional[datetime],
+        folders: Optional[List[str]],
+        page_token: Optional[str],
+    ) -> Tuple[List[EmailMessage], Optional[str]]:
+        """Fetch one page, retrying transient failures with exponential backoff
 
-                logger.debug(
-                    f"Processed email batch {batch_num + 1}/{total_batches} for provider {self.provider}"
+        A failed page cannot be skipped without losing its cursor, so after
+        ``max_batch_retries`` attempts the error is propagated and the caller's
+        last checkpoint stays valid for a later resume.
+        """
+        attempt = 0
+        while True:
+            try:
+                return await self._get_email_batch(
+                    provider, batch_size, start_date, end_date, folders, page_token
                 )
-
             except Exception as e:
-                logger.error(
-                    f"Failed to process email batch {batch_num} for provider {self.provider}: {str(e)}",
-                    exc_info=True,
+                attempt += 1
+                if attempt > self.max_batch_retries:
+                    raise
+                delay = self.retry_base_delay * (2 ** (attempt - 1))
+                logger.warning(
+                    f"Email batch fetch failed for provider {provider} "
+                    f"(attempt {attempt}/{self.max_batch_retries}), retrying in {delay:.1f}s: {str(e)}"
                 )
-                # Continue with next batch
-                continue
+                await asyncio.sleep(delay)
 
     async def _get_email_batch(
         self,
         provider: str,
-        batch_num: int,
         batch_size: int,
         start_date: Optional[datetime],
         end_date: Optional[datetime],
         folders: Optional[List[str]],
-    ) -> List[EmailMessage]:
-        """Get a batch of emails from the specified provider using the office service's unified API
+        page_token: Optional[str] = None,
+    ) -> Tuple[List[EmailMessage], Optional[str]]:
+        """Get a page of emails from the specified provider using the office service's unified API
 
         The method reconstructs the EmailMessageList response structure from the API
         and returns the normalized EmailMessage objects.
 
         Returns:
-            List[EmailMessage]: Normalized EmailMessage objects ready for processing.
+            Tuple of the normalized EmailMessage objects and the cursor for the
+            next page (None when the provider has no more pages).
         """
         try:
-            import httpx
-
             # Call the office service's internal /internal/messages endpoint
             # This is the same endpoint the frontend uses
             office_service_url = "http://localhost:8003"
@@ -317,64 +351,60 @@ class EmailCrawler:
                 "include_body": True,
                 "no_cache": True,  # Always get fresh data for backfill
             }
+            if page_token:
+                params["page_token"] = page_token
 
             # Add folder filtering if specified
-            if folders:
+            if folders and len(folders) == 1:
+                # A single folder is fetched directly (Gmail label / Graph mail folder)
+                params["folder_id"] = folders[0]
+            elif folders:
                 # For both providers, folders are typically labels
                 params["labels"] = folders
 
-            # Add date filtering if specified
-            if start_date or end_date:
-                # Build search query with date filters
-                query_parts = []
-                if start_date:
-                    query_parts.append(f"after:{start_date.strftime('%Y/%m/%d')}")
-                if end_date:
-                    query_parts.append(f"before:{end_date.strftime('%Y/%m/%d')}")
-                if query_parts:
-                    params["q"] = " ".join(query_parts)
-
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    f"{office_service_url}/internal/messages",
-                    params=params,
-                    headers={
-                        "X-API-Key": get_settings().api_backfill_office_key,
-                    },
-                    timeout=30.0,
-                )
+            # Add date filtering if specified; the office service translates the
+            # window into each provider's own filter syntax
+            if start_date:
+                params["received_after"] = start_date.isoformat()
+            if end_date:
+                params["received_before"] = end_date.isoformat()
+
+            client = get_http_pool().get_client(office_service_url)
+            response = await client.get(
+                f"{office_service_url}/internal/messages",
+                params=params,
+                headers={
+                    "X-API-Key": get_settings().api_backfill_office_key,
+                },
+                timeout=30.0,
+            )
 
-                if response.status_code == 200:
-                    data = response.json()
-
-                    # Reconstruct EmailMessageList from the API response
-                    email_list = EmailMessageList(**data)
-
-                    if (
-                        email_list.success
-                        and email_list.data
-                        and email_list.data.messages
-                    ):
-                        logger.debug(
-                            f"Retrieved {len(email_list.data.messages)} emails from {provider_str} using office service internal API"
-                        )
-                        return email_list.data.messages
-                    else:
-                        if not email_list.success:
-                            error_msg = (
-                                email_list.error.get("message", "Unknown error")
-                                if email_list.error
-                                else "Unknown error"
-                            )
-                            logger.error(f"Office service error: {error_msg}")
-                        else:
-                            logger.warning("Office service returned no emails")
-                        return []
-                else:
-                    logger.error(
-                        f"Office service returned status {response.status_code}: {response.text}"
+            if response.status_code == 200:
+                data = response.json()
+
+                # Reconstruct EmailMessageList from the API response
+                email_list = EmailMessageList(**data)
+
+                if not email_list.success:
+                    error_msg = (
+                        email_list.error.get("message", "Unknown error")
+                        if email_list.error
+                        else "Unknown error"
                     )
-                    return []
+                    raise Exception(f"Office service error: {error_msg}")
+
+                if not email_list.data:
+                    logger.warning("Office service returned no emails")
+                    return [], None
+
+                logger.debug(
+                    f"Retrieved {len(email_list.data.messages)} emails from {provider_str} using office service internal API"
+                )
+                return email_list.data.messages, email_list.data.next_page_token
+            else:
+                raise Exception(
+                    f"Office service returned status {response.status_code}: {response.text}"
+                )
 
         except Exception as e:
             logger.error(
@@ -390,9 +420,6 @@ class EmailCrawler:
                 f"Failed to retrieve real emails from {provider_str if 'provider_str' in locals() else provider} via office service: {str(e)}"
             )
 
-        # Return empty list if no emails found
-        return []
-
     def set_rate_limit(self, emails_per_second: int) -> None:
         """Set the rate limit for email crawling"""
         if emails_per_second > 0:
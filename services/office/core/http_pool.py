@@ -0,0 +1,161 @@
+"""
+Process-wide pooled HTTP clients for upstream APIs.
+
+The office service talks to a handful of upstream hosts (Google, Microsoft
+Graph, the user service). Creating an httpx.AsyncClient per request pays a
+fresh TCP and TLS handshake every time, so instead one long-lived client is
+kept per upstream origin and shared by every request. Clients carry no
+credentials; callers pass per-user auth headers on each request.
+
+The pool is created lazily and closed from the application lifespan.
+"""
+
+from typing import Any, Dict, Optional
+from urllib.parse import urlsplit
+
+import httpx
+
+from services.common.logging_config import get_logger
+from services.office.core.settings import get_settings
+
+logger = get_logger(__name__)
+
+try:
+    import h2  # noqa: F401
+
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+
+def _origin(url: str) -> str:
+    """Reduce a URL to its scheme://host[:port] origin"""
+    parts = urlsplit(url)
+    if not parts.scheme or not parts.netloc:
+        raise ValueError(f"URL must be absolute: {url}")
+    return f"{parts.scheme.lower()}://{parts.netloc.lower()}"
+
+
+class HTTPClientPool:
+    """
+    Registry of shared httpx.AsyncClient instances, one per upstream origin.
+
+    Each client keeps its own connection pool with the configured limits and
+    keep-alive expiry, and negotiates HTTP/2 when the h2 package is installed.
+    """
+
+    def __init__(
+        self,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        keepalive_expiry: float = 30.0,
+        timeout: float = 30.0,
+        http2: bool = True,
+    ):
+        """
+        Initialize the pool.
+
+        Args:
+            max_connections: Maximum concurrent connections per origin
+            max_keepalive_connections: Idle connections kept open per origin
+            keepalive_expiry: Seconds an idle connection is kept open
+            timeout: Default request timeout in seconds
+            http2: Negotiate HTTP/2 where the upstream supports it
+        """
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.timeout = timeout
+        if http2 and not HTTP2_AVAILABLE:
+            logger.warning("h2 is not installed, pooled HTTP clients use HTTP/1.1")
+        self.http2 = http2 and HTTP2_AVAILABLE
+        self._clients: Dict[str, httpx.AsyncClient] = {}
+
+    def get_client(self, url: str) -> httpx.AsyncClient:
+        """
+        Get the shared client for the origin of a URL, creating it if needed.
+
+        Args:
+            url: Any absolute URL on the upstream host
+
+        Returns:
+            The pooled client; callers must not close it
+        """
+        origin = _origin(url)
+        client = self._clients.get(origin)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(
+                timeout=httpx.Timeout(self.timeout),
+                limits=self.limits,
+                http2=self.http2,
+            )
+            self._clients[origin] = client
+            logger.debug(f"Created pooled HTTP client for {origin}")
+        return client
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Connection pool utilisation per origin.
+
+        Returns:
+            Mapping of origin to open, active and idle connection counts
+        """
+        stats: Dict[str, Dict[str, Any]] = {}
+        for origin, client in self._clients.items():
+            # httpx does not expose its transport pool publicly
+            pool = getattr(getattr(client, "_transport", None), "_pool", None)
+            connections = list(getattr(pool, "connections", None) or [])
+            idle = sum(1 for connection in connections if connection.is_idle())
+            max_connections = self.limits.max_connections
+            stats[origin] = {
+                "closed": client.is_closed,
+                "http2": self.http2,
+                "max_connections": max_connections,
+                "connections": len(connections),
+                "active": len(connections) - idle,
+                "idle": idle,
+                "utilization": (
+                    round((len(connections) - idle) / max_connections, 3)
+                    if max_connections
+                    else None
+                ),
+            }
+        return stats
+
+    async def aclose(self) -> None:
+        """Close every pooled client"""
+        clients, self._clients = list(self._clients.values()), {}
+        for client in clients:
+            try:
+                await client.aclose()
+            except Exception as e:
+                logger.warning(f"Failed to close pooled HTTP client: {e}")
+
+
+# Global pool instance
+_pool: Optional[HTTPClientPool] = None
+
+
+def get_http_pool() -> HTTPClientPool:
+    """Get the global HTTP client pool, creating it from settings if necessary."""
+    global _pool
+    if _pool is None:
+        settings = get_settings()
+        _pool = HTTPClientPool(
+            max_connections=settings.http_pool_max_connections,
+            max_keepalive_connections=settings.http_pool_max_keepalive_connections,
+            keepalive_expiry=settings.http_pool_keepalive_expiry,
+            timeout=settings.http_pool_timeout,
+            http2=settings.http_pool_http2,
+        )
+    return _pool
+
+
+async def close_http_pool() -> None:
+    """Close the global HTTP client pool (called on application shutdown)."""
+    global _pool
+    if _pool is not None:
+        await _pool.aclose()
+        _pool = None
@@ -0,0 +1,239 @@
+"""
+Cached directory of user integrations for the Office Service.
+
+Almost every office endpoint starts by asking the user service which
+providers a user has connected (or which one they prefer). Those answers
+change rarely, so they are cached in two tiers:
+
+- a short-TTL in-process map, so hot users cost no I/O at all;
+- Redis, shared by every replica, so each user costs at most one user
+  service round trip per cache TTL.
+
+Concurrent lookups for the same entry share a single in-flight load. Entries
+are dropped when the user service announces an integration change on the
+``office:integrations:changed`` Redis channel.
+"""
+
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from services.common.logging_config import get_logger
+from services.office.core.cache_manager import cache_manager
+from services.office.core.settings import get_settings
+
+logger = get_logger(__name__)
+
+# The user service publishes a user ID here whenever that user's
+# integrations (or preferred provider) change
+INTEGRATIONS_CHANGED_CHANNEL = "office:integrations:changed"
+
+# Directory entries cached per user
+EMAIL_PROVIDERS = "email_providers"
+PREFERRED_PROVIDER = "preferred_provider"
+DIRECTORY_ENTRIES = (EMAIL_PROVIDERS, PREFERRED_PROVIDER)
+
+# Seconds to wait before re-subscribing after the listener loses Redis
+_RESUBSCRIBE_DELAY_SECONDS = 5.0
+
+
+def generate_directory_cache_key(user_id: str, entry: str) -> str:
+    """
+    Generate the Redis key for a user's directory entry.
+
+    Args:
+        user_id: User ID
+        entry: Directory entry name (e.g. "email_providers")
+
+    Returns:
+        Cache key string
+    """
+    return f"office:{user_id}:directory:{entry}"
+
+
+class IntegrationDirectory:
+    """
+    Two-tier cache of per-user integration lookups with single-flight loads.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: Optional[int] = None,
+        local_ttl_seconds: Optional[float] = None,
+        max_local_entries: int = 10000,
+    ) -> None:
+        """
+        Initialize the directory.
+
+        Args:
+            ttl_seconds: Redis TTL (defaults to settings.integration_cache_ttl)
+            local_ttl_seconds: In-process TTL (defaults to
+                settings.integration_local_cache_ttl)
+            max_local_entries: In-process entries kept before the oldest are
+                evicted
+        """
+        self._ttl_seconds = ttl_seconds
+        self._local_ttl_seconds = local_ttl_seconds
+        self.max_local_entries = max_local_entries
+        # (user_id, entry) -> (expires_at monotonic, value)
+        self._local: Dict[Tuple[str, str], Tuple[float, Any]] = {}
+        self._inflight: Dict[Tuple[str, str], "asyncio.Task[Any]"] = {}
+        # Bumped on invalidation so loads started earlier are not cached
+        self._generations: Dict[str, int] = {}
+        self._listener: Optional["asyncio.Task[None]"] = None
+
+    @property
+    def ttl_seconds(self) -> int:
+        if self._ttl_seconds is not None:
+            return self._ttl_seconds
+        return get_settings().integration_cache_ttl
+
+    @property
+    def local_ttl_seconds(self) -> float:
+        if self._local_ttl_seconds is not None:
+            return self._local_ttl_seconds
+        return get_settings().integration_local_cache_ttl
+
+    async def get(
+        self, user_id: str, entry: str, loader: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """
+        Get a directory entry, loading it from the user service if needed.
+
+        Args:
+            user_id: User ID
+            entry: Directory entry name
+            loader: Coroutine factory fetching the value from the user service.
+                It must raise on failure, so that failures are never cached.
+                The value must be JSON serializable.
+
+        Returns:
+            The cached or freshly loaded value
+        """
+        local_key = (user_id, entry)
+        cached = self._local.get(local_key)
+        if cached is not None and cached[0] > time.monotonic():
+            return cached[1]
+
+        task = self._inflight.get(local_key)
+        if task is None:
+            task = asyncio.create_task(self._load(user_id, entry, loader))
+            self._inflight[local_key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(local_key, None))
+
+        # Shield the shared load so one cancelled caller does not cancel it
+        # for every other waiter
+        return await asyncio.shield(task)
+
+    async def _load(
+        self, user_id: str, entry: str, loader: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """Read through Redis to the loader and fill both tiers"""
+        generation = self._generations.get(user_id, 0)
+        cache_key = generate_directory_cache_key(user_id, entry)
+
+        cached = await cache_manager.get_from_cache(cache_key)
+        if isinstance(cached, dict) and "value" in cached:
+            value = cached["value"]
+        else:
+            value = await loader()
+            if self._generations.get(user_id, 0) != generation:
+                # Invalidated while loading; the result may already be stale
+                return value
+            # Wrapped so that a cached None is distinguishable from a miss
+            await cache_manager.set_to_cache(
+                cache_key, {"value": value}, self.ttl_seconds
+            )
+
+        if self._generations.get(user_id, 0) == generation:
+            self._store_local(user_id, entry, value)
+        return value
+
+    def _store_local(self, user_id: str, entry: str, value: Any) -> None:
+        if len(self._local) >= self.max_local_entries:
+            now = time.monotonic()
+            self._local = {k: v for k, v in self._local.items() if v[0] > now}
+            while len(self._local) >= self.max_local_entries:
+                # Dicts keep insertion order, so this drops the oldest entry
+                self._local.pop(next(iter(self._local)))
+        self._local[(user_id, entry)] = (
+            time.monotonic() + self.local_ttl_seconds,
+            value,
+        )
+
+    def invalidate_local(self, user_id: str) -> None:
+        """
+        Drop a user's in-process entries.
+
+        Args:
+            user_id: User ID
+        """
+        self._generations[user_id] = self._generations.get(user_id, 0) + 1
+        for entry in DIRECTORY_ENTRIES:
+            self._local.pop((user_id, entry), None)
+
+    async def invalidate(self, user_id: str, broadcast: bool = True) -> None:
+        """
+        Drop a user's entries from both tiers.
+
+        Args:
+            user_id: User ID
+            broadcast: Also tell the other replicas to drop their entries
+        """
+        self.invalidate_local(user_id)
+        for entry in DIRECTORY_ENTRIES:
+            await cache_manager.delete_from_cache(
+                generate_directory_cache_key(user_id, entry)
+            )
+        if broadcast:
+            await cache_manager.publish(INTEGRATIONS_CHANGED_CHANNEL, user_id)
+
+    def clear_local(self) -> None:
+        """Drop every in-process entry."""
+        self._local.clear()
+        for user_id in list(self._generations):
+            self._generations[user_id] += 1
+
+    async def start_listener(self) -> None:
+        """Start listening for integration-change events."""
+        if self._listener is None or self._listener.done():
+            self._listener = asyncio.create_task(self._listen())
+
+    async def stop_listener(self) -> None:
+        """Stop listening for integration-change events."""
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+
+    async def _listen(self) -> None:
+        while True:
+            try:
+                pubsub = await cache_manager.subscribe(INTEGRATIONS_CHANGED_CHANNEL)
+                try:
+                    async for message in pubsub.listen():
+                        if message.get("type") != "message":
+                            continue
+                        user_id = str(message.get("data") or "")
+                        if user_id:
+                            logger.debug(f"Integrations changed for user {user_id}")
+                            await self.invalidate(user_id, broadcast=False)
+                finally:
+                    await pubsub.aclose()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(
+                    f"Integration change listener failed, retrying in "
+                    f"{_RESUBSCRIBE_DELAY_SECONDS}s: {e}"
+                )
+                # Anything cached locally may have missed an event
+                self.clear_local()
+                await asyncio.sleep(_RESUBSCRIBE_DELAY_SECONDS)
+
+
+# Global integration directory instance
+integration_directory = IntegrationDirectory()
@@ -0,0 +1,170 @@
+"""
+In-process LRU tier in front of the Redis cache.
+
+Holds decoded values (including Pydantic models) so that a hit costs neither
+a Redis round trip nor decoding. Entries live for a short TTL, which bounds
+how long a replica can serve a value that was changed or deleted elsewhere,
+and the tier is bounded by both entry count and encoded payload size.
+"""
+
+import fnmatch
+import time
+from collections import OrderedDict
+from typing import Any, Dict, FrozenSet, Iterable, NamedTuple, Optional
+
+
+class LocalEntry(NamedTuple):
+    value: Any
+    fresh_until: float
+    expires_at: float
+    size: int
+    tags: FrozenSet[str] = frozenset()
+
+
+class LocalCache:
+    """
+    Size-bounded in-process LRU of cache entries.
+
+    Values are shared between callers, so they must not be mutated.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1000,
+        max_bytes: int = 64 * 1024 * 1024,
+        ttl_seconds: float = 10.0,
+    ) -> None:
+        """
+        Initialize the local cache.
+
+        Args:
+            max_entries: Entries kept before the least recently used is evicted
+            max_bytes: Total encoded size kept before evicting
+            ttl_seconds: Seconds an entry is kept
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, LocalEntry]" = OrderedDict()
+        self._bytes = 0
+
+    def get(self, key: str) -> Optional[LocalEntry]:
+        """
+        Get an entry, marking it as recently used.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            The entry, or None if missing or expired
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry.expires_at <= time.monotonic():
+            self.delete(key)
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def set(
+        self,
+        key: str,
+        value: Any,
+        fresh_until: float,
+        size: int,
+        tags: Iterable[str] = (),
+    ) -> None:
+        """
+        Store an entry, evicting least recently used entries as needed.
+
+        Args:
+            key: Cache key
+            value: Decoded value
+            fresh_until: Unix time until which the value is fresh
+            size: Encoded size of the value in bytes
+            tags: Invalidation tags the entry is registered under
+        """
+        self.delete(key)
+        if size > self.max_bytes or self.max_entries <= 0:
+            return
+        while self._entries and (
+            len(self._entries) >= self.max_entries
+            or self._bytes + size > self.max_bytes
+        ):
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= evicted.size
+        self._entries[key] = LocalEntry(
+            value,
+            fresh_until,
+            time.monotonic() + self.ttl_seconds,
+            size,
+            frozenset(tags),
+        )
+        self._bytes += size
+
+    def delete(self, key: str) -> bool:
+        """
+        Drop an entry.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            True if the entry existed
+        """
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return False
+        self._bytes -= entry.size
+        return True
+
+    def delete_pattern(self, pattern: str) -> int:
+        """
+        Drop every entry whose key matches a Redis-style glob pattern.
+
+        Args:
+            pattern: Pattern to match (e.g., "office:123:*")
+
+        Returns:
+            Number of entries dropped
+        """
+        keys = [key for key in self._entries if fnmatch.fnmatchcase(key, pattern)]
+        for key in keys:
+            self.delete(key)
+        return len(keys)
+
+    def delete_tagged(self, tags: Iterable[str]) -> int:
+        """
+        Drop every entry registered under any of the tags.
+
+        Args:
+            tags: Invalidation tags
+
+        Returns:
+            Number of entries dropped
+        """
+        tag_set = frozenset(tags)
+        keys = [key for key, entry in self._entries.items() if entry.tags & tag_set]
+        for key in keys:
+            self.delete(key)
+        return len(keys)
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        self._entries.clear()
+        self._bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Current size of the local cache.
+
+        Returns:
+            Entry count and encoded bytes held, with their limits
+        """
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+        }
@@ -13,11 +13,12 @@ from typing import Any, Dict, List, Optional
 from google.api_core import exceptions as google_exceptions
 from google.cloud import pubsub_v1  # type: ignore[attr-defined]
 
-from services.common.events.base_events import EventMetadata
+from services.common.events.base_events import BaseEvent, EventMetadata
 from services.common.events.calendar_events import CalendarEvent, CalendarEventData
 from services.common.events.contact_events import ContactData, ContactEvent
 from services.common.events.email_events import EmailData, EmailEvent
 from services.common.logging_config import get_logger
+from services.common.pubsub_client import await_publish_futures
 
 logger = get_logger(__name__)
 
@@ -26,10 +27,14 @@ class PubSubPublisher:
     """Publishes events to Google Cloud Pub/Sub for event-driven architecture"""
 
     def __init__(
-        self, project_id: str = "briefly-dev", emulator_host: str = "localhost:8085"
+        self,
+        project_id: str = "briefly-dev",
+        emulator_host: str = "localhost:8085",
+        batch_settings: pubsub_v1.types.BatchSettings | None = None,
     ):
         self.project_id = project_id
         self.emulator_host = emulator_host
+        self.batch_settings = batch_settings
         self.publisher: pubsub_v1.PublisherClient | None = None
         # New data-type focused topic names
         self.topics = {
@@ -57,7 +62,12 @@ class PubSubPublisher:
                 os.environ["PUBSUB_EMULATOR_HOST"] = self.emulator_host
                 logger.info(f"Using Pub/Sub emulator at {self.emulator_host}")
 
-            self.publisher = pubsub_v1.PublisherClient()
+            if self.batch_settings is not None:
+                self.publisher = pubsub_v1.PublisherClient(
+                    batch_settings=self.batch_settings
+                )
+            else:
+                self.publisher = pubsub_v1.PublisherClient()
             logger.info("Pub/Sub publisher initialized successfully")
 
         except Exception as e:
@@ -82,6 +92,161 @@ class PubSubPublisher:
             tags={"publisher": "office-service"},
         )
 
+    def _build_email_event(
+        self,
+        email_data: EmailData,
+        operation: str,
+        batch_id: str | None,
+        user_id: str | None,
+        correlation_id: str | None,
+    ) -> EmailEvent | None:
+        """Build an EmailEvent, or None if it cannot be published"""
+        # Validate required user_id parameter
+        if not user_id:
+            logger.error(
+                f"user_id is required for publishing EmailEvent {email_data.id}"
+            )
+            return None
+
+        # Create event metadata
+        metadata = self._create_event_metadata(
+            source_service="office-service",
+            user_id=user_id,
+            correlation_id=correlation_id,
+        )
+        return EmailEvent(
+            metadata=metadata,
+            user_id=user_id,  # user_id is required, no fallback
+            email=email_data,
+            operation=operation,
+            batch_id=batch_id,
+            last_updated=datetime.now(timezone.utc),
+            sync_timestamp=datetime.now(timezone.utc),
+            provider=email_data.provider,
+            sync_type="sync",
+        )
+
+    def _build_calendar_event(
+        self,
+        calendar_data: CalendarEventData,
+        operation: str,
+        batch_id: str | None,
+        user_id: str | None,
+        correlation_id: str | None,
+    ) -> CalendarEvent | None:
+        """Build a CalendarEvent, or None if it cannot be published"""
+        # Validate required user_id parameter
+        if not user_id:
+            logger.error(
+                f"user_id is required for publishing CalendarEvent {calendar_data.id}"
+            )
+            return None
+
+        # Create event metadata
+        metadata = self._create_event_metadata(
+            source_service="office-service",
+            user_id=user_id,
+            correlation_id=correlation_id,
+        )
+        return CalendarEvent(
+            metadata=metadata,
+            user_id=user_id,  # user_id is required, no fallback
+            event=calendar_data,
+            operation=operation,
+            batch_id=batch_id,
+            last_updated=datetime.now(timezone.utc),
+            sync_timestamp=datetime.now(timezone.utc),
+            provider=calendar_data.provider,
+            calendar_id=calendar_data.calendar_id,
+        )
+
+    def _build_contact_event(
+        self,
+        contact_data: ContactData,
+        operation: str,
+        batch_id: str | None,
+        user_id: str | None,
+        correlation_id: str | None,
+    ) -> ContactEvent | None:
+        """Build a ContactEvent, or None if it cannot be published"""
+        # Validate required user_id parameter
+        if not user_id:
+            logger.error(
+                f"user_id is required for publishing ContactEvent {contact_data.id}"
+            )
+            return None
+
+        # Create event metadata
+        metadata = self._create_event_metadata(
+            source_service="office-service",
+            user_id=user_id,
+            correlation_id=correlation_id,
+        )
+        return ContactEvent(
+            metadata=metadata,
+            user_id=user_id,  # user_id is required, no fallback
+            contact=contact_data,
+            operation=operation,
+            batch_id=batch_id,
+            last_updated=datetime.now(timezone.utc),
+            sync_timestamp=datetime.now(timezone.utc),
+            provider=contact_data.provider,
+        )
+
+    def _topic_path(self, topic_key: str) -> str:
+        return f"projects/{self.project_id}/topics/{self.topics[topic_key]}"
+
+    async def _publish_events(
+        self, topic_key: str, events: list[BaseEvent | None]
+    ) -> list[bool]:
+        """
+        Publish events to one topic and await their futures together.
+
+        Every event is handed to the publisher before any future is awaited,
+        so the client library can pack them into batched publish RPCs.
+        ``None`` entries (events that failed validation) are reported as
+        failures in place. A missing topic disables the publisher like the
+        single-event methods do, and the partial results are returned.
+        """
+        if not self.publisher:
+            logger.warning("Pub/Sub publisher not available")
+            return [False] * len(events)
+
+        topic_path = self._topic_path(topic_key)
+        futures = []
+        positions = []
+        results = [False] * len(events)
+        try:
+            for position, event in enumerate(events):
+                if event is None:
+                    continue
+                message_data = event.model_dump_json().encode("utf-8")
+                futures.append(self.publisher.publish(topic_path, message_data))
+                positions.append(position)
+        except Exception as e:
+            logger.error(f"Failed to publish batch to {self.topics[topic_key]}: {e}")
+
+        publish_results = await await_publish_futures(futures)
+        for position, result in zip(positions, publish_results):
+            results[position] = result.success
+            if isinstance(result.exception, google_exceptions.NotFound):
+                if self.publisher is not None:
+                    # Topic not found - fatal, halt further publishing
+                    logger.error(
+                        f"FATAL: Pub/Sub topic '{self.topics[topic_key]}' not found. Halting publishing. Error: {result.error}"
+                    )
+                # Set publisher to None to prevent further attempts
+                self.publisher = None
+            elif result.error:
+                logger.error(
+                    f"Failed to publish event to {self.topics[topic_key]}: {result.error}"
+                )
+
+        logger.info(
+            f"Published {sum(results)} out of {len(events)} events to topic {self.topics[topic_key]}"
+        )
+        return results
+
     async def publish_email_event(
         self,
         email_data: EmailData,
@@ -96,42 +261,22 @@ class PubSubPublisher:
             return False
 
         try:
-            # Create event metadata
-            metadata = self._create_event_metadata(
-                source_service="office-service",
-                user_id=user_id,
-                correlation_id=correlation_id,
+            email_event = self._build_email_event(
+                email_data, operation, batch_id, user_id, correlation_id
             )
-
-            # Validate required user_id parameter
-            if not user_id:
-                logger.error(
-                    f"user_id is required for publishing EmailEvent {email_data.id}"
-                )
+            if email_event is None:
                 return False
 
-            # Create EmailEvent
-            email_event = EmailEvent(
-                metadata=metadata,
-                user_id=user_id,  # user_id is required, no fallback
-                email=email_data,
-                operation=operation,
-                batch_id=batch_id,
-                last_updated=datetime.now(timezone.utc),
-                sync_timestamp=datetime.now(timezone.utc),
-                provider=email_data.provider,
-                sync_type="sync",
-            )
-
             # Convert to JSON
             message_data = email_event.model_dump_json().encode("utf-8")
 
             # Publish to emails topic
             future = self.publisher.publish(
-                f"projects/{self.project_id}/topics/{self.topics['emails']}",
+                self._topic_path("emails"),
                 message_data,
             )
-            message_id = future.result()
+            # Await on the loop instead of blocking it on future.result()
+            message_id = await asyncio.wrap_future(future)
 
             logger.debug(
                 f"Published EmailEvent {email_data.id} (operation: {operation}) to Pub/Sub: {message_id}"
@@ -166,42 +311,22 @@ class PubSubPublisher:
             return False
 
         try:
-            # Create event metadata
-            metadata = self._create_event_metadata(
-                source_service="office-service",
-                user_id=user_id,
-                correlation_id=correlation_id,
+            calendar_event = self._build_calendar_event(
+                calendar_data, operation, batch_id, user_id, correlation_id
             )
-
-            # Validate required user_id parameter
-            if not user_id:
-                logger.error(
-                    f"user_id is required for publishing CalendarEvent {calendar_data.id}"
-                )
+            if calendar_event is None:
                 return False
 
-            # Create CalendarEvent
-            calendar_event = CalendarEvent(
-                metadata=metadata,
-                user_id=user_id,  # user_id is required, no fallback
-                event=calendar_data,
-                operation=operation,
-                batch_id=batch_id,
-                last_updated=datetime.now(timezone.utc),
-                sync_timestamp=datetime.now(timezone.utc),
-                provider=calendar_data.provider,
-                calendar_id=calendar_data.calendar_id,
-            )
-
             # Convert to JSON
             message_data = calendar_event.model_dump_json().encode("utf-8")
 
             # Publish to calendars topic
             future = self.publisher.publish(
-                f"projects/{self.project_id}/topics/{self.topics['calendars']}",
+                self._topic_path("calendars"),
                 message_data,
             )
-            message_id = future.result()
+            # Await on the loop instead of blocking it on future.result()
+            message_id = await asyncio.wrap_future(future)
 
             logger.debug(
                 f"Published CalendarEvent {calendar_data.id} (operation: {operation}) to Pub/Sub: {message_id}"
@@ -236,41 +361,22 @@ class PubSubPublisher:
             return False
 
         try:
-            # Create event metadata
-            metadata = self._create_event_metadata(
-                source_service="office-service",
-                user_id=user_id,
-                correlation_id=correlation_id,
+            contact_event = self._build_contact_event(
+                contact_data, operation, batch_id, user_id, correlation_id
             )
-
-            # Validate required user_id parameter
-            if not user_id:
-                logger.error(
-                    f"user_id is required for publishing ContactEvent {contact_data.id}"
-                )
+            if contact_event is None:
                 return False
 
-            # Create ContactEvent
-            contact_event = ContactEvent(
-                metadata=metadata,
-                user_id=user_id,  # user_id is required, no fallback
-                contact=contact_data,
-                operation=operation,
-                batch_id=batch_id,
-                last_updated=datetime.now(timezone.utc),
-                sync_timestamp=datetime.now(timezone.utc),
-                provider=contact_data.provider,
-            )
-
             # Convert to JSON
             message_data = contact_event.model_dump_json().encode("utf-8")
 
             # Publish to contacts topic
             future = self.publisher.publish(
-                f"projects/{self.project_id}/topics/{self.topics['contacts']}",
+                self._topic_path("contacts"),
                 message_data,
             )
-            message_id = future.result()
+            # Await on the loop instead of blocking it on future.result()
+            message_id = await asyncio.wrap_future(future)
 
             logger.debug(
                 f"Published ContactEvent {contact_data.id} (operation: {operation}) to Pub/Sub: {message_id}"
@@ -300,35 +406,11 @@ class PubSubPublisher:
         correlation_id: str | None = None,
     ) -> list[bool]:
         """Publish multiple EmailEvents in batch"""
-        try:
-            results = []
-
-            for email in emails:
-                try:
-                    success = await self.publish_email_event(
-                        email, operation, batch_id, user_id, correlation_id
-                    )
-                    results.append(success)
-                except RuntimeError as e:
-                    # Fatal error (e.g., topic not found) - halt the batch
-                    logger.error(f"Fatal error in batch email publishing: {e}")
-                    # Return partial results and re-raise the fatal error
-                    return results
-                except Exception as e:
-                    logger.error(f"Failed to publish email in batch: {e}")
-                    # Continue with other emails
-                    results.append(False)
-                    continue
-
-            success_count = sum(results)
-            logger.info(
-                f"Published {success_count} out of {len(emails)} EmailEvents to topic {self.topics['emails']}"
-            )
-            return results
-
-        except Exception as e:
-            logger.error(f"Failed to publish batch emails: {e}")
-            raise
+        events: list[BaseEvent | None] = [
+            self._build_email_event(email, operation, batch_id, user_id, correlation_id)
+            for email in emails
+        ]
+        return await self._publish_events("emails", events)
 
     async def publish_batch_calendar_events(
         self,
@@ -339,35 +421,13 @@ class PubSubPublisher:
         correlation_id: str | None = None,
     ) -> list[bool]:
         """Publish multiple CalendarEvents in batch"""
-        try:
-            results = []
-
-            for event in events:
-                try:
-                    success = await self.publish_calendar_event(
-                        event, operation, batch_id, user_id, correlation_id
-                    )
-                    results.append(success)
-                except RuntimeError as e:
-                    # Fatal error (e.g., topic not found) - halt the batch
-                    logger.error(f"Fatal error in batch calendar publishing: {e}")
-                    # Return partial results and re-raise the fatal error
-                    return results
-                except Exception as e:
-                    logger.error(f"Failed to publish calendar event in batch: {e}")
-                    # Continue with other events
-                    results.append(False)
-                    continue
-
-            success_count = sum(results)
-            logger.info(
-                f"Published {success_count} out of {len(events)} CalendarEvents to topic {self.topics['calendars']}"
+        built_events: list[BaseEvent | None] = [
+            self._build_calendar_event(
+                event, operation, batch_id, user_id, correlation_id
             )
-            return results
-
-        except Exception as e:
-            logger.error(f"Failed to publish batch calendar events: {e}")
-            raise
+            for event in events
+        ]
+        return await self._publish_events("calendars", built_events)
 
     async def publish_batch_contacts(
         self,
@@ -378,35 +438,13 @@ class PubSubPublisher:
         correlation_id: str | None = None,
     ) -> list[bool]:
         """Publish multiple contacts in batch"""
-        try:
-            results = []
-
-            for contact in contacts:
-                try:
-                    success = await self.publish_contact(
-                        contact, operation, batch_id, user_id, correlation_id
-                    )
-                    results.append(success)
-                except RuntimeError as e:
-                    # Fatal error (e.g., topic not found) - halt the batch
-                    logger.error(f"Fatal error in batch contact publishing: {e}")
-                    # Return partial results and re-raise the fatal error
-                    return results
-                except Exception as e:
-                    logger.error(f"Failed to publish contact in batch: {e}")
-                    # Continue with other contacts
-                    results.append(False)
-                    continue
-
-            success_count = sum(results)
-            logger.info(
-                f"Published {success_count} out of {len(contacts)} contacts to topic {self.topics['contacts']}"
+        events: list[BaseEvent | None] = [
+            self._build_contact_event(
+                contact, operation, batch_id, user_id, correlation_id
             )
-            return results
-
-        except Exception as e:
-            logger.error(f"Failed to publish batch contacts: {e}")
-            raise
+            for contact in contacts
+        ]
+        return await self._publish_events("contacts", events)
 
     def set_topics(
         self,
@@ -0,0 +1,73 @@
+"""
+Async rate limiting primitives for outbound provider API calls.
+"""
+
+import asyncio
+import time
+from typing import Optional
+
+from services.common.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+
+class TokenBucket:
+    """
+    Async token bucket.
+
+    Tokens refill continuously at ``rate`` per second up to ``capacity``.
+    ``acquire`` waits until enough tokens are available, so concurrent
+    callers sharing one bucket are smoothed to the configured rate while
+    still allowing short bursts up to ``capacity``.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        """
+        Initialize the token bucket.
+
+        Args:
+            rate: Tokens added per second (must be positive)
+            capacity: Maximum tokens held; defaults to ``rate`` (one second burst)
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else max(rate, 1.0))
+        self._tokens = self.capacity
+        self._last_refill = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        elapsed = now - self._last_refill
+        self._last_refill = now
+        self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+
+    async def acquire(self, tokens: float = 1.0) -> float:
+        """
+        Wait until ``tokens`` are available and consume them.
+
+        Args:
+            tokens: Number of tokens to consume (capped at capacity)
+
+        Returns:
+            Seconds spent waiting
+        """
+        tokens = min(tokens, self.capacity)
+        waited = 0.0
+        # The lock keeps waiters FIFO so one caller cannot starve the others
+        async with self._lock:
+            while True:
+                self._refill()
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return waited
+                delay = (tokens - self._tokens) / self.rate
+                waited += delay
+                await asyncio.sleep(delay)
+
+    @property
+    def available(self) -> float:
+        """Tokens currently available (after refilling)."""
+        self._refill()
+        return self._tokens
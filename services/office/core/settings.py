@@ -50,6 +50,11 @@ class Settings(BaseSettings):
         description="Backfill service API key to access this Office service",
         validation_alias=AliasChoices("API_BACKFILL_OFFICE_KEY"),
     )
+    api_email_sync_office_key: Optional[str] = Field(
+        default=None,
+        description="Email sync service API key to access this Office service",
+        validation_alias=AliasChoices("API_EMAIL_SYNC_OFFICE_KEY"),
+    )
     api_office_user_key: Optional[str] = Field(
         default=None,
         description="Office service API key to call User Management service",
@@ -68,9 +73,135 @@ class Settings(BaseSettings):
         default=60, description="Rate limit duration in seconds"
     )
 
+    # Backfill pipeline configuration
+    backfill_fetch_workers: int = Field(
+        default=4, description="Concurrent shard fetch workers per backfill job"
+    )
+    backfill_convert_workers: int = Field(
+        default=2, description="Workers converting messages to events per job"
+    )
+    backfill_publish_workers: int = Field(
+        default=8, description="Concurrent Pub/Sub publish workers per job"
+    )
+    backfill_publish_batch_size: int = Field(
+        default=100,
+        description="Events per Pub/Sub publish batch (also the client batch size)",
+    )
+    backfill_publish_max_bytes: int = Field(
+        default=1024 * 1024,
+        description="Payload bytes per Pub/Sub publish RPC (Pub/Sub caps this at 10MB)",
+    )
+    backfill_publish_max_latency: float = Field(
+        default=0.01,
+        description="Seconds the client waits for a publish batch to fill",
+    )
+    backfill_queue_size: int = Field(
+        default=8,
+        description="Max pages buffered between fetch and convert (bounds memory)",
+    )
+    backfill_shard_window_days: int = Field(
+        default=30, description="Width of each date-window shard in days"
+    )
+    backfill_shard_count: int = Field(
+        default=12,
+        description="Date-window shards to create when no start_date is given",
+    )
+    backfill_google_requests_per_second: float = Field(
+        default=10.0, description="Gmail page fetch rate per backfill job"
+    )
+    backfill_google_burst: int = Field(
+        default=20, description="Gmail page fetch burst size per backfill job"
+    )
+    backfill_microsoft_requests_per_second: float = Field(
+        default=4.0, description="Microsoft Graph page fetch rate per backfill job"
+    )
+    backfill_microsoft_burst: int = Field(
+        default=4, description="Microsoft Graph page fetch burst size per backfill job"
+    )
+
+    # Backfill job scheduling (jobs are stored in the database and claimed by
+    # worker pools on every replica under renewable leases)
+    backfill_job_workers: int = Field(
+        default=2, description="Backfill jobs run at the same time per replica"
+    )
+    backfill_google_max_jobs: int = Field(
+        default=8, description="Gmail backfill jobs running across all replicas"
+    )
+    backfill_microsoft_max_jobs: int = Field(
+        default=4,
+        description="Microsoft Graph backfill jobs running across all replicas",
+    )
+    backfill_lease_seconds: float = Field(
+        default=60.0,
+        description="Seconds a job stays claimed without a heartbeat before "
+        "another worker resumes it",
+    )
+    backfill_heartbeat_seconds: float = Field(
+        default=15.0,
+        description="Seconds between lease renewals and checkpoints of a running job",
+    )
+    backfill_poll_seconds: float = Field(
+        default=5.0, description="Seconds an idle worker waits before polling for jobs"
+    )
+    backfill_max_attempts: int = Field(
+        default=5, description="Times a job is claimed before it is marked failed"
+    )
+
+    # User integration directory cache (providers / preferred provider)
+    integration_cache_ttl: int = Field(
+        default=60, description="Redis TTL in seconds for cached user integrations"
+    )
+    integration_local_cache_ttl: float = Field(
+        default=10.0,
+        description="In-process TTL in seconds for cached user integrations",
+    )
+
+    # Pooled upstream HTTP clients (one per host, shared across requests)
+    http_pool_max_connections: int = Field(
+        default=100, description="Maximum concurrent connections per upstream host"
+    )
+    http_pool_max_keepalive_connections: int = Field(
+        default=20, description="Idle keep-alive connections kept per upstream host"
+    )
+    http_pool_keepalive_expiry: float = Field(
+        default=30.0, description="Seconds an idle upstream connection is kept open"
+    )
+    http_pool_timeout: float = Field(
+        default=30.0, description="Default upstream request timeout in seconds"
+    )
+    http_pool_http2: bool = Field(
+        default=True, description="Negotiate HTTP/2 with upstream hosts"
+    )
+
     # Cache configuration
     CACHE_TTL: int = Field(default=300, description="Cache TTL in seconds")
     CACHE_MAX_SIZE: int = Field(default=1000, description="Maximum cache entries")
+    CACHE_STALE_TTL: int = Field(
+        default=60,
+        description="Seconds an expired entry may still be served while it is refreshed",
+    )
+    CACHE_LOCAL_ENABLED: bool = Field(
+        default=True,
+        description="Keep hot cache entries in an in-process tier in front of Redis",
+    )
+    CACHE_LOCAL_TTL: float = Field(
+        default=10.0, description="Seconds an entry is kept in the in-process tier"
+    )
+    CACHE_LOCAL_MAX_BYTES: int = Field(
+        default=64 * 1024 * 1024,
+        description="Encoded bytes kept in the in-process tier (entries are capped by CACHE_MAX_SIZE)",
+    )
+    CACHE_TAG_TTL: int = Field(
+        default=86400,
+        description="Seconds an invalidation tag set is kept after its last write",
+    )
+    CACHE_REFRESH_LOCK: bool = Field(
+        default=False,
+        description="Coordinate cache refreshes across replicas with a Redis lock",
+    )
+    CACHE_REFRESH_LOCK_TTL: float = Field(
+        default=30.0, description="Seconds a cache refresh lock is held at most"
+    )
 
     # Logging configuration
     LOG_LEVEL: str = Field(default="INFO", description="Logging level")
@@ -4,7 +4,7 @@ from typing import Any, AsyncGenerator, Dict, Optional
 
 from sqlalchemy import JSON
 from sqlalchemy import Enum as SQLEnum
-from sqlalchemy import Text, func
+from sqlalchemy import Index, Text, func, text
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlmodel import Column, DateTime, Field, SQLModel
 
@@ -139,6 +139,53 @@ class RateLimitBucket(SQLModel, table=True):
     )
 
 
+# Backfill jobs
+class BackfillJob(SQLModel, table=True):
+    """
+    Durable state of a backfill job.
+
+    ``data`` holds the job's BackfillStatus, including its shard checkpoints;
+    the columns hold what jobs are looked up and scheduled by. A running job
+    is owned by the worker named in ``lease_owner`` until
+    ``lease_expires_at``; a job whose lease has lapsed is resumed by another
+    worker from its last checkpoint.
+    """
+
+    __tablename__ = "backfill_jobs"  # type: ignore[assignment]
+    __table_args__ = (
+        Index("ix_backfill_jobs_user_id_created_at", "user_id", "created_at"),
+        Index("ix_backfill_jobs_status_lease", "status", "lease_expires_at"),
+        # At most one active job per user, enforced across replicas
+        Index(
+            "uq_backfill_jobs_active_user",
+            "user_id",
+            unique=True,
+            postgresql_where=text("status IN ('queued', 'running', 'paused')"),
+            sqlite_where=text("status IN ('queued', 'running', 'paused')"),
+        ),
+        {"extend_existing": True},
+    )
+
+    job_id: str = Field(primary_key=True, max_length=255)
+    user_id: str = Field(max_length=255)
+    provider: str = Field(max_length=20)
+    status: str = Field(max_length=20)
+    data: Dict[str, Any] = Field(sa_column=Column(JSON, nullable=False))
+    lease_owner: Optional[str] = Field(default=None, max_length=255)
+    lease_expires_at: Optional[datetime] = Field(
+        default=None, sa_column=Column(DateTime(timezone=True))
+    )
+    attempts: int = Field(default=0)
+    created_at: datetime = Field(
+        default_factory=lambda: datetime.now(timezone.utc),
+        sa_column=Column(DateTime(timezone=True), nullable=False),
+    )
+    updated_at: datetime = Field(
+        default_factory=lambda: datetime.now(timezone.utc),
+        sa_column=Column(DateTime(timezone=True), nullable=False),
+    )
+
+
 # Database lifecycle management
 async def get_async_session() -> AsyncGenerator[AsyncSession, None]:
     """Get async database session for dependency injection."""
@@ -13,6 +13,7 @@ from pydantic import BaseModel, ConfigDict, Field
 class BackfillStatusEnum(str, Enum):
     """Status of a backfill job"""
 
+    QUEUED = "queued"
     STARTED = "started"
     RUNNING = "running"
     PAUSED = "paused"
@@ -71,6 +72,27 @@ class BackfillResponse(BaseModel):
     model_config = ConfigDict(extra="forbid")
 
 
+class BackfillShardCheckpoint(BaseModel):
+    """Resume checkpoint for one folder/date-window shard of a backfill job"""
+
+    folder: Optional[str] = Field(
+        None, description="Provider folder/label ID, or None for all mail"
+    )
+    start_date: Optional[datetime] = Field(
+        None, description="Inclusive lower bound of the shard's received-date window"
+    )
+    end_date: Optional[datetime] = Field(
+        None, description="Exclusive upper bound of the shard's received-date window"
+    )
+    next_page_token: Optional[str] = Field(
+        None, description="Provider cursor for the first unprocessed page"
+    )
+    completed: bool = Field(False, description="Whether every page was processed")
+    processed_emails: int = Field(0, ge=0, description="Emails published from shard")
+
+    model_config = ConfigDict(extra="forbid")
+
+
 class BackfillStatus(BaseModel):
     """Current status of a backfill job"""
 
@@ -88,6 +110,14 @@ class BackfillStatus(BaseModel):
     total_emails: int = Field(0, ge=0, description="Total emails to process")
     processed_emails: int = Field(0, ge=0, description="Number of emails processed")
     failed_emails: int = Field(0, ge=0, description="Number of emails that failed")
+    next_page_token: Optional[str] = Field(
+        None,
+        description="Provider cursor for the first unprocessed page (resume checkpoint)",
+    )
+    shards: List[BackfillShardCheckpoint] = Field(
+        default_factory=list,
+        description="Folder/date-window shards with per-shard resume checkpoints",
+    )
     error_message: Optional[str] = Field(
         None, description="Error message if job failed"
     )
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Benchmark cache payload size and cache-hit decode time for message pages.
+
+Compares the previous cache format (``json.dumps`` of the dumped response,
+then ``json.loads`` and an ``EmailMessage(**m)`` per message on every hit)
+with the binary entries of ``cache_codec`` decoded straight into
+``EmailMessageListData``, and with a hit on the in-process tier. Redis round
+trips are not included; they shrink with the payload.
+
+Usage:
+    python -m services.office.scripts.benchmark_cache_codec [--messages N]
+"""
+
+import argparse
+import json
+import random
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Callable
+
+from services.api.v1.office import (
+    EmailAddress,
+    EmailMessage,
+    EmailMessageListData,
+    Provider,
+)
+from services.office.core import cache_codec
+from services.office.core.cache_codec import decode_entry, encode_entry
+from services.office.core.local_cache import LocalCache
+
+_WORDS = (
+    "quarterly planning review notes thursday questions budget launch team "
+    "customer roadmap update meeting agenda design draft feedback schedule "
+    "deadline priority follow-up proposal contract invoice report metrics"
+).split()
+
+
+def _body(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(_WORDS) for _ in range(words))
+
+
+def _page(count: int) -> EmailMessageListData:
+    rng = random.Random(0)
+    now = datetime.now(timezone.utc)
+    messages = [
+        EmailMessage(
+            id=f"gmail_{i:016x}",
+            thread_id=f"gmail_thread_{i // 3:016x}",
+            subject=_body(rng, 6),
+            snippet=_body(rng, 20),
+            body_text=_body(rng, 300),
+            body_html=f"<div><p>{_body(rng, 300)}</p></div>",
+            from_address=EmailAddress(email=f"sender{i}@example.com", name="Sender"),
+            to_addresses=[EmailAddress(email="user@example.com", name="User")],
+            date=now - timedelta(minutes=i),
+            labels=["INBOX", "IMPORTANT"],
+            provider=Provider.GOOGLE,
+            provider_message_id=f"{i:016x}",
+            account_email="user@example.com",
+        )
+        for i in range(count)
+    ]
+    return EmailMessageListData(
+        messages=messages,
+        total_count=count,
+        providers_used=["google"],
+        request_metadata={"user_id": "benchmark", "limit": count},
+    )
+
+
+def _time(func: Callable[[], object], rounds: int) -> float:
+    started = time.perf_counter()
+    for _ in range(rounds):
+        func()
+    return (time.perf_counter() - started) / rounds
+
+
+def _legacy_hit(data: str) -> EmailMessageListData:
+    cached = json.loads(data)
+    messages = [EmailMessage(**m) for m in cached.get("messages", [])]
+    return EmailMessageListData(
+        messages=messages,
+        total_count=cached.get("total_count", len(messages)),
+        providers_used=cached.get("providers_used", []),
+        provider_errors=cached.get("provider_errors"),
+        has_more=cached.get("has_more", False),
+        request_metadata=cached.get("request_metadata", {}),
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--messages", type=int, default=100)
+    parser.add_argument("--rounds", type=int, default=200)
+    args = parser.parse_args()
+
+    page = _page(args.messages)
+    legacy = json.dumps(
+        {**page.model_dump(), "messages": [m.model_dump() for m in page.messages]},
+        default=str,
+    )
+    encoded = encode_entry(page, time.time() + 60)
+    local = LocalCache()
+    local.set("page", page, time.time() + 60, len(encoded))
+
+    assert _legacy_hit(legacy) == page
+    decoded = decode_entry(encoded, EmailMessageListData)
+    assert decoded is not None and decoded[0] == page
+
+    legacy_hit = _time(lambda: _legacy_hit(legacy), args.rounds)
+    redis_hit = _time(lambda: decode_entry(encoded, EmailMessageListData), args.rounds)
+    local_hit = _time(lambda: local.get("page"), args.rounds)
+
+    compression = "zstd" if cache_codec.ZSTD_AVAILABLE else "zlib"
+    json_library = "orjson" if cache_codec.ORJSON_AVAILABLE else "json"
+    print(f"{args.messages} messages per page ({json_library} + {compression})")
+    print(f"payload, json:        {len(legacy.encode()) / 1024:>9.1f} KiB")
+    print(
+        f"payload, binary:      {len(encoded) / 1024:>9.1f} KiB  "
+        f"({len(legacy.encode()) / len(encoded):.1f}x smaller)"
+    )
+    print(f"hit, json + models:   {legacy_hit * 1000:>9.3f} ms")
+    print(
+        f"hit, binary (Redis):  {redis_hit * 1000:>9.3f} ms  "
+        f"({legacy_hit / redis_hit:.1f}x)"
+    )
+    print(
+        f"hit, in-process:      {local_hit * 1000:>9.3f} ms  "
+        f"({legacy_hit / local_hit:.0f}x)"
+    )
+
+
+if __name__ == "__main__":
+    main()
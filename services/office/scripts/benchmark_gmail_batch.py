@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Benchmark Gmail message hydration against a local fake Gmail server.
+
+The fake server answers messages.get and the multipart batch endpoint after
+a fixed per-request latency (simulating the round trip to Google). The
+baseline hydrates messages one at a time like the old ``get_message`` loop;
+the batched run uses ``get_messages_batch``, and the fallback run disables the
+batch endpoint so ``get_messages_batch`` falls back to concurrent fetches.
+
+Usage:
+    python -m services.office.scripts.benchmark_gmail_batch [--messages N]
+"""
+
+import argparse
+import asyncio
+import json
+import re
+import socket
+import time
+from typing import Awaitable, Callable, List
+
+import uvicorn
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response
+from starlette.routing import Route
+
+from services.common.logging_config import setup_service_logging
+from services.office.core.clients.google import GoogleAPIClient
+
+_BOUNDARY = "fake_batch_boundary"
+
+
+def _message(message_id: str) -> dict:
+    return {
+        "id": message_id,
+        "threadId": f"thread-{message_id}",
+        "snippet": "lorem ipsum",
+        "payload": {
+            "headers": [
+                {"name": "Subject", "value": f"Subject {message_id}"},
+                {"name": "From", "value": "sender@example.com"},
+            ],
+            "body": {"data": "bG9yZW0gaXBzdW0g" * 100},
+        },
+    }
+
+
+def _fake_gmail(latency: float, batch_enabled: bool) -> Starlette:
+    async def get_message(request: Request) -> Response:
+        await asyncio.sleep(latency)
+        return JSONResponse(_message(request.path_params["message_id"]))
+
+    async def batch(request: Request) -> Response:
+        if not batch_enabled:
+            return JSONResponse({"error": {"message": "unavailable"}}, 503)
+        body = (await request.body()).decode()
+        await asyncio.sleep(latency)
+        parts = []
+        for index, path in enumerate(re.findall(r"GET (\S+)", body)):
+            message_id = path.split("?")[0].rsplit("/", 1)[1]
+            parts.append(
+                f"--{_BOUNDARY}\r\n"
+                "Content-Type: application/http\r\n"
+                f"Content-ID: <response-item-{index}>\r\n\r\n"
+                "HTTP/1.1 200 OK\r\n"
+                "Content-Type: application/json; charset=UTF-8\r\n\r\n"
+                f"{json.dumps(_message(message_id))}\r\n"
+            )
+        parts.append(f"--{_BOUNDARY}--\r\n")
+        return Response(
+            "".join(parts), media_type=f"multipart/mixed; boundary={_BOUNDARY}"
+        )
+
+    return Starlette(
+        routes=[
+            Route("/gmail/v1/users/me/messages/{message_id}", get_message),
+            Route("/batch/gmail/v1", batch, methods=["POST"]),
+        ]
+    )
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return int(sock.getsockname()[1])
+
+
+class _LocalGoogleClient(GoogleAPIClient):
+    def __init__(self, base_url: str) -> None:
+        super().__init__("benchmark-token", "benchmark-user")
+        self.base_url = base_url
+
+    def _get_base_url(self) -> str:
+        return self.base_url
+
+
+async def _timed(
+    base_url: str,
+    ids: List[str],
+    hydrate: Callable[[GoogleAPIClient, List[str]], Awaitable[None]],
+) -> float:
+    client = _LocalGoogleClient(base_url)
+    async with client:
+        started = time.perf_counter()
+        await hydrate(client, ids)
+        return time.perf_counter() - started
+
+
+async def _sequential(client: GoogleAPIClient, ids: List[str]) -> None:
+    for message_id in ids:
+        await client.get_message(message_id)
+
+
+async def _batched(client: GoogleAPIClient, ids: List[str]) -> None:
+    results = await client.get_messages_batch(ids)
+    assert all(isinstance(result, dict) for result in results)
+
+
+async def _run_server(args: argparse.Namespace, batch_enabled: bool) -> List[float]:
+    port = _free_port()
+    server = uvicorn.Server(
+        uvicorn.Config(
+            _fake_gmail(args.latency_ms / 1000, batch_enabled),
+            host="127.0.0.1",
+            port=port,
+            log_level="error",
+        )
+    )
+    task = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.01)
+
+    base_url = f"http://127.0.0.1:{port}"
+    ids = [f"m{i}" for i in range(args.messages)]
+    try:
+        if batch_enabled:
+            return [
+                await _timed(base_url, ids, _sequential),
+                await _timed(base_url, ids, _batched),
+            ]
+        return [await _timed(base_url, ids, _batched)]
+    finally:
+        server.should_exit = True
+        await task
+
+
+async def _run(args: argparse.Namespace) -> None:
+    sequential, batched = await _run_server(args, batch_enabled=True)
+    (fallback,) = await _run_server(args, batch_enabled=False)
+
+    print(f"{args.messages} messages, {args.latency_ms:.0f} ms simulated round trip")
+    print(f"sequential get_message:         {sequential * 1000:>8.0f} ms")
+    print(
+        f"get_messages_batch (batch):     {batched * 1000:>8.0f} ms  "
+        f"({sequential / batched:.1f}x)"
+    )
+    print(
+        f"get_messages_batch (fallback):  {fallback * 1000:>8.0f} ms  "
+        f"({sequential / fallback:.1f}x)"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--messages", type=int, default=50)
+    parser.add_argument("--latency-ms", type=float, default=40.0)
+    args = parser.parse_args()
+
+    # Per-request debug/error logging would dominate the timings
+    setup_service_logging("benchmark", log_level="CRITICAL", log_format="text")
+    asyncio.run(_run(args))
+
+
+if __name__ == "__main__":
+    main()
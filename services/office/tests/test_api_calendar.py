@@ -76,6 +76,7 @@ def mock_cache_manager():
     with patch("services.office.api.calendar.cache_manager") as mock:
         mock.get_from_cache = AsyncMock(return_value=None)
         mock.set_to_cache = AsyncMock()
+        mock.invalidate_tags = AsyncMock(return_value=0)
         yield mock
 
 
@@ -37,6 +37,12 @@ def patch_settings(monkeypatch):
     monkeypatch.setattr("services.office.core.settings._settings", test_settings)
 
 
+@pytest.fixture(autouse=True)
+def reset_http_pool(monkeypatch):
+    """Start each test with an empty shared HTTP client pool."""
+    monkeypatch.setattr("services.office.core.http_pool._pool", None)
+
+
 class MockAPIClient(BaseAPIClient):
     """Mock API client for testing base functionality."""
 
@@ -72,9 +78,15 @@ class TestBaseAPIClient:
         async with mock_client:
             assert mock_client.http_client is not None
             assert isinstance(mock_client.http_client, httpx.AsyncClient)
+            shared_client = mock_client.http_client
 
-        # Client should be closed after context
-        assert mock_client.http_client.is_closed
+        # The pooled client is released, not closed, and reused by later clients
+        assert mock_client.http_client is None
+        assert not shared_client.is_closed
+
+        other_client = MockAPIClient("other_token", "other_user", Provider.GOOGLE)
+        async with other_client:
+            assert other_client.http_client is shared_client
 
     @pytest.mark.asyncio
     async def test_get_request_success(self, mock_client):
@@ -446,6 +458,39 @@ class TestMicrosoftAPIClient:
                 assert params["$top"] == 25
                 assert params["$filter"] == "isRead eq false"
 
+    @pytest.mark.asyncio
+    async def test_get_messages_page_follows_next_link(self, microsoft_client):
+        """Test that an @odata.nextLink is requested verbatim."""
+        next_link = (
+            "https://graph.microsoft.com/v1.0/me/messages?$top=25&$skiptoken=abc"
+        )
+
+        async with microsoft_client:
+            with patch.object(
+                microsoft_client.http_client, "request", new_callable=AsyncMock
+            ) as mock_request:
+                mock_response = MagicMock()
+                mock_response.status_code = 200
+                mock_response.json.return_value = {"value": []}
+                mock_response.raise_for_status.return_value = None
+                mock_request.return_value = mock_response
+
+                result = await microsoft_client.get_messages_page(next_link)
+
+                assert result == {"value": []}
+                call_args = mock_request.call_args
+                assert call_args[1]["url"] == next_link
+                assert call_args[1]["params"] is None
+
+    @pytest.mark.asyncio
+    async def test_get_messages_page_rejects_foreign_host(self, microsoft_client):
+        """Test that nextLinks outside Graph are refused."""
+        async with microsoft_client:
+            with pytest.raises(ValueError):
+                await microsoft_client.get_messages_page(
+                    "https://evil.example.com/v1.0/me/messages"
+                )
+
     @pytest.mark.asyncio
     async def test_get_events(self, microsoft_client):
         """Test Microsoft Graph get events API call."""
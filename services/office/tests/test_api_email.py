@@ -5,6 +5,7 @@ Tests email listing, searching, sending, and management functionality
 for both Google and Microsoft providers with comprehensive error handling.
 """
 
+import time
 from datetime import datetime, timezone
 from unittest.mock import AsyncMock, patch
 
@@ -18,6 +19,8 @@ from services.api.v1.office import (
     SendEmailRequest,
 )
 from services.office.app.main import app
+from services.office.core.cache_codec import encode_entry
+from services.office.core.cache_manager import CacheManager
 
 
 @pytest.fixture(autouse=True)
@@ -76,10 +79,13 @@ def mock_email_message():
 
 @pytest.fixture
 def mock_cache_manager():
-    """Mock the cache manager."""
-    with patch("services.office.api.email.cache_manager") as mock:
+    """Mock the cache manager's Redis reads and writes."""
+    with patch("services.office.api.email.cache_manager", CacheManager()) as mock:
         mock.get_from_cache = AsyncMock(return_value=None)
         mock.set_to_cache = AsyncMock()
+        mock.get_raw = AsyncMock(return_value=None)
+        mock.set_raw = AsyncMock()
+        mock.invalidate_tags = AsyncMock(return_value=0)
         yield mock
 
 
@@ -147,7 +153,9 @@ class TestEmailMessagesEndpoint:
                 "include_body": False,
             },
         }
-        mock_cache_manager.get_from_cache.return_value = cached_data
+        mock_cache_manager.get_raw.return_value = encode_entry(
+            cached_data, time.time() + 60
+        )
 
         response = client.get("/v1/email/messages?limit=10", headers=auth_headers)
 
@@ -156,7 +164,7 @@ class TestEmailMessagesEndpoint:
 
         assert data["success"] is True
         assert data["cache_hit"] is True
-        assert data["data"] == cached_data
+        assert data["data"] == {**cached_data, "next_page_token": None}
 
         # Ensure fetch_provider_emails was not called due to cache hit
         mock_fetch_provider_emails.assert_not_called()
@@ -218,7 +226,7 @@ class TestEmailMessagesEndpoint:
     ):
         """Test that email messages are not cached when all providers fail."""
         # Mock cache miss
-        mock_cache_manager.get_from_cache.return_value = None
+        mock_cache_manager.get_raw.return_value = None
 
         # Mock all providers failing with different error types
         mock_fetch_provider_emails.side_effect = [
@@ -243,11 +251,11 @@ class TestEmailMessagesEndpoint:
         assert len(data["data"]["provider_errors"]) == 2
 
         # Verify that the response was NOT cached since all providers failed
-        mock_cache_manager.set_to_cache.assert_not_called()
+        mock_cache_manager.set_raw.assert_not_called()
 
         # Verify that cache was checked but not set
-        mock_cache_manager.get_from_cache.assert_called_once()
-        assert mock_cache_manager.set_to_cache.call_count == 0
+        mock_cache_manager.get_raw.assert_called_once()
+        assert mock_cache_manager.set_raw.call_count == 0
 
     @patch("services.office.api.email.fetch_provider_emails")
     @pytest.mark.asyncio
@@ -268,7 +276,7 @@ class TestEmailMessagesEndpoint:
         ]
 
         # Mock cache to return None (cache miss)
-        mock_cache_manager.get_from_cache.return_value = None
+        mock_cache_manager.get_raw.return_value = None
 
         response = client.get(
             "/v1/email/messages?limit=10&no_cache=true", headers=auth_headers
@@ -399,6 +407,41 @@ class TestSendEmailEndpoint:
         mock_create_client.assert_called_once()
         mock_factory.create_client.assert_called_once_with("test_user", "google")
 
+    @patch("services.office.api.email.get_api_client_factory")
+    @pytest.mark.asyncio
+    async def test_send_email_invalidates_cached_mail(
+        self,
+        mock_create_client,
+        send_email_request,
+        client,
+        auth_headers,
+        mock_cache_manager,
+    ):
+        """Test that sending drops the cached lists and the replied-to thread."""
+        mock_google_client = AsyncMock()
+        mock_google_client.__aenter__.return_value = mock_google_client
+        mock_google_client.send_message = AsyncMock(
+            return_value={"id": "sent_123", "threadId": "thread_1"}
+        )
+        mock_factory = AsyncMock()
+        mock_factory.create_client = AsyncMock(return_value=mock_google_client)
+        mock_create_client.return_value = mock_factory
+
+        response = client.post(
+            "/v1/email/send",
+            json=send_email_request.model_dump(),
+            headers=auth_headers,
+        )
+
+        assert response.status_code == 200
+        assert response.json()["success"] is True
+        mock_cache_manager.invalidate_tags.assert_awaited_once_with(
+            "office:test_user:tag:messages",
+            "office:test_user:tag:threads",
+            "office:test_user:tag:folders",
+            "office:test_user:tag:thread:gmail_thread_1",
+        )
+
     @patch("services.office.api.email.get_api_client_factory")
     @pytest.mark.asyncio
     async def test_send_email_microsoft_success(
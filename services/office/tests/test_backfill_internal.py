@@ -3,14 +3,19 @@
 Tests for internal backfill endpoints (service-to-service communication)
 """
 
+import asyncio
 from datetime import datetime, timezone
 from unittest.mock import AsyncMock, patch
 
 import pytest
 from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
 
 from services.office.app.main import app
+from services.office.core.backfill_store import BackfillJobStore
 from services.office.core.settings import get_settings
+from services.office.models import BackfillJob
 from services.office.models.backfill import BackfillRequest, ProviderEnum
 
 client = TestClient(app)
@@ -37,6 +42,25 @@ def patch_settings():
     office_settings._settings = None
 
 
+@pytest.fixture(autouse=True)
+def job_store(tmp_path, monkeypatch):
+    """Store backfill jobs in a throwaway SQLite database."""
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'office.db'}", poolclass=NullPool
+    )
+
+    async def create_table() -> None:
+        async with engine.begin() as conn:
+            await conn.run_sync(BackfillJob.__table__.create)  # type: ignore[attr-defined]
+
+    asyncio.run(create_table())
+    store = BackfillJobStore(
+        async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    )
+    monkeypatch.setattr("services.office.api.backfill.backfill_job_store", store)
+    return store
+
+
 class TestInternalBackfillEndpoints:
     """Test internal backfill endpoints with API key authentication"""
 
@@ -72,6 +96,37 @@ class TestInternalBackfillEndpoints:
             assert data["status"] == "started"
             assert "Internal backfill job started successfully" in data["message"]
 
+    def test_start_internal_backfill_queues_job(self):
+        """Test that a started job is stored as queued for the workers"""
+        response = client.post(
+            f"/internal/backfill/start?user_id={self.test_user_email}",
+            json=self.valid_request,
+            headers={"X-API-Key": self.valid_backfill_key},
+        )
+
+        job_id = response.json()["job_id"]
+        status_response = client.get(
+            f"/internal/backfill/status/{job_id}?user_id={self.test_user_email}",
+            headers={"X-API-Key": self.valid_backfill_key},
+        )
+        assert status_response.json()["status"] == "queued"
+
+    def test_start_internal_backfill_conflict(self):
+        """Test that a user can only have one active backfill job"""
+        first = client.post(
+            f"/internal/backfill/start?user_id={self.test_user_email}",
+            json=self.valid_request,
+            headers={"X-API-Key": self.valid_backfill_key},
+        )
+        second = client.post(
+            f"/internal/backfill/start?user_id={self.test_user_email}",
+            json=self.valid_request,
+            headers={"X-API-Key": self.valid_backfill_key},
+        )
+
+        assert second.status_code == 409
+        assert first.json()["job_id"] in second.json().get("message", "")
+
     def test_start_internal_backfill_missing_user_id(self):
         """Test internal backfill start without user_id parameter"""
         response = client.post(
@@ -0,0 +1,385 @@
+"""
+Unit tests for the staged backfill pipeline, shard planning and token bucket.
+"""
+
+import asyncio
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Tuple
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from services.api.v1.office import EmailAddress, EmailMessage, Provider
+from services.common.pubsub_client import PublishResult
+from services.office.core import backfill_pipeline
+from services.office.core.backfill_pipeline import (
+    BackfillPipeline,
+    plan_backfill_shards,
+)
+from services.office.core.rate_limiter import TokenBucket
+from services.office.models.backfill import (
+    BackfillRequest,
+    BackfillStatus,
+    BackfillStatusEnum,
+)
+
+
+@pytest.fixture(autouse=True)
+def patch_settings():
+    """Patch the _settings global variable to return test settings."""
+    import services.office.core.settings as office_settings
+
+    test_settings = office_settings.Settings(
+        db_url_office="sqlite:///:memory:",
+        api_frontend_office_key="test-frontend-office-key",
+        api_chat_office_key="test-chat-office-key",
+        api_meetings_office_key="test-meetings-office-key",
+        api_backfill_office_key="test-backfill-office-key",
+        api_office_user_key="test-office-user-key",
+        pagination_secret_key="test-pagination-secret-key",
+    )
+
+    office_settings._settings = test_settings
+    yield
+    office_settings._settings = None
+
+
+NOW = datetime(2024, 6, 1, tzinfo=timezone.utc)
+
+
+def _make_email(message_id: str) -> EmailMessage:
+    return EmailMessage(
+        id=f"gmail_{message_id}",
+        subject=message_id,
+        from_address=EmailAddress(email="sender@example.com"),
+        date=NOW,
+        provider=Provider.GOOGLE,
+        provider_message_id=message_id,
+        account_email="me@example.com",
+    )
+
+
+class FakeCrawler:
+    """Serves pre-built pages keyed by (folder, start_date, page_token)."""
+
+    def __init__(self, pages: Dict[Tuple, Tuple[List[str], Optional[str]]]):
+        self.pages = pages
+        self.next_page_token: Optional[str] = None
+        self.calls: List[Tuple] = []
+
+    async def crawl_emails(
+        self, batch_size, start_date, end_date, folders, resume_from, max_emails=None
+    ):
+        folder = folders[0] if folders else None
+        token = resume_from
+        while True:
+            key = (folder, start_date, token)
+            self.calls.append(key)
+            ids, token = self.pages[key]
+            self.next_page_token = token
+            if ids:
+                yield [_make_email(message_id) for message_id in ids]
+            if not token:
+                return
+
+
+def _make_job(**request_kwargs) -> BackfillStatus:
+    request = BackfillRequest(provider="google", **request_kwargs)
+    return BackfillStatus(
+        job_id="job-1",
+        user_id="me@example.com",
+        status=BackfillStatusEnum.RUNNING,
+        start_time=NOW,
+        request=request,
+    )
+
+
+def _make_pipeline(job, crawler, publish=None, **kwargs) -> BackfillPipeline:
+    publish = publish or (lambda event: f"msg-{event.email.id}")
+    published: List = []
+
+    async def publish_email_events(events):
+        results = []
+        for event in events:
+            published.append(event)
+            try:
+                results.append(PublishResult(message_id=publish(event)))
+            except Exception as e:
+                results.append(PublishResult(error=str(e), exception=e))
+        return results
+
+    pubsub_client = MagicMock()
+    pubsub_client.published = published
+    pubsub_client.publish_email_events = AsyncMock(side_effect=publish_email_events)
+    return BackfillPipeline(
+        job,
+        "user-1",
+        "me@example.com",
+        pubsub_client,
+        batch_size=2,
+        crawler_factory=lambda: crawler,
+        fetch_workers=kwargs.pop("fetch_workers", 2),
+        convert_workers=1,
+        publish_workers=kwargs.pop("publish_workers", 3),
+        publish_batch_size=kwargs.pop("publish_batch_size", 10),
+        queue_size=1,
+        rate_limiter=TokenBucket(1000, 1000),
+        **kwargs,
+    )
+
+
+class TestPlanBackfillShards:
+    def test_start_date_is_cut_into_windows(self):
+        shards = plan_backfill_shards(
+            folders=None,
+            start_date=NOW - timedelta(days=25),
+            end_date=NOW,
+            window_days=10,
+            default_shard_count=12,
+        )
+
+        assert [(s.start_date, s.end_date) for s in shards] == [
+            (NOW - timedelta(days=10), NOW),
+            (NOW - timedelta(days=20), NOW - timedelta(days=10)),
+            (NOW - timedelta(days=25), NOW - timedelta(days=20)),
+        ]
+
+    def test_open_ended_range_adds_tail_shard(self):
+        shards = plan_backfill_shards(
+            folders=["INBOX", "SENT"],
+            start_date=None,
+            end_date=None,
+            window_days=30,
+            default_shard_count=2,
+            now=NOW,
+        )
+
+        assert len(shards) == 6
+        assert shards[2].start_date is None
+        assert shards[2].end_date == NOW - timedelta(days=60)
+        assert {s.folder for s in shards} == {"INBOX", "SENT"}
+
+
+class TestTokenBucket:
+    @pytest.mark.asyncio
+    async def test_burst_then_paced(self):
+        bucket = TokenBucket(rate=50, capacity=2)
+
+        started = time.monotonic()
+        for _ in range(4):
+            await bucket.acquire()
+        elapsed = time.monotonic() - started
+
+        # Two burst tokens are free, the next two wait ~1/50s each
+        assert 0.03 <= elapsed < 0.5
+
+    def test_rejects_non_positive_rate(self):
+        with pytest.raises(ValueError):
+            TokenBucket(rate=0)
+
+
+class TestBackfillPipeline:
+    @pytest.mark.asyncio
+    async def test_publishes_all_shards_and_completes_checkpoints(self):
+        job = _make_job(folders=["INBOX", "SENT"])
+        job.shards = plan_backfill_shards(
+            job.request.folders, NOW - timedelta(days=1), NOW, 1, 0
+        )
+        start = NOW - timedelta(days=1)
+        crawler = FakeCrawler(
+            {
+                ("INBOX", start, None): (["a1", "a2"], "a-2"),
+                ("INBOX", start, "a-2"): (["a3"], None),
+                ("SENT", start, None): (["b1", "b2"], "b-2"),
+                ("SENT", start, "b-2"): ([], None),
+            }
+        )
+        pipeline = _make_pipeline(job, crawler)
+
+        await pipeline.run()
+
+        published = {event.email.id for event in pipeline.pubsub_client.published}
+        assert published == {"a1", "a2", "a3", "b1", "b2"}
+        assert job.processed_emails == 5
+        assert all(shard.completed for shard in job.shards)
+        assert [shard.processed_emails for shard in job.shards] == [3, 2]
+
+    @pytest.mark.asyncio
+    async def test_publish_workers_send_queued_events_as_one_batch(self):
+        job = _make_job()
+        job.shards = plan_backfill_shards(None, None, None, 30, 0, now=NOW)
+        crawler = FakeCrawler({(None, None, None): (["a1", "a2", "a3"], None)})
+        pipeline = _make_pipeline(job, crawler, publish_workers=1)
+
+        await pipeline.run()
+
+        batch_sizes = [
+            len(call.args[0])
+            for call in pipeline.pubsub_client.publish_email_events.call_args_list
+        ]
+        # The converter queues the whole page before the publisher wakes up
+        assert batch_sizes == [3]
+        assert job.processed_emails == 3
+
+    @pytest.mark.asyncio
+    async def test_failed_publish_holds_checkpoint_and_raises(self):
+        job = _make_job()
+        job.shards = plan_backfill_shards(None, None, None, 30, 0, now=NOW)
+        crawler = FakeCrawler(
+            {
+                (None, None, None): (["a1", "a2"], "t-2"),
+                (None, None, "t-2"): (["a3"], None),
+            }
+        )
+
+        def publish(event):
+            if event.email.id == "a2":
+                raise RuntimeError("publish failed")
+            return "ok"
+
+        pipeline = _make_pipeline(job, crawler, publish=publish)
+        with pytest.raises(RuntimeError, match="failed to publish email a2"):
+            await pipeline.run()
+
+        assert job.processed_emails == 2
+        assert job.failed_emails == 1
+        # The page with the failed message is refetched on resume
+        assert not job.shards[0].completed
+        assert job.shards[0].next_page_token is None
+
+    @pytest.mark.asyncio
+    async def test_max_emails_stops_without_completing_shard(self):
+        job = _make_job(max_emails=3)
+        job.shards = plan_backfill_shards(None, None, None, 30, 0, now=NOW)
+        crawler = FakeCrawler(
+            {
+                (None, None, None): (["a1", "a2"], "t-2"),
+                (None, None, "t-2"): (["a3", "a4"], "t-3"),
+                (None, None, "t-3"): (["a5"], None),
+            }
+        )
+        pipeline = _make_pipeline(job, crawler, max_emails=3)
+
+        await pipeline.run()
+
+        assert job.processed_emails == 3
+        assert not job.shards[0].completed
+        # The cut-short page is checkpointed at its own cursor, so a4 is
+        # fetched again on resume
+        assert job.shards[0].next_page_token == "t-2"
+        # Single-shard jobs mirror the cursor on the job itself
+        assert job.next_page_token == "t-2"
+
+    @pytest.mark.asyncio
+    async def test_max_emails_on_page_boundary_checkpoints_next_page(self):
+        job = _make_job(max_emails=2)
+        job.shards = plan_backfill_shards(None, None, None, 30, 0, now=NOW)
+        crawler = FakeCrawler(
+            {
+                (None, None, None): (["a1", "a2"], "t-2"),
+                (None, None, "t-2"): (["a3"], None),
+            }
+        )
+        pipeline = _make_pipeline(job, crawler, max_emails=2)
+
+        await pipeline.run()
+
+        assert job.processed_emails == 2
+        assert job.shards[0].next_page_token == "t-2"
+
+    @pytest.mark.asyncio
+    async def test_failed_conversion_holds_checkpoint_and_raises(self):
+        job = _make_job()
+        job.shards = plan_backfill_shards(None, None, None, 30, 0, now=NOW)
+        crawler = FakeCrawler(
+            {
+                (None, None, None): (["a1"], "t-2"),
+                (None, None, "t-2"): (["a2", "a3"], None),
+            }
+        )
+        convert = backfill_pipeline.email_message_to_event
+
+        def email_message_to_event(email, *args):
+            if email.provider_message_id == "a2":
+                raise ValueError("bad message")
+            return convert(email, *args)
+
+        pipeline = _make_pipeline(job, crawler)
+        with patch.object(
+            backfill_pipeline, "email_message_to_event", email_message_to_event
+        ):
+            with pytest.raises(RuntimeError, match="failed to convert email"):
+                await pipeline.run()
+
+        assert job.failed_emails == 1
+        assert not job.shards[0].completed
+        assert job.shards[0].next_page_token == "t-2"
+
+    @pytest.mark.asyncio
+    async def test_shard_failure_keeps_checkpoint_and_raises(self):
+        job = _make_job()
+        job.shards = plan_backfill_shards(None, None, None, 30, 0, now=NOW)
+
+        class FailingCrawler(FakeCrawler):
+            async def crawl_emails(self, *args, **kwargs):
+                async for batch in super().crawl_emails(*args, **kwargs):
+                    yield batch
+                raise RuntimeError("provider down")
+
+        crawler = FailingCrawler({(None, None, None): (["a1"], None)})
+        pipeline = _make_pipeline(job, crawler)
+
+        with pytest.raises(RuntimeError, match="provider down"):
+            await pipeline.run()
+
+        assert job.processed_emails == 1
+        assert not job.shards[0].completed
+
+    @pytest.mark.asyncio
+    async def test_resumes_from_shard_checkpoint(self):
+        job = _make_job()
+        job.shards = plan_backfill_shards(None, None, None, 30, 0, now=NOW)
+        job.shards[0].next_page_token = "t-2"
+        job.processed_emails = 2
+        crawler = FakeCrawler({(None, None, "t-2"): (["a3"], None)})
+        pipeline = _make_pipeline(job, crawler)
+
+        await pipeline.run()
+
+        assert crawler.calls == [(None, None, "t-2")]
+        assert job.processed_emails == 3
+        assert job.shards[0].completed
+
+    @pytest.mark.asyncio
+    async def test_cancelled_job_stops_fetching(self):
+        job = _make_job()
+        job.shards = plan_backfill_shards(None, None, None, 30, 0, now=NOW)
+
+        class GatedCrawler(FakeCrawler):
+            async def crawl_emails(self, *args, **kwargs):
+                async for batch in super().crawl_emails(*args, **kwargs):
+                    yield batch
+                    # Hold further pages until the job has been cancelled
+                    while job.status != BackfillStatusEnum.CANCELLED:
+                        await asyncio.sleep(0.01)
+
+        crawler = GatedCrawler(
+            {
+                (None, None, None): (["a1"], "t-2"),
+                (None, None, "t-2"): (["a2"], "t-3"),
+                (None, None, "t-3"): (["a3"], None),
+            }
+        )
+
+        def publish(event):
+            job.status = BackfillStatusEnum.CANCELLED
+            return "ok"
+
+        pipeline = _make_pipeline(job, crawler, publish=publish, publish_workers=1)
+        await asyncio.wait_for(pipeline.run(), timeout=2)
+
+        assert job.processed_emails == 1
+        assert not job.shards[0].completed
+        # The dropped second page is refetched on resume
+        assert job.shards[0].next_page_token == "t-2"
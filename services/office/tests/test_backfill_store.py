@@ -0,0 +1,262 @@
+"""
+Unit tests for the durable backfill job store and the backfill worker pool.
+
+Covers queuing, one active job per user, lease claims and expiry, the
+per-provider cap, checkpoints, cancellation and resuming interrupted jobs.
+"""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+from typing import List
+
+import pytest
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from services.office.core.backfill_store import ActiveBackfillJobError, BackfillJobStore
+from services.office.core.backfill_worker import BackfillWorkerPool
+from services.office.models import BackfillJob
+from services.office.models.backfill import (
+    BackfillRequest,
+    BackfillShardCheckpoint,
+    BackfillStatus,
+    BackfillStatusEnum,
+)
+
+LIMITS = {"google": 2, "microsoft": 1}
+
+
+@pytest.fixture(autouse=True)
+def patch_settings():
+    """Patch the _settings global variable to return test settings."""
+    import services.office.core.settings as office_settings
+
+    test_settings = office_settings.Settings(
+        db_url_office="sqlite:///:memory:",
+        api_frontend_office_key="test-frontend-office-key",
+        api_chat_office_key="test-chat-office-key",
+        api_meetings_office_key="test-meetings-office-key",
+        api_backfill_office_key="test-backfill-office-key",
+        api_office_user_key="test-office-user-key",
+        pagination_secret_key="test-pagination-secret-key",
+        backfill_heartbeat_seconds=0.01,
+        backfill_poll_seconds=0.01,
+    )
+
+    office_settings._settings = test_settings
+    yield test_settings
+    office_settings._settings = None
+
+
+@pytest.fixture
+async def session_factory(tmp_path):
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'office.db'}", poolclass=NullPool
+    )
+    async with engine.begin() as conn:
+        await conn.run_sync(BackfillJob.__table__.create)  # type: ignore[attr-defined]
+    yield async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    await engine.dispose()
+
+
+@pytest.fixture
+def store(session_factory):
+    return BackfillJobStore(session_factory)
+
+
+def make_job(user: str, provider: str = "google", index: int = 0) -> BackfillStatus:
+    return BackfillStatus(
+        job_id=f"backfill_{user}_{index}",
+        user_id=user,
+        status=BackfillStatusEnum.QUEUED,
+        start_time=datetime.now(timezone.utc),
+        request=BackfillRequest(provider=provider, max_emails=10),
+    )
+
+
+async def expire_lease(session_factory, job_id: str) -> None:
+    async with session_factory() as session:
+        await session.execute(
+            update(BackfillJob)
+            .where(BackfillJob.job_id == job_id)
+            .values(lease_expires_at=datetime.now(timezone.utc) - timedelta(1))
+        )
+        await session.commit()
+
+
+class TestBackfillJobStore:
+    async def test_create_get_and_list(self, store):
+        await store.create(make_job("a@example.com"))
+
+        job = await store.get("backfill_a@example.com_0", "a@example.com")
+        assert job.status == BackfillStatusEnum.QUEUED
+        assert job.request.max_emails == 10
+        assert await store.get("backfill_a@example.com_0", "b@example.com") is None
+        assert [j.job_id for j in await store.list_for_user("a@example.com")] == [
+            "backfill_a@example.com_0"
+        ]
+
+    async def test_one_active_job_per_user(self, store):
+        await store.create(make_job("a@example.com"))
+
+        with pytest.raises(ActiveBackfillJobError) as exc:
+            await store.create(make_job("a@example.com", index=1))
+        assert exc.value.job_id == "backfill_a@example.com_0"
+
+        # A finished job no longer blocks a new one
+        await store.cancel("backfill_a@example.com_0", "a@example.com")
+        await store.create(make_job("a@example.com", index=1))
+
+    async def test_claim_takes_oldest_job_once(self, store):
+        await store.create(make_job("a@example.com"))
+        await store.create(make_job("b@example.com"))
+
+        first = await store.claim("w1", 60, LIMITS, 5)
+        second = await store.claim("w2", 60, LIMITS, 5)
+        third = await store.claim("w3", 60, LIMITS, 5)
+
+        assert first.job_id == "backfill_a@example.com_0"
+        assert first.status == BackfillStatusEnum.RUNNING
+        assert second.job_id == "backfill_b@example.com_0"
+        assert third is None
+
+    async def test_claim_respects_provider_cap(self, store):
+        await store.create(make_job("a@example.com", "microsoft"))
+        await store.create(make_job("b@example.com", "microsoft"))
+        await store.create(make_job("c@example.com", "google"))
+
+        first = await store.claim("w1", 60, LIMITS, 5)
+        second = await store.claim("w2", 60, LIMITS, 5)
+
+        assert first.job_id == "backfill_a@example.com_0"
+        # The second Microsoft job waits for the first
+        assert second.job_id == "backfill_c@example.com_0"
+        assert await store.claim("w3", 60, LIMITS, 5) is None
+
+    async def test_expired_lease_is_resumed_from_checkpoint(
+        self, store, session_factory
+    ):
+        await store.create(make_job("a@example.com"))
+        job = await store.claim("w1", 60, LIMITS, 5)
+        job.shards = [
+            BackfillShardCheckpoint(next_page_token="page-3", processed_emails=20)
+        ]
+        job.processed_emails = 20
+        assert await store.checkpoint(job, "w1", 60) == BackfillStatusEnum.RUNNING
+
+        # The worker dies and its lease lapses
+        await expire_lease(session_factory, job.job_id)
+        resumed = await store.claim("w2", 60, LIMITS, 5)
+
+        assert resumed.job_id == job.job_id
+        assert resumed.processed_emails == 20
+        assert resumed.shards[0].next_page_token == "page-3"
+        # The old worker lost the job
+        assert await store.checkpoint(job, "w1", 60) is None
+
+    async def test_cancel_is_seen_by_checkpoint_and_kept_on_release(self, store):
+        await store.create(make_job("a@example.com"))
+        job = await store.claim("w1", 60, LIMITS, 5)
+
+        assert await store.cancel(job.job_id, "a@example.com")
+        assert await store.checkpoint(job, "w1", 60) == BackfillStatusEnum.CANCELLED
+
+        job.status = BackfillStatusEnum.COMPLETED
+        await store.release(job, "w1")
+        stored = await store.get(job.job_id, "a@example.com")
+        assert stored.status == BackfillStatusEnum.CANCELLED
+        assert not await store.cancel(job.job_id, "a@example.com")
+
+    async def test_released_running_job_is_claimable(self, store):
+        await store.create(make_job("a@example.com"))
+        job = await store.claim("w1", 60, LIMITS, 5)
+
+        await store.release(job, "w1")
+
+        assert (await store.claim("w2", 60, LIMITS, 5)).job_id == job.job_id
+
+    async def test_released_claims_do_not_use_up_attempts(self, store):
+        await store.create(make_job("a@example.com"))
+        for owner in ("w1", "w2", "w3"):
+            job = await store.claim(owner, 60, LIMITS, 1)
+            assert job is not None
+            await store.release(job, owner)
+
+        stored = await store.get(job.job_id, "a@example.com")
+        assert stored.status == BackfillStatusEnum.RUNNING
+
+    async def test_job_fails_after_max_attempts(self, store, session_factory):
+        await store.create(make_job("a@example.com"))
+        job = await store.claim("w1", 60, LIMITS, 1)
+        await expire_lease(session_factory, job.job_id)
+
+        assert await store.claim("w2", 60, LIMITS, 1) is None
+        stored = await store.get(job.job_id, "a@example.com")
+        assert stored.status == BackfillStatusEnum.FAILED
+        assert "1 attempts" in stored.error_message
+
+
+class TestBackfillWorkerPool:
+    async def test_runs_queued_jobs_and_saves_result(self, store):
+        ran: List[str] = []
+
+        async def runner(job: BackfillStatus) -> None:
+            ran.append(job.job_id)
+            job.processed_emails = 10
+            job.status = BackfillStatusEnum.COMPLETED
+
+        await store.create(make_job("a@example.com"))
+        pool = BackfillWorkerPool(store, runner, worker_count=2, owner="w1")
+        await pool.start()
+        try:
+            for _ in range(100):
+                job = await store.get("backfill_a@example.com_0", "a@example.com")
+                if job.status == BackfillStatusEnum.COMPLETED:
+                    break
+                await asyncio.sleep(0.01)
+        finally:
+            await pool.stop()
+
+        assert ran == ["backfill_a@example.com_0"]
+        assert job.status == BackfillStatusEnum.COMPLETED
+        assert job.processed_emails == 10
+
+    async def test_cancellation_reaches_running_job(self, store):
+        stopped = asyncio.Event()
+
+        async def runner(job: BackfillStatus) -> None:
+            while job.status != BackfillStatusEnum.CANCELLED:
+                await asyncio.sleep(0.01)
+            stopped.set()
+
+        await store.create(make_job("a@example.com"))
+        pool = BackfillWorkerPool(store, runner, worker_count=1, owner="w1")
+        await pool.start()
+        try:
+            while not pool.running_jobs():
+                await asyncio.sleep(0.01)
+            await store.cancel("backfill_a@example.com_0", "a@example.com")
+            await asyncio.wait_for(stopped.wait(), 5)
+        finally:
+            await pool.stop()
+
+        job = await store.get("backfill_a@example.com_0", "a@example.com")
+        assert job.status == BackfillStatusEnum.CANCELLED
+
+    async def test_stop_hands_running_job_back(self, store):
+        async def runner(job: BackfillStatus) -> None:
+            job.shards = [BackfillShardCheckpoint(next_page_token="page-2")]
+            await asyncio.Event().wait()
+
+        await store.create(make_job("a@example.com"))
+        pool = BackfillWorkerPool(store, runner, worker_count=1, owner="w1")
+        await pool.start()
+        while not pool.running_jobs():
+            await asyncio.sleep(0.01)
+        await asyncio.sleep(0.05)
+        await pool.stop()
+
+        resumed = await store.claim("w2", 60, LIMITS, 5)
+        assert resumed.job_id == "backfill_a@example.com_0"
+        assert resumed.shards[0].next_page_token == "page-2"
@@ -0,0 +1,135 @@
+"""
+Tests for the binary cache entry codec and the in-process cache tier.
+"""
+
+import time
+from datetime import datetime, timezone
+from unittest.mock import patch
+
+from services.api.v1.office import EmailMessage, EmailMessageListData, Provider
+from services.office.core import cache_codec
+from services.office.core.cache_codec import (
+    COMPRESSION_NONE,
+    COMPRESSION_THRESHOLD,
+    decode_entry,
+    encode_entry,
+)
+from services.office.core.local_cache import LocalCache
+
+
+def make_page(count: int) -> EmailMessageListData:
+    messages = [
+        EmailMessage(
+            id=f"gmail_{i}",
+            subject=f"Subject {i}",
+            body_text="lorem ipsum " * 200,
+            date=datetime(2024, 1, 1, tzinfo=timezone.utc),
+            provider=Provider.GOOGLE,
+            provider_message_id=str(i),
+            account_email="user@example.com",
+        )
+        for i in range(count)
+    ]
+    return EmailMessageListData(
+        messages=messages,
+        total_count=count,
+        providers_used=["google"],
+        request_metadata={"limit": count},
+    )
+
+
+class TestCacheCodec:
+    def test_model_round_trip(self):
+        page = make_page(3)
+
+        value, fresh_until = decode_entry(
+            encode_entry(page, 123.5), EmailMessageListData
+        )
+
+        assert value == page
+        assert fresh_until == 123.5
+
+    def test_plain_values_round_trip(self):
+        value = {"a": [1, 2], "when": datetime(2024, 1, 1, tzinfo=timezone.utc)}
+
+        decoded, _ = decode_entry(encode_entry(value, 0))
+
+        assert decoded == {"a": [1, 2], "when": "2024-01-01T00:00:00+00:00"}
+
+    def test_large_payloads_are_compressed(self):
+        page = make_page(100)
+
+        encoded = encode_entry(page, 0)
+
+        assert encoded[2] != COMPRESSION_NONE
+        assert len(encoded) < len(page.model_dump_json()) / 5
+
+    def test_small_payloads_are_not_compressed(self):
+        encoded = encode_entry("x", 0)
+
+        assert len(encoded) < COMPRESSION_THRESHOLD
+        assert encoded[2] == COMPRESSION_NONE
+
+    def test_zlib_fallback(self):
+        with patch.object(cache_codec, "ZSTD_AVAILABLE", False):
+            encoded = encode_entry(make_page(10), 0)
+
+            assert encoded[2] == cache_codec.COMPRESSION_ZLIB
+            assert decode_entry(encoded, EmailMessageListData) is not None
+
+    def test_foreign_or_corrupt_data_is_rejected(self):
+        encoded = encode_entry(make_page(10), 0)
+
+        assert decode_entry(b'{"messages": []}') is None
+        assert decode_entry(encoded[:-10], EmailMessageListData) is None
+        assert decode_entry(encode_entry({"a": 1}, 0), EmailMessageListData) is None
+
+
+class TestLocalCache:
+    def test_least_recently_used_entry_is_evicted(self):
+        local = LocalCache(max_entries=2)
+        local.set("a", 1, 0, 1)
+        local.set("b", 2, 0, 1)
+        local.get("a")
+
+        local.set("c", 3, 0, 1)
+
+        assert local.get("b") is None
+        assert local.get("a").value == 1
+        assert local.get("c").value == 3
+
+    def test_byte_budget_is_enforced(self):
+        local = LocalCache(max_bytes=10)
+        local.set("a", 1, 0, 6)
+        local.set("b", 2, 0, 6)
+        local.set("too_big", 3, 0, 11)
+
+        assert local.stats()["entries"] == 1
+        assert local.stats()["bytes"] == 6
+        assert local.get("b") is not None
+
+    def test_entries_expire(self):
+        local = LocalCache(ttl_seconds=0)
+        local.set("a", 1, time.time() + 60, 1)
+
+        assert local.get("a") is None
+        assert local.stats()["bytes"] == 0
+
+    def test_delete_pattern(self):
+        local = LocalCache()
+        local.set("office:u1:unified:messages:x", 1, 0, 1)
+        local.set("office:u2:unified:messages:x", 2, 0, 1)
+
+        assert local.delete_pattern("office:u1:*") == 1
+        assert local.get("office:u2:unified:messages:x") is not None
+
+    def test_delete_tagged(self):
+        local = LocalCache()
+        local.set("a", 1, 0, 1, ["office:u1:tag:messages"])
+        local.set("b", 2, 0, 1, ["office:u1:tag:threads"])
+        local.set("c", 3, 0, 1)
+
+        assert local.delete_tagged(["office:u1:tag:messages"]) == 1
+        assert local.get("a") is None
+        assert local.get("b") is not None
+        assert local.get("c") is not None
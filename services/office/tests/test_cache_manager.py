@@ -0,0 +1,345 @@
+"""
+Tests for the cache manager's get_or_compute stale-while-revalidate path and
+tag-based invalidation.
+"""
+
+import asyncio
+import time
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from services.api.v1.office import EmailMessageListData
+from services.office.core.cache_codec import decode_entry, encode_entry
+from services.office.core.cache_manager import (
+    CACHE_HIT,
+    CACHE_MISS,
+    CACHE_STALE,
+    CacheManager,
+    generate_cache_tag,
+)
+
+
+@pytest.fixture(autouse=True)
+def patch_settings(monkeypatch):
+    """Patch the _settings global variable to return test settings."""
+    import services.office.core.settings as office_settings
+
+    test_settings = office_settings.Settings(
+        db_url_office="sqlite:///:memory:",
+        api_frontend_office_key="test-frontend-office-key",
+        api_chat_office_key="test-chat-office-key",
+        api_meetings_office_key="test-meetings-office-key",
+        api_backfill_office_key="test-backfill-office-key",
+        api_office_user_key="test-office-user-key",
+        pagination_secret_key="test-pagination-secret-key",
+    )
+
+    monkeypatch.setattr("services.office.core.settings._settings", test_settings)
+    return test_settings
+
+
+@pytest.fixture
+def cache():
+    """Cache manager whose Redis reads and writes go to a dict."""
+    manager = CacheManager()
+    manager.store = {}
+
+    async def get_raw(key):
+        return manager.store.get(key)
+
+    async def set_raw(key, data, ttl_seconds, tags=()):
+        manager.store[key] = data
+        return True
+
+    manager.get_raw = AsyncMock(side_effect=get_raw)
+    manager.set_raw = AsyncMock(side_effect=set_raw)
+    return manager
+
+
+def stored_value(cache, key, model=None):
+    return decode_entry(cache.store[key], model)[0]
+
+
+class TestGetOrCompute:
+    @pytest.mark.asyncio
+    async def test_concurrent_misses_share_one_producer(self, cache):
+        calls = 0
+
+        async def producer():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return {"messages": [1]}
+
+        results = await asyncio.gather(
+            *(cache.get_or_compute("k", producer, ttl_seconds=60) for _ in range(10))
+        )
+
+        assert results == [({"messages": [1]}, CACHE_MISS)] * 10
+        assert calls == 1
+        cache.set_raw.assert_awaited_once()
+        assert cache.set_raw.call_args.args[2] == 60 + 60
+
+    @pytest.mark.asyncio
+    async def test_fresh_entry_is_a_hit(self, cache):
+        producer = AsyncMock(return_value="value")
+
+        await cache.get_or_compute("k", producer, ttl_seconds=60)
+        assert await cache.get_or_compute("k", producer) == ("value", CACHE_HIT)
+
+        producer.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_local_tier_serves_hits_without_redis(self, cache):
+        producer = AsyncMock(return_value="value")
+
+        await cache.get_or_compute("k", producer, namespace="ns")
+        await cache.get_or_compute("k", producer, namespace="ns")
+
+        cache.get_raw.assert_awaited_once()
+        assert cache.get_stats()["ns"]["local_hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_redis_hits_decode_into_the_model(self, cache, patch_settings):
+        patch_settings.CACHE_LOCAL_ENABLED = False
+        data = EmailMessageListData(
+            messages=[], total_count=0, providers_used=["google"], request_metadata={}
+        )
+        producer = AsyncMock(return_value=data)
+
+        await cache.get_or_compute("k", producer, model=EmailMessageListData)
+        value, status = await cache.get_or_compute(
+            "k", producer, model=EmailMessageListData
+        )
+
+        assert status == CACHE_HIT
+        assert value == data
+        assert value is not data
+        assert cache.get_local_stats() is None
+
+    @pytest.mark.asyncio
+    async def test_stale_entry_is_served_while_refreshing(self, cache):
+        cache.store["k"] = encode_entry("old", time.time() - 1)
+        release = asyncio.Event()
+
+        async def producer():
+            await release.wait()
+            return "new"
+
+        first = await cache.get_or_compute("k", producer, ttl_seconds=60)
+        second = await cache.get_or_compute("k", producer, ttl_seconds=60)
+
+        assert first == second == ("old", CACHE_STALE)
+        assert len(cache._inflight) == 1
+
+        release.set()
+        await asyncio.gather(*cache._inflight.values())
+
+        assert await cache.get_or_compute("k", producer) == ("new", CACHE_HIT)
+
+    @pytest.mark.asyncio
+    async def test_failed_refresh_keeps_stale_entry(self, cache):
+        cache.store["k"] = encode_entry("old", time.time() - 1)
+        producer = AsyncMock(side_effect=RuntimeError("provider down"))
+
+        assert await cache.get_or_compute("k", producer, namespace="ns") == (
+            "old",
+            CACHE_STALE,
+        )
+        await asyncio.gather(*cache._inflight.values(), return_exceptions=True)
+
+        assert stored_value(cache, "k") == "old"
+        assert cache.get_stats()["ns"]["refresh_errors"] == 1
+
+    @pytest.mark.asyncio
+    async def test_uncacheable_values_are_not_stored(self, cache):
+        producer = AsyncMock(return_value={"providers_used": []})
+
+        result = await cache.get_or_compute(
+            "k", producer, should_cache=lambda data: bool(data["providers_used"])
+        )
+
+        assert result == ({"providers_used": []}, CACHE_MISS)
+        assert cache.store == {}
+
+    @pytest.mark.asyncio
+    async def test_force_refresh_skips_the_read(self, cache):
+        cache.store["k"] = encode_entry("old", time.time() + 60)
+
+        result = await cache.get_or_compute(
+            "k", AsyncMock(return_value="new"), force_refresh=True
+        )
+
+        assert result == ("new", CACHE_MISS)
+        cache.get_raw.assert_not_awaited()
+        assert stored_value(cache, "k") == "new"
+
+    @pytest.mark.asyncio
+    async def test_undecodable_entries_are_recomputed(self, cache):
+        cache.store["k"] = b'{"messages": []}'
+        producer = AsyncMock(return_value="value")
+
+        assert await cache.get_or_compute("k", producer) == ("value", CACHE_MISS)
+        producer.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_counters_are_kept_per_namespace(self, cache):
+        producer = AsyncMock(return_value="value")
+
+        await cache.get_or_compute("a", producer, namespace="unified:messages")
+        cache.local_cache.clear()
+        await cache.get_or_compute("a", producer, namespace="unified:messages")
+        await cache.get_or_compute("b", producer, namespace="unified:threads")
+
+        stats = cache.get_stats()
+        assert stats["unified:messages"][CACHE_HIT] == 1
+        assert stats["unified:messages"][CACHE_MISS] == 1
+        assert stats["unified:messages"]["hit_ratio"] == 0.5
+        assert stats["unified:threads"][CACHE_MISS] == 1
+
+    @pytest.mark.asyncio
+    async def test_locked_key_waits_for_other_replica(self, cache, patch_settings):
+        patch_settings.CACHE_REFRESH_LOCK = True
+        redis_client = AsyncMock()
+        redis_client.set.return_value = None  # lock held elsewhere
+        redis_client.exists.return_value = 1
+        cache._get_redis = AsyncMock(return_value=redis_client)
+        producer = AsyncMock(return_value="mine")
+
+        async def other_replica():
+            await asyncio.sleep(0.01)
+            cache.store["k"] = encode_entry("theirs", time.time() + 60)
+
+        result, _ = await asyncio.gather(
+            cache.get_or_compute("k", producer), other_replica()
+        )
+
+        assert result == ("theirs", CACHE_MISS)
+        producer.assert_not_awaited()
+
+
+class FakePipeline:
+    """Records pipelined commands and returns canned results."""
+
+    def __init__(self, results=None):
+        self.commands = []
+        self.results = results
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def __getattr__(self, name):
+        def command(*args):
+            self.commands.append((name, *args))
+
+        return command
+
+    async def execute(self):
+        if self.results is not None:
+            return self.results
+        return [len(cmd) - 1 if cmd[0] == "unlink" else True for cmd in self.commands]
+
+
+def redis_with(*pipelines):
+    redis_client = MagicMock()
+    redis_client.pipeline = MagicMock(side_effect=list(pipelines))
+    redis_client.setex = AsyncMock()
+    return redis_client
+
+
+class TestTags:
+    def test_generate_cache_tag(self):
+        assert generate_cache_tag("u1", "messages") == "office:u1:tag:messages"
+        assert (
+            generate_cache_tag("u1", "thread", "gmail_abc")
+            == "office:u1:tag:thread:gmail_abc"
+        )
+
+    @pytest.mark.asyncio
+    async def test_tagged_write_registers_key(self, patch_settings):
+        manager = CacheManager()
+        pipe = FakePipeline()
+        manager._get_redis = AsyncMock(return_value=redis_with(pipe))
+
+        await manager.set_to_cache("k", {"a": 1}, ttl_seconds=60, tags=["t1", "t2"])
+
+        assert pipe.commands == [
+            ("setex", "k", 60, '{"a": 1}'),
+            ("sadd", "t1", "k"),
+            ("expire", "t1", patch_settings.CACHE_TAG_TTL),
+            ("sadd", "t2", "k"),
+            ("expire", "t2", patch_settings.CACHE_TAG_TTL),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_untagged_write_is_a_single_setex(self):
+        manager = CacheManager()
+        redis_client = redis_with()
+        manager._get_redis = AsyncMock(return_value=redis_client)
+
+        await manager.set_to_cache("k", {"a": 1}, ttl_seconds=60)
+
+        redis_client.setex.assert_awaited_once_with("k", 60, '{"a": 1}')
+        redis_client.pipeline.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_invalidate_tags_deletes_tagged_keys(self):
+        manager = CacheManager()
+        read = FakePipeline(results=[{"k1", "k2"}, 1])
+        unlink = FakePipeline()
+        manager._get_redis = AsyncMock(return_value=redis_with(read, unlink))
+        manager.local_cache.set("k1", "v", time.time() + 60, 1, ["t1"])
+        manager.local_cache.set("other", "v", time.time() + 60, 1, ["t2"])
+
+        assert await manager.invalidate_tags("t1") == 2
+
+        assert read.commands == [("smembers", "t1"), ("delete", "t1")]
+        assert len(unlink.commands) == 1
+        assert set(unlink.commands[0][1:]) == {"k1", "k2"}
+        assert manager.local_cache.get("k1") is None
+        assert manager.local_cache.get("other") is not None
+
+    @pytest.mark.asyncio
+    async def test_value_invalidated_while_computing_is_not_cached(self, cache):
+        cache._get_redis = AsyncMock(
+            return_value=redis_with(FakePipeline(results=[set(), 1]))
+        )
+        started = asyncio.Event()
+        release = asyncio.Event()
+
+        async def producer():
+            started.set()
+            await release.wait()
+            return "old"
+
+        pending = asyncio.create_task(cache.get_or_compute("k", producer, tags=["t1"]))
+        await started.wait()
+        await cache.invalidate_tags("t1")
+        release.set()
+
+        assert await pending == ("old", CACHE_MISS)
+        assert cache.store == {}
+        assert cache.local_cache.get("k") is None
+
+    @pytest.mark.asyncio
+    async def test_delete_pattern_scans_in_batches(self):
+        manager = CacheManager()
+        keys = [f"office:u1:k{i}" for i in range(600)]
+
+        async def scan_iter(match, count):
+            for key in keys:
+                yield key
+
+        first, second = FakePipeline(), FakePipeline()
+        redis_client = redis_with(first, second)
+        redis_client.scan_iter = scan_iter
+        redis_client.keys = AsyncMock()
+        manager._get_redis = AsyncMock(return_value=redis_client)
+
+        assert await manager.delete_pattern("office:u1:*") == 600
+        assert [len(cmd) - 1 for cmd in first.commands + second.commands] == [500, 100]
+        redis_client.keys.assert_not_awaited()
@@ -0,0 +1,319 @@
+"""
+Unit tests for the internal message change feed.
+
+Covers merging Gmail history records, paging Gmail history and Graph delta
+feeds, cursor expiry, and the internal endpoint used by the email sync service.
+"""
+
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from services.common.http_errors import ProviderError
+from services.office.api.email import (
+    _merge_gmail_history,
+    fetch_gmail_changes,
+    fetch_outlook_changes,
+)
+from services.office.app.main import app
+
+
+@pytest.fixture(autouse=True)
+def patch_settings():
+    """Patch the _settings global variable to return test settings."""
+    import services.office.core.settings as office_settings
+
+    test_settings = office_settings.Settings(
+        db_url_office="sqlite:///:memory:",
+        api_frontend_office_key="test-frontend-office-key",
+        api_chat_office_key="test-chat-office-key",
+        api_meetings_office_key="test-meetings-office-key",
+        api_backfill_office_key="test-backfill-office-key",
+        api_email_sync_office_key="test-email-sync-office-key",
+        api_office_user_key="test-office-user-key",
+        pagination_secret_key="test-pagination-secret-key",
+    )
+
+    office_settings._settings = test_settings
+    yield
+    office_settings._settings = None
+
+
+def gmail_message(message_id: str) -> dict:
+    return {
+        "id": message_id,
+        "threadId": "thread_1",
+        "snippet": "Hello",
+        "labelIds": ["INBOX"],
+        "payload": {
+            "headers": [
+                {"name": "Subject", "value": f"Subject {message_id}"},
+                {"name": "From", "value": "sender@example.com"},
+                {"name": "To", "value": "user@example.com"},
+                {"name": "Date", "value": "Mon, 1 Jan 2024 12:00:00 +0000"},
+            ],
+            "mimeType": "text/plain",
+            "body": {"data": "SGVsbG8gd29ybGQ="},
+        },
+    }
+
+
+def outlook_message(message_id: str) -> dict:
+    return {
+        "id": message_id,
+        "conversationId": "conversation_1",
+        "subject": f"Subject {message_id}",
+        "bodyPreview": "Hello",
+        "body": {"contentType": "text", "content": "Hello world"},
+        "from": {"emailAddress": {"address": "sender@example.com"}},
+        "toRecipients": [{"emailAddress": {"address": "user@example.com"}}],
+        "receivedDateTime": "2024-01-01T12:00:00Z",
+        "isRead": False,
+        "hasAttachments": False,
+    }
+
+
+def not_found(provider: str, status_code: int = 404) -> ProviderError:
+    return ProviderError(
+        message="Not found", provider=provider, status_code=status_code
+    )
+
+
+def by_id(changes):
+    return {change.provider_message_id: change for change in changes}
+
+
+class TestMergeGmailHistory:
+    def test_one_operation_per_message(self):
+        history = [
+            {"messagesAdded": [{"message": {"id": "a"}}]},
+            {"labelsAdded": [{"message": {"id": "a"}}, {"message": {"id": "b"}}]},
+            {"labelsRemoved": [{"message": {"id": "c"}}]},
+            {"messagesDeleted": [{"message": {"id": "c"}}]},
+        ]
+
+        assert _merge_gmail_history(history) == {
+            "a": "create",
+            "b": "update",
+            "c": "delete",
+        }
+
+    def test_delete_wins_regardless_of_order(self):
+        history = [
+            {"messagesDeleted": [{"message": {"id": "a"}}]},
+            {"messagesAdded": [{"message": {"id": "a"}}]},
+        ]
+
+        assert _merge_gmail_history(history) == {"a": "delete"}
+
+
+@pytest.mark.asyncio
+class TestFetchGmailChanges:
+    async def test_history_page(self):
+        client = MagicMock()
+        client.get_history = AsyncMock(
+            return_value={
+                "history": [
+                    {"messagesAdded": [{"message": {"id": "a"}}]},
+                    {"labelsAdded": [{"message": {"id": "b"}}]},
+                    {"messagesDeleted": [{"message": {"id": "c"}}]},
+                ],
+                "historyId": "200",
+                "nextPageToken": "next",
+            }
+        )
+        client.get_messages_batch = AsyncMock(
+            return_value=[gmail_message("a"), not_found("google")]
+        )
+
+        data = await fetch_gmail_changes(client, "user-1", "100", None, None, 50)
+
+        client.get_history.assert_awaited_once_with(
+            "100", page_token=None, max_results=50
+        )
+        client.get_messages_batch.assert_awaited_once_with(["a", "b"])
+        changes = by_id(data.changes)
+        assert changes["a"].operation == "create"
+        assert changes["a"].message.subject == "Subject a"
+        # Gone before it could be fetched
+        assert changes["b"].operation == "delete"
+        assert changes["c"].operation == "delete"
+        assert changes["c"].message is None
+        assert data.cursor == "200"
+        assert data.next_page_token == "next"
+
+    async def test_expired_history_id(self):
+        client = MagicMock()
+        client.get_history = AsyncMock(side_effect=not_found("google"))
+
+        data = await fetch_gmail_changes(client, "user-1", "100", None, None, 50)
+
+        assert data.cursor_expired
+        assert data.changes == []
+
+    async def test_failed_fetch_is_raised(self):
+        client = MagicMock()
+        client.get_history = AsyncMock(
+            return_value={
+                "history": [{"messagesAdded": [{"message": {"id": "a"}}]}],
+                "historyId": "200",
+            }
+        )
+        client.get_messages_batch = AsyncMock(
+            return_value=[not_found("google", status_code=500)]
+        )
+
+        with pytest.raises(ProviderError):
+            await fetch_gmail_changes(client, "user-1", "100", None, None, 50)
+
+    async def test_recrawl_takes_cursor_first(self):
+        client = MagicMock()
+        client.get_profile = AsyncMock(return_value={"historyId": 300})
+        client.get_messages = AsyncMock(
+            return_value={"messages": [{"id": "a"}], "nextPageToken": "p2"}
+        )
+        client.get_messages_batch = AsyncMock(return_value=[gmail_message("a")])
+        since = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+        data = await fetch_gmail_changes(client, "user-1", None, since, None, 50)
+
+        client.get_messages.assert_awaited_once_with(
+            max_results=50, page_token=None, query=f"after:{int(since.timestamp())}"
+        )
+        assert data.cursor == "300"
+        assert data.next_page_token == "p2"
+        assert [c.operation for c in data.changes] == ["create"]
+
+        client.get_profile.reset_mock()
+        data = await fetch_gmail_changes(client, "user-1", None, since, "p2", 50)
+
+        client.get_profile.assert_not_awaited()
+        assert data.cursor is None
+
+
+@pytest.mark.asyncio
+class TestFetchOutlookChanges:
+    async def test_new_round_is_bounded_and_creates(self):
+        client = MagicMock()
+        client.get_messages_delta = AsyncMock(
+            return_value={
+                "value": [outlook_message("a")],
+                "@odata.nextLink": "https://graph.microsoft.com/v1.0/next",
+            }
+        )
+        since = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+        data = await fetch_outlook_changes(
+            client, "user-1", "inbox", None, since, None, 100
+        )
+
+        client.get_messages_delta.assert_awaited_once_with(
+            folder_id="inbox",
+            link=None,
+            received_after="2024-01-01T00:00:00Z",
+            page_size=100,
+        )
+        assert [c.operation for c in data.changes] == ["create"]
+        assert data.cursor is None
+        assert data.next_page_token == "https://graph.microsoft.com/v1.0/next"
+
+    async def test_delta_round_returns_updates_and_removals(self):
+        client = MagicMock()
+        client.get_messages_delta = AsyncMock(
+            return_value={
+                "value": [
+                    outlook_message("a"),
+                    {"id": "b", "@removed": {"reason": "deleted"}},
+                ],
+                "@odata.deltaLink": "https://graph.microsoft.com/v1.0/delta2",
+            }
+        )
+
+        data = await fetch_outlook_changes(
+            client,
+            "user-1",
+            "inbox",
+            "https://graph.microsoft.com/v1.0/delta1",
+            None,
+            None,
+            100,
+        )
+
+        assert client.get_messages_delta.await_args.kwargs["link"] == (
+            "https://graph.microsoft.com/v1.0/delta1"
+        )
+        changes = by_id(data.changes)
+        assert changes["a"].operation == "update"
+        assert changes["a"].message_id == "outlook_a"
+        assert changes["b"].operation == "delete"
+        assert data.cursor == "https://graph.microsoft.com/v1.0/delta2"
+        assert data.next_page_token is None
+
+    async def test_expired_delta_link(self):
+        client = MagicMock()
+        client.get_messages_delta = AsyncMock(
+            side_effect=not_found("microsoft", status_code=410)
+        )
+
+        data = await fetch_outlook_changes(
+            client,
+            "user-1",
+            "inbox",
+            "https://graph.microsoft.com/v1.0/d",
+            None,
+            None,
+            10,
+        )
+
+        assert data.cursor_expired
+
+
+class TestChangesEndpoint:
+    def test_requires_internal_access(self):
+        client = TestClient(app)
+
+        response = client.get(
+            "/internal/messages/changes",
+            params={"user_id": "user-1", "provider": "google"},
+            headers={"X-API-Key": "test-frontend-office-key"},
+        )
+
+        assert response.status_code == 403
+
+    def test_returns_changes(self):
+        api_client = MagicMock()
+        api_client.__aenter__ = AsyncMock(return_value=api_client)
+        api_client.__aexit__ = AsyncMock(return_value=None)
+        api_client.get_history = AsyncMock(
+            return_value={
+                "history": [{"messagesDeleted": [{"message": {"id": "a"}}]}],
+                "historyId": "200",
+            }
+        )
+        api_client.get_messages_batch = AsyncMock(return_value=[])
+        factory = MagicMock()
+        factory.create_client = AsyncMock(return_value=api_client)
+
+        with patch(
+            "services.office.api.email.get_api_client_factory",
+            AsyncMock(return_value=factory),
+        ):
+            response = TestClient(app).get(
+                "/internal/messages/changes",
+                params={"user_id": "user-1", "provider": "google", "cursor": "100"},
+                headers={"X-API-Key": "test-email-sync-office-key"},
+            )
+
+        assert response.status_code == 200
+        data = response.json()["data"]
+        assert data["cursor"] == "200"
+        assert data["changes"] == [
+            {
+                "operation": "delete",
+                "message_id": "gmail_a",
+                "provider_message_id": "a",
+                "message": None,
+            }
+        ]
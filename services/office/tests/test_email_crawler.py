@@ -0,0 +1,141 @@
+"""
+Unit tests for the cursor-based EmailCrawler.
+
+The office service internal API is mocked at the ``_get_email_batch`` level so
+the tests exercise cursor handling, checkpointing and retry behaviour only.
+"""
+
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from services.api.v1.office import EmailAddress, EmailMessage, Provider
+from services.office.core.email_crawler import EmailCrawler
+
+
+def _make_email(index: int) -> EmailMessage:
+    return EmailMessage(
+        id=f"gmail_{index}",
+        thread_id=f"thread_{index}",
+        subject=f"Email {index}",
+        snippet="snippet",
+        from_address=EmailAddress(email="sender@example.com"),
+        to_addresses=[EmailAddress(email="me@example.com")],
+        date=datetime(2024, 1, 1, tzinfo=timezone.utc),
+        provider=Provider.GOOGLE,
+        provider_message_id=f"msg_{index}",
+        account_email="me@example.com",
+    )
+
+
+@pytest.fixture
+def crawler():
+    crawler = EmailCrawler("user-1", "google", "me@example.com", max_email_count=100)
+    crawler.rate_limit_delay = 0.0
+    crawler.retry_base_delay = 0.0
+    return crawler
+
+
+class TestEmailCrawlerCursors:
+    """Tests for provider cursor pagination in EmailCrawler."""
+
+    @pytest.mark.asyncio
+    async def test_follows_page_tokens_until_exhausted(self, crawler):
+        pages = {
+            None: ([_make_email(1), _make_email(2)], "token-2"),
+            "token-2": ([_make_email(3), _make_email(4)], "token-3"),
+            "token-3": ([_make_email(5)], None),
+        }
+
+        async def fake_batch(provider, batch_size, start, end, folders, page_token):
+            return pages[page_token]
+
+        with patch.object(crawler, "_get_email_batch", side_effect=fake_batch) as m:
+            batches = []
+            checkpoints = []
+            async for batch in crawler.crawl_emails(batch_size=2):
+                batches.append([email.id for email in batch])
+                checkpoints.append(crawler.next_page_token)
+
+        assert batches == [
+            ["gmail_1", "gmail_2"],
+            ["gmail_3", "gmail_4"],
+            ["gmail_5"],
+        ]
+        assert checkpoints == ["token-2", "token-3", None]
+        assert [call.args[5] for call in m.call_args_list] == [
+            None,
+            "token-2",
+            "token-3",
+        ]
+
+    @pytest.mark.asyncio
+    async def test_resume_starts_at_checkpointed_cursor(self, crawler):
+        mock_batch = AsyncMock(return_value=([_make_email(9)], None))
+
+        with patch.object(crawler, "_get_email_batch", mock_batch):
+            batches = [
+                batch async for batch in crawler.crawl_emails(resume_from="token-9")
+            ]
+
+        assert len(batches) == 1
+        assert mock_batch.call_args.args[5] == "token-9"
+
+    @pytest.mark.asyncio
+    async def test_max_emails_limits_page_size_and_stops(self, crawler):
+        mock_batch = AsyncMock(
+            side_effect=[
+                ([_make_email(1), _make_email(2)], "token-2"),
+                ([_make_email(3)], "token-3"),
+            ]
+        )
+
+        with patch.object(crawler, "_get_email_batch", mock_batch):
+            batches = [
+                batch
+                async for batch in crawler.crawl_emails(batch_size=2, max_emails=3)
+            ]
+
+        assert sum(len(batch) for batch in batches) == 3
+        assert mock_batch.call_count == 2
+        # Second page only asks for the single remaining email
+        assert mock_batch.call_args_list[1].args[1] == 1
+
+    @pytest.mark.asyncio
+    async def test_transient_failure_retries_same_cursor(self, crawler):
+        mock_batch = AsyncMock(
+            side_effect=[
+                ([_make_email(1)], "token-2"),
+                Exception("temporary outage"),
+                ([_make_email(2)], None),
+            ]
+        )
+
+        with patch.object(crawler, "_get_email_batch", mock_batch):
+            batches = [batch async for batch in crawler.crawl_emails()]
+
+        assert len(batches) == 2
+        assert [call.args[5] for call in mock_batch.call_args_list] == [
+            None,
+            "token-2",
+            "token-2",
+        ]
+
+    @pytest.mark.asyncio
+    async def test_persistent_failure_keeps_last_checkpoint(self, crawler):
+        crawler.max_batch_retries = 1
+        mock_batch = AsyncMock(
+            side_effect=[
+                ([_make_email(1)], "token-2"),
+                Exception("down"),
+                Exception("still down"),
+            ]
+        )
+
+        with patch.object(crawler, "_get_email_batch", mock_batch):
+            with pytest.raises(Exception, match="still down"):
+                async for _ in crawler.crawl_emails():
+                    pass
+
+        assert crawler.next_page_token == "token-2"
@@ -10,7 +10,7 @@ from unittest.mock import AsyncMock, MagicMock, patch
 import pytest
 
 from services.api.v1.office import EmailAddress, EmailMessage, EmailThread, Provider
-from services.common.http_errors import ValidationError
+from services.common.http_errors import ProviderError, ValidationError
 from services.office.api.email import (
     fetch_provider_threads,
     get_email_thread,
@@ -26,6 +26,24 @@ from services.office.core.normalizer import (
 )
 
 
+@pytest.fixture(autouse=True)
+def patch_settings(monkeypatch):
+    """Patch the _settings global variable to return test settings."""
+    import services.office.core.settings as office_settings
+
+    test_settings = office_settings.Settings(
+        db_url_office="sqlite:///:memory:",
+        api_frontend_office_key="test-frontend-office-key",
+        api_chat_office_key="test-chat-office-key",
+        api_meetings_office_key="test-meetings-office-key",
+        api_backfill_office_key="test-backfill-office-key",
+        api_office_user_key="test-office-user-key",
+        pagination_secret_key="test-pagination-secret-key",
+    )
+
+    monkeypatch.setattr("services.office.core.settings._settings", test_settings)
+
+
 class TestThreadIDParsing:
     """Test thread ID parsing functionality."""
 
@@ -249,12 +267,12 @@ class TestThreadAPIEndpoints:
                 mock_request_id.return_value = "test_request"
 
                 with patch(
-                    "services.office.api.email.cache_manager.get_from_cache"
+                    "services.office.api.email.cache_manager.get_raw"
                 ) as mock_cache_get:
                     mock_cache_get.return_value = None
 
                     with patch(
-                        "services.office.api.email.cache_manager.set_to_cache"
+                        "services.office.api.email.cache_manager.set_raw"
                     ) as mock_cache_set:
                         # Test the core logic by calling the function with proper parameters
                         response = await get_email_threads(
@@ -379,27 +397,29 @@ class TestThreadFetchFunctions:
 
             # Mock Gmail API responses
             mock_client.get_threads.return_value = {"threads": [{"id": "thread1"}]}
-            mock_client.get_thread.return_value = {
-                "id": "thread1",
-                "messages": [
-                    {
-                        "id": "msg1",
-                        "threadId": "thread1",
-                        "snippet": "Test",
-                        "payload": {
-                            "headers": [
-                                {"name": "Subject", "value": "Test"},
-                                {"name": "From", "value": "sender@example.com"},
-                                {
-                                    "name": "Date",
-                                    "value": "Mon, 1 Jan 2024 12:00:00 +0000",
-                                },
-                            ]
-                        },
-                        "labelIds": ["INBOX"],
-                    }
-                ],
-            }
+            mock_client.get_threads_batch.return_value = [
+                {
+                    "id": "thread1",
+                    "messages": [
+                        {
+                            "id": "msg1",
+                            "threadId": "thread1",
+                            "snippet": "Test",
+                            "payload": {
+                                "headers": [
+                                    {"name": "Subject", "value": "Test"},
+                                    {"name": "From", "value": "sender@example.com"},
+                                    {
+                                        "name": "Date",
+                                        "value": "Mon, 1 Jan 2024 12:00:00 +0000",
+                                    },
+                                ]
+                            },
+                            "labelIds": ["INBOX"],
+                        }
+                    ],
+                }
+            ]
 
             threads, provider = await fetch_provider_threads(
                 "test_request",
@@ -498,13 +518,19 @@ class TestThreadFetchFunctions:
                     },
                 ]
             }
+            listed = mock_client.get_messages.return_value["value"]
+            # conv1 is hydrated through $batch, conv2 falls back to the listing
+            mock_client.get_conversation_messages_batch.return_value = [
+                {"value": listed[:2]},
+                ProviderError(message="throttled", provider="microsoft"),
+            ]
 
             threads, provider = await fetch_provider_threads(
                 "test_request",
                 "test_user",
                 "microsoft",
                 10,
-                False,
+                True,
                 None,
                 None,
                 None,
@@ -516,3 +542,48 @@ class TestThreadFetchFunctions:
             thread_ids = [thread.id for thread in threads]
             assert "microsoft_conv1" in thread_ids
             assert "microsoft_conv2" in thread_ids
+            mock_client.get_conversation_messages_batch.assert_awaited_once_with(
+                ["conv1", "conv2"]
+            )
+
+    @pytest.mark.asyncio
+    async def test_fetch_provider_threads_microsoft_without_body_uses_listing(self):
+        """Without bodies, Microsoft threads are built from the listing alone."""
+        with patch("services.office.api.email.get_api_client_factory") as mock_factory:
+            mock_client = AsyncMock()
+            mock_factory.return_value.create_client.return_value = mock_client
+            mock_client.get_messages.return_value = {
+                "value": [
+                    {
+                        "id": "msg1",
+                        "conversationId": "conv1",
+                        "subject": "Test Conversation",
+                        "bodyPreview": "Test",
+                        "from": {
+                            "emailAddress": {
+                                "address": "sender@example.com",
+                                "name": "Sender",
+                            }
+                        },
+                        "toRecipients": [],
+                        "receivedDateTime": "2024-01-01T12:00:00Z",
+                        "isRead": True,
+                        "hasAttachments": False,
+                    }
+                ]
+            }
+
+            threads, _ = await fetch_provider_threads(
+                "test_request",
+                "test_user",
+                "microsoft",
+                10,
+                False,
+                None,
+                None,
+                None,
+                None,
+            )
+
+            assert [thread.id for thread in threads] == ["microsoft_conv1"]
+            mock_client.get_conversation_messages_batch.assert_not_awaited()
@@ -42,6 +42,12 @@ def patch_settings():
     office_settings._settings = None
 
 
+@pytest.fixture(autouse=True)
+def reset_http_pool(monkeypatch):
+    """Start each test with an empty pool so patched AsyncClient classes apply."""
+    monkeypatch.setattr("services.office.core.http_pool._pool", None)
+
+
 class TestGlobalExceptionHandlers:
     """Test the global exception handlers defined in main.py"""
 
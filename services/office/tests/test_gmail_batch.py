@@ -0,0 +1,196 @@
+"""
+Tests for batched Gmail message and thread hydration.
+"""
+
+import json
+import re
+from typing import Dict, List
+
+import httpx
+import pytest
+
+from services.common.http_errors import ProviderError
+from services.office.core.clients.google import (
+    GoogleAPIClient,
+    _parse_gmail_batch_response,
+)
+
+
+@pytest.fixture(autouse=True)
+def patch_settings(monkeypatch):
+    """Patch the _settings global variable to return test settings."""
+    import services.office.core.settings as office_settings
+
+    test_settings = office_settings.Settings(
+        db_url_office="sqlite:///:memory:",
+        api_frontend_office_key="test-frontend-office-key",
+        api_chat_office_key="test-chat-office-key",
+        api_meetings_office_key="test-meetings-office-key",
+        api_backfill_office_key="test-backfill-office-key",
+        api_office_user_key="test-office-user-key",
+        pagination_secret_key="test-pagination-secret-key",
+    )
+
+    monkeypatch.setattr("services.office.core.settings._settings", test_settings)
+
+
+def batch_response(parts: List[tuple]) -> httpx.Response:
+    """Build a multipart batch response from (content id, status, body) parts."""
+    boundary = "batch_response_boundary"
+    chunks = []
+    for index, status, body in parts:
+        chunks.append(
+            f"--{boundary}\r\n"
+            "Content-Type: application/http\r\n"
+            f"Content-ID: <response-item-{index}>\r\n"
+            "\r\n"
+            f"HTTP/1.1 {status} X\r\n"
+            "Content-Type: application/json; charset=UTF-8\r\n"
+            "\r\n"
+            f"{json.dumps(body)}\r\n"
+        )
+    chunks.append(f"--{boundary}--\r\n")
+    return httpx.Response(
+        200,
+        headers={"Content-Type": f"multipart/mixed; boundary={boundary}"},
+        content="".join(chunks).encode(),
+    )
+
+
+class FakeGmail:
+    """Minimal Gmail batch and messages.get handler."""
+
+    def __init__(self, item_status: Dict[str, int] = None, batch_status: int = 200):
+        self.item_status = item_status or {}
+        self.batch_status = batch_status
+        self.batch_calls: List[List[str]] = []
+        self.single_calls: List[str] = []
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/batch/gmail/v1":
+            if self.batch_status != 200:
+                return httpx.Response(self.batch_status, json={"error": {}})
+            requests = re.findall(r"GET (\S+)", request.content.decode())
+            self.batch_calls.append(requests)
+            parts = []
+            for index, path in enumerate(requests):
+                message_id = path.split("?")[0].rsplit("/", 1)[1]
+                status = self.item_status.get(message_id, 200)
+                body = (
+                    {"id": message_id, "payload": {"headers": []}}
+                    if status == 200
+                    else {"error": {"code": status, "message": "failed"}}
+                )
+                parts.append((index, status, body))
+            # Gmail does not guarantee response order
+            return batch_response(list(reversed(parts)))
+
+        message_id = request.url.path.rsplit("/", 1)[1]
+        self.single_calls.append(message_id)
+        return httpx.Response(200, json={"id": message_id, "single": True})
+
+
+@pytest.fixture
+def fake_gmail():
+    return FakeGmail()
+
+
+def make_client(fake: FakeGmail) -> GoogleAPIClient:
+    client = GoogleAPIClient("google_token", "test_user")
+    client.http_client = httpx.AsyncClient(transport=httpx.MockTransport(fake.handler))
+    return client
+
+
+class TestGmailBatch:
+    @pytest.mark.asyncio
+    async def test_messages_are_fetched_in_batches_in_order(self, fake_gmail):
+        client = make_client(fake_gmail)
+        ids = [f"m{i}" for i in range(5)]
+
+        results = await client.get_messages_batch(ids, batch_size=2)
+
+        assert [r["id"] for r in results] == ids
+        assert len(fake_gmail.batch_calls) == 3
+        assert fake_gmail.batch_calls[0] == [
+            "/gmail/v1/users/me/messages/m0?format=full",
+            "/gmail/v1/users/me/messages/m1?format=full",
+        ]
+        assert fake_gmail.single_calls == []
+
+    @pytest.mark.asyncio
+    async def test_threads_use_thread_paths(self, fake_gmail):
+        client = make_client(fake_gmail)
+
+        results = await client.get_threads_batch(["t1"], format="metadata")
+
+        assert results[0]["id"] == "t1"
+        assert fake_gmail.batch_calls == [
+            ["/gmail/v1/users/me/threads/t1?format=metadata"]
+        ]
+
+    @pytest.mark.asyncio
+    async def test_item_errors_are_isolated(self):
+        fake = FakeGmail(item_status={"m1": 404})
+        client = make_client(fake)
+
+        results = await client.get_messages_batch(["m0", "m1", "m2"])
+
+        assert results[0]["id"] == "m0"
+        assert isinstance(results[1], ProviderError)
+        assert results[1].status_code == 404
+        assert results[2]["id"] == "m2"
+
+    @pytest.mark.asyncio
+    async def test_rate_limited_items_are_retried_individually(self):
+        fake = FakeGmail(item_status={"m1": 429})
+        client = make_client(fake)
+
+        results = await client.get_messages_batch(["m0", "m1"])
+
+        assert results[0]["id"] == "m0"
+        assert results[1] == {"id": "m1", "single": True}
+        assert fake.single_calls == ["m1"]
+
+    @pytest.mark.asyncio
+    async def test_failed_batch_falls_back_to_concurrent_fetches(self):
+        fake = FakeGmail(batch_status=503)
+        client = make_client(fake)
+
+        results = await client.get_messages_batch(["m0", "m1", "m2"])
+
+        assert [r["id"] for r in results] == ["m0", "m1", "m2"]
+        assert sorted(fake.single_calls) == ["m0", "m1", "m2"]
+
+    def test_parse_batch_response(self):
+        response = batch_response([(1, 200, {"id": "b"}), (0, 404, {"error": {}})])
+
+        parsed = _parse_gmail_batch_response(
+            response.headers["Content-Type"], response.text
+        )
+
+        assert parsed[0][0] == 404
+        assert parsed[1] == (200, '{"id": "b"}')
+
+
+class TestHydrateGmailMessages:
+    @pytest.mark.asyncio
+    async def test_hydrates_summaries_and_drops_failures(self):
+        from services.office.api.email import _hydrate_gmail_messages
+
+        fake = FakeGmail(item_status={"m1": 404})
+        client = make_client(fake)
+        summaries = [
+            {"id": "m0", "threadId": "t0"},
+            {"id": "m1", "threadId": "t1"},
+            {"id": "m2", "payload": {"headers": []}},
+        ]
+
+        messages = await _hydrate_gmail_messages(client, summaries, "metadata")
+
+        assert [m["id"] for m in messages] == ["m0", "m2"]
+        assert fake.batch_calls == [
+            [
+                "/gmail/v1/users/me/messages/m0?format=metadata",
+                "/gmail/v1/users/me/messages/m1?format=metadata",
+            ]
+        ]
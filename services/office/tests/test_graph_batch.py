@@ -0,0 +1,213 @@
+"""
+Tests for Microsoft Graph JSON $batch requests.
+"""
+
+import json
+from typing import Dict, List
+from unittest.mock import AsyncMock, patch
+
+import httpx
+import pytest
+
+from services.common.http_errors import ProviderError
+from services.office.core.clients.microsoft import (
+    GraphBatchRequest,
+    MicrosoftAPIClient,
+    _group_batch_requests,
+    build_graph_url,
+)
+
+
+@pytest.fixture(autouse=True)
+def patch_settings(monkeypatch):
+    """Patch the _settings global variable to return test settings."""
+    import services.office.core.settings as office_settings
+
+    test_settings = office_settings.Settings(
+        db_url_office="sqlite:///:memory:",
+        api_frontend_office_key="test-frontend-office-key",
+        api_chat_office_key="test-chat-office-key",
+        api_meetings_office_key="test-meetings-office-key",
+        api_backfill_office_key="test-backfill-office-key",
+        api_office_user_key="test-office-user-key",
+        pagination_secret_key="test-pagination-secret-key",
+    )
+
+    monkeypatch.setattr("services.office.core.settings._settings", test_settings)
+
+
+class FakeGraph:
+    """Minimal Graph $batch handler answering each sub-request by its URL."""
+
+    def __init__(self, item_status: Dict[str, List[int]] = None):
+        # URL -> statuses to answer with, one per attempt (then 200)
+        self.item_status = item_status or {}
+        self.batch_calls: List[List[dict]] = []
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        assert request.url.path == "/v1.0/$batch"
+        requests = json.loads(request.content)["requests"]
+        self.batch_calls.append(requests)
+
+        failed = set()
+        responses = []
+        for item in requests:
+            statuses = self.item_status.get(item["url"], [])
+            status = statuses.pop(0) if statuses else 200
+            if failed.intersection(item.get("dependsOn", [])):
+                status = 424
+            if status == 200:
+                body = {"url": item["url"]}
+            else:
+                failed.add(item["id"])
+                body = {"error": {"code": "Failed", "message": "failed"}}
+            headers = {"Retry-After": "2"} if status == 429 else {}
+            responses.append(
+                {"id": item["id"], "status": status, "headers": headers, "body": body}
+            )
+        # Graph does not guarantee response order
+        return httpx.Response(200, json={"responses": list(reversed(responses))})
+
+
+def make_client(fake: FakeGraph) -> MicrosoftAPIClient:
+    client = MicrosoftAPIClient("microsoft_token", "test_user")
+    client.http_client = httpx.AsyncClient(transport=httpx.MockTransport(fake.handler))
+    return client
+
+
+class TestGraphBatch:
+    @pytest.mark.asyncio
+    async def test_requests_are_packed_twenty_per_call_in_order(self):
+        fake = FakeGraph()
+        client = make_client(fake)
+        requests = [GraphBatchRequest(url=f"/me/messages/m{i}") for i in range(45)]
+
+        results = await client.batch(requests)
+
+        assert [r["url"] for r in results] == [r.url for r in requests]
+        assert [len(call) for call in fake.batch_calls] == [20, 20, 5]
+
+    @pytest.mark.asyncio
+    async def test_item_errors_are_returned_per_request(self):
+        fake = FakeGraph({"/me/messages/bad": [404]})
+        client = make_client(fake)
+
+        results = await client.batch(
+            [
+                GraphBatchRequest(url="/me/messages/good"),
+                GraphBatchRequest(url="/me/messages/bad"),
+            ]
+        )
+
+        assert results[0] == {"url": "/me/messages/good"}
+        assert isinstance(results[1], ProviderError)
+        assert results[1].status_code == 404
+
+    @pytest.mark.asyncio
+    async def test_throttled_items_and_dependents_are_retried(self):
+        fake = FakeGraph({"/me/messages/a": [429]})
+        client = make_client(fake)
+        requests = [
+            GraphBatchRequest(url="/me/messages/a"),
+            GraphBatchRequest(url="/me/messages/b", depends_on=[0]),
+            GraphBatchRequest(url="/me/messages/c"),
+        ]
+
+        with patch("asyncio.sleep", new_callable=AsyncMock) as sleep:
+            results = await client.batch(requests)
+
+        assert [r["url"] for r in results] == [r.url for r in requests]
+        sleep.assert_awaited_once_with(2.0)
+        assert len(fake.batch_calls) == 2
+        assert fake.batch_calls[0][1]["dependsOn"] == ["0"]
+        assert [item["url"] for item in fake.batch_calls[1]] == [
+            "/me/messages/a",
+            "/me/messages/b",
+        ]
+
+    @pytest.mark.asyncio
+    async def test_retries_stop_after_max_retries(self):
+        fake = FakeGraph({"/me/messages/a": [429, 429, 429]})
+        client = make_client(fake)
+
+        with patch("asyncio.sleep", new_callable=AsyncMock):
+            results = await client.batch(
+                [GraphBatchRequest(url="/me/messages/a")], max_retries=1
+            )
+
+        assert len(fake.batch_calls) == 2
+        assert isinstance(results[0], ProviderError)
+        assert results[0].status_code == 429
+        assert results[0].retry_after == 2
+
+    @pytest.mark.asyncio
+    async def test_post_requests_carry_body_and_content_type(self):
+        fake = FakeGraph()
+        client = make_client(fake)
+
+        await client.batch(
+            [GraphBatchRequest(url="/me/events", method="post", body={"a": 1})]
+        )
+
+        item = fake.batch_calls[0][0]
+        assert item["method"] == "POST"
+        assert item["body"] == {"a": 1}
+        assert item["headers"] == {"Content-Type": "application/json"}
+
+    @pytest.mark.asyncio
+    async def test_whole_batch_failure_marks_every_item(self):
+        client = MicrosoftAPIClient("microsoft_token", "test_user")
+        client.http_client = httpx.AsyncClient(
+            transport=httpx.MockTransport(lambda request: httpx.Response(503))
+        )
+
+        results = await client.batch(
+            [GraphBatchRequest(url="/me/messages/a") for _ in range(3)]
+        )
+
+        assert all(isinstance(r, ProviderError) for r in results)
+
+    @pytest.mark.asyncio
+    async def test_events_batch_queries_each_calendar(self):
+        fake = FakeGraph()
+        client = make_client(fake)
+
+        results = await client.get_events_batch(
+            ["cal1", "cal2"], "2024-01-01T00:00:00", "2024-01-02T00:00:00"
+        )
+
+        assert len(results) == 2
+        assert fake.batch_calls[0][0]["url"].startswith(
+            "/me/calendars/cal1/calendarView?$top=250"
+        )
+
+
+class TestGroupBatchRequests:
+    def test_dependent_requests_stay_in_one_call(self):
+        requests = [GraphBatchRequest(url=f"/r{i}") for i in range(4)]
+        requests[3].depends_on = [0]
+
+        assert _group_batch_requests(requests, 2) == [[0, 3], [1, 2]]
+
+    def test_forward_dependency_is_rejected(self):
+        requests = [
+            GraphBatchRequest(url="/a", depends_on=[1]),
+            GraphBatchRequest(url="/b"),
+        ]
+
+        with pytest.raises(ValueError):
+            _group_batch_requests(requests, 20)
+
+    def test_oversized_dependency_chain_is_rejected(self):
+        requests = [GraphBatchRequest(url="/r0")] + [
+            GraphBatchRequest(url=f"/r{i}", depends_on=[i - 1]) for i in range(1, 3)
+        ]
+
+        with pytest.raises(ValueError):
+            _group_batch_requests(requests, 2)
+
+
+def test_build_graph_url_keeps_odata_prefix():
+    url = build_graph_url("/me/messages", {"$filter": "conversationId eq 'x'"})
+
+    assert url == "/me/messages?$filter=conversationId%20eq%20%27x%27"
@@ -0,0 +1,89 @@
+"""
+Tests for the shared upstream HTTP client pool.
+"""
+
+import httpx
+import pytest
+
+from services.office.core import http_pool
+from services.office.core.http_pool import HTTPClientPool
+
+
+@pytest.fixture(autouse=True)
+def patch_settings(monkeypatch):
+    """Patch the _settings global variable to return test settings."""
+    import services.office.core.settings as office_settings
+
+    test_settings = office_settings.Settings(
+        db_url_office="sqlite:///:memory:",
+        api_frontend_office_key="test-frontend-office-key",
+        api_chat_office_key="test-chat-office-key",
+        api_meetings_office_key="test-meetings-office-key",
+        api_backfill_office_key="test-backfill-office-key",
+        api_office_user_key="test-office-user-key",
+        pagination_secret_key="test-pagination-secret-key",
+        http_pool_max_connections=7,
+    )
+
+    monkeypatch.setattr("services.office.core.settings._settings", test_settings)
+    monkeypatch.setattr("services.office.core.http_pool._pool", None)
+
+
+class TestHTTPClientPool:
+    @pytest.mark.asyncio
+    async def test_one_client_per_origin(self):
+        pool = HTTPClientPool()
+
+        gmail = pool.get_client("https://www.googleapis.com/gmail/v1/users/me")
+        calendar = pool.get_client("https://WWW.googleapis.com/calendar/v3")
+        graph = pool.get_client("https://graph.microsoft.com/v1.0")
+
+        assert gmail is calendar
+        assert gmail is not graph
+        assert set(pool.stats()) == {
+            "https://www.googleapis.com",
+            "https://graph.microsoft.com",
+        }
+        await pool.aclose()
+
+    @pytest.mark.asyncio
+    async def test_closed_clients_are_replaced(self):
+        pool = HTTPClientPool()
+        client = pool.get_client("http://localhost:8001/v1")
+
+        await client.aclose()
+
+        assert pool.get_client("http://localhost:8001") is not client
+        await pool.aclose()
+
+    def test_relative_urls_are_rejected(self):
+        with pytest.raises(ValueError):
+            HTTPClientPool().get_client("/v1/users")
+
+    @pytest.mark.asyncio
+    async def test_stats_report_connection_usage(self):
+        pool = HTTPClientPool(max_connections=4)
+        pool._clients["http://upstream"] = httpx.AsyncClient(
+            transport=httpx.MockTransport(lambda request: httpx.Response(200))
+        )
+
+        stats = pool.stats()["http://upstream"]
+
+        assert stats["max_connections"] == 4
+        assert stats["connections"] == 0
+        assert stats["utilization"] == 0
+        await pool.aclose()
+        assert pool.stats() == {}
+
+    @pytest.mark.asyncio
+    async def test_global_pool_uses_settings_and_closes(self):
+        pool = http_pool.get_http_pool()
+
+        assert http_pool.get_http_pool() is pool
+        assert pool.limits.max_connections == 7
+
+        client = pool.get_client("https://graph.microsoft.com")
+        await http_pool.close_http_pool()
+
+        assert client.is_closed
+        assert http_pool.get_http_pool() is not pool
@@ -0,0 +1,164 @@
+"""
+Tests for the cached user integration directory.
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from services.office.core.integration_directory import (
+    EMAIL_PROVIDERS,
+    INTEGRATIONS_CHANGED_CHANNEL,
+    PREFERRED_PROVIDER,
+    IntegrationDirectory,
+    generate_directory_cache_key,
+)
+
+
+@pytest.fixture(autouse=True)
+def patch_settings(monkeypatch):
+    """Patch the _settings global variable to return test settings."""
+    import services.office.core.settings as office_settings
+
+    test_settings = office_settings.Settings(
+        db_url_office="sqlite:///:memory:",
+        api_frontend_office_key="test-frontend-office-key",
+        api_chat_office_key="test-chat-office-key",
+        api_meetings_office_key="test-meetings-office-key",
+        api_backfill_office_key="test-backfill-office-key",
+        api_office_user_key="test-office-user-key",
+        pagination_secret_key="test-pagination-secret-key",
+    )
+
+    monkeypatch.setattr("services.office.core.settings._settings", test_settings)
+
+
+@pytest.fixture
+def redis_tier():
+    """In-memory stand-in for the Redis tier of the cache manager."""
+    store = {}
+
+    async def get_from_cache(key):
+        return store.get(key)
+
+    async def set_to_cache(key, data, ttl_seconds=None):
+        store[key] = data
+        return True
+
+    async def delete_from_cache(key):
+        return store.pop(key, None) is not None
+
+    with patch(
+        "services.office.core.integration_directory.cache_manager"
+    ) as mock_cache:
+        mock_cache.get_from_cache = AsyncMock(side_effect=get_from_cache)
+        mock_cache.set_to_cache = AsyncMock(side_effect=set_to_cache)
+        mock_cache.delete_from_cache = AsyncMock(side_effect=delete_from_cache)
+        mock_cache.publish = AsyncMock(return_value=1)
+        mock_cache.store = store
+        yield mock_cache
+
+
+class TestIntegrationDirectory:
+    @pytest.mark.asyncio
+    async def test_concurrent_lookups_share_one_load(self, redis_tier):
+        directory = IntegrationDirectory()
+        calls = 0
+
+        async def loader():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return ["google"]
+
+        results = await asyncio.gather(
+            *(directory.get("user1", EMAIL_PROVIDERS, loader) for _ in range(10))
+        )
+
+        assert results == [["google"]] * 10
+        assert calls == 1
+        assert redis_tier.store[
+            generate_directory_cache_key("user1", EMAIL_PROVIDERS)
+        ] == {"value": ["google"]}
+
+    @pytest.mark.asyncio
+    async def test_local_tier_serves_repeat_lookups(self, redis_tier):
+        directory = IntegrationDirectory()
+        loader = AsyncMock(return_value=None)
+
+        assert await directory.get("user1", PREFERRED_PROVIDER, loader) is None
+        assert await directory.get("user1", PREFERRED_PROVIDER, loader) is None
+
+        loader.assert_awaited_once()
+        assert redis_tier.get_from_cache.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_redis_tier_is_used_after_local_expiry(self, redis_tier):
+        directory = IntegrationDirectory(local_ttl_seconds=0)
+        loader = AsyncMock(return_value=["microsoft"])
+
+        await directory.get("user1", EMAIL_PROVIDERS, loader)
+        assert await directory.get("user1", EMAIL_PROVIDERS, loader) == ["microsoft"]
+
+        loader.assert_awaited_once()
+        assert redis_tier.get_from_cache.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_failures_are_not_cached(self, redis_tier):
+        directory = IntegrationDirectory()
+        loader = AsyncMock(side_effect=[ValueError("user service down"), ["google"]])
+
+        with pytest.raises(ValueError):
+            await directory.get("user1", EMAIL_PROVIDERS, loader)
+
+        assert await directory.get("user1", EMAIL_PROVIDERS, loader) == ["google"]
+        assert loader.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_invalidate_drops_both_tiers_and_broadcasts(self, redis_tier):
+        directory = IntegrationDirectory()
+        loader = AsyncMock(side_effect=[["google"], ["google", "microsoft"]])
+        await directory.get("user1", EMAIL_PROVIDERS, loader)
+
+        await directory.invalidate("user1")
+
+        assert redis_tier.store == {}
+        redis_tier.publish.assert_awaited_once_with(
+            INTEGRATIONS_CHANGED_CHANNEL, "user1"
+        )
+        assert await directory.get("user1", EMAIL_PROVIDERS, loader) == [
+            "google",
+            "microsoft",
+        ]
+
+    @pytest.mark.asyncio
+    async def test_load_racing_an_invalidation_is_not_cached(self, redis_tier):
+        directory = IntegrationDirectory()
+        started = asyncio.Event()
+        release = asyncio.Event()
+
+        async def slow_loader():
+            started.set()
+            await release.wait()
+            return ["google"]
+
+        pending = asyncio.create_task(
+            directory.get("user1", EMAIL_PROVIDERS, slow_loader)
+        )
+        await started.wait()
+        await directory.invalidate("user1", broadcast=False)
+        release.set()
+
+        assert await pending == ["google"]
+        assert redis_tier.store == {}
+        redis_tier.publish.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_local_tier_is_size_bounded(self, redis_tier):
+        directory = IntegrationDirectory(max_local_entries=2)
+
+        for user_id in ("a", "b", "c"):
+            await directory.get(user_id, EMAIL_PROVIDERS, AsyncMock(return_value=[]))
+
+        assert set(directory._local) == {("b", EMAIL_PROVIDERS), ("c", EMAIL_PROVIDERS)}
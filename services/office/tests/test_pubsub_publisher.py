@@ -0,0 +1,100 @@
+"""
+Tests for batched, non-blocking publishing in PubSubPublisher.
+"""
+
+import threading
+from concurrent.futures import Future
+from datetime import datetime, timezone
+from unittest.mock import patch
+
+import pytest
+from google.api_core import exceptions as google_exceptions
+
+from services.common.events.email_events import EmailData
+from services.office.core.pubsub_publisher import PubSubPublisher
+
+
+def _make_email_data(index: int) -> EmailData:
+    return EmailData(
+        id=f"email{index}",
+        thread_id=f"thread{index}",
+        subject="Test",
+        body="Body",
+        from_address="sender@example.com",
+        to_addresses=["me@example.com"],
+        received_date=datetime(2024, 1, 1, tzinfo=timezone.utc),
+        provider="gmail",
+        provider_message_id=f"msg{index}",
+    )
+
+
+class FakePublisher:
+    """Returns futures that a background thread resolves shortly after."""
+
+    def __init__(self, failures=None):
+        self.failures = failures or {}
+        self.published = []
+
+    def publish(self, topic_path, data):
+        index = len(self.published)
+        self.published.append(data)
+        future = Future()
+        if index in self.failures:
+            resolve = future.set_exception
+            outcome = self.failures[index]
+        else:
+            resolve = future.set_result
+            outcome = f"id-{index}"
+        threading.Timer(0.02, resolve, args=(outcome,)).start()
+        return future
+
+
+class TestPubSubPublisherBatch:
+    @pytest.fixture
+    def publisher(self):
+        with patch("services.office.core.pubsub_publisher.pubsub_v1.PublisherClient"):
+            publisher = PubSubPublisher(project_id="test-project", emulator_host="")
+        return publisher
+
+    @pytest.mark.asyncio
+    async def test_batch_emails_reports_per_message_results(self, publisher):
+        fake = FakePublisher(failures={2: RuntimeError("boom")})
+        publisher.publisher = fake
+
+        results = await publisher.publish_batch_emails(
+            [_make_email_data(i) for i in range(3)], user_id="user123"
+        )
+
+        assert results == [True, True, False]
+        assert len(fake.published) == 3
+
+    @pytest.mark.asyncio
+    async def test_missing_user_id_fails_every_message(self, publisher):
+        fake = FakePublisher()
+        publisher.publisher = fake
+
+        results = await publisher.publish_batch_emails([_make_email_data(1)])
+
+        assert results == [False]
+        assert fake.published == []
+
+    @pytest.mark.asyncio
+    async def test_topic_not_found_disables_publisher(self, publisher):
+        fake = FakePublisher(failures={0: google_exceptions.NotFound("no topic")})
+        publisher.publisher = fake
+
+        results = await publisher.publish_batch_emails(
+            [_make_email_data(1)], user_id="user123"
+        )
+
+        assert results == [False]
+        assert publisher.publisher is None
+
+    @pytest.mark.asyncio
+    async def test_single_event_awaits_future(self, publisher):
+        fake = FakePublisher()
+        publisher.publisher = fake
+
+        assert await publisher.publish_email_event(
+            _make_email_data(1), user_id="user123"
+        )
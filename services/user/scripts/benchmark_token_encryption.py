@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for token encryption throughput.
+
+Compares tokens/second with the derived key cache disabled (one PBKDF2
+derivation per operation, the previous behaviour) and enabled, for the
+get_valid_token access pattern (decrypt access + refresh token), and measures
+how long the event loop is blocked while concurrent requests decrypt tokens.
+
+Usage:
+    python -m services.user.scripts.benchmark_token_encryption [--users N]
+"""
+
+import argparse
+import asyncio
+import base64
+import os
+import time
+
+from services.user.security.encryption import DerivedKeyCache, TokenEncryption
+from services.user.settings import Settings
+
+
+def _build_encryption(key_cache: DerivedKeyCache) -> TokenEncryption:
+    os.environ.setdefault("ENVIRONMENT", "local")
+    os.environ.setdefault(
+        "TOKEN_ENCRYPTION_SALT", base64.b64encode(b"benchmark-salt-16").decode()
+    )
+    settings = Settings(
+        api_frontend_user_key="benchmark",
+        api_chat_user_key="benchmark",
+        api_office_user_key="benchmark",
+        api_meetings_user_key="benchmark",
+        pagination_secret_key="benchmark",
+    )
+    return TokenEncryption(settings=settings, key_cache=key_cache)
+
+
+def _bench_sync(encryption: TokenEncryption, tokens: dict, rounds: int) -> float:
+    started = time.perf_counter()
+    for _ in range(rounds):
+        for user_id, (access, refresh) in tokens.items():
+            encryption.decrypt_token(access, user_id)
+            encryption.decrypt_token(refresh, user_id)
+    elapsed = time.perf_counter() - started
+    return (rounds * len(tokens) * 2) / elapsed
+
+
+async def _bench_loop_blocking(
+    encryption: TokenEncryption, tokens: dict, use_async: bool
+) -> float:
+    """Return the worst event loop stall while all users decrypt concurrently."""
+    worst = 0.0
+    done = False
+
+    async def probe() -> None:
+        nonlocal worst
+        while not done:
+            before = time.perf_counter()
+            await asyncio.sleep(0)
+            worst = max(worst, time.perf_counter() - before)
+
+    async def get_valid_token(user_id: str, access: str, refresh: str) -> None:
+        if use_async:
+            await encryption.decrypt_token_async(access, user_id)
+            await encryption.decrypt_token_async(refresh, user_id)
+        else:
+            encryption.decrypt_token(access, user_id)
+            encryption.decrypt_token(refresh, user_id)
+
+    probe_task = asyncio.create_task(probe())
+    await asyncio.gather(*(get_valid_token(u, a, r) for u, (a, r) in tokens.items()))
+    done = True
+    await probe_task
+    return worst
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    cached = _build_encryption(DerivedKeyCache())
+    tokens = {
+        f"user_{i}": (
+            cached.encrypt_token(f"access-{i}", f"user_{i}"),
+            cached.encrypt_token(f"refresh-{i}", f"user_{i}"),
+        )
+        for i in range(args.users)
+    }
+
+    uncached = _build_encryption(DerivedKeyCache(max_size=0))
+    before = _bench_sync(uncached, tokens, 1)
+    after = _bench_sync(cached, tokens, args.rounds)
+    print(f"uncached: {before:>12,.0f} tokens/s")
+    print(f"cached:   {after:>12,.0f} tokens/s  ({after / before:,.0f}x)")
+
+    for use_async in (False, True):
+        cold = _build_encryption(DerivedKeyCache())
+        stall = asyncio.run(_bench_loop_blocking(cold, tokens, use_async))
+        api = "async" if use_async else "sync"
+        print(f"max event loop stall, cold cache, {api} API: {stall * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
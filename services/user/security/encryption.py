@@ -5,8 +5,13 @@ Provides secure encryption and decryption of OAuth tokens and sensitive data
 using AES-256-GCM encryption with user-specific keys derived via PBKDF2.
 """
 
+import asyncio
 import base64
+import hashlib
 import os
+import threading
+import time
+from collections import OrderedDict
 from typing import Optional, Tuple
 
 from cryptography.hazmat.primitives import hashes
@@ -32,6 +37,81 @@ PBKDF2_ITERATIONS = 100000  # OWASP recommended minimum
 KEY_VERSION = 1  # For key rotation support
 
 
+class DerivedKeyCache:
+    """
+    Bounded, TTL'd in-process cache of PBKDF2-derived user keys.
+
+    Deriving a key costs ~100k HMAC rounds, and every encrypt/decrypt needs
+    one, so keys are cached per (service salt, user ID, key version).
+    Entries expire after ``ttl_seconds`` and the least recently used entry is
+    evicted once ``max_size`` is reached. Access is guarded by a thread lock
+    because derivations run in executor threads.
+    """
+
+    def __init__(self, max_size: int = 10000, ttl_seconds: float = 3600.0):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Tuple[bytes, str, int], Tuple[bytes, float]]" = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+
+    def get(self, cache_key: Tuple[bytes, str, int]) -> Optional[bytes]:
+        """Return a cached key, or None if missing or expired."""
+        with self._lock:
+            entry = self._entries.get(cache_key)
+            if entry is None:
+                return None
+            key, expires_at = entry
+            if expires_at <= time.monotonic():
+                del self._entries[cache_key]
+                return None
+            self._entries.move_to_end(cache_key)
+            return key
+
+    def set(self, cache_key: Tuple[bytes, str, int], key: bytes) -> None:
+        """Store a derived key, evicting the least recently used entries."""
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._entries[cache_key] = (key, time.monotonic() + self.ttl_seconds)
+            self._entries.move_to_end(cache_key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate_user(self, user_id: str) -> int:
+        """Drop every cached key version of a user. Returns entries removed."""
+        with self._lock:
+            stale = [k for k in self._entries if k[1] == user_id]
+            for cache_key in stale:
+                del self._entries[cache_key]
+            return len(stale)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# Shared across TokenEncryption instances so that invalidation in one service
+# (e.g. on key rotation) is seen by all of them
+_derived_key_cache: Optional[DerivedKeyCache] = None
+
+
+def get_derived_key_cache(settings: Optional[Settings] = None) -> DerivedKeyCache:
+    """Get the process-wide derived key cache, creating it if necessary."""
+    global _derived_key_cache
+    if _derived_key_cache is None:
+        settings = settings or Settings()
+        _derived_key_cache = DerivedKeyCache(
+            max_size=settings.token_key_cache_max_size,
+            ttl_seconds=settings.token_key_cache_ttl_seconds,
+        )
+    return _derived_key_cache
+
+
 class TokenEncryption:
     """
     Token encryption service using AES-256-GCM with user-specific keys.
@@ -42,17 +122,27 @@ class TokenEncryption:
     - PBKDF2 key derivation with configurable iterations
     - Key versioning for rotation support
     - Secure random salt and nonce generation
+    - Cached key derivation, with async variants that derive off the event loop
     """
 
-    def __init__(self, settings: Optional[Settings] = None):
+    def __init__(
+        self,
+        settings: Optional[Settings] = None,
+        key_cache: Optional[DerivedKeyCache] = None,
+    ):
         """
         Initialize the token encryption service.
 
         Args:
             settings: Application settings for encryption configuration
+            key_cache: Derived key cache (defaults to the process-wide cache)
         """
         self.settings = settings or Settings()
         self._service_salt = self._get_service_salt()
+        self._salt_fingerprint = hashlib.sha256(self._service_salt).digest()[:8]
+        self._key_cache = (
+            key_cache if key_cache is not None else get_derived_key_cache(self.settings)
+        )
         logger.info("Token encryption service initialized", key_version=KEY_VERSION)
 
     def _get_service_salt(self) -> bytes:
@@ -103,10 +193,16 @@ class TokenEncryption:
             logger.error("Failed to get service salt", error=str(e))
             raise ServiceError("Failed to initialize encryption service")
 
+    def _cache_key(self, user_id: str, version: int) -> Tuple[bytes, str, int]:
+        return (self._salt_fingerprint, user_id, version)
+
     def derive_user_key(self, user_id: str, version: int = KEY_VERSION) -> bytes:
         """
         Derive a user-specific encryption key using PBKDF2.
 
+        Keys are served from the derived key cache when possible; only a
+        cache miss pays for the PBKDF2 derivation.
+
         Args:
             user_id: User identifier for key derivation
             version: Key version for rotation support
@@ -117,6 +213,11 @@ class TokenEncryption:
         Raises:
             ServiceError: If key derivation fails
         """
+        cache_key = self._cache_key(user_id, version)
+        cached = self._key_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
         try:
             logger.debug("Deriving user key", user_id=user_id, version=version)
 
@@ -124,8 +225,6 @@ class TokenEncryption:
             version_bytes = f"{user_id}:{version}".encode("utf-8")
             user_salt = self._service_salt + version_bytes
             # Hash to ensure consistent length and distribution
-            import hashlib
-
             user_salt = hashlib.sha256(user_salt).digest()[:SALT_LENGTH]
 
             # Derive key using PBKDF2
@@ -141,12 +240,59 @@ class TokenEncryption:
             key = kdf.derive(password)
 
             logger.debug("Successfully derived user key", user_id=user_id)
+            self._key_cache.set(cache_key, key)
             return key
 
         except Exception as e:
             logger.error("Key derivation failed", user_id=user_id, error=str(e))
             raise ServiceError(f"Failed to derive encryption key for user {user_id}")
 
+    async def derive_user_key_async(
+        self, user_id: str, version: int = KEY_VERSION
+    ) -> bytes:
+        """
+        Get a user key without blocking the event loop.
+
+        Cache hits return immediately; a miss runs the PBKDF2 derivation in
+        the default executor.
+
+        Raises:
+            ServiceError: If key derivation fails
+        """
+        cached = self._key_cache.get(self._cache_key(user_id, version))
+        if cached is not None:
+            return cached
+        return await asyncio.to_thread(self.derive_user_key, user_id, version)
+
+    async def encrypt_token_async(
+        self, token: str, user_id: str, additional_data: Optional[str] = None
+    ) -> str:
+        """Async variant of encrypt_token that derives keys off the event loop."""
+        await self.derive_user_key_async(user_id)
+        if additional_data is None:
+            return self.encrypt_token(token=token, user_id=user_id)
+        return self.encrypt_token(token, user_id, additional_data)
+
+    async def decrypt_token_async(
+        self, encrypted_token: str, user_id: str, additional_data: Optional[str] = None
+    ) -> str:
+        """Async variant of decrypt_token that derives keys off the event loop."""
+        version = self._peek_key_version(encrypted_token)
+        if version is not None:
+            await self.derive_user_key_async(user_id, version)
+        if additional_data is None:
+            return self.decrypt_token(encrypted_token=encrypted_token, user_id=user_id)
+        return self.decrypt_token(encrypted_token, user_id, additional_data)
+
+    @staticmethod
+    def _peek_key_version(encrypted_token: str) -> Optional[int]:
+        """Read the key version byte of an encrypted token, if it has one."""
+        try:
+            return base64.b64decode(encrypted_token)[0]
+        except Exception:
+            # Malformed input is reported by decrypt_token itself
+            return None
+
     def encrypt_token(
         self, token: str, user_id: str, additional_data: Optional[str] = None
     ) -> str:
@@ -286,6 +432,9 @@ class TokenEncryption:
             # Decrypt with old key
             decrypted_token = self.decrypt_token(old_token, user_id)
 
+            # Drop cached keys so no stale version outlives the rotation
+            self._key_cache.invalidate_user(user_id)
+
             # Re-encrypt with new version
             new_version = KEY_VERSION + 1
             new_key = self.derive_user_key(user_id, new_version)
@@ -42,6 +42,10 @@ from services.user.settings import get_settings
 # Set up logging
 logger = get_logger(__name__)
 
+# Office service replicas drop their cached integration directory entries for
+# user IDs published here (see services.office.core.integration_directory)
+INTEGRATIONS_CHANGED_CHANNEL = "office:integrations:changed"
+
 
 class IntegrationService:
     """
@@ -382,6 +386,7 @@ class IntegrationService:
 
             # Clean up OAuth state
             self.oauth_config.remove_state(oauth_state.state)
+            await self._notify_integrations_changed(user_id)
 
             # Log successful OAuth completion
             await audit_logger.log_user_action(
@@ -524,7 +529,7 @@ class IntegrationService:
                 )
                 access_token_record = access_token_result.scalar_one_or_none()
                 if access_token_record:
-                    access_token = self.token_encryption.decrypt_token(
+                    access_token = await self.token_encryption.decrypt_token_async(
                         encrypted_token=access_token_record.encrypted_value,
                         user_id=user_id,
                     )
@@ -538,7 +543,7 @@ class IntegrationService:
                 )
                 refresh_token_record = refresh_token_result.scalar_one_or_none()
                 if refresh_token_record:
-                    refresh_token = self.token_encryption.decrypt_token(
+                    refresh_token = await self.token_encryption.decrypt_token_async(
                         encrypted_token=refresh_token_record.encrypted_value,
                         user_id=user_id,
                     )
@@ -794,9 +799,11 @@ class IntegrationService:
                     # Revoke access token
                     if access_token_record:
                         try:
-                            access_token = self.token_encryption.decrypt_token(
-                                encrypted_token=access_token_record.encrypted_value,
-                                user_id=user_id,
+                            access_token = (
+                                await self.token_encryption.decrypt_token_async(
+                                    encrypted_token=access_token_record.encrypted_value,
+                                    user_id=user_id,
+                                )
                             )
                             access_token_revoked = await self.oauth_config.revoke_token(
                                 provider=provider,
@@ -815,7 +822,7 @@ class IntegrationService:
                     # Revoke refresh token if available
                     if refresh_token_record:
                         try:
-                            refresh_token = self.token_encryption.decrypt_token(
+                            refresh_token = await self.token_encryption.decrypt_token_async(
                                 encrypted_token=refresh_token_record.encrypted_value,
                                 user_id=user_id,
                             )
@@ -898,6 +905,8 @@ class IntegrationService:
                     session.add(integration)
                     await session.commit()
 
+            await self._notify_integrations_changed(user_id)
+
             # Clear calendar cache for this user since integration was removed
             if delete_data:
                 try:
@@ -916,11 +925,19 @@ class IntegrationService:
                         retry_on_timeout=True,
                     )
 
-                    # Clear all calendar cache keys for this user
+                    # Clear all office cache keys for this user; SCAN walks
+                    # the keyspace in steps instead of blocking Redis like KEYS
                     pattern = f"office:{user_id}:*"
-                    keys = await redis_client.keys(pattern)
-                    if keys:
-                        deleted_count = await redis_client.delete(*keys)
+                    deleted_count = 0
+                    batch: List[str] = []
+                    async for key in redis_client.scan_iter(match=pattern, count=1000):
+                        batch.append(key)
+                        if len(batch) >= 500:
+                            deleted_count += await redis_client.unlink(*batch)
+                            batch = []
+                    if batch:
+                        deleted_count += await redis_client.unlink(*batch)
+                    if deleted_count:
                         self.logger.info(
                             f"Cleared {deleted_count} cache keys for user {user_id}"
                         )
@@ -1186,6 +1203,36 @@ class IntegrationService:
 
     # Private helper methods
 
+    async def _notify_integrations_changed(self, user_id: str) -> None:
+        """
+        Tell office service replicas that a user's integrations changed.
+
+        Failures are logged and ignored; office entries then expire on their
+        own short TTL.
+
+        Args:
+            user_id: User ID whose integrations changed
+        """
+        try:
+            # Import here to avoid circular imports
+            import redis.asyncio as redis
+
+            redis_client = redis.from_url(
+                get_settings().redis_url,
+                encoding="utf-8",
+                decode_responses=True,
+                socket_timeout=5.0,
+                socket_connect_timeout=5.0,
+            )
+            try:
+                await redis_client.publish(INTEGRATIONS_CHANGED_CHANNEL, user_id)
+            finally:
+                await redis_client.aclose()
+        except Exception as e:
+            self.logger.warning(
+                f"Failed to publish integration change for user {user_id}: {e}"
+            )
+
     async def _get_user_integration(
         self,
         user_id: str,
@@ -1377,14 +1424,14 @@ class IntegrationService:
             user_id = user.external_auth_id
 
             # Encrypt tokens
-            encrypted_access = self.token_encryption.encrypt_token(
+            encrypted_access = await self.token_encryption.encrypt_token_async(
                 token=tokens.get("access_token", ""),
                 user_id=user_id,
             )
 
             encrypted_refresh = None
             if tokens.get("refresh_token"):
-                encrypted_refresh = self.token_encryption.encrypt_token(
+                encrypted_refresh = await self.token_encryption.encrypt_token_async(
                     token=tokens.get("refresh_token", ""),
                     user_id=user_id,
                 )
@@ -75,7 +75,7 @@ class TokenService:
             integration = await self._get_user_integration(user_id, provider)
 
             # Encrypt access token
-            encrypted_access = self.token_encryption.encrypt_token(
+            encrypted_access = await self.token_encryption.encrypt_token_async(
                 token=tokens["access_token"],
                 user_id=user_id,
             )
@@ -83,7 +83,7 @@ class TokenService:
             # Encrypt refresh token if provided
             encrypted_refresh = None
             if tokens.get("refresh_token"):
-                encrypted_refresh = self.token_encryption.encrypt_token(
+                encrypted_refresh = await self.token_encryption.encrypt_token_async(
                     token=tokens["refresh_token"],
                     user_id=user_id,
                 )
@@ -242,7 +242,7 @@ class TokenService:
                         )
 
             # Decrypt access token
-            access_token = self.token_encryption.decrypt_token(
+            access_token = await self.token_encryption.decrypt_token_async(
                 encrypted_token=access_token_record.encrypted_value,
                 user_id=user_id,
             )
@@ -250,7 +250,7 @@ class TokenService:
             # Decrypt refresh token if available
             refresh_token = None
             if refresh_token_record:
-                refresh_token = self.token_encryption.decrypt_token(
+                refresh_token = await self.token_encryption.decrypt_token_async(
                     encrypted_token=refresh_token_record.encrypted_value,
                     user_id=user_id,
                 )
@@ -718,7 +718,7 @@ class TokenService:
 
             # Revoke access token with provider
             if access_token_record:
-                access_token = self.token_encryption.decrypt_token(
+                access_token = await self.token_encryption.decrypt_token_async(
                     encrypted_token=access_token_record.encrypted_value,
                     user_id=user_id,
                 )
@@ -730,7 +730,7 @@ class TokenService:
 
             # Revoke refresh token with provider
             if refresh_token_record:
-                refresh_token = self.token_encryption.decrypt_token(
+                refresh_token = await self.token_encryption.decrypt_token_async(
                     encrypted_token=refresh_token_record.encrypted_value,
                     user_id=user_id,
                 )
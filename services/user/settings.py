@@ -62,6 +62,14 @@ class Settings(BaseSettings):
         default=None,
         description="Base64-encoded service salt for token encryption key derivation",
     )
+    token_key_cache_max_size: int = Field(
+        default=10000,
+        description="Maximum derived token encryption keys cached in memory",
+    )
+    token_key_cache_ttl_seconds: float = Field(
+        default=3600.0,
+        description="Seconds a derived token encryption key stays cached",
+    )
     jwt_verify_signature: bool = Field(
         default=True,
         description="Whether to verify JWT signatures (set to False for development)",
@@ -5,13 +5,15 @@ Tests encryption/decryption, key derivation, user isolation,
 and security features of the TokenEncryption service.
 """
 
+import asyncio
 import base64
 import os
 from unittest.mock import patch
 
 import pytest
+from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
 
-from services.user.security.encryption import TokenEncryption
+from services.user.security.encryption import DerivedKeyCache, TokenEncryption
 from services.user.tests.test_base import BaseUserManagementTest
 
 
@@ -427,3 +429,100 @@ class TestTokenEncryption(BaseUserManagementTest):
         # All operations should succeed
         assert len(results) == 10
         assert all(result == token for result in results)
+
+
+class TestDerivedKeyCache(BaseUserManagementTest):
+    """Test cases for derived key caching in TokenEncryption."""
+
+    def setup_method(self):
+        super().setup_method()
+        self.salt_patcher = patch(
+            "services.user.security.encryption.get_token_encryption_salt",
+            return_value=base64.b64encode(b"test-salt-16byte").decode("utf-8"),
+        )
+        self.salt_patcher.start()
+        self.key_cache = DerivedKeyCache(max_size=2, ttl_seconds=60)
+        self.encryption_service = TokenEncryption(key_cache=self.key_cache)
+
+    def teardown_method(self):
+        self.salt_patcher.stop()
+        super().teardown_method()
+
+    def test_repeated_operations_derive_once(self):
+        """Encrypt and decrypt for the same user reuse the cached key."""
+        with patch(
+            "services.user.security.encryption.PBKDF2HMAC",
+            wraps=PBKDF2HMAC,
+        ) as mock_kdf:
+            encrypted = self.encryption_service.encrypt_token("token", "user_123")
+            for _ in range(3):
+                self.encryption_service.decrypt_token(encrypted, "user_123")
+
+        assert mock_kdf.call_count == 1
+
+    def test_cache_is_bounded(self):
+        """The least recently used key is evicted past max_size."""
+        for user_id in ["user_1", "user_2", "user_3"]:
+            self.encryption_service.derive_user_key(user_id)
+
+        assert len(self.key_cache) == 2
+        assert (
+            self.key_cache.get(self.encryption_service._cache_key("user_1", 1)) is None
+        )
+
+    def test_expired_keys_are_rederived(self):
+        """Entries past their TTL are dropped on access."""
+        self.key_cache.ttl_seconds = 0
+        self.encryption_service.derive_user_key("user_123")
+
+        assert (
+            self.key_cache.get(self.encryption_service._cache_key("user_123", 1))
+            is None
+        )
+
+    def test_rotation_invalidates_cached_keys(self):
+        """Rotating a user's key drops the previously cached versions."""
+        encrypted = self.encryption_service.encrypt_token("token", "user_123")
+        old_key = self.encryption_service._cache_key("user_123", 1)
+        assert self.key_cache.get(old_key) is not None
+
+        new_token, new_version = self.encryption_service.rotate_user_key(
+            "user_123", encrypted
+        )
+
+        assert self.key_cache.get(old_key) is None
+        assert (
+            self.key_cache.get(
+                self.encryption_service._cache_key("user_123", new_version)
+            )
+            is not None
+        )
+
+    def test_cache_is_scoped_to_service_salt(self):
+        """Services with different salts never share cached keys."""
+        key = self.encryption_service.derive_user_key("user_123")
+        with patch(
+            "services.user.security.encryption.get_token_encryption_salt",
+            return_value=base64.b64encode(b"other-salt-16byt").decode("utf-8"),
+        ):
+            other = TokenEncryption(key_cache=self.key_cache)
+
+        assert other.derive_user_key("user_123") != key
+
+    @pytest.mark.asyncio
+    async def test_async_roundtrip_derives_in_executor(self):
+        """Async variants run cache-miss derivations off the event loop."""
+        with patch(
+            "services.user.security.encryption.asyncio.to_thread",
+            wraps=asyncio.to_thread,
+        ) as mock_to_thread:
+            encrypted = await self.encryption_service.encrypt_token_async(
+                "token", "user_123"
+            )
+            decrypted = await self.encryption_service.decrypt_token_async(
+                encrypted, "user_123"
+            )
+
+        assert decrypted == "token"
+        # Only the first (cache-miss) call needs the executor
+        assert mock_to_thread.call_count == 1
@@ -1,21 +1,47 @@
 #!/usr/bin/env python3
 """
 Content normalizer for processing HTML and other content formats
+
+Tag and header stripping run as one combined, precompiled pass each. The
+original per-tag / per-header passes are order dependent on malformed input
+(e.g. ``<<div>b>`` or a line holding both ``Reply-To:`` and ``To:``), so
+inputs where pass order could matter are detected up front and sent through
+the multi-pass path instead. Output is identical either way.
 """
 
 import re
 from html import unescape
-from typing import Optional
+from typing import List, Optional
 
 from services.common.logging_config import get_logger
 
 logger = get_logger(__name__)
 
 
+_SCRIPT_RE = re.compile(r"<script[^>]*>.*?</script>", re.DOTALL | re.IGNORECASE)
+_STYLE_RE = re.compile(r"<style[^>]*>.*?</style>", re.DOTALL | re.IGNORECASE)
+_COMMENT_RE = re.compile(r"<!--.*?-->", re.DOTALL)
+
+# A "<" reaching another "<" before any ">": tag matches could overlap or be
+# created by earlier removals, so the single pass might differ
+_NESTED_TAG_RE = re.compile(r"<[^<>]*<")
+
+# Characters other than ASCII letters that re.IGNORECASE matches against a-z
+# but str.lower() does not map onto them
+_IGNORECASE_ONLY_CHARS = ("\u0130", "\u0131", "\u017f")
+
+# Runs of two or more (single spaces are already normalized)
+_SPACES_RE = re.compile("  +")
+_TABS_RE = re.compile(r"\t+")
+_NEWLINES_RE = re.compile(r"\n{3,}")
+
+
 class ContentNormalizer:
     """Normalizes content for better search indexing"""
 
-    def __init__(self) -> None:
+    def __init__(self, fast_path: bool = True) -> None:
+        self.fast_path = fast_path
+
         # Common HTML tags to remove
         self.html_tags = [
             "html",
@@ -108,6 +134,23 @@ class ContentNormalizer:
             re.compile(pattern, re.IGNORECASE | re.MULTILINE)
             for pattern in self.email_patterns
         ]
+        self.compiled_tag_patterns = [
+            re.compile(pattern, re.IGNORECASE)
+            for tag in self.html_tags
+            for pattern in (rf"<{tag}[^>]*>", rf"</{tag}[^>]*>")
+        ]
+
+        # Single-pass equivalents
+        tags = "|".join(self.html_tags)
+        self._tag_re = re.compile(rf"</?(?:{tags})[^>]*>", re.IGNORECASE)
+        self._header_keywords = [
+            pattern.removesuffix(r".*?\n") for pattern in self.email_patterns
+        ]
+        self._header_keywords_lower = [k.lower() for k in self._header_keywords]
+        # Zero-width, so every start position is found, including overlaps
+        self._header_start_re = re.compile(
+            rf"(?=(?:{'|'.join(self._header_keywords)}))", re.IGNORECASE
+        )
 
     def normalize(self, content: str) -> str:
         """Normalize content by removing HTML, cleaning email headers, etc."""
@@ -143,46 +186,102 @@ class ContentNormalizer:
     def _remove_html_tags(self, content: str) -> str:
         """Remove HTML tags from content"""
         # Remove script and style tags and their content
-        content = re.sub(
-            r"<script[^>]*>.*?</script>", "", content, flags=re.DOTALL | re.IGNORECASE
-        )
-        content = re.sub(
-            r"<style[^>]*>.*?</style>", "", content, flags=re.DOTALL | re.IGNORECASE
-        )
+        content = _SCRIPT_RE.sub("", content)
+        content = _STYLE_RE.sub("", content)
 
         # Remove HTML comments
-        content = re.sub(r"<!--.*?-->", "", content, flags=re.DOTALL)
+        content = _COMMENT_RE.sub("", content)
 
-        # Remove HTML tags
-        for tag in self.html_tags:
-            # Remove opening and closing tags
-            content = re.sub(rf"<{tag}[^>]*>", "", content, flags=re.IGNORECASE)
-            content = re.sub(rf"</{tag}[^>]*>", "", content, flags=re.IGNORECASE)
+        if "<" not in content:
+            return content
+        if self.fast_path and not _NESTED_TAG_RE.search(content):
+            # Every "<" closes before the next one opens, so each tag is
+            # removed or kept on its own regardless of pass order
+            return self._tag_re.sub("", content)
+
+        # Remove opening and closing tags, one tag name at a time
+        for pattern in self.compiled_tag_patterns:
+            content = pattern.sub("", content)
 
         return content
 
     def _clean_email_headers(self, content: str) -> str:
         """Clean email headers from content"""
+        if self.fast_path:
+            cleaned = self._clean_email_headers_single_pass(content)
+            if cleaned is not None:
+                return cleaned
+
         for pattern in self.compiled_patterns:
             content = pattern.sub("", content)
         return content
 
+    def _clean_email_headers_single_pass(self, content: str) -> Optional[str]:
+        """Strip header lines in one pass, or None if pass order could matter
+
+        The per-header patterns are unanchored and each removes through the
+        end of the line, joining what precedes it to the next line. With at
+        most one header keyword per line, and no keyword formed across a
+        join, every pattern removes the same text in any order.
+        """
+        starts = self._find_header_starts(content)
+        pieces = []
+        last = 0
+        previous_line: Optional[int] = None
+        for start in starts:
+            line_start = content.rfind("\n", 0, start)
+            if line_start == previous_line:
+                return None
+            previous_line = line_start
+
+            line_end = content.find("\n", start)
+            if line_end != -1:
+                pieces.append(content[last:start])
+                last = line_end + 1
+
+        if not pieces:
+            return content
+        pieces.append(content[last:])
+        cleaned = "".join(pieces)
+
+        # A keyword left on a complete line was formed by joining two lines
+        remaining = self._find_header_starts(cleaned)
+        if remaining and cleaned.find("\n", remaining[0]) != -1:
+            return None
+        return cleaned
+
+    def _find_header_starts(self, content: str) -> List[int]:
+        """Sorted start positions of every (possibly overlapping) header keyword"""
+        if not content.isascii() and any(
+            char in content for char in _IGNORECASE_ONLY_CHARS
+        ):
+            return [m.start() for m in self._header_start_re.finditer(content)]
+
+        # Case-insensitive substring search without the regex engine
+        lowered = content.lower()
+        starts = set()
+        for keyword in self._header_keywords_lower:
+            position = lowered.find(keyword)
+            while position != -1:
+                starts.add(position)
+                position = lowered.find(keyword, position + 1)
+        return sorted(starts)
+
     def _clean_whitespace(self, content: str) -> str:
         """Clean up whitespace in content"""
         # Replace multiple spaces with single space
-        content = re.sub(r" +", " ", content)
+        content = _SPACES_RE.sub(" ", content)
 
         # Replace multiple tabs with single space
-        content = re.sub(r"\t+", " ", content)
+        if "\t" in content:
+            content = _TABS_RE.sub(" ", content)
 
         return content
 
     def _remove_excessive_newlines(self, content: str) -> str:
         """Remove excessive newlines from content"""
         # Replace multiple newlines with double newline
-        content = re.sub(r"\n{3,}", "\n\n", content)
-
-        return content
+        return _NEWLINES_RE.sub("\n\n", content)
 
     def normalize_html(self, html_content: str) -> str:
         """Normalize HTML content specifically"""
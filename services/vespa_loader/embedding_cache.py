@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Content-hash embedding cache
+
+Embeddings are keyed by (model name, sha256 of the normalized content), so a
+document that is re-sent unchanged (backfills, re-syncs, update events) is
+never encoded twice. Lookups go through a bounded in-memory LRU first and an
+optional shared Redis tier second; Redis hits are promoted into memory.
+
+Vectors are stored as float32 bytes, which is what the model produces, so
+cached embeddings are identical to freshly encoded ones.
+"""
+
+import hashlib
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from services.common.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+try:
+    import redis.asyncio as redis_asyncio
+
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+
+
+class EmbeddingCache:
+    """Two-tier (memory LRU + optional Redis) cache of embeddings"""
+
+    def __init__(
+        self,
+        model_name: str,
+        max_entries: int = 20000,
+        redis_url: Optional[str] = None,
+        redis_ttl_seconds: int = 30 * 24 * 3600,
+        key_prefix: str = "embedding",
+    ) -> None:
+        self.model_name = model_name
+        self.max_entries = max_entries
+        self.redis_ttl_seconds = redis_ttl_seconds
+        self.key_prefix = key_prefix
+        self._memory: "OrderedDict[str, bytes]" = OrderedDict()
+        self._redis: Optional[Any] = None
+        self._stats = {
+            "memory_hits": 0,
+            "redis_hits": 0,
+            "misses": 0,
+            "stores": 0,
+            "redis_errors": 0,
+        }
+
+        if redis_url:
+            if REDIS_AVAILABLE:
+                self._redis = redis_asyncio.from_url(
+                    redis_url,
+                    socket_timeout=2.0,
+                    socket_connect_timeout=2.0,
+                )
+            else:
+                logger.warning(
+                    "Redis embedding cache requested but redis is not installed. "
+                    "Install with: pip install redis"
+                )
+
+    @staticmethod
+    def content_hash(content: str) -> str:
+        """sha256 hex digest of the normalized content"""
+        return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+    def _key(self, content: str) -> str:
+        return f"{self.key_prefix}:{self.model_name}:{self.content_hash(content)}"
+
+    @staticmethod
+    def _encode(embedding: Sequence[float]) -> bytes:
+        return np.asarray(embedding, dtype=np.float32).tobytes()
+
+    @staticmethod
+    def _decode(data: bytes) -> List[float]:
+        return np.frombuffer(data, dtype=np.float32).tolist()
+
+    def _remember(self, key: str, data: bytes) -> None:
+        if self.max_entries <= 0:
+            return
+        self._memory[key] = data
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    async def get_many(self, contents: Sequence[str]) -> List[Optional[List[float]]]:
+        """
+        Look up embeddings for several contents
+
+        Returns:
+            One entry per content, in order: the cached embedding or None
+        """
+        keys = [self._key(content) for content in contents]
+        results: List[Optional[List[float]]] = [None] * len(keys)
+        redis_positions = []
+
+        for position, key in enumerate(keys):
+            data = self._memory.get(key)
+            if data is not None:
+                self._memory.move_to_end(key)
+                results[position] = self._decode(data)
+                self._stats["memory_hits"] += 1
+            else:
+                redis_positions.append(position)
+
+        if redis_positions and self._redis is not None:
+            try:
+                values = await self._redis.mget([keys[p] for p in redis_positions])
+            except Exception as e:
+                logger.warning(f"Embedding cache Redis lookup failed: {e}")
+                self._stats["redis_errors"] += 1
+                values = [None] * len(redis_positions)
+            for position, data in zip(redis_positions, values):
+                if data is not None:
+                    self._remember(keys[position], data)
+                    results[position] = self._decode(data)
+                    self._stats["redis_hits"] += 1
+
+        self._stats["misses"] += sum(1 for result in results if result is None)
+        return results
+
+    async def set_many(
+        self, contents: Sequence[str], embeddings: Sequence[Sequence[float]]
+    ) -> None:
+        """Store freshly computed embeddings in both tiers"""
+        if not contents:
+            return
+        items = {
+            self._key(content): self._encode(embedding)
+            for content, embedding in zip(contents, embeddings)
+        }
+        for key, data in items.items():
+            self._remember(key, data)
+        self._stats["stores"] += len(items)
+
+        if self._redis is not None:
+            try:
+                async with self._redis.pipeline(transaction=False) as pipe:
+                    for key, data in items.items():
+                        pipe.set(key, data, ex=self.redis_ttl_seconds)
+                    await pipe.execute()
+            except Exception as e:
+                logger.warning(f"Embedding cache Redis store failed: {e}")
+                self._stats["redis_errors"] += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and tier sizes"""
+        hits = self._stats["memory_hits"] + self._stats["redis_hits"]
+        lookups = hits + self._stats["misses"]
+        return {
+            **self._stats,
+            "hit_rate": hits / lookups if lookups else 0.0,
+            "memory_entries": len(self._memory),
+            "max_entries": self.max_entries,
+            "redis_enabled": self._redis is not None,
+        }
+
+    async def close(self) -> None:
+        if self._redis is not None:
+            await self._redis.aclose()
+            self._redis = None
@@ -3,24 +3,94 @@
 Embedding generator for semantic search capabilities
 """
 
-from typing import Any, List, Optional
+import asyncio
+import multiprocessing
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Union
 
 import numpy as np
 
 from services.common.logging_config import get_logger
+from services.vespa_loader.embedding_cache import EmbeddingCache
 
 logger = get_logger(__name__)
 
+EXECUTOR_MODES = ("thread", "process", "inline")
+
+# Model loaded once per worker process in "process" executor mode
+_worker_model: Optional[Any] = None
+
+
+def _init_worker_model(model_name: str) -> None:
+    """Process pool initializer: load the model into the worker"""
+    global _worker_model
+    from sentence_transformers import SentenceTransformer
+
+    _worker_model = SentenceTransformer(model_name)
+
+
+def _worker_ready() -> bool:
+    return _worker_model is not None
+
+
+def _encode_in_worker(texts: Union[str, List[str]]) -> Any:
+    if _worker_model is None:
+        raise RuntimeError("Model not initialized in worker process")
+    return _worker_model.encode(texts)
+
 
 class EmbeddingGenerator:
-    """Generates embeddings for semantic search"""
+    """Generates embeddings for semantic search
+
+    ``model.encode`` is CPU-bound, so it runs in an executor instead of on the
+    event loop:
+
+    - ``thread``: a thread pool sharing the in-process model (torch releases
+      the GIL during inference)
+    - ``process``: a process pool with the model preloaded in every worker,
+      for scaling encoding across cores
+    - ``inline``: encode on the calling thread (previous behaviour)
+
+    At most ``max_pending_batches`` encodes are queued or running at once;
+    further callers wait, which applies backpressure to ingestion.
+
+    With a ``cache``, only texts whose content hash has not been seen before
+    are encoded.
+    """
 
     def __init__(
-        self, model_name: str = "sentence-transformers/all-MiniLM-L6-v2"
+        self,
+        model_name: str = "sentence-transformers/all-MiniLM-L6-v2",
+        executor_mode: str = "thread",
+        max_workers: int = 1,
+        max_pending_batches: int = 8,
+        cache: Optional[EmbeddingCache] = None,
     ) -> None:
+        if executor_mode not in EXECUTOR_MODES:
+            raise ValueError(
+                f"executor_mode must be one of {EXECUTOR_MODES}, got {executor_mode}"
+            )
         self.model_name = model_name
+        self.executor_mode = executor_mode
+        self.max_workers = max(1, max_workers)
         self.model: Optional[Any] = None
         self.tokenizer: Optional[Any] = None
+        self._executor: Optional[Executor] = None
+        self._closed = False
+        self.cache = cache
+        self._pending = asyncio.Semaphore(max(1, max_pending_batches))
+        self._in_flight = 0
+        self._metrics: Dict[str, float] = {
+            "batches": 0,
+            "texts": 0,
+            "errors": 0,
+            "encode_seconds_total": 0.0,
+            "encode_seconds_max": 0.0,
+            "queue_wait_seconds_total": 0.0,
+            "last_batch_size": 0,
+            "last_batch_seconds": 0.0,
+        }
         self._initialize_model()
 
     def _initialize_model(self) -> None:
@@ -28,6 +98,22 @@ class EmbeddingGenerator:
         try:
             logger.info(f"Initializing embedding model: {self.model_name}")
 
+            if self.executor_mode == "process":
+                # Workers load their own copy of the model on start-up
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_worker_model,
+                    initargs=(self.model_name,),
+                )
+                # Start the workers now so the model is preloaded before use
+                for _ in range(self.max_workers):
+                    self._executor.submit(_worker_ready)
+                logger.info(
+                    f"Embedding process pool started with {self.max_workers} workers"
+                )
+                return
+
             # Import and load the actual model
             from sentence_transformers import SentenceTransformer
 
@@ -39,42 +125,138 @@ class EmbeddingGenerator:
             logger.error(f"Failed to initialize embedding model: {e}")
             raise RuntimeError(f"Failed to initialize embedding model: {e}")
 
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="embedding"
+            )
+        return self._executor
+
+    async def _encode(self, texts: Union[str, List[str]]) -> Any:
+        """Run model.encode in the configured executor and record timings"""
+        if self._closed:
+            raise RuntimeError("Embedding generator is closed")
+        if self.executor_mode != "process" and not self.model:
+            raise RuntimeError("Model not initialized")
+
+        batch_size = 1 if isinstance(texts, str) else len(texts)
+        queued_at = time.perf_counter()
+        async with self._pending:
+            started = time.perf_counter()
+            self._in_flight += 1
+            try:
+                loop = asyncio.get_running_loop()
+                if self.executor_mode == "inline":
+                    result = self.model.encode(texts)  # type: ignore[union-attr]
+                elif self.executor_mode == "process":
+                    result = await loop.run_in_executor(
+                        self._get_executor(), _encode_in_worker, texts
+                    )
+                else:
+                    result = await loop.run_in_executor(
+                        self._get_executor(),
+                        self.model.encode,  # type: ignore[union-attr]
+                        texts,
+                    )
+            except Exception:
+                self._metrics["errors"] += 1
+                raise
+            finally:
+                self._in_flight -= 1
+
+        elapsed = time.perf_counter() - started
+        self._record_batch(batch_size, started - queued_at, elapsed)
+        return result
+
+    def _record_batch(self, size: int, queue_wait: float, elapsed: float) -> None:
+        metrics = self._metrics
+        metrics["batches"] += 1
+        metrics["texts"] += size
+        metrics["encode_seconds_total"] += elapsed
+        metrics["encode_seconds_max"] = max(metrics["encode_seconds_max"], elapsed)
+        metrics["queue_wait_seconds_total"] += queue_wait
+        metrics["last_batch_size"] = size
+        metrics["last_batch_seconds"] = elapsed
+        logger.debug(
+            f"Encoded batch of {size} texts in {elapsed * 1000:.1f}ms "
+            f"(queued {queue_wait * 1000:.1f}ms)"
+        )
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Get encode timing metrics"""
+        metrics: Dict[str, Any] = dict(self._metrics)
+        batches = metrics.get("batches", 0)
+        metrics["avg_batch_seconds"] = (
+            metrics["encode_seconds_total"] / batches if batches else 0.0
+        )
+        metrics["in_flight"] = self._in_flight
+        metrics["executor_mode"] = self.executor_mode
+        if self.cache is not None:
+            metrics["cache"] = self.cache.get_stats()
+        return metrics
+
+    async def close(self) -> None:
+        """Stop accepting work and wait for in-flight encodes to finish"""
+        self._closed = True
+        if self._executor is not None:
+            executor, self._executor = self._executor, None
+            await asyncio.to_thread(executor.shutdown, True)
+            logger.info("Embedding executor shut down")
+        if self.cache is not None:
+            await self.cache.close()
+
     async def generate_embedding(self, text: str) -> List[float]:
         """Generate embedding for the given text"""
         if not text:
             # Return zero vector for empty text
             return [0.0] * 384
 
-        try:
-            if self.model:
-                # Use the actual model to generate embeddings
-                embedding = self.model.encode(text)
-                return embedding.tolist()
-            else:
-                raise RuntimeError("Model not initialized")
+        if self.cache is not None:
+            cached = (await self.cache.get_many([text]))[0]
+            if cached is not None:
+                return cached
 
+        try:
+            embedding = (await self._encode(text)).tolist()
         except Exception as e:
             logger.error(f"Error generating embedding: {e}")
             # Return zero vector on error
             return [0.0] * 384
 
+        if self.cache is not None:
+            await self.cache.set_many([text], [embedding])
+        return embedding
+
     async def generate_batch_embeddings(self, texts: List[str]) -> List[List[float]]:
         """Generate embeddings for multiple texts in batch"""
         if not texts:
             return []
 
-        try:
-            if self.model:
-                # Use the actual model for batch processing
-                embeddings = self.model.encode(texts)
+        if self.cache is None:
+            try:
+                embeddings = await self._encode(texts)
                 return embeddings.tolist()
-            else:
-                raise RuntimeError("Model not initialized")
 
-        except Exception as e:
-            logger.error(f"Error generating batch embeddings: {e}")
-            # Return zero vectors on error
-            return [[0.0] * 384] * len(texts)
+            except Exception as e:
+                logger.error(f"Error generating batch embeddings: {e}")
+                # Return zero vectors on error
+                return [[0.0] * 384] * len(texts)
+
+        results = await self.cache.get_many(texts)
+        missing = [i for i, embedding in enumerate(results) if embedding is None]
+        if missing:
+            # Encode each distinct uncached text once
+            unique = list(dict.fromkeys(texts[i] for i in missing))
+            try:
+                encoded = dict(zip(unique, (await self._encode(unique)).tolist()))
+            except Exception as e:
+                logger.error(f"Error generating batch embeddings: {e}")
+                encoded = {}
+            else:
+                await self.cache.set_many(list(encoded), list(encoded.values()))
+            for i in missing:
+                results[i] = encoded.get(texts[i], [0.0] * 384)
+        return results  # type: ignore[return-value]
 
     def get_embedding_dimension(self) -> int:
         """Get the dimension of the embeddings"""
@@ -82,6 +264,8 @@ class EmbeddingGenerator:
 
     def is_model_loaded(self) -> bool:
         """Check if the model is loaded and ready"""
+        if self.executor_mode == "process":
+            return self._executor is not None and not self._closed
         return self.model is not None
 
     def get_model_info(self) -> dict:
@@ -90,7 +274,8 @@ class EmbeddingGenerator:
             "model_name": self.model_name,
             "is_loaded": self.is_model_loaded(),
             "dimension": self.get_embedding_dimension(),
-            "type": "real" if self.model is not None else "none",
+            "type": "real" if self.is_model_loaded() else "none",
+            "executor_mode": self.executor_mode,
         }
 
     async def similarity(
@@ -6,7 +6,8 @@ This module contains the core document ingestion logic that can be used
 by both the HTTP API endpoints and the Pub/Sub consumer.
 """
 
-from typing import Any, Dict
+import logging
+from typing import Any, Dict, List, Optional, Sequence, Union
 
 from vespa_loader.content_normalizer import ContentNormalizer
 from vespa_loader.embeddings import EmbeddingGenerator
@@ -19,6 +20,131 @@ from services.common.http_errors import (
     ValidationError,
 )
 
+logger = logging.getLogger(__name__)
+
+
+def _prepare_vespa_document(
+    document_data: VespaDocumentType,
+    content_normalizer: Optional[ContentNormalizer],
+) -> Dict[str, Any]:
+    """Validate a document and convert it to a normalized Vespa dict."""
+    if not document_data.id or not document_data.user_id:
+        raise ValidationError(
+            "Document ID and user_id are required",
+            field="document_data",
+            value=document_data,
+        )
+
+    # Document is already in Vespa format, use it directly
+    vespa_document = document_data.to_dict()
+
+    # Normalize content
+    if vespa_document.get("content") and content_normalizer:
+        vespa_document["content"] = content_normalizer.normalize(
+            vespa_document["content"]
+        )
+    return vespa_document
+
+
+async def ingest_documents_batch_service(
+    documents: Sequence[VespaDocumentType],
+    vespa_client: VespaClient,
+    content_normalizer: Optional[ContentNormalizer],
+    embedding_generator: Optional[EmbeddingGenerator],
+) -> List[Union[DocumentIngestionResult, Exception]]:
+    """Ingest several documents with a single batched embedding call
+
+    Documents are validated and normalized individually, all non-empty
+    contents are embedded with one ``generate_batch_embeddings`` call, and
+    the documents are then fed with ``VespaClient.feed_documents``, which
+    bounds the writes in flight and retries overloaded ones. A failure only
+    affects the document it belongs to.
+
+    Args:
+        documents: Documents to ingest
+        vespa_client: Initialized Vespa client instance
+        content_normalizer: Initialized content normalizer instance
+        embedding_generator: Initialized embedding generator instance
+
+    Returns:
+        One entry per input document, in order: a DocumentIngestionResult on
+        success, or the ValidationError / ServiceError that document raised
+    """
+    outcomes: List[Union[Dict[str, Any], Exception]] = []
+    for document_data in documents:
+        try:
+            outcomes.append(_prepare_vespa_document(document_data, content_normalizer))
+        except ValidationError as e:
+            outcomes.append(e)
+        except Exception as e:
+            logger.error(f"Error preparing document {document_data.id}: {e}")
+            outcomes.append(
+                ServiceError(
+                    "Document ingestion failed",
+                    code=ErrorCode.SERVICE_ERROR,
+                    details={"error": str(e)},
+                )
+            )
+
+    # Generate embeddings for every document with content in one model call
+    if embedding_generator:
+        to_embed = [
+            vespa_document
+            for vespa_document in outcomes
+            if isinstance(vespa_document, dict) and vespa_document.get("content")
+        ]
+        if to_embed:
+            try:
+                embeddings = await embedding_generator.generate_batch_embeddings(
+                    [vespa_document["content"] for vespa_document in to_embed]
+                )
+                for vespa_document, embedding in zip(to_embed, embeddings):
+                    vespa_document["embedding"] = embedding
+            except Exception as e:
+                # Log warning but continue without embeddings
+                logger.warning(f"Failed to generate batch embeddings: {e}")
+
+    # Feed the prepared documents through the client's bounded, retrying feed
+    prepared = [
+        (document_data, outcome)
+        for document_data, outcome in zip(documents, outcomes)
+        if isinstance(outcome, dict)
+    ]
+    feed_results = (
+        await vespa_client.feed_documents(
+            [vespa_document for _, vespa_document in prepared]
+        )
+        if prepared
+        else []
+    )
+    indexed: List[Union[DocumentIngestionResult, Exception]] = []
+    for (document_data, _), feed_result in zip(prepared, feed_results):
+        if feed_result.success:
+            indexed.append(
+                DocumentIngestionResult(
+                    status="success",
+                    document_id=document_data.id,
+                    vespa_result=feed_result.result,
+                )
+            )
+        else:
+            logger.error(
+                f"Error ingesting document {document_data.id}: {feed_result.error}"
+            )
+            indexed.append(
+                ServiceError(
+                    "Document ingestion failed",
+                    code=ErrorCode.SERVICE_ERROR,
+                    details={"error": feed_result.error},
+                )
+            )
+
+    indexed_iter = iter(indexed)
+    return [
+        outcome if not isinstance(outcome, dict) else next(indexed_iter)
+        for outcome in outcomes
+    ]
+
 
 async def ingest_document_service(
     document_data: VespaDocumentType,
@@ -46,22 +172,7 @@ async def ingest_document_service(
     """
 
     try:
-        # Validate document data
-        if not document_data.id or not document_data.user_id:
-            raise ValidationError(
-                "Document ID and user_id are required",
-                field="document_data",
-                value=document_data,
-            )
-
-        # Document is already in Vespa format, use it directly
-        vespa_document = document_data.to_dict()
-
-        # Normalize content
-        if vespa_document.get("content") and content_normalizer:
-            vespa_document["content"] = content_normalizer.normalize(
-                vespa_document["content"]
-            )
+        vespa_document = _prepare_vespa_document(document_data, content_normalizer)
 
         # Generate embeddings if content exists
         content = vespa_document.get("content")
@@ -71,9 +182,6 @@ async def ingest_document_service(
                 vespa_document["embedding"] = embedding
             except Exception as e:
                 # Log warning but continue without embedding
-                import logging
-
-                logger = logging.getLogger(__name__)
                 logger.warning(f"Failed to generate embedding: {e}")
 
         # Index document in Vespa
@@ -89,9 +197,6 @@ async def ingest_document_service(
         # Re-raise ValidationError to preserve the specific error details
         raise
     except Exception as e:
-        import logging
-
-        logger = logging.getLogger(__name__)
         logger.error(f"Error ingesting document: {e}")
         raise ServiceError(
             "Document ingestion failed",
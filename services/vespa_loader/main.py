@@ -145,6 +145,7 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
 
     # Now import modules that use logging after logging is configured
     from services.vespa_loader.content_normalizer import ContentNormalizer
+    from services.vespa_loader.embedding_cache import EmbeddingCache
     from services.vespa_loader.embeddings import EmbeddingGenerator
     from services.vespa_loader.pubsub_consumer import PubSubConsumer
     from services.vespa_loader.vespa_client import VespaClient
@@ -156,9 +157,29 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     logger.info("Starting Vespa Loader Service...")
 
     # Initialize components
-    vespa_client = VespaClient(settings.vespa_endpoint)
+    vespa_client = VespaClient(
+        settings.vespa_endpoint,
+        max_connections=settings.vespa_max_connections,
+        feed_concurrency=settings.vespa_feed_concurrency,
+        max_retries=settings.max_retries,
+        retry_delay_seconds=settings.retry_delay_seconds,
+    )
     content_normalizer = ContentNormalizer()
-    embedding_generator = EmbeddingGenerator(settings.embedding_model)
+    embedding_cache = None
+    if settings.embedding_cache_enabled:
+        embedding_cache = EmbeddingCache(
+            settings.embedding_model,
+            max_entries=settings.embedding_cache_max_entries,
+            redis_url=settings.embedding_cache_redis_url,
+            redis_ttl_seconds=settings.embedding_cache_ttl_seconds,
+        )
+    embedding_generator = EmbeddingGenerator(
+        settings.embedding_model,
+        executor_mode=settings.embedding_executor,
+        max_workers=settings.embedding_workers,
+        max_pending_batches=settings.embedding_max_pending_batches,
+        cache=embedding_cache,
+    )
 
     # Initialize rate limiter with settings
     global rate_limiter
@@ -205,6 +226,9 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
         await vespa_client.close()
     if pubsub_consumer:
         await pubsub_consumer.stop()
+    if embedding_generator:
+        # After the consumer so in-flight batches can finish encoding
+        await embedding_generator.close()
     logger.info("Vespa Loader Service shutdown complete")
 
     # Log service shutdown
@@ -286,6 +310,10 @@ async def health_check() -> Dict[str, Any]:
         health_status["components"][name] = {
             "status": "healthy" if component else "not_initialized"
         }
+    if embedding_generator:
+        health_status["components"]["embedding_generator"][
+            "metrics"
+        ] = embedding_generator.get_metrics()
 
     # Determine overall status
     if any(
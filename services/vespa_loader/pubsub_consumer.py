@@ -11,13 +11,16 @@ import asyncio
 import json
 from abc import ABC, abstractmethod
 from datetime import datetime, timezone
-from typing import Any, Callable, Dict, List, Optional, Union
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 
 from services.api.v1.vespa.vespa_types import VespaDocumentType
 from services.common.config.subscription_config import SubscriptionConfig
 from services.common.logging_config import get_logger
 from services.vespa_loader.document_factory import process_message
-from services.vespa_loader.ingest_service import ingest_document_service
+from services.vespa_loader.ingest_service import (
+    ingest_document_service,
+    ingest_documents_batch_service,
+)
 from services.vespa_loader.settings import Settings
 
 # PubSub types
@@ -86,6 +89,13 @@ class PubSubConsumer:
         # Event loop reference for cross-thread communication
         self.loop: Optional[asyncio.AbstractEventLoop] = None
 
+        # Micro-batching stage between the subscriber callbacks and ingestion
+        self._batch_queue: Optional[asyncio.Queue[Tuple[VespaDocumentType, Any]]] = None
+        self._batch_task: Optional[asyncio.Task] = None
+        self._batch_tasks: set[asyncio.Task] = set()
+        self._batch_semaphore: Optional[asyncio.Semaphore] = None
+        self.batch_count = 0
+
     async def start(self) -> bool:
         """Start the Pub/Sub consumer"""
         if not PUBSUB_AVAILABLE:
@@ -115,6 +125,14 @@ class PubSubConsumer:
             self.loop = asyncio.get_running_loop()
             logger.info("Event loop reference stored")
 
+            # Start the micro-batching stage before any message can arrive
+            if self.settings.ingest_batch_size > 1:
+                self._batch_queue = asyncio.Queue()
+                self._batch_semaphore = asyncio.Semaphore(
+                    self.settings.ingest_max_concurrent_batches
+                )
+                self._batch_task = asyncio.create_task(self._run_ingest_batches())
+
             # Create subscriptions if they don't exist
             await self._ensure_subscriptions()
 
@@ -146,6 +164,19 @@ class PubSubConsumer:
                     f"Error cancelling subscription for topic {topic_name}: {e}"
                 )
 
+        # Stop batching; unacked messages are redelivered by Pub/Sub
+        if self._batch_task:
+            self._batch_task.cancel()
+            await asyncio.gather(self._batch_task, return_exceptions=True)
+            self._batch_task = None
+        if self._batch_tasks:
+            await asyncio.gather(*self._batch_tasks, return_exceptions=True)
+        if self._batch_queue:
+            # Nack what never made it into a batch so it is redelivered promptly
+            while not self._batch_queue.empty():
+                _, message = self._batch_queue.get_nowait()
+                message.nack()
+
         # Close subscriber client
         if self.subscriber:
             self.subscriber.close()
@@ -291,8 +322,12 @@ class PubSubConsumer:
                         f"Processed message data: message_id={message.message_id}, user_id={vespa_document.user_id}, doc_id={vespa_document.id}"
                     )
 
-                    # Process message immediately - no batching needed
-                    if self.loop:
+                    if self.loop and self._batch_queue is not None:
+                        # Hand the document to the micro-batching stage
+                        self.loop.call_soon_threadsafe(
+                            self._batch_queue.put_nowait, (vespa_document, message)
+                        )
+                    elif self.loop:
                         # Schedule immediate processing in the event loop
                         asyncio.run_coroutine_threadsafe(
                             self._process_message_immediate(vespa_document, message),
@@ -348,12 +383,82 @@ class PubSubConsumer:
             message.nack()
             self.error_count += 1
 
+    async def _run_ingest_batches(self) -> None:
+        """Collect queued messages into batches and ingest each batch"""
+        assert self._batch_queue is not None and self._batch_semaphore is not None
+        while True:
+            batch = await self._collect_batch(
+                self._batch_queue,
+                self.settings.ingest_batch_size,
+                self.settings.ingest_batch_max_wait_ms / 1000,
+            )
+            # Bound the number of batches being embedded/indexed at once
+            await self._batch_semaphore.acquire()
+            task = asyncio.create_task(self._process_message_batch(batch))
+            self._batch_tasks.add(task)
+            task.add_done_callback(self._on_batch_done)
+
+    def _on_batch_done(self, task: asyncio.Task) -> None:
+        self._batch_tasks.discard(task)
+        if self._batch_semaphore is not None:
+            self._batch_semaphore.release()
+
+    @staticmethod
+    async def _collect_batch(
+        queue: "asyncio.Queue[Tuple[VespaDocumentType, Any]]",
+        max_size: int,
+        max_wait: float,
+    ) -> List[Tuple[VespaDocumentType, Any]]:
+        """Wait for one item, then gather up to max_size items or max_wait seconds"""
+        batch = [await queue.get()]
+        deadline = asyncio.get_running_loop().time() + max_wait
+        while len(batch) < max_size:
+            remaining = deadline - asyncio.get_running_loop().time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _process_message_batch(
+        self, batch: List[Tuple[VespaDocumentType, Any]]
+    ) -> None:
+        """Ingest a batch of documents, then ack or nack each message"""
+        documents = [vespa_document for vespa_document, _ in batch]
+        logger.info(f"Processing batch of {len(batch)} documents")
+        try:
+            results = await ingest_documents_batch_service(
+                documents,
+                self.vespa_client,
+                self.content_normalizer,
+                self.embedding_generator,
+            )
+        except Exception as e:
+            logger.error(f"Error processing batch of {len(batch)} messages: {e}")
+            results = [e] * len(batch)
+
+        self.batch_count += 1
+        for (vespa_document, message), result in zip(batch, results):
+            if isinstance(result, Exception):
+                logger.error(f"Error processing message {message.message_id}: {result}")
+                message.nack()
+                self.error_count += 1
+            else:
+                logger.debug(
+                    f"Successfully ingested document {vespa_document.id} from message {message.message_id}"
+                )
+                message.ack()
+                self.processed_count += 1
+
     def get_stats(self) -> Dict[str, Any]:
         """Get consumer statistics"""
         stats = {
             "running": self.running,
             "processed_count": self.processed_count,
             "error_count": self.error_count,
+            "batch_count": self.batch_count,
             "subscriptions": list(self.subscriptions.keys()),
             "subscription_details": {
                 topic: {
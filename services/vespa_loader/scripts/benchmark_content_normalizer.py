@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Benchmark ContentNormalizer on synthetic HTML emails.
+
+Compares the single-pass normalizer with the original multi-pass one
+(``fast_path=False``) on generated newsletter-style HTML between 10KB and
+1MB, and checks that both produce identical output.
+
+Usage:
+    python -m services.vespa_loader.scripts.benchmark_content_normalizer
+"""
+
+import argparse
+import random
+import time
+
+from services.vespa_loader.content_normalizer import ContentNormalizer
+
+_BLOCKS = [
+    '<table width="100%" cellpadding="0" style="max-width:600px"><tr>'
+    '<td class="content">{text}</td></tr></table>\n',
+    '<div class="row"><p style="margin:0">{text} &amp; more</p></div>\n',
+    '<a href="https://example.com/{word}?utm_source=news">{text}</a><br/>\n',
+    "<ul><li><strong>{word}</strong> {text}</li><li><em>{word}</em></li></ul>\n",
+    '<!-- tracking {word} --><img src="https://t.example.com/{word}.gif">\n',
+    '<span style="font-size:14px">{text}</span>&nbsp;&nbsp;\t\t\n\n\n',
+]
+_WORDS = "quarterly update meeting invoice launch report team product".split()
+
+
+def _make_email(size: int, rng: random.Random) -> str:
+    parts = [
+        "<html><head><style>body{font-family:Arial}</style></head><body>\n",
+        "<script>var x = 1;</script>\n",
+    ]
+    length = sum(len(part) for part in parts)
+    while length < size:
+        text = " ".join(rng.choice(_WORDS) for _ in range(rng.randint(5, 30)))
+        block = rng.choice(_BLOCKS).format(text=text, word=rng.choice(_WORDS))
+        parts.append(block)
+        length += len(block)
+    parts.append("</body></html>")
+    return "".join(parts)
+
+
+def _time(normalizer: ContentNormalizer, content: str, rounds: int) -> float:
+    started = time.perf_counter()
+    for _ in range(rounds):
+        normalizer.normalize(content)
+    return (time.perf_counter() - started) / rounds
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000]
+    )
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    fast = ContentNormalizer()
+    legacy = ContentNormalizer(fast_path=False)
+
+    for size in args.sizes:
+        content = _make_email(size, rng)
+        if fast.normalize(content) != legacy.normalize(content):
+            raise SystemExit(f"Output mismatch for {size} byte email")
+        before = _time(legacy, content, args.rounds)
+        after = _time(fast, content, args.rounds)
+        print(
+            f"{len(content) / 1000:>7,.0f}KB: multi-pass {before * 1000:>8.1f}ms  "
+            f"single-pass {after * 1000:>8.1f}ms  ({before / after:.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Benchmark document chunking on large (1MB+) documents.
+
+Measures section extraction with the previous per-line loop over twelve
+uncompiled patterns against the compiled header matcher, and compares
+``chunk_document`` with the streaming ``iter_chunks`` in time and peak
+traced memory.
+
+Usage:
+    python -m services.vespa_loader.scripts.benchmark_document_chunking
+"""
+
+import argparse
+import logging
+import random
+import re
+import time
+import tracemalloc
+from typing import Callable, List, Tuple
+
+from services.vespa_loader.services.document_chunking_service import (
+    DocumentChunkingService,
+)
+
+_LEGACY_PATTERNS = [
+    r"^#+\s+(.+)$",
+    r"^[A-Z][A-Z\s]+\n[-=]+\n",
+    r"^\d+\.\s+(.+)$",
+    r"^[A-Z][^.!?]*[.!?]?\n",
+    r"^From:.*$",
+    r"^To:.*$",
+    r"^Subject:.*$",
+    r"^Date:.*$",
+    r"^Sent:.*$",
+    r"^On .* wrote:$",
+    r"^>.*$",
+    r"^---.*$",
+]
+_WORDS = "project budget review the quarterly plan team update launch risk".split()
+
+
+def _legacy_extract_sections(content: str) -> List[Tuple[str, str]]:
+    sections = []
+    current_section: List[str] = []
+    current_title = "Introduction"
+    for line in content.split("\n"):
+        if any(re.match(p, line) for p in _LEGACY_PATTERNS) and current_section:
+            sections.append((current_title, "\n".join(current_section)))
+            current_section = []
+            current_title = line.strip()
+        else:
+            current_section.append(line)
+    if current_section:
+        sections.append((current_title, "\n".join(current_section)))
+    return sections
+
+
+def _make_document(size: int, rng: random.Random) -> str:
+    lines = []
+    length = 0
+    section = 0
+    while length < size:
+        if rng.random() < 0.05:
+            section += 1
+            line = f"## Section {section}"
+        else:
+            line = " ".join(rng.choice(_WORDS) for _ in range(rng.randint(6, 20)))
+            line = line.capitalize() + "."
+        lines.append(line)
+        length += len(line) + 1
+    return "\n".join(lines)
+
+
+def _measure(func: Callable[[], object]) -> Tuple[float, float]:
+    """Wall time, then peak traced memory from a second (slower) run"""
+    started = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - started
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / 1024 / 1024
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000_000, 5_000_000])
+    args = parser.parse_args()
+
+    # Per-document log lines are not what is being measured
+    logging.disable(logging.WARNING)
+    service = DocumentChunkingService()
+    rng = random.Random(42)
+
+    for size in args.sizes:
+        content = _make_document(size, rng)
+        label = f"{len(content) / 1_000_000:.1f}MB"
+
+        started = time.perf_counter()
+        legacy = _legacy_extract_sections(content)
+        before = time.perf_counter() - started
+        started = time.perf_counter()
+        compiled = service._extract_sections(content, None)
+        after = time.perf_counter() - started
+        assert legacy == compiled
+        print(
+            f"{label} sections: per-pattern {before * 1000:>7.1f}ms  "
+            f"compiled {after * 1000:>7.1f}ms  ({before / after:.1f}x)"
+        )
+
+        full_time, full_peak = _measure(
+            lambda: service.chunk_document("bench", content, "word")
+        )
+        stream_time, stream_peak = _measure(
+            lambda: sum(1 for _ in service.iter_chunks("bench", content, "word"))
+        )
+        print(
+            f"{label} chunking: chunk_document {full_time:>6.2f}s "
+            f"{full_peak:>7.1f}MB peak  iter_chunks {stream_time:>6.2f}s "
+            f"{stream_peak:>7.1f}MB peak"
+        )
+        service.clear_cache()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Benchmark bulk Vespa feeding against a local stub server.
+
+The stub answers every document write after a fixed latency (simulating the
+Vespa round trip) and rejects a fraction of writes with 429 so retries are
+exercised. The baseline feeds documents one at a time like per-document
+``index_document`` calls; the bulk runs use ``feed_documents`` at increasing
+concurrency levels.
+
+Usage:
+    python -m services.vespa_loader.scripts.benchmark_vespa_feed [--docs N]
+"""
+
+import argparse
+import asyncio
+import random
+import time
+from typing import List
+
+from aiohttp import web
+
+from services.common.logging_config import setup_service_logging
+from services.vespa_loader.vespa_client import VespaClient
+
+
+async def _start_stub(latency: float, overload_rate: float) -> web.AppRunner:
+    async def handle(request: web.Request) -> web.Response:
+        await request.read()
+        await asyncio.sleep(latency)
+        if random.random() < overload_rate:
+            return web.Response(status=429, text="overloaded")
+        return web.json_response({"id": request.match_info["doc_id"]})
+
+    app = web.Application()
+    app.router.add_post(
+        "/document/v1/briefly/briefly_document/group/{user_id}/{doc_id}", handle
+    )
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, "127.0.0.1", 0).start()
+    return runner
+
+
+def _documents(count: int) -> List[dict]:
+    return [
+        {
+            "id": f"doc{i}",
+            "user_id": f"user{i % 10}@example.com",
+            "source_type": "email",
+            "provider": "gmail",
+            "title": f"Subject {i}",
+            "content": "lorem ipsum " * 200,
+            "embedding": [0.1] * 384,
+        }
+        for i in range(count)
+    ]
+
+
+async def _run(args: argparse.Namespace) -> None:
+    runner = await _start_stub(args.latency_ms / 1000, args.overload_rate)
+    endpoint = f"http://127.0.0.1:{runner.addresses[0][1]}"
+    documents = _documents(args.docs)
+
+    try:
+        client = VespaClient(endpoint, retry_delay_seconds=0.005)
+        started = time.perf_counter()
+        for document in documents[: args.baseline_docs]:
+            try:
+                await client.index_document(document)
+            except Exception:
+                pass
+        elapsed = time.perf_counter() - started
+        await client.close()
+        print(
+            f"sequential index_document: {args.baseline_docs / elapsed:>9,.0f} docs/s"
+        )
+
+        for concurrency in args.concurrency:
+            client = VespaClient(
+                endpoint,
+                max_connections=concurrency,
+                feed_concurrency=concurrency,
+                retry_delay_seconds=0.005,
+            )
+            started = time.perf_counter()
+            results = await client.feed_documents(documents)
+            elapsed = time.perf_counter() - started
+            await client.close()
+            failed = sum(1 for r in results if not r.success)
+            retries = sum(max(r.attempts - 1, 0) for r in results)
+            print(
+                f"feed_documents c={concurrency:<4}: {len(results) / elapsed:>9,.0f} "
+                f"docs/s  ({retries} retries, {failed} failed)"
+            )
+    finally:
+        await runner.cleanup()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--docs", type=int, default=2000)
+    parser.add_argument("--baseline-docs", type=int, default=200)
+    parser.add_argument("--latency-ms", type=float, default=5.0)
+    parser.add_argument("--overload-rate", type=float, default=0.02)
+    parser.add_argument(
+        "--concurrency", type=int, nargs="+", default=[1, 8, 32, 64, 128]
+    )
+    # Per-document log lines would dominate the measurement
+    setup_service_logging("benchmark", log_level="CRITICAL", log_format="text")
+    asyncio.run(_run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
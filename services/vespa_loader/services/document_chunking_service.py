@@ -5,11 +5,12 @@ This module has been moved from services/common/services/ to services/vespa_load
 to consolidate chunking functionality with the vespa_loader service.
 """
 
+import itertools
 import logging
 import re
 import time
 from datetime import datetime, timezone
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
 
 from services.api.v1.vespa.document_chunking import (
     ChunkingResult,
@@ -22,6 +23,45 @@ from services.api.v1.vespa.document_chunking import (
 
 logger = logging.getLogger(__name__)
 
+# Section header patterns, matched against one line at a time:
+#   markdown headers, numbered sections, email From/To/Subject/Date/Sent
+#   lines, "On ... wrote:" quote starts, quoted lines and "---" separators.
+# Underlined and sentence-style headers need a newline inside the match, so
+# they can never match a single line and are not included.
+_SECTION_HEADER_RE = re.compile(
+    r"#+\s+.+$"
+    r"|\d+\.\s+.+$"
+    r"|(?:From|To|Subject|Date|Sent):"
+    r"|On .* wrote:$"
+    r"|>"
+    r"|---"
+)
+_SECTION_HEADER_FIRST_CHARS = frozenset("#FTSDO>-")
+
+# Strategies that can be chunked section by section without the full text
+_STREAMING_STRATEGIES = (ChunkingStrategy.HYBRID, ChunkingStrategy.SECTION_BOUNDARIES)
+
+
+def _is_section_header(line: str) -> bool:
+    """Check whether a line starts a new section"""
+    # Cheap first-character dispatch; most lines are body text
+    first = line[:1]
+    if first not in _SECTION_HEADER_FIRST_CHARS and not first.isdecimal():
+        return False
+    return _SECTION_HEADER_RE.match(line) is not None
+
+
+def _iter_lines(content: str) -> Iterator[str]:
+    """Yield the same lines as ``content.split("\\n")`` without building a list"""
+    start = 0
+    while True:
+        end = content.find("\n", start)
+        if end == -1:
+            yield content[start:]
+            return
+        yield content[start:end]
+        start = end + 1
+
 
 class DocumentChunkingService:
     """Service for chunking large documents into searchable fragments."""
@@ -117,6 +157,128 @@ class DocumentChunkingService:
             logger.error(f"Error chunking document {document_id}: {e}")
             raise
 
+    def iter_chunks(
+        self,
+        document_id: str,
+        content: Union[str, Iterable[str]],
+        document_type: str,
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> Iterator[DocumentChunk]:
+        """Chunk a document lazily, yielding post-processed chunks in order.
+
+        ``content`` may be a string or an iterable of lines (e.g. an open
+        file). For section-based strategies (hybrid and section boundaries)
+        only the current section is held in memory, and offsets are the
+        actual positions in the document. Other strategies need the whole
+        text and fall back to ``chunk_document``. Streamed chunks are not
+        added to the chunk cache.
+        """
+        rules = self._get_chunking_rules(document_type)
+
+        if rules.strategy not in _STREAMING_STRATEGIES:
+            if not isinstance(content, str):
+                content = "\n".join(line.rstrip("\n") for line in content)
+            yield from self.chunk_document(
+                document_id, content, document_type, metadata
+            ).chunks
+            return
+
+        if isinstance(content, str):
+            lines: Iterable[str] = _iter_lines(content)
+        else:
+            lines = (line.rstrip("\n") for line in content)
+
+        chunks = self._iter_section_chunks(lines, rules, metadata)
+        if rules.strategy == ChunkingStrategy.HYBRID:
+            chunks = self._iter_split_large_chunks(chunks, rules, metadata)
+        yield from self._iter_post_processed_chunks(chunks, rules)
+
+    def _iter_section_chunks(
+        self,
+        lines: Iterable[str],
+        rules: ChunkingRule,
+        metadata: Optional[Dict[str, Any]],
+    ) -> Iterator[DocumentChunk]:
+        """Streaming equivalent of ``_section_boundary_chunking``."""
+        # Small sections are skipped when there are several, and if all of
+        # them are, the whole content becomes one chunk. Lines are therefore
+        # recorded until the first chunk is emitted.
+        recorded: Optional[List[str]] = []
+
+        def record(lines: Iterable[str]) -> Iterator[str]:
+            for line in lines:
+                if recorded is not None:
+                    recorded.append(line)
+                yield line
+
+        sections = self._iter_sections(record(lines))
+        first = next(sections, None)
+        if first is None:
+            return
+        second = next(sections, None)
+        if second is None:
+            # The only section is always kept
+            title, section_content, start = first
+            yield self._make_section_chunk(
+                title, section_content, 1, start, rules, metadata
+            )
+            return
+
+        for i, (title, section_content, start) in enumerate(
+            itertools.chain((first, second), sections)
+        ):
+            if len(section_content.strip()) < rules.min_chunk_size:
+                continue
+            recorded = None
+            yield self._make_section_chunk(
+                title, section_content, i + 1, start, rules, metadata
+            )
+
+        if recorded is not None:
+            content = "\n".join(recorded)
+            if content.strip():
+                chunk = self._make_section_chunk(
+                    "Content", content, 1, 0, rules, metadata
+                )
+                chunk.section_path = ["content"]
+                yield chunk
+
+    def _iter_split_large_chunks(
+        self,
+        chunks: Iterable[DocumentChunk],
+        rules: ChunkingRule,
+        metadata: Optional[Dict[str, Any]],
+    ) -> Iterator[DocumentChunk]:
+        """Streaming equivalent of the size split in ``_hybrid_chunking``."""
+        for section_chunk in chunks:
+            if section_chunk.content_length <= rules.max_chunk_size:
+                yield section_chunk
+                continue
+            sub_chunks = self._fixed_size_chunking(
+                section_chunk.content, rules, metadata
+            )
+            for i, sub_chunk in enumerate(sub_chunks):
+                sub_chunk.section_path = section_chunk.section_path + [f"sub_{i+1}"]
+                sub_chunk.parent_doc_id = section_chunk.parent_doc_id
+                yield sub_chunk
+
+    def _iter_post_processed_chunks(
+        self, chunks: Iterable[DocumentChunk], rules: ChunkingRule
+    ) -> Iterator[DocumentChunk]:
+        """Streaming equivalent of ``_post_process_chunks``.
+
+        Holds back one chunk, since the last chunk is always kept.
+        """
+        sequence = 0
+        previous: Optional[DocumentChunk] = None
+        for chunk in chunks:
+            if previous is not None and self._keep_chunk(previous, rules):
+                sequence += 1
+                yield self._finish_chunk(previous, sequence)
+            previous = chunk
+        if previous is not None:
+            yield self._finish_chunk(previous, sequence + 1)
+
     def _hybrid_chunking(
         self, content: str, rules: ChunkingRule, metadata: Optional[Dict[str, Any]]
     ) -> List[DocumentChunk]:
@@ -162,28 +324,13 @@ class DocumentChunkingService:
                 continue
 
             # Create chunk for this section
-            chunk = DocumentChunk(
-                parent_doc_id=(
-                    metadata.get("document_id", "unknown") if metadata else "unknown"
-                ),
-                chunk_sequence=i + 1,
-                chunk_type=ChunkType.SECTION,
-                content=section_content.strip(),
-                content_length=len(section_content.strip()),
-                word_count=len(section_content.split()),
-                title=section_title,
-                section_path=[section_title] if section_title else [],
-                page_number=None,
-                chunking_strategy=rules.strategy,
-                chunk_size=rules.target_chunk_size,
-                overlap_size=rules.overlap_size,
-                start_offset=content.find(section_content),
-                end_offset=content.find(section_content) + len(section_content),
-                previous_chunk_id=None,
-                next_chunk_id=None,
-                search_text=self._optimize_for_search(section_content),
-                keywords=self._extract_keywords(section_content),
-                embedding=None,
+            chunk = self._make_section_chunk(
+                section_title,
+                section_content,
+                i + 1,
+                content.find(section_content),
+                rules,
+                metadata,
             )
 
             chunks.append(chunk)
@@ -220,6 +367,40 @@ class DocumentChunkingService:
 
         return chunks
 
+    def _make_section_chunk(
+        self,
+        section_title: str,
+        section_content: str,
+        sequence: int,
+        start_offset: int,
+        rules: ChunkingRule,
+        metadata: Optional[Dict[str, Any]],
+    ) -> DocumentChunk:
+        """Build the chunk for one section."""
+        return DocumentChunk(
+            parent_doc_id=(
+                metadata.get("document_id", "unknown") if metadata else "unknown"
+            ),
+            chunk_sequence=sequence,
+            chunk_type=ChunkType.SECTION,
+            content=section_content.strip(),
+            content_length=len(section_content.strip()),
+            word_count=len(section_content.split()),
+            title=section_title,
+            section_path=[section_title] if section_title else [],
+            page_number=None,
+            chunking_strategy=rules.strategy,
+            chunk_size=rules.target_chunk_size,
+            overlap_size=rules.overlap_size,
+            start_offset=start_offset,
+            end_offset=start_offset + len(section_content),
+            previous_chunk_id=None,
+            next_chunk_id=None,
+            search_text=self._optimize_for_search(section_content),
+            keywords=self._extract_keywords(section_content),
+            embedding=None,
+        )
+
     def _page_limit_chunking(
         self, content: str, rules: ChunkingRule, metadata: Optional[Dict[str, Any]]
     ) -> List[DocumentChunk]:
@@ -536,57 +717,38 @@ class DocumentChunkingService:
         self, content: str, metadata: Optional[Dict[str, Any]]
     ) -> List[Tuple[str, str]]:
         """Extract sections from content based on headers and structure."""
-        sections = []
-
-        # Common header patterns
-        header_patterns = [
-            r"^#+\s+(.+)$",  # Markdown headers
-            r"^[A-Z][A-Z\s]+\n[-=]+\n",  # Underlined headers
-            r"^\d+\.\s+(.+)$",  # Numbered sections
-            r"^[A-Z][^.!?]*[.!?]?\n",  # Sentence-style headers
+        sections = [
+            (title, section_content)
+            for title, section_content, _ in self._iter_sections(_iter_lines(content))
         ]
 
-        # Email-specific patterns
-        email_patterns = [
-            r"^From:.*$",  # From line
-            r"^To:.*$",  # To line
-            r"^Subject:.*$",  # Subject line
-            r"^Date:.*$",  # Date line
-            r"^Sent:.*$",  # Sent line
-            r"^On .* wrote:$",  # Quote start
-            r"^>.*$",  # Quoted content
-            r"^---.*$",  # Separator lines
-        ]
+        # If no sections found, fall back to semantic units (useful for emails)
+        if not sections and metadata and metadata.get("document_type") == "email":
+            return self._extract_semantic_units(content, metadata)
 
-        # Combine all patterns
-        all_patterns = header_patterns + email_patterns
+        return sections
 
-        # Split content by headers
-        lines = content.split("\n")
+    def _iter_sections(self, lines: Iterable[str]) -> Iterator[Tuple[str, str, int]]:
+        """Split lines into (title, content, start offset) sections at headers."""
         current_section: List[str] = []
         current_title = "Introduction"
+        section_start = 0
+        offset = 0
 
         for line in lines:
-            # Check if line is a header
-            is_header = any(re.match(pattern, line) for pattern in all_patterns)
-
-            if is_header and current_section:
+            if current_section and _is_section_header(line):
                 # Save current section
-                sections.append((current_title, "\n".join(current_section)))
+                yield current_title, "\n".join(current_section), section_start
                 current_section = []
                 current_title = line.strip()
+                section_start = offset + len(line) + 1
             else:
                 current_section.append(line)
+            offset += len(line) + 1
 
         # Add final section
         if current_section:
-            sections.append((current_title, "\n".join(current_section)))
-
-        # If no sections found, fall back to semantic units (useful for emails)
-        if not sections and metadata and metadata.get("document_type") == "email":
-            return self._extract_semantic_units(content, metadata)
-
-        return sections
+            yield current_title, "\n".join(current_section), section_start
 
     def _extract_pages(
         self, content: str, metadata: Optional[Dict[str, Any]]
@@ -644,55 +806,38 @@ class DocumentChunkingService:
         metadata: Optional[Dict[str, Any]],
     ) -> List[DocumentChunk]:
         """Post-process chunks to improve quality and consistency."""
-        processed_chunks = []
+        # Skip chunks that are too small or too low quality, UNLESS it's the
+        # last chunk. This prevents having 0 chunks and handles residual chunks
+        kept = [
+            chunk
+            for i, chunk in enumerate(chunks)
+            if i == len(chunks) - 1 or self._keep_chunk(chunk, rules)
+        ]
 
-        for i, chunk in enumerate(chunks):
-            is_last_chunk = i == len(chunks) - 1
+        # Clean up and re-sequence chunks
+        return [self._finish_chunk(chunk, i + 1) for i, chunk in enumerate(kept)]
 
-            # Skip chunks that are too small, UNLESS it's the last chunk
-            # This prevents having 0 chunks and handles residual chunks
-            if chunk.content_length < rules.min_chunk_size and not is_last_chunk:
-                continue
+    def _keep_chunk(self, chunk: DocumentChunk, rules: ChunkingRule) -> bool:
+        """Check a chunk against the minimum size and quality."""
+        if chunk.content_length < rules.min_chunk_size:
+            return False
+        return self._calculate_chunk_quality(chunk) >= rules.min_content_quality
 
-            # Skip chunks that are too low quality, UNLESS it's the last chunk
-            if (
-                self._calculate_chunk_quality(chunk) < rules.min_content_quality
-                and not is_last_chunk
-            ):
-                continue
+    def _finish_chunk(self, chunk: DocumentChunk, sequence: int) -> DocumentChunk:
+        """Clean a kept chunk and refresh its derived fields."""
+        # Clean up content
+        chunk.content = self._clean_content(chunk.content)
+        chunk.content_length = len(chunk.content)
+        chunk.word_count = len(chunk.content.split())
+
+        # Update search text
+        chunk.search_text = self._optimize_for_search(chunk.content)
+
+        # Extract keywords
+        chunk.keywords = self._extract_keywords(chunk.content)
 
-            # Clean up content
-            chunk.content = self._clean_content(chunk.content)
-            chunk.content_length = len(chunk.content)
-            chunk.word_count = len(chunk.content.split())
-
-            # Update search text
-            chunk.search_text = self._optimize_for_search(chunk.content)
-
-            # Extract keywords
-            chunk.keywords = self._extract_keywords(chunk.content)
-
-            processed_chunks.append(chunk)
-
-        # If we filtered out all chunks, keep at least one (the first one)
-        # This prevents having 0 chunks which breaks the system
-        if not processed_chunks and chunks:
-            first_chunk = chunks[0]
-            # Clean up content
-            first_chunk.content = self._clean_content(first_chunk.content)
-            first_chunk.content_length = len(first_chunk.content)
-            first_chunk.word_count = len(first_chunk.content.split())
-            # Update search text
-            first_chunk.search_text = self._optimize_for_search(first_chunk.content)
-            # Extract keywords
-            first_chunk.keywords = self._extract_keywords(first_chunk.content)
-            processed_chunks.append(first_chunk)
-
-        # Re-sequence chunks
-        for i, chunk in enumerate(processed_chunks):
-            chunk.chunk_sequence = i + 1
-
-        return processed_chunks
+        chunk.chunk_sequence = sequence
+        return chunk
 
     def _clean_content(self, content: str) -> str:
         """Clean and normalize content."""
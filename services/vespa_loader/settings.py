@@ -3,6 +3,8 @@
 Configuration settings for the Vespa loader service
 """
 
+from typing import Optional
+
 from services.common.settings import BaseSettings, Field, SettingsConfigDict
 
 
@@ -38,6 +40,14 @@ class Settings(BaseSettings):
         default="http://localhost:8080", validation_alias="VESPA_ENDPOINT"
     )
     vespa_timeout: int = Field(default=30, validation_alias="VESPA_TIMEOUT")
+    vespa_max_connections: int = Field(
+        default=64, validation_alias="VESPA_MAX_CONNECTIONS"
+    )
+    vespa_feed_concurrency: int = Field(
+        default=32,
+        validation_alias="VESPA_FEED_CONCURRENCY",
+        description="Maximum document writes in flight during a bulk feed",
+    )
 
     # Embedding configuration
     embedding_model: str = Field(
@@ -45,6 +55,31 @@ class Settings(BaseSettings):
         validation_alias="EMBEDDING_MODEL",
     )
     embedding_timeout: int = Field(default=60, validation_alias="EMBEDDING_TIMEOUT")
+    embedding_executor: str = Field(
+        default="thread",
+        validation_alias="EMBEDDING_EXECUTOR",
+        description="Where model.encode runs: thread, process or inline",
+    )
+    embedding_workers: int = Field(default=1, validation_alias="EMBEDDING_WORKERS")
+    embedding_max_pending_batches: int = Field(
+        default=8, validation_alias="EMBEDDING_MAX_PENDING_BATCHES"
+    )
+    embedding_cache_enabled: bool = Field(
+        default=True, validation_alias="EMBEDDING_CACHE_ENABLED"
+    )
+    embedding_cache_max_entries: int = Field(
+        default=20000,
+        validation_alias="EMBEDDING_CACHE_MAX_ENTRIES",
+        description="In-memory LRU size; 384 float32 dims is ~1.5KB per entry",
+    )
+    embedding_cache_redis_url: Optional[str] = Field(
+        default=None,
+        validation_alias="EMBEDDING_CACHE_REDIS_URL",
+        description="Optional shared Redis tier; unset keeps the cache in memory",
+    )
+    embedding_cache_ttl_seconds: int = Field(
+        default=30 * 24 * 3600, validation_alias="EMBEDDING_CACHE_TTL_SECONDS"
+    )
 
     # Content processing
     max_content_length: int = Field(
@@ -85,6 +120,15 @@ class Settings(BaseSettings):
         default=False, validation_alias="DISABLE_PUBSUB_CONSUMER"
     )
 
+    # Micro-batching of consumed messages (one embedding call per batch)
+    ingest_batch_size: int = Field(default=32, validation_alias="INGEST_BATCH_SIZE")
+    ingest_batch_max_wait_ms: int = Field(
+        default=50, validation_alias="INGEST_BATCH_MAX_WAIT_MS"
+    )
+    ingest_max_concurrent_batches: int = Field(
+        default=2, validation_alias="INGEST_MAX_CONCURRENT_BATCHES"
+    )
+
     # Health check configuration
     health_check_interval_seconds: int = Field(
         default=30, validation_alias="HEALTH_CHECK_INTERVAL"
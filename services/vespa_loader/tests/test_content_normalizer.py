@@ -0,0 +1,58 @@
+"""
+Tests for the single-pass content normalizer
+"""
+
+import random
+
+import pytest
+
+from services.vespa_loader.content_normalizer import ContentNormalizer
+
+CORPUS = [
+    "<html><body><p>Hello <b>world</b></p></body></html>",
+    "<div>Text</div><script>alert(1)</script><style>p{}</style><!-- c -->",
+    "From: a@example.com\nTo: b@example.com\nSubject: Hi\n\nBody text",
+    "Reply-To: a@example.com\nIn-Reply-To: <id@example.com>\nBody",
+    "See the max-width setting\nnext line\n",
+    "<<div>b>nested</b>",
+    "<b x <a y>kept?",
+    "Dat<span>To: x\n</span>e: y\ntail",
+    "a \t b\t\t c   d\n\n\n\ne &amp; f &lt;g&gt;",
+    "ſubject: long s\nİn-Reply-To: dotted\nbody",
+    "<td style='max-width:600px'>cell</td><font>kept tag</font>",
+]
+
+
+@pytest.fixture
+def normalizers():
+    return ContentNormalizer(), ContentNormalizer(fast_path=False)
+
+
+class TestContentNormalizerFastPath:
+    @pytest.mark.parametrize("content", CORPUS)
+    @pytest.mark.parametrize(
+        "method", ["normalize", "normalize_html", "normalize_email", "normalize_text"]
+    )
+    def test_matches_multi_pass_output(self, normalizers, method, content):
+        fast, legacy = normalizers
+
+        assert getattr(fast, method)(content) == getattr(legacy, method)(content)
+
+    def test_matches_multi_pass_output_on_random_fragments(self, normalizers):
+        fast, legacy = normalizers
+        fragments = [
+            "<", ">", "</", "<div>", "</p>", "<a href='x'>", "<!--", "-->",
+            "From:", "To:", "Reply-", "CC:", "BCC:", "X-", "box-", "Dat", "e:",
+            "\n", "\n\n\n", " ", "  ", "\t", "&amp;", "text", "ı", "ſ",
+        ]  # fmt: skip
+        rng = random.Random(7)
+
+        for _ in range(500):
+            content = "".join(rng.choice(fragments) for _ in range(rng.randint(0, 20)))
+            assert fast.normalize(content) == legacy.normalize(content)
+
+    def test_strips_tags_and_headers(self, normalizers):
+        fast, _ = normalizers
+        content = "From: a@example.com\n<div><p>Hello&nbsp;<b>there</b></p></div>"
+
+        assert fast.normalize(content) == "Hello\xa0there"
@@ -2,6 +2,8 @@
 Tests for the document chunking service.
 """
 
+import re
+
 import pytest
 
 from services.api.v1.vespa.document_chunking import (
@@ -11,6 +13,7 @@ from services.api.v1.vespa.document_chunking import (
 )
 from services.vespa_loader.services.document_chunking_service import (
     DocumentChunkingService,
+    _is_section_header,
 )
 
 
@@ -1010,3 +1013,108 @@ Short."""
         ), "Should use HYBRID strategy"
 
         # logger.info(f"Successfully handled residual chunk in document with {result.total_chunks} chunks")
+
+
+class TestSectionHeaderMatching:
+    """The compiled matcher agrees with the original per-pattern checks."""
+
+    LEGACY_PATTERNS = [
+        r"^#+\s+(.+)$",
+        r"^[A-Z][A-Z\s]+\n[-=]+\n",
+        r"^\d+\.\s+(.+)$",
+        r"^[A-Z][^.!?]*[.!?]?\n",
+        r"^From:.*$",
+        r"^To:.*$",
+        r"^Subject:.*$",
+        r"^Date:.*$",
+        r"^Sent:.*$",
+        r"^On .* wrote:$",
+        r"^>.*$",
+        r"^---.*$",
+    ]
+
+    @pytest.mark.parametrize(
+        "line",
+        [
+            "# Title",
+            "#",
+            "# ",
+            "#  ",
+            "### Deep",
+            "#NoSpace",
+            "1. First",
+            "12.  Twelve",
+            "1.",
+            "١. Arabic-Indic digit",
+            "From: a@example.com",
+            "Fromage",
+            "To:",
+            "Subject: hi",
+            "Date: today",
+            "Sent: now",
+            "On Mon, Bob wrote:",
+            "On  wrote:",
+            "On wrote:",
+            "> quoted",
+            "---",
+            "----- Original Message",
+            "SUMMARY",
+            "Plain sentence.",
+            "",
+            "\t# indented",
+        ],
+    )
+    def test_matches_legacy_patterns(self, line):
+        expected = any(re.match(pattern, line) for pattern in self.LEGACY_PATTERNS)
+
+        assert _is_section_header(line) is expected
+
+
+class TestStreamingChunking:
+    """iter_chunks yields the same chunks as chunk_document."""
+
+    CONTENT = "\n".join(
+        [
+            "Intro line that is not a header.",
+            "# Overview",
+            "The project overview covers goals and scope in some detail. " * 12,
+            "## Budget",
+            "Budget line items and quarterly estimates for the team. " * 50,
+            "1. Risks",
+            "Tiny.",
+            "> quoted reply",
+            "Closing remarks about the plan and the next review meeting. " * 10,
+        ]
+    )
+
+    @staticmethod
+    def _summary(chunks):
+        return [
+            (c.chunk_sequence, c.title, c.section_path, c.content, c.keywords)
+            for c in chunks
+        ]
+
+    @pytest.mark.parametrize("document_type", ["word", "sheet", "email"])
+    def test_matches_chunk_document(self, document_type):
+        service = DocumentChunkingService()
+        metadata = {"document_id": "doc1"}
+
+        expected = service.chunk_document(
+            "doc1", self.CONTENT, document_type, metadata
+        ).chunks
+        streamed = list(
+            service.iter_chunks("doc1", self.CONTENT, document_type, metadata)
+        )
+
+        assert self._summary(streamed) == self._summary(expected)
+
+    def test_accepts_line_iterables_with_real_offsets(self):
+        service = DocumentChunkingService()
+        lines = (line + "\n" for line in self.CONTENT.split("\n"))
+
+        chunks = list(service.iter_chunks("doc1", lines, "sheet"))
+
+        assert chunks
+        for chunk in chunks:
+            source = self.CONTENT[chunk.start_offset : chunk.end_offset]
+            assert source.split()[:3] == chunk.content.split()[:3]
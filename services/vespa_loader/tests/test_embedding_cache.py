@@ -0,0 +1,117 @@
+"""
+Tests for the content-hash embedding cache
+"""
+
+from unittest.mock import AsyncMock, MagicMock, Mock, patch
+
+import numpy as np
+import pytest
+
+from services.vespa_loader.embedding_cache import EmbeddingCache
+from services.vespa_loader.embeddings import EmbeddingGenerator
+
+
+def _vector(value: float) -> list:
+    return [value] * 384
+
+
+class TestEmbeddingCache:
+    @pytest.mark.asyncio
+    async def test_round_trip_and_counters(self):
+        cache = EmbeddingCache("model-a")
+
+        assert await cache.get_many(["hello"]) == [None]
+        await cache.set_many(["hello"], [_vector(0.25)])
+
+        assert await cache.get_many(["hello", "other"]) == [_vector(0.25), None]
+        stats = cache.get_stats()
+        assert stats["memory_hits"] == 1
+        assert stats["misses"] == 2
+        assert stats["hit_rate"] == pytest.approx(1 / 3)
+
+    @pytest.mark.asyncio
+    async def test_keys_include_model_name(self):
+        cache_a = EmbeddingCache("model-a")
+        cache_b = EmbeddingCache("model-b")
+
+        assert cache_a._key("same") != cache_b._key("same")
+
+    @pytest.mark.asyncio
+    async def test_memory_tier_is_bounded_lru(self):
+        cache = EmbeddingCache("model-a", max_entries=2)
+        await cache.set_many(["a", "b"], [_vector(1.0), _vector(2.0)])
+        await cache.get_many(["a"])
+        await cache.set_many(["c"], [_vector(3.0)])
+
+        assert await cache.get_many(["a", "b", "c"]) == [
+            _vector(1.0),
+            None,
+            _vector(3.0),
+        ]
+        assert cache.get_stats()["memory_entries"] == 2
+
+    @pytest.mark.asyncio
+    async def test_redis_hits_are_promoted(self):
+        cache = EmbeddingCache("model-a")
+        stored = np.asarray(_vector(0.5), dtype=np.float32).tobytes()
+        cache._redis = MagicMock()
+        cache._redis.mget = AsyncMock(return_value=[stored])
+
+        assert await cache.get_many(["x"]) == [_vector(0.5)]
+        assert await cache.get_many(["x"]) == [_vector(0.5)]
+
+        cache._redis.mget.assert_awaited_once()
+        stats = cache.get_stats()
+        assert stats["redis_hits"] == 1
+        assert stats["memory_hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_redis_errors_degrade_to_misses(self):
+        cache = EmbeddingCache("model-a")
+        cache._redis = MagicMock()
+        cache._redis.mget = AsyncMock(side_effect=ConnectionError("down"))
+
+        assert await cache.get_many(["x"]) == [None]
+        assert cache.get_stats()["redis_errors"] == 1
+
+
+class TestEmbeddingGeneratorCache:
+    def _make_generator(self, cache):
+        with patch.object(EmbeddingGenerator, "_initialize_model"):
+            generator = EmbeddingGenerator(executor_mode="inline", cache=cache)
+        generator.model = Mock()
+        generator.model.encode.side_effect = lambda texts: np.full(
+            (len(texts), 384) if isinstance(texts, list) else 384, 0.5
+        )
+        return generator
+
+    @pytest.mark.asyncio
+    async def test_batch_encodes_only_unseen_contents(self):
+        generator = self._make_generator(EmbeddingCache("model-a"))
+
+        await generator.generate_batch_embeddings(["a", "b"])
+        result = await generator.generate_batch_embeddings(["a", "c", "c"])
+
+        assert len(result) == 3
+        assert generator.model.encode.call_args_list[1].args[0] == ["c"]
+        assert generator.get_metrics()["cache"]["memory_hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_single_embedding_uses_cache(self):
+        generator = self._make_generator(EmbeddingCache("model-a"))
+
+        first = await generator.generate_embedding("hello")
+        second = await generator.generate_embedding("hello")
+
+        assert first == second == _vector(0.5)
+        generator.model.encode.assert_called_once_with("hello")
+
+    @pytest.mark.asyncio
+    async def test_failed_encodes_are_not_cached(self):
+        generator = self._make_generator(EmbeddingCache("model-a"))
+        generator.model.encode.side_effect = RuntimeError("boom")
+
+        result = await generator.generate_batch_embeddings(["a"])
+
+        assert result == [[0.0] * 384]
+        assert generator.cache.get_stats()["stores"] == 0
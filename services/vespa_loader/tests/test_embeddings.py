@@ -3,6 +3,9 @@
 Tests for the EmbeddingGenerator
 """
 
+import asyncio
+import threading
+import time
 from unittest.mock import AsyncMock, Mock, patch
 
 import numpy as np
@@ -241,10 +244,9 @@ class TestEmbeddingGenerator:
     @pytest.mark.asyncio
     async def test_generate_embedding_model_not_loaded(self):
         """Test embedding generation when model is not loaded"""
-        # Create generator without calling __init__ to avoid model loading
-        generator = EmbeddingGenerator.__new__(EmbeddingGenerator)
-        generator.model = None
-        generator.model_name = "test-model"
+        # Skip model loading so the model stays unloaded
+        with patch.object(EmbeddingGenerator, "_initialize_model"):
+            generator = EmbeddingGenerator("test-model")
 
         # Should return zero vector when model is not loaded (due to error handling)
         result = await generator.generate_embedding(self.test_text)
@@ -315,10 +317,9 @@ class TestEmbeddingGenerator:
     @pytest.mark.asyncio
     async def test_generate_batch_embeddings_model_not_loaded(self):
         """Test batch embedding generation when model is not loaded"""
-        # Create generator without calling __init__ to avoid model loading
-        generator = EmbeddingGenerator.__new__(EmbeddingGenerator)
-        generator.model = None
-        generator.model_name = "test-model"
+        # Skip model loading so the model stays unloaded
+        with patch.object(EmbeddingGenerator, "_initialize_model"):
+            generator = EmbeddingGenerator("test-model")
 
         # Should return zero vectors when model is not loaded (due to error handling)
         result = await generator.generate_batch_embeddings(self.test_texts)
@@ -514,12 +515,107 @@ class TestEmbeddingGenerator:
 
     def test_model_info_when_not_loaded(self):
         """Test model info when model is not loaded"""
-        generator = EmbeddingGenerator.__new__(EmbeddingGenerator)
-        generator.model = None
-        generator.model_name = "test-model"
+        # Skip model loading so the model stays unloaded
+        with patch.object(EmbeddingGenerator, "_initialize_model"):
+            generator = EmbeddingGenerator("test-model")
 
         info = generator.get_model_info()
 
         assert info["model_name"] == "test-model"
         assert info["is_loaded"] is False
         assert info["type"] == "none"
+
+
+class TestEmbeddingExecutor:
+    """Test running model.encode off the event loop"""
+
+    def _make_generator(self, encode, **kwargs):
+        with patch.object(EmbeddingGenerator, "_initialize_model"):
+            generator = EmbeddingGenerator(**kwargs)
+        generator.model = Mock()
+        generator.model.encode.side_effect = encode
+        return generator
+
+    def test_rejects_unknown_executor_mode(self):
+        with pytest.raises(ValueError):
+            EmbeddingGenerator(executor_mode="gpu")
+
+    @pytest.mark.asyncio
+    async def test_thread_mode_keeps_event_loop_responsive(self):
+        def slow_encode(texts):
+            time.sleep(0.1)
+            return np.zeros((len(texts), 384))
+
+        generator = self._make_generator(slow_encode, executor_mode="thread")
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            for _ in range(5):
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        result, _ = await asyncio.gather(
+            generator.generate_batch_embeddings(["a", "b"]), ticker()
+        )
+
+        assert len(result) == 2
+        assert ticks == 5
+        await generator.close()
+
+    @pytest.mark.asyncio
+    async def test_pending_batches_are_bounded(self):
+        running = 0
+        peak = 0
+        lock = threading.Lock()
+
+        def encode(texts):
+            nonlocal running, peak
+            with lock:
+                running += 1
+                peak = max(peak, running)
+            time.sleep(0.02)
+            with lock:
+                running -= 1
+            return np.zeros((len(texts), 384))
+
+        generator = self._make_generator(
+            encode, executor_mode="thread", max_workers=4, max_pending_batches=2
+        )
+
+        await asyncio.gather(
+            *(generator.generate_batch_embeddings(["t"]) for _ in range(6))
+        )
+
+        assert peak <= 2
+        await generator.close()
+
+    @pytest.mark.asyncio
+    async def test_records_batch_metrics(self):
+        generator = self._make_generator(
+            lambda texts: np.zeros((len(texts), 384)), executor_mode="thread"
+        )
+
+        await generator.generate_batch_embeddings(["a", "b", "c"])
+        await generator.generate_embedding("d")
+        metrics = generator.get_metrics()
+
+        assert metrics["batches"] == 2
+        assert metrics["texts"] == 4
+        assert metrics["last_batch_size"] == 1
+        assert metrics["executor_mode"] == "thread"
+        assert metrics["avg_batch_seconds"] >= 0
+        await generator.close()
+
+    @pytest.mark.asyncio
+    async def test_closed_generator_returns_zero_vectors(self):
+        generator = self._make_generator(
+            lambda texts: np.ones((len(texts), 384)), executor_mode="thread"
+        )
+        await generator.generate_batch_embeddings(["warm"])
+
+        await generator.close()
+        result = await generator.generate_batch_embeddings(["a"])
+
+        assert result == [[0.0] * 384]
+        assert generator.is_model_loaded() is True
@@ -10,10 +10,13 @@ from unittest.mock import AsyncMock, MagicMock
 import pytest
 
 from services.api.v1.vespa.vespa_types import VespaDocumentType
-from services.common.http_errors import ValidationError
+from services.common.http_errors import ServiceError, ValidationError
 from services.vespa_loader.content_normalizer import ContentNormalizer
 from services.vespa_loader.embeddings import EmbeddingGenerator
-from services.vespa_loader.ingest_service import ingest_document_service
+from services.vespa_loader.ingest_service import (
+    ingest_document_service,
+    ingest_documents_batch_service,
+)
 from services.vespa_loader.vespa_client import VespaClient
 
 
@@ -239,3 +242,91 @@ class TestIngestService:
             )
 
         assert "Document ID and user_id are required" in str(exc_info.value)
+
+
+class TestIngestDocumentsBatchService:
+    """Test the ingest_documents_batch_service function"""
+
+    def setup_method(self):
+        # A real client feeds the batch; only the single-document write is mocked
+        self.vespa_client = VespaClient("http://localhost:8080")
+        self.vespa_client.session = MagicMock()
+        self.vespa_client._index_document = AsyncMock(
+            side_effect=lambda vespa_document: (
+                {"id": vespa_document["doc_id"], "status": "success"},
+                1,
+            )
+        )
+        self.mock_content_normalizer = MagicMock(spec=ContentNormalizer)
+        self.mock_content_normalizer.normalize.side_effect = lambda text: text.lower()
+        self.mock_embedding_generator = MagicMock(spec=EmbeddingGenerator)
+        self.mock_embedding_generator.generate_batch_embeddings = AsyncMock(
+            side_effect=lambda texts: [[float(i)] for i in range(len(texts))]
+        )
+
+    @staticmethod
+    def _make_document(doc_id, body="Content", user_id="test_user_123"):
+        return VespaDocumentType(
+            id=doc_id,
+            user_id=user_id,
+            type="email",
+            provider="gmail",
+            subject="Test Subject",
+            body=body,
+            from_address="sender@test.com",
+            to_addresses=["recipient@test.com"],
+        )
+
+    @pytest.mark.asyncio
+    async def test_embeds_all_contents_in_one_call(self):
+        documents = [
+            self._make_document("doc_1", body="First"),
+            self._make_document("doc_2", body=""),
+            self._make_document("doc_3", body="Third"),
+        ]
+
+        results = await ingest_documents_batch_service(
+            documents,
+            self.vespa_client,
+            self.mock_content_normalizer,
+            self.mock_embedding_generator,
+        )
+
+        assert [r.document_id for r in results] == ["doc_1", "doc_2", "doc_3"]
+        # Empty content is not sent to the model
+        self.mock_embedding_generator.generate_batch_embeddings.assert_awaited_once_with(
+            ["first", "third"]
+        )
+        indexed = {
+            call.args[0]["doc_id"]: call.args[0]
+            for call in self.vespa_client._index_document.call_args_list
+        }
+        assert indexed["doc_1"]["embedding"] == [0.0]
+        assert indexed["doc_3"]["embedding"] == [1.0]
+        assert "embedding" not in indexed["doc_2"]
+
+    @pytest.mark.asyncio
+    async def test_failures_are_reported_per_document(self):
+        documents = [
+            self._make_document("doc_1"),
+            self._make_document("doc_2", user_id=""),
+            self._make_document("doc_3"),
+        ]
+
+        async def index_document(vespa_document):
+            if vespa_document["doc_id"] == "doc_3":
+                raise RuntimeError("vespa down")
+            return {"id": vespa_document["doc_id"], "status": "success"}, 1
+
+        self.vespa_client._index_document.side_effect = index_document
+
+        results = await ingest_documents_batch_service(
+            documents,
+            self.vespa_client,
+            self.mock_content_normalizer,
+            self.mock_embedding_generator,
+        )
+
+        assert results[0].status == "success"
+        assert isinstance(results[1], ValidationError)
+        assert isinstance(results[2], ServiceError)
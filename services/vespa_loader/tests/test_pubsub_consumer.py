@@ -1,3 +1,4 @@
+import asyncio
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
@@ -186,3 +187,98 @@ class TestPubSubConsumer:
         mock_message.nack.assert_called_once()
         assert mock_consumer.processed_count == 0
         assert mock_consumer.error_count == 1
+
+
+class TestPubSubConsumerBatching:
+    """Test the micro-batching stage of the PubSubConsumer"""
+
+    @pytest.fixture
+    def consumer(self):
+        from services.vespa_loader.settings import Settings
+
+        mock_settings = MagicMock(spec=Settings)
+        mock_settings.pubsub_project_id = "test-project"
+        mock_settings.ingest_batch_size = 3
+        mock_settings.ingest_batch_max_wait_ms = 20
+        mock_settings.ingest_max_concurrent_batches = 2
+        return PubSubConsumer(mock_settings)
+
+    @staticmethod
+    def _make_item(index):
+        document = MagicMock()
+        document.id = f"doc-{index}"
+        message = MagicMock()
+        message.message_id = f"msg-{index}"
+        return document, message
+
+    async def test_collect_batch_caps_size(self, consumer):
+        queue = asyncio.Queue()
+        for i in range(5):
+            queue.put_nowait(self._make_item(i))
+
+        batch = await consumer._collect_batch(queue, 3, 1.0)
+
+        assert [doc.id for doc, _ in batch] == ["doc-0", "doc-1", "doc-2"]
+        assert queue.qsize() == 2
+
+    async def test_collect_batch_flushes_after_max_wait(self, consumer):
+        queue = asyncio.Queue()
+        queue.put_nowait(self._make_item(0))
+
+        batch = await asyncio.wait_for(
+            consumer._collect_batch(queue, 32, 0.02), timeout=1
+        )
+
+        assert len(batch) == 1
+
+    @patch("services.vespa_loader.pubsub_consumer.ingest_documents_batch_service")
+    async def test_process_batch_acks_and_nacks_individually(
+        self, mock_batch_service, consumer
+    ):
+        items = [self._make_item(i) for i in range(3)]
+        mock_batch_service.return_value = [
+            {"status": "success"},
+            Exception("index failed"),
+            {"status": "success"},
+        ]
+
+        await consumer._process_message_batch(items)
+
+        mock_batch_service.assert_awaited_once()
+        assert [doc.id for doc in mock_batch_service.call_args.args[0]] == [
+            "doc-0",
+            "doc-1",
+            "doc-2",
+        ]
+        items[0][1].ack.assert_called_once()
+        items[1][1].nack.assert_called_once()
+        items[1][1].ack.assert_not_called()
+        items[2][1].ack.assert_called_once()
+        assert consumer.processed_count == 2
+        assert consumer.error_count == 1
+
+    @patch("services.vespa_loader.pubsub_consumer.ingest_documents_batch_service")
+    async def test_batches_flow_from_queue_to_ingestion(
+        self, mock_batch_service, consumer
+    ):
+        mock_batch_service.side_effect = lambda docs, *args: [{}] * len(docs)
+        consumer._batch_queue = asyncio.Queue()
+        consumer._batch_semaphore = asyncio.Semaphore(2)
+        items = [self._make_item(i) for i in range(4)]
+        for item in items:
+            consumer._batch_queue.put_nowait(item)
+
+        task = asyncio.create_task(consumer._run_ingest_batches())
+        try:
+            for _ in range(100):
+                if consumer.processed_count == 4:
+                    break
+                await asyncio.sleep(0.01)
+        finally:
+            task.cancel()
+
+        assert consumer.processed_count == 4
+        assert [len(call.args[0]) for call in mock_batch_service.call_args_list] == [
+            3,
+            1,
+        ]
@@ -0,0 +1,141 @@
+"""
+Tests for bulk feeding documents to Vespa against a local stub server
+"""
+
+import asyncio
+
+import pytest
+from aiohttp import web
+
+from services.vespa_loader.vespa_client import VespaClient
+
+
+def _document(index: int) -> dict:
+    return {
+        "id": f"doc{index}",
+        "user_id": "user@example.com",
+        "source_type": "email",
+        "provider": "gmail",
+        "content": f"content {index}",
+    }
+
+
+class StubVespa:
+    """Counts concurrent writes and fails the first ``fail_first`` per doc"""
+
+    def __init__(self, status_for=None, fail_first: int = 0, delay: float = 0.01):
+        self.status_for = status_for or {}
+        self.fail_first = fail_first
+        self.delay = delay
+        self.attempts: dict = {}
+        self.in_flight = 0
+        self.peak = 0
+
+    async def handle(self, request: web.Request) -> web.Response:
+        doc_id = request.match_info["doc_id"]
+        self.attempts[doc_id] = self.attempts.get(doc_id, 0) + 1
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.in_flight -= 1
+        if self.attempts[doc_id] <= self.fail_first:
+            return web.Response(status=429, text="overloaded")
+        status = self.status_for.get(doc_id, 200)
+        if status != 200:
+            return web.Response(status=status, text="rejected")
+        return web.json_response({"id": doc_id})
+
+
+@pytest.fixture
+async def stub_server():
+    runners = []
+
+    async def start(stub: StubVespa) -> str:
+        app = web.Application()
+        app.router.add_post(
+            "/document/v1/briefly/briefly_document/group/{user_id}/{doc_id}",
+            stub.handle,
+        )
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        runners.append(runner)
+        port = runner.addresses[0][1]
+        return f"http://127.0.0.1:{port}"
+
+    yield start
+    for runner in runners:
+        await runner.cleanup()
+
+
+class TestFeedDocuments:
+    @pytest.mark.asyncio
+    async def test_bounded_concurrency_and_ordered_results(self, stub_server):
+        stub = StubVespa()
+        client = VespaClient(await stub_server(stub), feed_concurrency=4)
+
+        results = await client.feed_documents(_document(i) for i in range(20))
+        await client.close()
+
+        assert [r.index for r in results] == list(range(20))
+        assert all(r.success for r in results)
+        assert results[3].document_id.endswith("email_gmail_doc3")
+        assert 1 < stub.peak <= 4
+
+    @pytest.mark.asyncio
+    async def test_accepts_async_streams(self, stub_server):
+        stub = StubVespa(delay=0)
+        client = VespaClient(await stub_server(stub))
+
+        async def stream():
+            for i in range(5):
+                yield _document(i)
+
+        results = await client.feed_documents(stream(), concurrency=2)
+        await client.close()
+
+        assert len(results) == 5
+        assert all(r.success for r in results)
+
+    @pytest.mark.asyncio
+    async def test_retries_overloaded_responses(self, stub_server):
+        stub = StubVespa(fail_first=2, delay=0)
+        client = VespaClient(
+            await stub_server(stub), max_retries=3, retry_delay_seconds=0.001
+        )
+
+        results = await client.feed_documents([_document(1)])
+        await client.close()
+
+        assert results[0].success
+        assert results[0].attempts == 3
+
+    @pytest.mark.asyncio
+    async def test_failures_are_reported_per_document(self, stub_server):
+        stub = StubVespa(status_for={"email_gmail_doc1": 400}, fail_first=0, delay=0)
+        client = VespaClient(await stub_server(stub), retry_delay_seconds=0.001)
+
+        results = await client.feed_documents([_document(i) for i in range(3)])
+        await client.close()
+
+        assert [r.success for r in results] == [True, False, True]
+        assert "HTTP 400" in results[1].error
+        # Client errors are not retried
+        assert stub.attempts["email_gmail_doc1"] == 1
+
+    @pytest.mark.asyncio
+    async def test_gives_up_after_max_retries(self, stub_server):
+        stub = StubVespa(fail_first=10, delay=0)
+        client = VespaClient(
+            await stub_server(stub), max_retries=2, retry_delay_seconds=0.001
+        )
+
+        results = await client.feed_documents([_document(1)])
+        await client.close()
+
+        assert not results[0].success
+        assert results[0].attempts == 3
+        assert "HTTP 429" in results[0].error
@@ -3,9 +3,21 @@
 Vespa HTTP API client for the loader service
 """
 
+import asyncio
 import json
+import random
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
-from typing import Any, Dict, List, Optional
+from typing import (
+    Any,
+    AsyncIterable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
 
 import aiohttp
 
@@ -15,19 +27,75 @@ from services.common.telemetry import get_tracer
 logger = get_logger(__name__)
 tracer = get_tracer(__name__)
 
+# Vespa answers these when the content cluster is overloaded; safe to retry
+RETRYABLE_STATUSES = frozenset({429, 503})
 
-class VespaClient:
-    """Client for interacting with Vespa HTTP API"""
 
-    def __init__(self, vespa_endpoint: str) -> None:
+class VespaFeedError(Exception):
+    """A document write rejected by Vespa"""
+
+    def __init__(
+        self, status: int, message: str, retry_after: Optional[float] = None
+    ) -> None:
+        super().__init__(f"HTTP {status}: {message}")
+        self.status = status
+        self.retryable = status in RETRYABLE_STATUSES
+        self.retry_after = retry_after
+        self.attempts = 1
+
+
+@dataclass
+class FeedResult:
+    """Outcome of feeding a single document"""
+
+    index: int
+    document_id: Optional[str] = None
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    attempts: int = 0
+    exception: Optional[BaseException] = field(default=None, repr=False)
+
+    @property
+    def success(self) -> bool:
+        return self.error is None
+
+
+class VespaClient:
+    """Client for interacting with Vespa HTTP API
+
+    Requests share one keep-alive connection pool. Writes that Vespa rejects
+    with 429/503 are retried with exponential backoff, and ``feed_documents``
+    feeds many documents with a bounded number of requests in flight.
+    """
+
+    def __init__(
+        self,
+        vespa_endpoint: str,
+        max_connections: int = 64,
+        feed_concurrency: int = 32,
+        max_retries: int = 3,
+        retry_delay_seconds: float = 0.5,
+    ) -> None:
         self.vespa_endpoint = vespa_endpoint.rstrip("/")
         self.session: Optional[aiohttp.ClientSession] = None
+        self.max_connections = max_connections
+        self.feed_concurrency = max(1, feed_concurrency)
+        self.max_retries = max(0, max_retries)
+        self.retry_delay_seconds = retry_delay_seconds
 
     async def start(self) -> None:
         """Start the client and create HTTP session"""
         if not self.session:
             timeout = aiohttp.ClientTimeout(total=30, connect=10)
-            self.session = aiohttp.ClientSession(timeout=timeout)
+            # All traffic goes to one endpoint, so the per-host limit is the
+            # pool size; keep idle connections around between feed bursts
+            connector = aiohttp.TCPConnector(
+                limit=self.max_connections,
+                limit_per_host=self.max_connections,
+                keepalive_timeout=60,
+                ttl_dns_cache=300,
+            )
+            self.session = aiohttp.ClientSession(timeout=timeout, connector=connector)
         logger.info("Vespa client started")
 
     async def close(self) -> None:
@@ -71,6 +139,13 @@ class VespaClient:
 
     async def index_document(self, document: Dict[str, Any]) -> Dict[str, Any]:
         """Index a document into Vespa"""
+        result, _ = await self._index_document(document)
+        return result
+
+    async def _index_document(
+        self, document: Dict[str, Any]
+    ) -> Tuple[Dict[str, Any], int]:
+        """Index a document, returning the result and the number of attempts"""
         with tracer.start_as_current_span("vespa.index_document") as span:
             span.set_attribute(
                 "vespa.document.type", document.get("source_type", "unknown")
@@ -100,30 +175,32 @@ class VespaClient:
                 url = f"{self.vespa_endpoint}/document/v1/briefly/briefly_document/group/{user_id}/{doc_id}"
                 span.set_attribute("vespa.request.url", url)
 
-                if self.session:
-                    async with self.session.post(url, json=vespa_doc) as response:
-                        span.set_attribute("vespa.response.status", response.status)
-
-                        if response.status == 200:
-                            result = await response.json()
-                            logger.info(f"Successfully indexed document {doc_id}")
-                            span.set_attribute("vespa.indexing.success", True)
-                            return {
-                                "id": full_doc_id,
-                                "status": "success",
-                                "result": result,
-                            }
-                        else:
-                            error_text = await response.text()
-                            logger.error(
-                                f"Failed to index document {doc_id}: {response.status} - {error_text}"
-                            )
-                            span.set_attribute("vespa.indexing.success", False)
-                            span.set_attribute("vespa.error.status", response.status)
-                            span.set_attribute("vespa.error.message", error_text)
-                            raise Exception(f"HTTP {response.status}: {error_text}")
-                else:
-                    raise Exception("No session available")
+                attempt = 0
+                while True:
+                    try:
+                        result = await self._post_document(url, vespa_doc, span)
+                        break
+                    except (VespaFeedError, aiohttp.ClientConnectionError) as e:
+                        if isinstance(e, VespaFeedError):
+                            e.attempts = attempt + 1
+                        retryable = getattr(e, "retryable", True)
+                        if not retryable or attempt >= self.max_retries:
+                            raise
+                        delay = self._retry_delay(attempt, e)
+                        logger.warning(
+                            f"Retrying document {doc_id} in {delay:.2f}s "
+                            f"(attempt {attempt + 1}/{self.max_retries}): {e}"
+                        )
+                        await asyncio.sleep(delay)
+                        attempt += 1
+
+                logger.info(f"Successfully indexed document {doc_id}")
+                span.set_attribute("vespa.indexing.success", True)
+                span.set_attribute("vespa.indexing.attempts", attempt + 1)
+                return (
+                    {"id": full_doc_id, "status": "success", "result": result},
+                    attempt + 1,
+                )
 
             except Exception as e:
                 logger.error(
@@ -133,6 +210,117 @@ class VespaClient:
                 span.record_exception(e)
                 raise
 
+    async def _post_document(
+        self, url: str, vespa_doc: Dict[str, Any], span: Any
+    ) -> Dict[str, Any]:
+        """POST one document, raising VespaFeedError for non-200 responses"""
+        if not self.session:
+            raise Exception("No session available")
+
+        async with self.session.post(url, json=vespa_doc) as response:
+            span.set_attribute("vespa.response.status", response.status)
+
+            if response.status == 200:
+                return await response.json()
+
+            error_text = await response.text()
+            span.set_attribute("vespa.error.status", response.status)
+            span.set_attribute("vespa.error.message", error_text)
+            if response.status in RETRYABLE_STATUSES:
+                raise VespaFeedError(
+                    response.status, error_text, self._parse_retry_after(response)
+                )
+            logger.error(
+                f"Failed to index document at {url}: {response.status} - {error_text}"
+            )
+            raise VespaFeedError(response.status, error_text)
+
+    @staticmethod
+    def _parse_retry_after(response: Any) -> Optional[float]:
+        try:
+            return min(float(response.headers.get("Retry-After")), 30.0)
+        except (AttributeError, TypeError, ValueError):
+            return None
+
+    def _retry_delay(self, attempt: int, error: Exception) -> float:
+        """Exponential backoff with jitter, honouring Retry-After when sent"""
+        retry_after = getattr(error, "retry_after", None)
+        if retry_after is not None:
+            return retry_after
+        base = self.retry_delay_seconds * (2**attempt)
+        return base * random.uniform(0.5, 1.5)
+
+    async def feed_documents(
+        self,
+        documents: Union[Iterable[Dict[str, Any]], AsyncIterable[Dict[str, Any]]],
+        concurrency: Optional[int] = None,
+    ) -> List[FeedResult]:
+        """Feed many documents with at most ``concurrency`` requests in flight
+
+        Documents are pulled from ``documents`` (a list, generator or async
+        stream) only as workers free up, so large streams are never fully
+        buffered. Each write is retried on 429/503 like ``index_document``.
+
+        Returns:
+            One FeedResult per document, in input order
+        """
+        concurrency = max(1, concurrency or self.feed_concurrency)
+        if not self.session:
+            await self.start()
+
+        queue: asyncio.Queue = asyncio.Queue(maxsize=concurrency)
+        results: Dict[int, FeedResult] = {}
+
+        async def produce() -> None:
+            index = 0
+            try:
+                if isinstance(documents, AsyncIterable):
+                    async for document in documents:
+                        await queue.put((index, document))
+                        index += 1
+                else:
+                    for document in documents:
+                        await queue.put((index, document))
+                        index += 1
+            finally:
+                for _ in range(concurrency):
+                    await queue.put(None)
+
+        async def work() -> None:
+            while True:
+                item = await queue.get()
+                if item is None:
+                    return
+                index, document = item
+                try:
+                    result, attempts = await self._index_document(document)
+                    results[index] = FeedResult(
+                        index=index,
+                        document_id=result["id"],
+                        result=result,
+                        attempts=attempts,
+                    )
+                except Exception as e:
+                    results[index] = FeedResult(
+                        index=index,
+                        error=str(e),
+                        attempts=getattr(e, "attempts", 0),
+                        exception=e,
+                    )
+
+        with tracer.start_as_current_span("vespa.feed_documents") as span:
+            span.set_attribute("vespa.feed.concurrency", concurrency)
+            await asyncio.gather(produce(), *(work() for _ in range(concurrency)))
+            failed = sum(1 for r in results.values() if not r.success)
+            span.set_attribute("vespa.feed.documents", len(results))
+            span.set_attribute("vespa.feed.failed", failed)
+
+        logger.info(
+            f"Fed {len(results)} documents to Vespa ({failed} failed, "
+            f"concurrency {concurrency})"
+        )
+        return [results[index] for index in range(len(results))]
+
     async def get_document(self, doc_id: str, user_id: str) -> Optional[Dict[str, Any]]:
         """Get a document from Vespa"""
         with tracer.start_as_current_span("vespa.get_document") as span:
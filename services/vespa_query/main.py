@@ -3,6 +3,7 @@
 Vespa Query Service - Query interface for hybrid search capabilities
 """
 
+import asyncio
 from contextlib import asynccontextmanager
 from datetime import UTC, datetime
 from typing import Any, AsyncGenerator, Dict, List, Optional
@@ -38,6 +39,7 @@ tracer = get_tracer(__name__)
 search_engine: Optional[Any] = None
 query_builder: Optional[Any] = None
 result_processor: Optional[Any] = None
+query_embedder: Optional[Any] = None
 
 
 async def verify_api_key(x_api_key: str = Header(..., alias="X-API-Key")) -> str:
@@ -54,7 +56,7 @@ async def verify_api_key(x_api_key: str = Header(..., alias="X-API-Key")) -> str
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     """Manage service lifecycle"""
-    global search_engine, query_builder, result_processor
+    global search_engine, query_builder, result_processor, query_embedder
 
     # Initialize settings
     from services.vespa_query.settings import get_settings
@@ -70,6 +72,10 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
 
     # Now import modules that use logging after logging is configured
     from services.vespa_query.query_builder import QueryBuilder
+    from services.vespa_query.query_embedder import (
+        SENTENCE_TRANSFORMERS_AVAILABLE,
+        QueryEmbedder,
+    )
     from services.vespa_query.result_processor import ResultProcessor
     from services.vespa_query.search_engine import SearchEngine
 
@@ -81,9 +87,23 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
 
     # Initialize components
     search_engine = SearchEngine(settings.vespa_endpoint)
-    query_builder = QueryBuilder()
+    query_builder = QueryBuilder(target_hits=settings.query_embedding_target_hits)
     result_processor = ResultProcessor()
 
+    if settings.query_embedding_enabled:
+        if SENTENCE_TRANSFORMERS_AVAILABLE:
+            query_embedder = QueryEmbedder(
+                model_name=settings.query_embedding_model,
+                max_entries=settings.query_embedding_cache_size,
+            )
+            # Load the model off-loop now rather than on the first search
+            await asyncio.to_thread(query_embedder.load)
+        else:
+            logger.warning(
+                "Query embedding enabled but sentence-transformers is not "
+                "installed; searches will use keyword matching only"
+            )
+
     # Test Vespa connectivity
     try:
         await search_engine.test_connection()
@@ -100,6 +120,8 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     logger.info("Shutting down Vespa Query Service...")
     if search_engine:
         await search_engine.close()
+    if query_embedder:
+        await query_embedder.close()
     logger.info("Vespa Query Service shutdown complete")
 
     # Log service shutdown
@@ -161,6 +183,8 @@ async def health_check() -> Dict[str, Any]:
     health_status["checks"]["result_processor"] = (
         "healthy" if result_processor else "unhealthy - not initialized"
     )
+    if query_embedder:
+        health_status["query_embedding"] = query_embedder.get_stats()
 
     # Determine overall status
     overall_status = "healthy"
@@ -203,6 +227,8 @@ async def search(
         )
 
     try:
+        query_embedding = await query_embedder.embed(query) if query_embedder else None
+
         # Build search query
         search_query = query_builder.build_search_query(
             query=query,
@@ -215,6 +241,7 @@ async def search(
             date_to=date_to,
             folders=folders,
             include_facets=include_facets,
+            query_embedding=query_embedding,
         )
 
         # Execute search
@@ -11,14 +11,21 @@ from services.common.telemetry import get_tracer
 logger = get_logger(__name__)
 tracer = get_tracer(__name__)
 
+# Query tensor declared as an input of the hybrid and semantic rank profiles
+QUERY_EMBEDDING_INPUT = "input.query(query_embedding)"
+DEFAULT_TARGET_HITS = 100
+
 
 class QueryBuilder:
     """
     Builds Vespa YQL queries with proper escaping and validation
     """
 
-    def __init__(self, max_max_hits: int = 1000):
+    def __init__(
+        self, max_max_hits: int = 1000, target_hits: int = DEFAULT_TARGET_HITS
+    ):
         self.max_max_hits = max_max_hits
+        self.target_hits = target_hits
 
     def _escape_yql_value(self, value: str) -> str:
         """
@@ -54,14 +61,24 @@ class QueryBuilder:
         date_to: Optional[str] = None,
         folders: Optional[List[str]] = None,
         include_facets: bool = True,
+        query_embedding: Optional[List[float]] = None,
+        target_hits: Optional[int] = None,
     ) -> Dict[str, Any]:
-        """Build a complete Vespa search query"""
+        """
+        Build a complete Vespa search query
+
+        With a ``query_embedding``, documents are also retrieved by
+        nearestNeighbor on the ``embedding`` field, so semantically related
+        documents are recalled even without a keyword match. The ``semantic``
+        profile uses nearestNeighbor alone.
+        """
         with tracer.start_as_current_span("query_builder.build_search_query") as span:
             span.set_attribute("query.user_id", user_id)
             span.set_attribute("query.ranking_profile", ranking_profile)
             span.set_attribute("query.max_hits", max_hits)
             span.set_attribute("query.offset", offset)
             span.set_attribute("query.include_facets", include_facets)
+            span.set_attribute("query.has_embedding", query_embedding is not None)
             span.set_attribute(
                 "query.source_types", str(source_types) if source_types else "none"
             )
@@ -73,6 +90,12 @@ class QueryBuilder:
                 # Validate inputs
                 self._validate_query_inputs(query, user_id, max_hits, offset)
 
+                nearest_neighbor = None
+                if query_embedding is not None:
+                    nearest_neighbor = self.build_nearest_neighbor_clause(
+                        target_hits or self.target_hits
+                    )
+
                 # Build base query
                 vespa_query = {
                     "yql": self._build_yql_query(
@@ -83,6 +106,9 @@ class QueryBuilder:
                         date_from,
                         date_to,
                         folders,
+                        nearest_neighbor=nearest_neighbor,
+                        keyword_match=ranking_profile != "semantic"
+                        or nearest_neighbor is None,
                     ),
                     "ranking": ranking_profile,
                     "hits": min(max_hits, self.max_max_hits),
@@ -91,6 +117,9 @@ class QueryBuilder:
                     "streaming.groupname": user_id,  # Add streaming mode support for user isolation
                 }
 
+                if query_embedding is not None:
+                    vespa_query[QUERY_EMBEDDING_INPUT] = query_embedding
+
                 # Add faceting if requested
                 if include_facets:
                     vespa_query["presentation.timing"] = True
@@ -263,6 +292,16 @@ class QueryBuilder:
         if offset < 0:
             raise ValueError("Offset cannot be negative")
 
+    @staticmethod
+    def build_nearest_neighbor_clause(target_hits: int = DEFAULT_TARGET_HITS) -> str:
+        """nearestNeighbor clause matching the query tensor against documents"""
+        if target_hits <= 0:
+            raise ValueError("Target hits must be positive")
+        return (
+            f"({{targetHits:{target_hits}}}"
+            "nearestNeighbor(embedding, query_embedding))"
+        )
+
     def _build_yql_query(
         self,
         query: str,
@@ -272,6 +311,8 @@ class QueryBuilder:
         date_from: Optional[str] = None,
         date_to: Optional[str] = None,
         folders: Optional[List[str]] = None,
+        nearest_neighbor: Optional[str] = None,
+        keyword_match: bool = True,
     ) -> str:
         """Build the YQL query string"""
         # Safely escape user inputs to prevent YQL injection
@@ -279,9 +320,17 @@ class QueryBuilder:
         escaped_user_id = self._escape_yql_value(user_id)
 
         # Build a more specific query that searches in search_text and content fields
+        recall = []
+        if keyword_match:
+            recall.append(
+                f'search_text contains "{escaped_query}" or content contains "{escaped_query}"'
+            )
+        if nearest_neighbor:
+            recall.append(nearest_neighbor)
+
         # Add explicit user_id filtering for consistent user isolation
         yql_parts = [
-            f'select * from briefly_document where user_id="{escaped_user_id}" and (search_text contains "{escaped_query}" or content contains "{escaped_query}")'
+            f'select * from briefly_document where user_id="{escaped_user_id}" and ({" or ".join(recall)})'
         ]
 
         # Add source type filter
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Query embedder for hybrid and semantic ranking
+
+Encodes search queries with the same MiniLM model the loader uses for
+documents (``services.vespa_loader.embeddings.EmbeddingGenerator``, declared
+through the ``embeddings`` extra), so the query tensor and the indexed
+``embedding`` field live in the same space.
+Encoding runs in the generator's executor, off the event loop.
+
+Autocomplete and agent retries send the same queries over and over, so
+embeddings are kept in a bounded LRU keyed by the normalized query text, and
+concurrent misses for the same query share a single encode. MiniLM's
+tokenizer is uncased, so case-folding the key does not change the embedding.
+"""
+
+import asyncio
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+from services.common.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+try:
+    import sentence_transformers  # noqa: F401
+
+    SENTENCE_TRANSFORMERS_AVAILABLE = True
+except ImportError:
+    SENTENCE_TRANSFORMERS_AVAILABLE = False
+
+DEFAULT_MODEL_NAME = "sentence-transformers/all-MiniLM-L6-v2"
+
+
+def normalize_query(query: str) -> str:
+    """Cache key for a query: case-folded with whitespace collapsed"""
+    return " ".join(query.casefold().split())
+
+
+class QueryEmbedder:
+    """Embeds search queries behind a bounded LRU cache"""
+
+    def __init__(
+        self,
+        generator: Optional[Any] = None,
+        model_name: str = DEFAULT_MODEL_NAME,
+        max_entries: int = 2048,
+        max_workers: int = 1,
+    ) -> None:
+        self.model_name = model_name
+        self.max_entries = max_entries
+        self.max_workers = max_workers
+        self._generator = generator
+        self._load_error: Optional[str] = None
+        self._cache: "OrderedDict[str, List[float]]" = OrderedDict()
+        self._in_flight: Dict[str, "asyncio.Future[Optional[List[float]]]"] = {}
+        self._stats = {"hits": 0, "misses": 0, "coalesced": 0, "errors": 0}
+
+    def load(self) -> None:
+        """Load the embedding model (blocking; called off-loop on first use)"""
+        if self._generator is not None or self._load_error is not None:
+            return
+        try:
+            from services.vespa_loader.embeddings import EmbeddingGenerator
+
+            self._generator = EmbeddingGenerator(
+                model_name=self.model_name,
+                executor_mode="thread",
+                max_workers=self.max_workers,
+            )
+        except Exception as e:
+            # Don't retry the load on every query
+            self._load_error = str(e)
+            logger.error(f"Query embedding disabled, model failed to load: {e}")
+
+    def _remember(self, key: str, embedding: List[float]) -> None:
+        if self.max_entries <= 0:
+            return
+        self._cache[key] = embedding
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.max_entries:
+            self._cache.popitem(last=False)
+
+    async def embed(self, query: str) -> Optional[List[float]]:
+        """
+        Embed a query
+
+        Returns:
+            The query embedding, or None if the query is empty or encoding
+            failed, in which case callers fall back to keyword matching
+        """
+        key = normalize_query(query)
+        if not key or self._load_error is not None:
+            return None
+
+        cached = self._cache.get(key)
+        if cached is not None:
+            self._cache.move_to_end(key)
+            self._stats["hits"] += 1
+            return cached
+
+        pending = self._in_flight.get(key)
+        if pending is not None:
+            self._stats["coalesced"] += 1
+            return await asyncio.shield(pending)
+
+        self._stats["misses"] += 1
+        future: "asyncio.Future[Optional[List[float]]]" = (
+            asyncio.get_running_loop().create_future()
+        )
+        self._in_flight[key] = future
+        embedding: Optional[List[float]] = None
+        try:
+            if self._generator is None:
+                await asyncio.to_thread(self.load)
+            if self._generator is None:
+                return None
+            result = await self._generator.generate_embedding(key)
+            # The generator returns a zero vector when encoding fails
+            if any(result):
+                embedding = result
+                self._remember(key, embedding)
+            else:
+                self._stats["errors"] += 1
+        except Exception as e:
+            logger.warning(f"Query embedding failed, using keyword search only: {e}")
+            self._stats["errors"] += 1
+        finally:
+            del self._in_flight[key]
+            future.set_result(embedding)
+        return embedding
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and cache size"""
+        lookups = self._stats["hits"] + self._stats["misses"]
+        return {
+            **self._stats,
+            "hit_rate": self._stats["hits"] / lookups if lookups else 0.0,
+            "entries": len(self._cache),
+            "max_entries": self.max_entries,
+            "model_loaded": self._generator is not None,
+            "load_error": self._load_error,
+        }
+
+    async def close(self) -> None:
+        if self._generator is not None:
+            await self._generator.close()
+            self._generator = None
+
+
+_shared_embedder: Optional[QueryEmbedder] = None
+
+
+def get_query_embedder() -> Optional[QueryEmbedder]:
+    """
+    Process-wide query embedder, or None when sentence-transformers is not
+    installed. Sharing one instance keeps a single model and cache per process.
+    """
+    global _shared_embedder
+    if not SENTENCE_TRANSFORMERS_AVAILABLE:
+        return None
+    if _shared_embedder is None:
+        _shared_embedder = QueryEmbedder()
+    return _shared_embedder
@@ -34,6 +34,21 @@ class Settings(BaseSettings):
         default="hybrid", validation_alias="DEFAULT_RANKING_PROFILE"
     )
 
+    # Query embedding (hybrid/semantic ranking)
+    query_embedding_enabled: bool = Field(
+        default=True, validation_alias="QUERY_EMBEDDING_ENABLED"
+    )
+    query_embedding_model: str = Field(
+        default="sentence-transformers/all-MiniLM-L6-v2",
+        validation_alias="QUERY_EMBEDDING_MODEL",
+    )
+    query_embedding_cache_size: int = Field(
+        default=2048, validation_alias="QUERY_EMBEDDING_CACHE_SIZE"
+    )
+    query_embedding_target_hits: int = Field(
+        default=100, validation_alias="QUERY_EMBEDDING_TARGET_HITS"
+    )
+
     # Query processing
     query_timeout: int = Field(default=10, validation_alias="QUERY_TIMEOUT")
     max_concurrent_queries: int = Field(
@@ -0,0 +1,156 @@
+"""
+Tests for query embedding and the nearestNeighbor clause in search queries.
+"""
+
+import asyncio
+from typing import List
+
+import pytest
+
+from services.vespa_query.query_builder import QUERY_EMBEDDING_INPUT, QueryBuilder
+from services.vespa_query.query_embedder import QueryEmbedder, normalize_query
+
+
+class FakeGenerator:
+    """Stands in for EmbeddingGenerator without loading a model."""
+
+    def __init__(self, fail: bool = False, delay: float = 0.0) -> None:
+        self.calls: List[str] = []
+        self.fail = fail
+        self.delay = delay
+        self.closed = False
+
+    async def generate_embedding(self, text: str) -> List[float]:
+        self.calls.append(text)
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        if self.fail:
+            return [0.0] * 384
+        return [float(len(text))] + [0.1] * 383
+
+    async def close(self) -> None:
+        self.closed = True
+
+
+class TestQueryEmbedder:
+    def test_normalize_query(self):
+        assert normalize_query("  Budget   REVIEW\tnotes ") == "budget review notes"
+        assert normalize_query("   ") == ""
+
+    @pytest.mark.asyncio
+    async def test_repeated_queries_hit_cache(self):
+        generator = FakeGenerator()
+        embedder = QueryEmbedder(generator=generator)
+
+        first = await embedder.embed("Budget review")
+        second = await embedder.embed("  budget   REVIEW ")
+
+        assert first == second
+        assert generator.calls == ["budget review"]
+        stats = embedder.get_stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["hit_rate"] == 0.5
+
+    @pytest.mark.asyncio
+    async def test_lru_eviction(self):
+        generator = FakeGenerator()
+        embedder = QueryEmbedder(generator=generator, max_entries=2)
+
+        await embedder.embed("a")
+        await embedder.embed("b")
+        await embedder.embed("a")  # a is now most recently used
+        await embedder.embed("c")  # evicts b
+        await embedder.embed("a")
+        await embedder.embed("b")
+
+        assert generator.calls == ["a", "b", "c", "b"]
+        assert embedder.get_stats()["entries"] == 2
+
+    @pytest.mark.asyncio
+    async def test_concurrent_misses_share_one_encode(self):
+        generator = FakeGenerator(delay=0.01)
+        embedder = QueryEmbedder(generator=generator)
+
+        results = await asyncio.gather(
+            *(embedder.embed("same query") for _ in range(5))
+        )
+
+        assert generator.calls == ["same query"]
+        assert all(result == results[0] for result in results)
+        assert embedder.get_stats()["coalesced"] == 4
+
+    @pytest.mark.asyncio
+    async def test_failed_encode_returns_none_and_is_not_cached(self):
+        generator = FakeGenerator(fail=True)
+        embedder = QueryEmbedder(generator=generator)
+
+        assert await embedder.embed("query") is None
+        assert await embedder.embed("query") is None
+        assert generator.calls == ["query", "query"]
+        assert embedder.get_stats()["errors"] == 2
+
+    @pytest.mark.asyncio
+    async def test_empty_query_is_not_embedded(self):
+        generator = FakeGenerator()
+        embedder = QueryEmbedder(generator=generator)
+
+        assert await embedder.embed("   ") is None
+        assert generator.calls == []
+
+    @pytest.mark.asyncio
+    async def test_close_closes_generator(self):
+        generator = FakeGenerator()
+        embedder = QueryEmbedder(generator=generator)
+
+        await embedder.close()
+
+        assert generator.closed
+
+
+class TestNearestNeighborQuery:
+    @pytest.fixture
+    def query_builder(self):
+        return QueryBuilder(target_hits=50)
+
+    def test_without_embedding_query_is_keyword_only(self, query_builder):
+        query = query_builder.build_search_query("budget", "user1")
+
+        assert "nearestNeighbor" not in query["yql"]
+        assert QUERY_EMBEDDING_INPUT not in query
+        assert query["yql"] == (
+            'select * from briefly_document where user_id="user1" and '
+            '(search_text contains "budget" or content contains "budget")'
+        )
+
+    def test_hybrid_adds_nearest_neighbor_to_keyword_recall(self, query_builder):
+        embedding = [0.1] * 384
+        query = query_builder.build_search_query(
+            "budget", "user1", query_embedding=embedding, source_types=["email"]
+        )
+
+        assert query[QUERY_EMBEDDING_INPUT] == embedding
+        assert query["yql"].startswith(
+            'select * from briefly_document where user_id="user1" and '
+            '(search_text contains "budget" or content contains "budget" or '
+            "({targetHits:50}nearestNeighbor(embedding, query_embedding)))"
+        )
+        assert 'and (source_type="email")' in query["yql"]
+
+    def test_semantic_uses_nearest_neighbor_only(self, query_builder):
+        query = query_builder.build_search_query(
+            "budget",
+            "user1",
+            ranking_profile="semantic",
+            query_embedding=[0.1] * 384,
+            target_hits=10,
+        )
+
+        assert "contains" not in query["yql"]
+        assert "({targetHits:10}nearestNeighbor(embedding, query_embedding))" in (
+            query["yql"]
+        )
+
+    def test_target_hits_must_be_positive(self):
+        with pytest.raises(ValueError):
+            QueryBuilder.build_nearest_neighbor_clause(0)